@@ -0,0 +1,17 @@
+"""
+Benchmarks del compilador KForge.
+
+- generator: generador de programas sintéticos del subconjunto de Kotlin
+- run: medición por fase y curvas de rendimiento en JSON
+"""
+
+from benchmarks.generator import ProgramGenerator, generate_program
+from benchmarks.run import run_benchmark, bench_size, scaling_exponents
+
+__all__ = [
+    'ProgramGenerator',
+    'generate_program',
+    'run_benchmark',
+    'bench_size',
+    'scaling_exponents'
+]
@@ -0,0 +1,7 @@
+"""Permite ejecutar el benchmark con `python -m benchmarks`."""
+
+import sys
+
+from benchmarks.run import main
+
+sys.exit(main())
@@ -0,0 +1,274 @@
+"""
+Generador de programas sintéticos del subconjunto de Kotlin de KForge.
+
+Produce programas válidos (sin errores léxicos, sintácticos ni semánticos) de
+un número aproximado de líneas, a partir de una gramática con pesos:
+
+    programa   -> funcion* main
+    funcion    -> 'fun' fN '(' params ')' ':' 'Int' '{' sentencia* 'return' expr '}'
+    sentencia  -> declaracion | asignacion | if | while | for | arreglo | println
+    expr       -> expr op expr | '(' expr ')' | '-' atomo | atomo
+    atomo      -> variable | literal | arreglo '[' indice ']' | fK '(' expr, ... ')'
+
+Las funciones solo llaman a funciones declaradas antes (sin recursión), los
+arreglos se indexan con literales dentro de rango y las divisiones usan
+divisores literales distintos de cero. Los programas de hasta ~1000 líneas
+también se compilan a .class: el backend JVM pone todo el programa en un solo
+método, limitado a 64 KiB de código (ver `benchmarks.run.MAX_LINEAS_JVM`).
+"""
+
+import random
+from typing import Dict, List, Optional, Tuple
+
+
+class ProgramGenerator:
+    """
+    Generador determinista (por semilla) de programas Kotlin.
+
+    Example:
+        >>> codigo = ProgramGenerator(seed=1).generate(1000)
+        >>> len(codigo.splitlines()) >= 1000
+        True
+    """
+
+    # Pesos de cada tipo de sentencia
+    PESOS_SENTENCIAS = (
+        ('declaracion', 30),
+        ('asignacion', 25),
+        ('if', 12),
+        ('while', 6),
+        ('for', 8),
+        ('arreglo', 6),
+        ('println', 8),
+    )
+
+    def __init__(self, seed: int = 0, max_expr_depth: int = 5, max_block_depth: int = 3,
+                 statements_per_function: Tuple[int, int] = (4, 14)):
+        """
+        Inicializa el generador.
+
+        Args:
+            seed: Semilla del generador aleatorio
+            max_expr_depth: Profundidad máxima de las expresiones
+            max_block_depth: Anidamiento máximo de bloques (if/while/for)
+            statements_per_function: Rango de sentencias de primer nivel por función
+        """
+        self.rng = random.Random(seed)
+        self.max_expr_depth = max_expr_depth
+        self.max_block_depth = max_block_depth
+        self.statements_per_function = statements_per_function
+
+        self._tipos = [t for t, _ in self.PESOS_SENTENCIAS]
+        self._pesos = [p for _, p in self.PESOS_SENTENCIAS]
+
+    def generate(self, lines: int) -> str:
+        """
+        Genera un programa de al menos `lines` líneas.
+
+        Args:
+            lines: Número objetivo de líneas
+
+        Returns:
+            Código fuente Kotlin
+        """
+        self._lineas: List[str] = [f"// Programa sintetico KForge (~{lines} lineas)"]
+        self._funciones: List[Tuple[str, int]] = []  # (nombre, número de parámetros)
+        self._contador = 0
+
+        while len(self._lineas) < lines:
+            self._funcion()
+
+        self._main()
+        return "\n".join(self._lineas) + "\n"
+
+    # ========== Utilidades ==========
+
+    def _nombre(self, prefijo: str) -> str:
+        self._contador += 1
+        return f"{prefijo}{self._contador}"
+
+    def _emitir(self, nivel: int, texto: str):
+        self._lineas.append("    " * nivel + texto)
+
+    # ========== Declaraciones de primer nivel ==========
+
+    def _funcion(self):
+        """Genera una función Int con parámetros Int."""
+        nombre = self._nombre("f")
+        n_params = self.rng.randint(0, 3)
+        params = [f"p{i}" for i in range(n_params)]
+        firma = ", ".join(f"{p}: Int" for p in params)
+
+        self._emitir(0, f"fun {nombre}({firma}): Int {{")
+        alcance = _Alcance()
+        for p in params:
+            alcance.enteros.append((p, False))
+
+        # Al menos una variable local para que haya algo que asignar
+        self._declaracion(1, alcance)
+        for _ in range(self.rng.randint(*self.statements_per_function)):
+            self._sentencia(1, alcance, 1)
+
+        self._emitir(1, f"return {self._expr(alcance, self.max_expr_depth)}")
+        self._emitir(0, "}")
+        self._lineas.append("")
+        self._funciones.append((nombre, n_params))
+
+    def _main(self):
+        """Genera main() llamando a algunas de las funciones declaradas."""
+        self._emitir(0, "fun main() {")
+        alcance = _Alcance()
+        for nombre, n_params in self._funciones[-min(len(self._funciones), 20):]:
+            variable = self._nombre("r")
+            args = ", ".join(str(self.rng.randint(0, 50)) for _ in range(n_params))
+            self._emitir(1, f"var {variable}: Int = {nombre}({args})")
+            self._emitir(1, f"println({variable})")
+            alcance.enteros.append((variable, True))
+        self._emitir(0, "}")
+
+    # ========== Sentencias ==========
+
+    def _sentencia(self, nivel: int, alcance: "_Alcance", profundidad: int):
+        tipo = self.rng.choices(self._tipos, self._pesos)[0]
+        if tipo in ('if', 'while', 'for') and profundidad >= self.max_block_depth:
+            tipo = 'asignacion'
+        if tipo == 'asignacion' and not alcance.asignables():
+            tipo = 'declaracion'
+        getattr(self, f"_{tipo}")(nivel, alcance, profundidad) if tipo in ('if', 'while', 'for') \
+            else getattr(self, f"_{tipo}")(nivel, alcance)
+
+    def _declaracion(self, nivel: int, alcance: "_Alcance"):
+        variable = self._nombre("v")
+        self._emitir(nivel, f"var {variable}: Int = {self._expr(alcance, self.max_expr_depth)}")
+        alcance.enteros.append((variable, True))
+
+    def _asignacion(self, nivel: int, alcance: "_Alcance"):
+        variable = self.rng.choice(alcance.asignables())
+        self._emitir(nivel, f"{variable} = {self._expr(alcance, self.max_expr_depth)}")
+
+    def _println(self, nivel: int, alcance: "_Alcance"):
+        self._emitir(nivel, f"println({self._expr(alcance, 2)})")
+
+    def _arreglo(self, nivel: int, alcance: "_Alcance"):
+        variable = self._nombre("a")
+        tamano = self.rng.randint(2, 8)
+        valores = ", ".join(str(self.rng.randint(-99, 99)) for _ in range(tamano))
+        self._emitir(nivel, f"var {variable}: IntArray = intArrayOf({valores})")
+        alcance.arreglos.append((variable, tamano))
+        indice = self.rng.randrange(tamano)
+        self._emitir(nivel, f"{variable}[{indice}] = {self._expr(alcance, 3)}")
+
+    def _bloque(self, nivel: int, alcance: "_Alcance", profundidad: int, n: Optional[int] = None):
+        interno = alcance.hijo()
+        for _ in range(n if n is not None else self.rng.randint(1, 4)):
+            self._sentencia(nivel, interno, profundidad + 1)
+
+    def _if(self, nivel: int, alcance: "_Alcance", profundidad: int):
+        self._emitir(nivel, f"if ({self._condicion(alcance)}) {{")
+        self._bloque(nivel + 1, alcance, profundidad)
+        if self.rng.random() < 0.5:
+            self._emitir(nivel, "} else {")
+            self._bloque(nivel + 1, alcance, profundidad)
+        self._emitir(nivel, "}")
+
+    def _while(self, nivel: int, alcance: "_Alcance", profundidad: int):
+        contador = self._nombre("w")
+        self._emitir(nivel, f"var {contador}: Int = 0")
+        alcance.enteros.append((contador, False))
+        self._emitir(nivel, f"while ({contador} < {self.rng.randint(2, 10)}) {{")
+        self._bloque(nivel + 1, alcance, profundidad)
+        self._emitir(nivel + 1, f"{contador} = {contador} + 1")
+        self._emitir(nivel, "}")
+
+    def _for(self, nivel: int, alcance: "_Alcance", profundidad: int):
+        indice = self._nombre("i")
+        rango = "until" if self.rng.random() < 0.5 else ".."
+        self._emitir(nivel, f"for ({indice} in 0 {rango} {self.rng.randint(1, 10)}) {{")
+        interno = alcance.hijo()
+        interno.enteros.append((indice, False))
+        for _ in range(self.rng.randint(1, 4)):
+            self._sentencia(nivel + 1, interno, profundidad + 1)
+        self._emitir(nivel, "}")
+
+    # ========== Expresiones ==========
+
+    def _condicion(self, alcance: "_Alcance") -> str:
+        op = self.rng.choice(('<', '>', '<=', '>=', '==', '!='))
+        condicion = f"{self._expr(alcance, 2)} {op} {self._expr(alcance, 2)}"
+        if self.rng.random() < 0.2:
+            logico = self.rng.choice(('&&', '||'))
+            condicion = f"{condicion} {logico} {self._expr(alcance, 1)} < {self.rng.randint(0, 100)}"
+        return condicion
+
+    def _expr(self, alcance: "_Alcance", profundidad: int) -> str:
+        if profundidad <= 0 or self.rng.random() < 0.25:
+            return self._atomo(alcance, profundidad)
+
+        op = self.rng.choice(('+', '-', '*', '+', '-', '/', '%'))
+        izquierda = self._expr(alcance, profundidad - 1)
+        if op in ('/', '%'):
+            derecha = str(self.rng.randint(1, 9))
+        else:
+            derecha = self._expr(alcance, profundidad - 1)
+        if self.rng.random() < 0.4:
+            return f"({izquierda} {op} {derecha})"
+        return f"{izquierda} {op} {derecha}"
+
+    def _atomo(self, alcance: "_Alcance", profundidad: int) -> str:
+        r = self.rng.random()
+        enteros = alcance.todos_enteros()
+        if r < 0.45 and enteros:
+            return self.rng.choice(enteros)
+        if r < 0.55:
+            arreglos = alcance.todos_arreglos()
+            if arreglos:
+                nombre, tamano = self.rng.choice(arreglos)
+                return f"{nombre}[{self.rng.randrange(tamano)}]"
+        if r < 0.62 and self._funciones and profundidad > 0:
+            nombre, n_params = self.rng.choice(self._funciones)
+            args = ", ".join(self._expr(alcance, min(profundidad - 1, 1)) for _ in range(n_params))
+            return f"{nombre}({args})"
+        if r < 0.66:
+            return f"-{self.rng.randint(1, 99)}"
+        return str(self.rng.randint(0, 999))
+
+
+class _Alcance:
+    """Variables visibles en un bloque (con enlace al bloque padre)."""
+
+    def __init__(self, padre: Optional["_Alcance"] = None):
+        self.padre = padre
+        self.enteros: List[Tuple[str, bool]] = []  # (nombre, asignable)
+        self.arreglos: List[Tuple[str, int]] = []  # (nombre, tamaño)
+
+    def hijo(self) -> "_Alcance":
+        return _Alcance(self)
+
+    def _cadena(self):
+        alcance = self
+        while alcance is not None:
+            yield alcance
+            alcance = alcance.padre
+
+    def todos_enteros(self) -> List[str]:
+        return [n for a in self._cadena() for n, _ in a.enteros]
+
+    def asignables(self) -> List[str]:
+        return [n for a in self._cadena() for n, asignable in a.enteros if asignable]
+
+    def todos_arreglos(self) -> List[Tuple[str, int]]:
+        return [x for a in self._cadena() for x in a.arreglos]
+
+
+def generate_program(lines: int, seed: int = 0) -> str:
+    """
+    Atajo para generar un programa con los parámetros por defecto.
+
+    Args:
+        lines: Número objetivo de líneas
+        seed: Semilla del generador
+
+    Returns:
+        Código fuente Kotlin
+    """
+    return ProgramGenerator(seed=seed).generate(lines)
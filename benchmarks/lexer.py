@@ -0,0 +1,154 @@
+"""
+Benchmark de los motores de escaneo del lexer.
+
+Tokeniza los mismos programas sintéticos con `Lexer(motor='regex')` y
+`Lexer(motor='dfa')`, comprueba que producen los mismos tokens y reporta
+tokens/s de cada motor y la aceleración del DFA.
+
+Con `--stream ARCHIVO` mide en cambio `Lexer.iter_tokens` sobre un archivo
+(tokens/s y pico de memoria de Python con tracemalloc).
+
+Uso:
+    python -m benchmarks.lexer --sizes 10000,100000 --repeat 3
+    python -m benchmarks.lexer --stream grande.kt
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional
+
+from core.lexer import Lexer
+from benchmarks.generator import generate_program
+
+
+DEFAULT_SIZES = (10000, 50000, 200000)
+
+
+def medir_motor(codigo: str, motor: str, repeat: int = 1) -> Dict[str, Any]:
+    """
+    Mide el mejor tiempo de tokenización de un motor.
+
+    Args:
+        codigo: Código fuente
+        motor: 'regex' o 'dfa'
+        repeat: Repeticiones (se toma el mínimo)
+
+    Returns:
+        {"ms", "tokens", "tokens_per_s", "buffer"}
+    """
+    mejor = None
+    for _ in range(max(1, repeat)):
+        lexer = Lexer(motor=motor)
+        inicio = time.perf_counter()
+        tokens = lexer.tokenizar(codigo)
+        transcurrido = time.perf_counter() - inicio
+        if mejor is None or transcurrido < mejor[0]:
+            mejor = (transcurrido, tokens)
+    segundos, tokens = mejor
+    return {
+        "ms": segundos * 1000,
+        "tokens": len(tokens),
+        "tokens_per_s": len(tokens) / segundos if segundos else None,
+        "buffer": tokens,
+    }
+
+
+def run_lexer_benchmark(sizes=DEFAULT_SIZES, seed: int = 0, repeat: int = 1,
+                        progreso=None) -> Dict[str, Any]:
+    """
+    Compara los motores de escaneo para varios tamaños.
+
+    Args:
+        sizes: Tamaños en líneas
+        seed: Semilla del generador
+        repeat: Repeticiones por motor y tamaño
+        progreso: Callback opcional progreso(resultado_de_un_tamano)
+
+    Returns:
+        Reporte serializable a JSON
+    """
+    resultados = []
+    for lines in sorted(sizes):
+        codigo = generate_program(lines, seed)
+        regex = medir_motor(codigo, 'regex', repeat)
+        dfa = medir_motor(codigo, 'dfa', repeat)
+        b_regex, b_dfa = regex.pop("buffer"), dfa.pop("buffer")
+        resultado = {
+            "lines": codigo.count("\n"),
+            "bytes": len(codigo.encode('utf-8')),
+            "regex": regex,
+            "dfa": dfa,
+            "speedup": regex["ms"] / dfa["ms"] if dfa["ms"] else None,
+            "identical": (b_regex.tipos == b_dfa.tipos and b_regex.inicios == b_dfa.inicios
+                          and b_regex.lineas == b_dfa.lineas and b_regex.columnas == b_dfa.columnas),
+        }
+        resultados.append(resultado)
+        if progreso:
+            progreso(resultado)
+    return {"seed": seed, "repeat": repeat, "sizes": resultados}
+
+
+def medir_streaming(ruta: str, tam_bloque: int = 1 << 20) -> Dict[str, Any]:
+    """
+    Mide la tokenización por bloques de un archivo.
+
+    Args:
+        ruta: Archivo fuente
+        tam_bloque: Bytes por bloque
+
+    Returns:
+        {"ms", "tokens", "tokens_per_s", "peak_kb", "errors"}
+    """
+    lexer = Lexer(motor='dfa')
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    tokens = sum(1 for _ in lexer.iter_tokens(ruta, tam_bloque))
+    segundos = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "ms": segundos * 1000,
+        "tokens": tokens,
+        "tokens_per_s": tokens / segundos if segundos else None,
+        "peak_kb": pico / 1024,
+        "errors": len(lexer.error_manager.obtener_errores()),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Punto de entrada de `python -m benchmarks.lexer`."""
+    parser = argparse.ArgumentParser(description="Benchmark de motores de escaneo de KForge")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES),
+                        help="Tamaños en lineas separados por coma (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0, help="Semilla del generador")
+    parser.add_argument("--repeat", type=int, default=3, help="Repeticiones por motor (minimo)")
+    parser.add_argument("--stream", metavar="ARCHIVO", default=None,
+                        help="Medir Lexer.iter_tokens sobre un archivo en lugar de comparar motores")
+    parser.add_argument("--block-size", type=int, default=1 << 20, help="Bytes por bloque con --stream")
+    parser.add_argument("-o", "--output", default=None, help="Archivo JSON de salida (default: stdout)")
+    args = parser.parse_args(argv)
+
+    if args.stream:
+        print(json.dumps(medir_streaming(args.stream, args.block_size), indent=2))
+        return 0
+
+    def progreso(r):
+        print(f"{r['lines']:>8} lineas  regex {r['regex']['ms']:>8.1f} ms  dfa {r['dfa']['ms']:>8.1f} ms  "
+              f"x{r['speedup']:.2f}" + ("" if r["identical"] else "  [DIFERENCIAS]"), file=sys.stderr)
+
+    reporte = run_lexer_benchmark([int(s) for s in args.sizes.split(",") if s.strip()],
+                                  seed=args.seed, repeat=args.repeat, progreso=progreso)
+    texto = json.dumps(reporte, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(texto)
+    else:
+        print(texto)
+    return 0 if all(r["identical"] for r in reporte["sizes"]) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
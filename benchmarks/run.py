@@ -0,0 +1,248 @@
+"""
+Benchmark de escalabilidad del compilador.
+
+Genera programas sintéticos de varios tamaños (ver generator.py), mide cada
+fase del pipeline (léxico, sintáctico, semántico, TAC, bytecode) y la
+generación JVM (`JVMCompiler.compile`), y reporta curvas de rendimiento
+(líneas/s, tokens/s, nodos/s) en JSON.
+
+Para cada par de tamaños consecutivos se calcula el exponente de escala de
+cada fase, log(t2/t1) / log(n2/n1): ~1 es lineal, ~2 es cuadrático.
+
+El backend JVM genera todo el programa en un solo método `main`, que no puede
+pasar de 64 KiB de código: la generación JVM solo se mide en los tamaños de
+hasta `MAX_LINEAS_JVM` líneas (el reporte lo indica con `"jvm"`). Si falla en
+uno de ellos, el benchmark falla.
+
+Uso:
+    python kforge.py bench --sizes 1000,10000,100000 --repeat 3 -o bench.json
+    python -m benchmarks --sizes 1000,5000
+"""
+
+import argparse
+import json
+import math
+import platform
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from core.pipeline import CompilationPipeline, contar_nodos
+from core.metrics import MetricsCollector, NOMBRES_FASES
+from benchmarks.generator import generate_program
+
+
+DEFAULT_SIZES = (1000, 5000, 20000)
+
+# Exponente a partir del cual una fase se marca como superlineal
+UMBRAL_SUPERLINEAL = 1.3
+
+# Tamaño máximo (líneas) con que un programa generado cabe en un método JVM;
+# 1000 líneas ocupan ~52-60 KiB de código
+MAX_LINEAS_JVM = 1000
+
+
+def _medir_una_vez(codigo: str, memoria: bool, jvm: bool, motor_lexico: str = 'regex') -> Dict[str, Any]:
+    """Compila una vez y devuelve métricas por fase y tamaños."""
+    pipeline = CompilationPipeline(motor_lexico)
+    pipeline.cargar(codigo)
+    colector = MetricsCollector(memoria=memoria)
+    pipeline.metricas = colector
+    pipeline.ejecutar_hasta('bytecode')
+
+    errores = [str(e) for e in pipeline.error_manager.obtener_errores()]
+    if jvm and not errores and pipeline.tac_instructions:
+        from core.jvm.jvm_compiler import JVMCompiler
+        try:
+            JVMCompiler("Bench").compile(pipeline.tac_instructions, "Bench.kt", True, colector)
+        except Exception as e:
+            raise RuntimeError(f"Fallo la generacion JVM: {type(e).__name__}: {e}") from e
+
+    return {
+        "fases": {f: r for f, r in colector.fases.items()},
+        "tokens": len(pipeline.tokens),
+        "nodos": contar_nodos(pipeline.ast),
+        "tac": len(pipeline.tac_instructions),
+        "errores": errores,
+    }
+
+
+def bench_size(lines: int, seed: int = 0, repeat: int = 1, memoria: bool = False,
+               jvm: bool = True, motor_lexico: str = 'regex') -> Dict[str, Any]:
+    """
+    Mide un tamaño de programa.
+
+    Args:
+        lines: Número objetivo de líneas del programa generado
+        seed: Semilla del generador
+        repeat: Repeticiones (se toma el mínimo tiempo por fase)
+        memoria: Si medir el pico de memoria (tracemalloc infla los tiempos)
+        jvm: Si incluir JVMCompiler.compile (solo hasta MAX_LINEAS_JVM líneas)
+        motor_lexico: Motor de escaneo del lexer ('regex' o 'dfa')
+
+    Returns:
+        Resultados del tamaño (ver run_benchmark)
+
+    Raises:
+        RuntimeError: Si la generación JVM falla
+    """
+    jvm = jvm and lines <= MAX_LINEAS_JVM
+    inicio = time.perf_counter()
+    codigo = generate_program(lines, seed)
+    tiempo_generacion = (time.perf_counter() - inicio) * 1000
+    n_lineas = codigo.count("\n")
+
+    mejores: Dict[str, Any] = {}
+    medicion = None
+    for _ in range(max(1, repeat)):
+        medicion = _medir_una_vez(codigo, memoria, jvm, motor_lexico)
+        for fase, registro in medicion["fases"].items():
+            if fase not in mejores or registro.wall_ms < mejores[fase].wall_ms:
+                mejores[fase] = registro
+
+    fases = {}
+    for fase, registro in mejores.items():
+        segundos = registro.wall_ms / 1000
+        fases[fase] = {
+            "wall_ms": registro.wall_ms,
+            "cpu_ms": registro.cpu_ms,
+            "peak_bytes": registro.peak_bytes,
+            "contadores": dict(registro.contadores),
+            "lines_per_s": n_lineas / segundos if segundos else None,
+            "tokens_per_s": medicion["tokens"] / segundos if segundos else None,
+            "nodes_per_s": medicion["nodos"] / segundos if segundos else None,
+        }
+
+    total_ms = sum(f["wall_ms"] for f in fases.values())
+    return {
+        "lines": n_lineas,
+        "bytes": len(codigo.encode('utf-8')),
+        "tokens": medicion["tokens"],
+        "nodes": medicion["nodos"],
+        "tac_instructions": medicion["tac"],
+        "generation_ms": tiempo_generacion,
+        "total_ms": total_ms,
+        "lines_per_s": n_lineas / (total_ms / 1000) if total_ms else None,
+        "fases": fases,
+        "jvm": jvm,
+        "errores": medicion["errores"],
+    }
+
+
+def scaling_exponents(resultados: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Calcula el exponente de escala de cada fase entre tamaños consecutivos.
+
+    Args:
+        resultados: Lista de resultados de bench_size ordenada por tamaño
+
+    Returns:
+        Lista de {"from_lines", "to_lines", "exponentes": {fase: float},
+                  "superlineales": [fase, ...]}
+    """
+    curvas = []
+    for anterior, siguiente in zip(resultados, resultados[1:]):
+        razon_n = siguiente["lines"] / anterior["lines"]
+        if razon_n <= 1:
+            continue
+        exponentes = {}
+        for fase, medida in siguiente["fases"].items():
+            previa = anterior["fases"].get(fase)
+            if previa and previa["wall_ms"] > 0 and medida["wall_ms"] > 0:
+                exponentes[fase] = math.log(medida["wall_ms"] / previa["wall_ms"]) / math.log(razon_n)
+        curvas.append({
+            "from_lines": anterior["lines"],
+            "to_lines": siguiente["lines"],
+            "exponentes": exponentes,
+            "superlineales": [f for f, e in exponentes.items() if e > UMBRAL_SUPERLINEAL],
+        })
+    return curvas
+
+
+def run_benchmark(sizes=DEFAULT_SIZES, seed: int = 0, repeat: int = 1, memoria: bool = False,
+                  jvm: bool = True, progreso=None, motor_lexico: str = 'regex') -> Dict[str, Any]:
+    """
+    Ejecuta el benchmark para varios tamaños.
+
+    Args:
+        sizes: Tamaños objetivo en líneas
+        seed: Semilla del generador
+        repeat: Repeticiones por tamaño
+        memoria: Si medir pico de memoria
+        jvm: Si incluir la generación JVM (en los tamaños que caben en un método)
+        progreso: Callback opcional progreso(resultado_de_un_tamano)
+        motor_lexico: Motor de escaneo del lexer ('regex' o 'dfa')
+
+    Returns:
+        Reporte serializable a JSON
+    """
+    resultados = []
+    for lines in sorted(sizes):
+        resultado = bench_size(lines, seed, repeat, memoria, jvm, motor_lexico)
+        resultados.append(resultado)
+        if progreso:
+            progreso(resultado)
+
+    return {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "seed": seed,
+        "repeat": repeat,
+        "memory": memoria,
+        "lexer": motor_lexico,
+        "sizes": resultados,
+        "scaling": scaling_exponents(resultados),
+    }
+
+
+def formatear_linea(resultado: Dict[str, Any]) -> str:
+    """Resumen de una línea para la consola."""
+    fases = " ".join(
+        f"{NOMBRES_FASES.get(f, f)}={m['wall_ms']:.0f}ms"
+        for f, m in resultado["fases"].items()
+    )
+    return (f"{resultado['lines']:>8} lineas  {resultado['total_ms']:>9.1f} ms  "
+            f"{(resultado['lines_per_s'] or 0):>9.0f} lineas/s  {fases}"
+            + ("" if resultado["jvm"] else "  [sin JVM]")
+            + ("  [errores]" if resultado["errores"] else ""))
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    """Agrega los argumentos del benchmark a un parser."""
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES),
+                        help="Tamaños en lineas separados por coma (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0, help="Semilla del generador")
+    parser.add_argument("--repeat", type=int, default=1, help="Repeticiones por tamaño (minimo)")
+    parser.add_argument("--memory", action="store_true", help="Medir pico de memoria (mas lento)")
+    parser.add_argument("--no-jvm", action="store_true", help="No medir la generacion JVM")
+    parser.add_argument("--lexer", choices=("regex", "dfa"), default="regex",
+                        help="Motor de escaneo del lexer (default: %(default)s)")
+    parser.add_argument("-o", "--output", default=None, help="Archivo JSON de salida (default: stdout)")
+
+
+def main_from_args(args) -> int:
+    """Ejecuta el benchmark con argumentos ya parseados."""
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    reporte = run_benchmark(
+        sizes, seed=args.seed, repeat=args.repeat, memoria=args.memory, jvm=not args.no_jvm,
+        progreso=lambda r: print(formatear_linea(r), file=sys.stderr), motor_lexico=args.lexer
+    )
+    for curva in reporte["scaling"]:
+        if curva["superlineales"]:
+            print(f"[AVISO] Fases superlineales entre {curva['from_lines']} y {curva['to_lines']} "
+                  f"lineas: {', '.join(curva['superlineales'])}", file=sys.stderr)
+
+    texto = json.dumps(reporte, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(texto)
+    else:
+        print(texto)
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Punto de entrada de `python -m benchmarks`."""
+    parser = argparse.ArgumentParser(description="Benchmark de escalabilidad de KForge")
+    add_arguments(parser)
+    return main_from_args(parser.parse_args(argv))
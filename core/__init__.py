@@ -4,9 +4,16 @@ Contiene todas las fases del análisis: léxico, sintáctico, semántico y gener
 """
 
 from core.lexer import Lexer
+from core.token_buffer import TokenBuffer, TokenRingBuffer
+from core.source import SourceText
+from core.ast_arena import ASTArena
+from core.tac_buffer import TACBuffer
 from core.parser import Parser
+from core.visitor import ASTVisitor, ASTTransformer
 from core.semantic import AnalizadorSemantico
 from core.controller import CompiladorController
+from core.cache import CompilationCache
+from core.incremental import IncrementalParser
 from core.errors import (
     CompiladorError,
     LexicalError,
@@ -26,9 +33,18 @@ from core.utils import (
 
 __all__ = [
     'Lexer',
+    'TokenBuffer',
+    'TokenRingBuffer',
+    'ASTArena',
+    'TACBuffer',
+    'SourceText',
     'Parser',
+    'ASTVisitor',
+    'ASTTransformer',
     'AnalizadorSemantico',
     'CompiladorController',
+    'CompilationCache',
+    'IncrementalParser',
     'CompiladorError',
     'LexicalError',
     'SyntaxError',
@@ -0,0 +1,149 @@
+"""
+Árbol sintáctico almacenado en columnas.
+
+`ASTArena` guarda un AST completo en arreglos paralelos indexados por número
+de nodo: tipo (un byte con el valor de `TipoNodo`), línea, columna, offset de
+los hijos y valor. Los nodos se numeran en anchura, así que los hijos de un
+nodo son índices consecutivos y basta un offset por nodo para encontrarlos.
+
+Las fases del compilador trabajan sobre `NodoAST`; la arena sirve para
+retener muchos árboles (p. ej. en un servidor o entre revisiones del
+editor) con una fracción de la memoria, y para reconstruir el árbol de
+objetos cuando se necesita:
+
+    >>> arena = ASTArena.desde_arbol(ast)
+    >>> arena.tipo(0)
+    <TipoNodo.PROGRAMA: 1>
+    >>> arena.nodo() == ast
+    True
+"""
+
+from array import array
+from typing import Any, Dict, List, Optional
+
+from core.utils import NodoAST, TipoNodo
+
+
+# TipoNodo por valor del enum (auto() empieza en 1)
+_TIPOS = [None] * (max(t.value for t in TipoNodo) + 1)
+for _tipo in TipoNodo:
+    _TIPOS[_tipo.value] = _tipo
+del _tipo
+
+# Línea/columna ausente (None en NodoAST)
+_SIN_POSICION = -1
+
+
+class ASTArena:
+    """
+    AST en columnas, de solo lectura.
+
+    Los nodos se identifican por su índice (la raíz es 0).
+    """
+
+    __slots__ = ('tipos', 'valores', 'lineas', 'columnas', 'inicio_hijos', 'metadatos')
+
+    def __init__(self):
+        """Inicializa una arena vacía (usar `desde_arbol`)."""
+        self.tipos = array('B')
+        self.valores: List[Any] = []
+        self.lineas = array('i')
+        self.columnas = array('i')
+        # Hijos del nodo i: índices inicio_hijos[i] .. inicio_hijos[i + 1] - 1
+        self.inicio_hijos = array('i', [1])
+        self.metadatos: Dict[int, dict] = {}
+
+    @classmethod
+    def desde_arbol(cls, raiz: NodoAST) -> 'ASTArena':
+        """
+        Copia un árbol de NodoAST a una arena.
+
+        Args:
+            raiz: Nodo raíz
+
+        Returns:
+            Arena con la raíz en el índice 0
+        """
+        arena = cls()
+        pendientes = [raiz]
+        siguiente_hijo = 1
+        # Recorrido en anchura: `pendientes` crece mientras se recorre
+        for indice, nodo in enumerate(pendientes):
+            arena.tipos.append(nodo.tipo.value)
+            arena.valores.append(nodo.valor)
+            arena.lineas.append(_SIN_POSICION if nodo.linea is None else nodo.linea)
+            arena.columnas.append(_SIN_POSICION if nodo.columna is None else nodo.columna)
+            if nodo.metadata:
+                arena.metadatos[indice] = dict(nodo.metadata)
+            pendientes.extend(nodo.hijos)
+            siguiente_hijo += len(nodo.hijos)
+            arena.inicio_hijos.append(siguiente_hijo)
+        return arena
+
+    # ========== Acceso por índice ==========
+
+    def __len__(self) -> int:
+        return len(self.tipos)
+
+    def tipo(self, indice: int) -> TipoNodo:
+        """Tipo del nodo."""
+        return _TIPOS[self.tipos[indice]]
+
+    def valor(self, indice: int) -> Any:
+        """Valor del nodo."""
+        return self.valores[indice]
+
+    def linea(self, indice: int) -> Optional[int]:
+        """Línea del nodo (None si no tiene)."""
+        linea = self.lineas[indice]
+        return None if linea == _SIN_POSICION else linea
+
+    def columna(self, indice: int) -> Optional[int]:
+        """Columna del nodo (None si no tiene)."""
+        columna = self.columnas[indice]
+        return None if columna == _SIN_POSICION else columna
+
+    def hijos(self, indice: int) -> range:
+        """Índices de los hijos del nodo."""
+        return range(self.inicio_hijos[indice], self.inicio_hijos[indice + 1])
+
+    def metadata(self, indice: int) -> dict:
+        """Metadata del nodo (vacía si no tiene)."""
+        return self.metadatos.get(indice, {})
+
+    # ========== Reconstrucción ==========
+
+    def nodo(self, indice: int = 0) -> NodoAST:
+        """
+        Reconstruye el subárbol de un nodo como NodoAST.
+
+        Args:
+            indice: Índice de la raíz del subárbol
+
+        Returns:
+            Copia del subárbol
+        """
+        orden = [indice]
+        for actual in orden:
+            orden.extend(self.hijos(actual))
+
+        # Los hijos siempre tienen índice mayor que su padre: se construyen antes
+        construidos: Dict[int, NodoAST] = {}
+        for actual in reversed(orden):
+            hijos = [construidos.pop(h) for h in self.hijos(actual)]
+            nodo = NodoAST(self.tipo(actual), self.valores[actual], None,
+                           self.linea(actual), self.columna(actual),
+                           dict(self.metadatos[actual]) if actual in self.metadatos else None)
+            for hijo in hijos:
+                nodo.agregar_hijo(hijo)
+            construidos[actual] = nodo
+        return construidos[indice]
+
+    def nbytes(self) -> int:
+        """Memoria aproximada de las columnas (sin los valores ni la metadata)."""
+        return (sum(c.itemsize * len(c) for c in
+                    (self.tipos, self.lineas, self.columnas, self.inicio_hijos))
+                + 8 * len(self.valores))
+
+    def __repr__(self) -> str:
+        return f"ASTArena({len(self)} nodos)"
@@ -0,0 +1,201 @@
+"""
+Compilación por lotes de directorios con archivos .kt.
+
+Busca todos los archivos `.kt` bajo un directorio y los compila a `.class` en
+un pool de procesos. Cada proceso trabajador crea un único
+`CompiladorController` al arrancar (lexer, tablas de builtins y módulos JVM ya
+importados) y lo reutiliza para todos los archivos que le toquen.
+
+El resultado es un resumen serializable a JSON con los errores y el tiempo de
+compilación de cada archivo.
+"""
+
+import os
+import re
+import time
+import multiprocessing
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from core.controller import CompiladorController
+
+
+# Controlador del proceso trabajador (uno por proceso, creado en _iniciar_trabajador)
+_controlador: Optional[CompiladorController] = None
+
+
+def find_sources(directorio: str) -> List[Path]:
+    """
+    Busca recursivamente los archivos .kt de un directorio.
+
+    Args:
+        directorio: Directorio raíz (o un único archivo .kt)
+
+    Returns:
+        Rutas ordenadas alfabéticamente
+    """
+    raiz = Path(directorio)
+    if raiz.is_file():
+        return [raiz]
+    return sorted(p for p in raiz.rglob('*.kt') if p.is_file())
+
+
+def class_name_for(ruta: Path) -> str:
+    """
+    Deriva un nombre de clase JVM válido a partir del nombre del archivo.
+
+    Args:
+        ruta: Ruta del archivo fuente
+
+    Returns:
+        Identificador Java (caracteres inválidos reemplazados por '_')
+    """
+    nombre = re.sub(r'\W', '_', ruta.stem, flags=re.ASCII) or 'Main'
+    if nombre[0].isdigit():
+        nombre = '_' + nombre
+    return nombre
+
+
+def _iniciar_trabajador(cache_dir: Optional[str] = None):
+    """Crea el controlador reutilizado por el proceso trabajador."""
+    global _controlador
+    cache = None
+    if cache_dir:
+        from core.cache import CompilationCache
+        cache = CompilationCache(cache_dir)
+    _controlador = CompiladorController(cache=cache)
+
+
+def _compilar_archivo(tarea: tuple) -> Dict[str, Any]:
+    """
+    Compila un archivo con el controlador del proceso.
+
+    Args:
+        tarea: (ruta fuente, ruta relativa, directorio de salida, java_version, metricas)
+
+    Returns:
+        Diccionario con el resultado del archivo
+    """
+    fuente, relativa, salida, java_version, metricas = tarea
+    if _controlador is None:
+        _iniciar_trabajador()
+
+    relativa = Path(relativa)
+    class_name = class_name_for(relativa)
+    output_path = Path(salida) / relativa.parent / f"{class_name}.class"
+
+    inicio = time.perf_counter()
+    inicio_cpu = time.process_time()
+    try:
+        with open(fuente, 'r', encoding='utf-8') as f:
+            codigo = f.read()
+        resultado = _controlador.ejecutar_jvm(
+            codigo,
+            class_name=class_name,
+            output_path=str(output_path),
+            java_version=java_version,
+            metricas=metricas
+        )
+        exito = resultado["exito"]
+        errores = [str(e) for e in resultado["errores"]]
+        tamano = len(resultado["bytecode_jvm"]) if resultado["bytecode_jvm"] else 0
+        metricas_archivo = resultado.get("metricas")
+    except Exception as e:
+        exito, errores, tamano = False, [f"Error al compilar {fuente}: {e}"], 0
+        metricas_archivo = None
+
+    archivo = {
+        "source": str(relativa),
+        "class_name": class_name,
+        "output": str(output_path) if exito else None,
+        "exito": exito,
+        "errores": errores,
+        "bytecode_size": tamano,
+        "time_ms": (time.perf_counter() - inicio) * 1000,
+        "cpu_time_ms": (time.process_time() - inicio_cpu) * 1000,
+        "pid": os.getpid()
+    }
+    if metricas:
+        archivo["metricas"] = metricas_archivo
+    return archivo
+
+
+def _agregar_metricas(archivos: List[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    """Suma tiempos y contadores por fase de todos los archivos (pico: máximo)."""
+    totales: Dict[str, Dict[str, float]] = {}
+    for archivo in archivos:
+        for registro in (archivo.get("metricas") or {}).get("fases", []):
+            total = totales.setdefault(registro["fase"], {
+                "wall_ms": 0.0, "cpu_ms": 0.0, "peak_bytes": 0, "archivos": 0
+            })
+            total["wall_ms"] += registro["wall_ms"]
+            total["cpu_ms"] += registro["cpu_ms"]
+            total["peak_bytes"] = max(total["peak_bytes"], registro["peak_bytes"])
+            total["archivos"] += 1
+            for nombre, valor in registro["contadores"].items():
+                total[nombre] = total.get(nombre, 0) + valor
+    return totales
+
+
+def compile_directory(directorio: str, output_dir: str, jobs: Optional[int] = None,
+                      cache_dir: Optional[str] = None,
+                      java_version: int = 6,
+                      metricas: bool = False) -> Dict[str, Any]:
+    """
+    Compila todos los archivos .kt de un directorio a archivos .class.
+
+    Los archivos se reparten de mayor a menor tamaño para equilibrar la carga
+    entre procesos; el resumen se devuelve ordenado por ruta.
+
+    Args:
+        directorio: Directorio con los fuentes .kt (o un único archivo)
+        output_dir: Directorio donde escribir los .class (se conserva la estructura)
+        jobs: Número de procesos (None = número de CPUs, 1 = sin pool)
+        cache_dir: Directorio de CompilationCache compartido por los procesos
+        java_version: Version de Java target (6, 7, 8)
+        metricas: Si incluir métricas por fase de cada archivo y sus totales
+
+    Returns:
+        Resumen serializable a JSON
+    """
+    raiz = Path(directorio)
+    base = raiz.parent if raiz.is_file() else raiz
+    fuentes = find_sources(directorio)
+
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    jobs = max(1, min(jobs, len(fuentes) or 1))
+
+    tareas = [
+        (str(p), str(p.relative_to(base)), str(output_dir), java_version, metricas)
+        for p in sorted(fuentes, key=lambda p: p.stat().st_size, reverse=True)
+    ]
+
+    inicio = time.perf_counter()
+    if jobs == 1:
+        _iniciar_trabajador(cache_dir)
+        archivos = [_compilar_archivo(t) for t in tareas]
+    else:
+        with multiprocessing.Pool(jobs, initializer=_iniciar_trabajador,
+                                  initargs=(cache_dir,)) as pool:
+            archivos = list(pool.imap_unordered(_compilar_archivo, tareas))
+    tiempo_total = (time.perf_counter() - inicio) * 1000
+
+    archivos.sort(key=lambda r: r["source"])
+    fallidos = sum(1 for r in archivos if not r["exito"])
+
+    resumen = {
+        "source_dir": str(directorio),
+        "output_dir": str(output_dir),
+        "jobs": jobs,
+        "java_version": java_version,
+        "total": len(archivos),
+        "compiled": len(archivos) - fallidos,
+        "failed": fallidos,
+        "wall_time_ms": tiempo_total,
+        "compile_time_ms": sum(r["time_ms"] for r in archivos),
+        "files": archivos
+    }
+    if metricas:
+        resumen["metricas"] = _agregar_metricas(archivos)
+    return resumen
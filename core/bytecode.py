@@ -11,7 +11,8 @@ Versión: 1.1
 """
 
 from typing import List, Dict, Optional
-from core.tac import TACInstruction
+from core.tac import TACInstruction, Operand, Const, as_operand
+from core.utils import TipoDato
 
 
 class BytecodeInstruction:
@@ -30,11 +31,11 @@ class BytecodeInstruction:
 
         Args:
             opcode: Código de operación (PUSH, LOAD, ADD, etc.)
-            operand: Operando opcional (variable, literal, label)
+            operand: Operando opcional (variable, literal, label); se guarda su texto
             comment: Comentario opcional para documentar la instrucción
         """
         self.opcode = opcode
-        self.operand = operand
+        self.operand = str(operand) if operand is not None else None
         self.comment = comment
 
     def __str__(self) -> str:
@@ -72,12 +73,20 @@ class BytecodeGenerator:
     - CALL <func>        : Llamar función
     - RET                : Retornar de función
     - HALT               : Fin de programa
+
+    Las operaciones que el TAC anota como Double usan la variante con prefijo
+    D (DADD, DLT, DNEG, DALOAD, DASTORE) y los operandos Int que se usan como
+    Double se convierten con I2D después de cargarlos.
+
+    Los operandos `Const` se cargan con PUSH y el resto con LOAD; el tipo de
+    un literal es el de su `Const`, sin volver a analizar el texto.
     """
 
     def __init__(self):
         """Inicializa el generador de bytecode"""
         self.instructions: List[BytecodeInstruction] = []
         self.current_function: Optional[str] = None
+        self.tipos: Dict[str, TipoDato] = {}  # Variable/temporal -> tipo del último valor guardado
 
     def generate(self, tac_instructions: List[TACInstruction]) -> List[BytecodeInstruction]:
         """
@@ -90,9 +99,12 @@ class BytecodeGenerator:
             Lista de instrucciones de bytecode
         """
         self.instructions = []
+        self.tipos = {}
 
         for tac in tac_instructions:
             self._translate_instruction(tac)
+            if tac.result and tac.op != 'ARRAY_STORE' and tac.tipo_resultado is not None:
+                self.tipos[str(tac.result)] = tac.tipo_resultado
 
         # Agregar HALT al final si no existe
         if not self.instructions or self.instructions[-1].opcode != 'HALT':
@@ -152,9 +164,9 @@ class BytecodeGenerator:
         )
 
         # Si es una etiqueta de función, actualizar función actual
-        if tac.label and tac.label.startswith('func_'):
-            func_name = tac.label.replace('func_', '')
-            self.current_function = func_name
+        etiqueta = str(tac.label) if tac.label else ''
+        if etiqueta.startswith('func_'):
+            self.current_function = etiqueta[len('func_'):]
 
     def _translate_assign(self, tac: TACInstruction):
         """
@@ -166,14 +178,16 @@ class BytecodeGenerator:
             STORE result
         """
         # Cargar el valor fuente
-        if self._is_literal(tac.arg1):
+        fuente = as_operand(tac.arg1)
+        if isinstance(fuente, Const):
             self.instructions.append(
-                BytecodeInstruction('PUSH', tac.arg1, f"Push literal {tac.arg1}")
+                BytecodeInstruction('PUSH', str(fuente), f"Push literal {fuente}")
             )
         else:
             self.instructions.append(
-                BytecodeInstruction('LOAD', tac.arg1, f"Load {tac.arg1}")
+                BytecodeInstruction('LOAD', str(fuente), f"Load {fuente}")
             )
+        self._convert(fuente, tac.tipo)
 
         # Guardar en destino
         self.instructions.append(
@@ -196,12 +210,13 @@ class BytecodeGenerator:
         }.get(tac.op, tac.op)
 
         # Cargar operandos
-        self._load_operand(tac.arg1, f"Left operand of {op_name}")
-        self._load_operand(tac.arg2, f"Right operand of {op_name}")
+        self._load_operand(tac.arg1, f"Left operand of {op_name}", tac.tipo)
+        self._load_operand(tac.arg2, f"Right operand of {op_name}", tac.tipo)
 
         # Ejecutar operación
         self.instructions.append(
-            BytecodeInstruction(tac.op, comment=f"Compute {tac.arg1} {op_name} {tac.arg2}")
+            BytecodeInstruction(self._typed(tac.op, tac.tipo),
+                                comment=f"Compute {tac.arg1} {op_name} {tac.arg2}")
         )
 
         # Guardar resultado
@@ -225,12 +240,13 @@ class BytecodeGenerator:
         }.get(tac.op, tac.op)
 
         # Cargar operandos
-        self._load_operand(tac.arg1, f"Left operand")
-        self._load_operand(tac.arg2, f"Right operand")
+        self._load_operand(tac.arg1, f"Left operand", tac.tipo)
+        self._load_operand(tac.arg2, f"Right operand", tac.tipo)
 
         # Ejecutar comparación
         self.instructions.append(
-            BytecodeInstruction(tac.op, comment=f"Compare {tac.arg1} {op_symbol} {tac.arg2}")
+            BytecodeInstruction(self._typed(tac.op, tac.tipo),
+                                comment=f"Compare {tac.arg1} {op_symbol} {tac.arg2}")
         )
 
         # Guardar resultado
@@ -274,11 +290,11 @@ class BytecodeGenerator:
     def _translate_neg(self, tac: TACInstruction):
         """Traduce negación unaria"""
         # Cargar operando
-        self._load_operand(tac.arg1, f"Operand")
+        self._load_operand(tac.arg1, f"Operand", tac.tipo)
 
         # Ejecutar NEG
         self.instructions.append(
-            BytecodeInstruction('NEG', comment=f"Negate {tac.arg1}")
+            BytecodeInstruction(self._typed('NEG', tac.tipo), comment=f"Negate {tac.arg1}")
         )
 
         # Guardar resultado
@@ -315,7 +331,7 @@ class BytecodeGenerator:
 
         Los parámetros se pushean al stack para la llamada de función.
         """
-        self._load_operand(tac.arg1, f"Parameter")
+        self._load_operand(tac.arg1, f"Parameter", tac.tipo)
 
     def _translate_call(self, tac: TACInstruction):
         """
@@ -351,7 +367,7 @@ class BytecodeGenerator:
         """
         # Si hay valor de retorno, cargarlo
         if tac.arg1:
-            self._load_operand(tac.arg1, "Return value")
+            self._load_operand(tac.arg1, "Return value", tac.tipo)
 
         # Retornar
         self.instructions.append(
@@ -377,7 +393,7 @@ class BytecodeGenerator:
 
         # Cargar elemento del array
         self.instructions.append(
-            BytecodeInstruction('ALOAD', comment=f"Load {tac.arg1}[{tac.arg2}]")
+            BytecodeInstruction(self._typed('ALOAD', tac.tipo), comment=f"Load {tac.arg1}[{tac.arg2}]")
         )
 
         # Guardar resultado
@@ -404,61 +420,62 @@ class BytecodeGenerator:
         self._load_operand(tac.arg1, f"Index")
 
         # Cargar valor
-        self._load_operand(tac.arg2, f"Value")
+        self._load_operand(tac.arg2, f"Value", tac.tipo)
 
         # Guardar en array
         self.instructions.append(
-            BytecodeInstruction('ASTORE', comment=f"Store in {array_name}[{tac.arg1}]")
+            BytecodeInstruction(self._typed('ASTORE', tac.tipo), comment=f"Store in {array_name}[{tac.arg1}]")
         )
 
-    def _load_operand(self, operand: str, comment: str = ""):
+    def _load_operand(self, operand, comment: str = "", tipo: Optional[TipoDato] = None):
         """
         Carga un operando al stack (PUSH si es literal, LOAD si es variable).
 
         Args:
-            operand: Operando a cargar
+            operand: Operando a cargar (`Operand` o texto TAC)
             comment: Comentario opcional
+            tipo: Tipo con que se usará el valor (un Int usado como Double se convierte)
         """
-        if self._is_literal(operand):
+        operand = as_operand(operand)
+        if isinstance(operand, Const):
             self.instructions.append(
-                BytecodeInstruction('PUSH', operand, comment or f"Push {operand}")
+                BytecodeInstruction('PUSH', str(operand), comment or f"Push {operand}")
             )
         else:
             self.instructions.append(
-                BytecodeInstruction('LOAD', operand, comment or f"Load {operand}")
+                BytecodeInstruction('LOAD', str(operand), comment or f"Load {operand}")
+            )
+        self._convert(operand, tipo)
+
+    def _convert(self, operand: Operand, tipo: Optional[TipoDato]):
+        """Agrega I2D si el operando recién cargado es Int y se usa como Double."""
+        if tipo == TipoDato.DOUBLE and self._operand_type(operand) == TipoDato.INT:
+            self.instructions.append(
+                BytecodeInstruction('I2D', comment=f"Convert {operand} to Double")
             )
 
-    def _is_literal(self, value: str) -> bool:
+    def _operand_type(self, operand: Operand) -> Optional[TipoDato]:
+        """Tipo de un operando: el de su literal o el último guardado en él."""
+        if isinstance(operand, Const):
+            return operand.tipo
+        return self.tipos.get(operand.texto, operand.tipo)
+
+    @staticmethod
+    def _typed(opcode: str, tipo: Optional[TipoDato]) -> str:
+        """Variante del opcode para el tipo de la operación (prefijo D para Double)."""
+        return 'D' + opcode if tipo == TipoDato.DOUBLE else opcode
+
+    def _is_literal(self, value) -> bool:
         """
         Determina si un valor es un literal (número, string, booleano).
 
         Args:
-            value: Valor a verificar
+            value: Operando o texto TAC a verificar
 
         Returns:
             True si es literal, False si es variable/temporal
         """
-        if not value:
-            return False
-
-        # Números
-        if value.replace('.', '', 1).replace('-', '', 1).isdigit():
-            return True
-
-        # Strings (comienzan y terminan con comillas)
-        if (value.startswith('"') and value.endswith('"')) or \
-           (value.startswith("'") and value.endswith("'")):
-            return True
-
-        # Booleanos
-        if value in ('true', 'false', 'True', 'False'):
-            return True
-
-        # Propiedades (contienen punto)
-        if '.' in value:
-            return False
-
-        return False
+        return isinstance(as_operand(value or None), Const)
 
     def format_output(self, show_comments: bool = True) -> str:
         """
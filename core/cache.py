@@ -0,0 +1,232 @@
+"""
+Caché persistente de compilación direccionada por contenido.
+
+Guarda en disco los resultados de compilar un programa (TAC, bytecode de pila
+y bytes del .class) bajo una clave derivada del hash del código fuente, la
+versión del compilador y las opciones de compilación. Recompilar un archivo
+sin cambios cuesta un hash y una lectura de archivo.
+
+Características:
+- Escrituras atómicas (archivo temporal + os.replace): varios procesos pueden
+  compilar a la vez sobre el mismo directorio sin leer entradas a medias.
+- Expulsión LRU acotada por tamaño total (la fecha de modificación de cada
+  entrada se actualiza en cada acierto).
+- Estadísticas de aciertos, fallos, escrituras y expulsiones.
+
+Las entradas se serializan con pickle: el directorio de caché debe ser local y
+de confianza, igual que cualquier directorio de compilación.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+from dataclasses import dataclass, asdict
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+# Versión del compilador incluida en todas las claves. La huella de los
+# fuentes de `core` (ver _huella_compilador) invalida además la caché cuando
+# cambia el código del compilador sin cambiar esta versión.
+COMPILER_VERSION = "2.0.0-alpha.6"
+
+EXTENSION_ENTRADA = ".pkl"
+
+
+@lru_cache(maxsize=1)
+def _huella_compilador() -> str:
+    """Hash de los fuentes de `core`, calculado una vez por proceso."""
+    raiz = Path(__file__).resolve().parent
+    h = hashlib.sha256(COMPILER_VERSION.encode('utf-8'))
+    for ruta in sorted(raiz.rglob('*.py')):
+        h.update(str(ruta.relative_to(raiz)).encode('utf-8'))
+        h.update(ruta.read_bytes())
+    return h.hexdigest()
+
+
+@dataclass
+class CacheStats:
+    """Contadores de uso de la caché."""
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+
+    @property
+    def tasa_aciertos(self) -> float:
+        """Fracción de consultas resueltas desde la caché."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convierte las estadísticas a diccionario."""
+        datos = asdict(self)
+        datos['hit_rate'] = self.tasa_aciertos
+        return datos
+
+
+class CompilationCache:
+    """
+    Caché de compilación en disco con expulsión LRU.
+
+    Example:
+        >>> cache = CompilationCache(".kforge-cache")
+        >>> clave = cache.clave(codigo, class_name="Main", java_version=6)
+        >>> entrada = cache.obtener(clave)
+        >>> if entrada is None:
+        ...     entrada = compilar(codigo)
+        ...     cache.guardar(clave, entrada)
+    """
+
+    def __init__(self, directorio: str, max_bytes: int = 256 * 1024 * 1024):
+        """
+        Inicializa la caché.
+
+        Args:
+            directorio: Directorio donde se guardan las entradas (se crea si no existe)
+            max_bytes: Tamaño total máximo de las entradas antes de expulsar
+        """
+        self.directorio = Path(directorio)
+        self.directorio.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._tamano_estimado: Optional[int] = None
+
+    def clave(self, contenido: str, **opciones) -> str:
+        """
+        Calcula la clave de una entrada.
+
+        Args:
+            contenido: Texto a compilar (código fuente o TAC serializado)
+            **opciones: Opciones que afectan al resultado (java_version, etc.)
+
+        Returns:
+            Hash hexadecimal SHA-256
+        """
+        h = hashlib.sha256()
+        h.update(_huella_compilador().encode('ascii'))
+        for nombre in sorted(opciones):
+            h.update(f"\0{nombre}={opciones[nombre]!r}".encode('utf-8'))
+        h.update(b"\0\0")
+        h.update(contenido.encode('utf-8'))
+        return h.hexdigest()
+
+    def _ruta(self, clave: str) -> Path:
+        """Ruta de la entrada (repartida en subdirectorios por prefijo)."""
+        return self.directorio / clave[:2] / (clave + EXTENSION_ENTRADA)
+
+    def obtener(self, clave: str) -> Optional[Dict[str, Any]]:
+        """
+        Busca una entrada en la caché.
+
+        Args:
+            clave: Clave calculada con `clave()`
+
+        Returns:
+            La entrada guardada o None si no existe (o está corrupta)
+        """
+        ruta = self._ruta(clave)
+        try:
+            with open(ruta, 'rb') as f:
+                entrada = pickle.load(f)
+        except FileNotFoundError:
+            self.stats.misses += 1
+            return None
+        except Exception:
+            # Entrada corrupta o de un formato anterior: descartarla
+            self._eliminar(ruta)
+            self.stats.misses += 1
+            return None
+
+        # Marcar como usada recientemente (LRU por fecha de modificación)
+        try:
+            os.utime(ruta, None)
+        except OSError:
+            pass
+
+        self.stats.hits += 1
+        return entrada
+
+    def guardar(self, clave: str, entrada: Dict[str, Any]):
+        """
+        Guarda una entrada de forma atómica.
+
+        Args:
+            clave: Clave calculada con `clave()`
+            entrada: Diccionario serializable con pickle
+        """
+        ruta = self._ruta(clave)
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        datos = pickle.dumps(entrada, protocol=pickle.HIGHEST_PROTOCOL)
+
+        fd, temporal = tempfile.mkstemp(dir=ruta.parent, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(datos)
+            os.replace(temporal, ruta)
+        except BaseException:
+            self._eliminar(Path(temporal))
+            raise
+
+        self.stats.writes += 1
+        if self._tamano_estimado is None:
+            self._tamano_estimado = self.tamano_total()
+        else:
+            self._tamano_estimado += len(datos)
+
+        if self._tamano_estimado > self.max_bytes:
+            self._expulsar()
+
+    def _entradas(self):
+        """Lista (mtime, tamaño, ruta) de todas las entradas."""
+        entradas = []
+        for ruta in self.directorio.glob('*/*' + EXTENSION_ENTRADA):
+            try:
+                info = ruta.stat()
+            except OSError:
+                continue  # Expulsada por otro proceso
+            entradas.append((info.st_mtime, info.st_size, ruta))
+        return entradas
+
+    def tamano_total(self) -> int:
+        """Tamaño en bytes de todas las entradas."""
+        return sum(tamano for _, tamano, _ in self._entradas())
+
+    def _expulsar(self):
+        """Expulsa las entradas menos usadas hasta respetar max_bytes."""
+        entradas = sorted(self._entradas(), key=lambda e: e[0])
+        total = sum(tamano for _, tamano, _ in entradas)
+
+        for _, tamano, ruta in entradas:
+            if total <= self.max_bytes:
+                break
+            if self._eliminar(ruta):
+                self.stats.evictions += 1
+            total -= tamano
+
+        self._tamano_estimado = total
+
+    def _eliminar(self, ruta: Path) -> bool:
+        """Elimina un archivo ignorando carreras con otros procesos."""
+        try:
+            ruta.unlink()
+            return True
+        except OSError:
+            return False
+
+    def limpiar(self):
+        """Elimina todas las entradas de la caché."""
+        for _, _, ruta in self._entradas():
+            self._eliminar(ruta)
+        self._tamano_estimado = 0
+
+    def obtener_estadisticas(self) -> Dict[str, Any]:
+        """
+        Obtiene las estadísticas de uso.
+
+        Returns:
+            Diccionario con hits, misses, writes, evictions y hit_rate
+        """
+        return self.stats.to_dict()
@@ -4,13 +4,12 @@ Coordina todas las fases del análisis: léxico, sintáctico, semántico y gener
 """
 
 from typing import Dict, Any, List
-from core.lexer import Lexer
-from core.parser import Parser
-from core.semantic import AnalizadorSemantico
 # from core.codegen import CodeGenerator  # Obsoleto - ver tac.py y bytecode.py
-from core.tac import TACGenerator, TACInstruction
-from core.bytecode import BytecodeGenerator, BytecodeInstruction
+from core.tac import TACInstruction
+from core.bytecode import BytecodeInstruction
 from core.errors import ErrorManager
+from core.pipeline import CompilationPipeline
+from core.metrics import MetricsCollector
 
 
 class CompiladorController:
@@ -21,9 +20,21 @@ class CompiladorController:
     unificada para ejecutar el compilador.
     """
 
-    def __init__(self):
-        """Inicializa el controlador del compilador."""
+    def __init__(self, cache=None, motor_lexico: str = 'regex', tac_compacto: bool = False,
+                 optimizar: bool = False):
+        """
+        Inicializa el controlador del compilador.
+
+        Args:
+            cache: CompilationCache opcional usada por `ejecutar_jvm` para
+                reutilizar TAC, bytecode y .class de compilaciones previas.
+            motor_lexico: Motor de escaneo del lexer ('regex' o 'dfa')
+            tac_compacto: Si guardar el TAC en un TACBuffer (ver core/tac_buffer.py)
+            optimizar: Si optimizar el TAC antes de los backends (ver core/ir/optimizer.py)
+        """
+        self.cache = cache
         self.error_manager = ErrorManager()
+        self.pipeline = CompilationPipeline(motor_lexico, tac_compacto, optimizar)  # Fases memoizadas por revisión del código
         self.lexer = None
         self.parser = None
         self.semantic_analyzer = None
@@ -38,12 +49,17 @@ class CompiladorController:
         self.tac_instructions: List[TACInstruction] = []  # Código TAC generado
         self.bytecode_instructions: List[BytecodeInstruction] = []  # Bytecode generado
 
-    def ejecutar(self, codigo: str) -> Dict[str, Any]:
+    def ejecutar(self, codigo: str, metricas: bool = False) -> Dict[str, Any]:
         """
         Ejecuta todas las fases del compilador sobre el código fuente.
 
+        Las fases ya ejecutadas para este mismo código (por ejemplo, tras
+        `ejecutar_sintactico`) se reutilizan desde el pipeline.
+
         Args:
             codigo: Código fuente a compilar.
+            metricas: Si agregar la sección "metricas" (tiempo real y de CPU,
+                pico de memoria y contadores de cada fase).
 
         Returns:
             Diccionario con los resultados de cada fase:
@@ -56,11 +72,9 @@ class CompiladorController:
                 "exito": bool
             }
         """
-        # Limpiar estado previo
-        self.limpiar()
-
         # Verificar que el código no esté vacío
         if not codigo or codigo.strip() == "":
+            self.limpiar()
             return {
                 "tokens": [],
                 "arbol": None,
@@ -70,69 +84,25 @@ class CompiladorController:
                 "exito": False
             }
 
-        # Fase 1: Análisis Léxico
-        try:
-            self.lexer = Lexer(self.error_manager)
-            self.tokens = self.lexer.tokenizar(codigo)
-        except Exception as e:
-            self.error_manager.agregar_error(Exception(f"Error en análisis léxico: {str(e)}"))
-
-        # Si hay errores léxicos, detener
-        if self.error_manager.tiene_errores():
-            return self._construir_resultado()
-
-        # Fase 2: Análisis Sintáctico
-        try:
-            self.parser = Parser(self.tokens, self.error_manager)
-            self.ast = self.parser.parsear()
-        except Exception as e:
-            self.error_manager.agregar_error(Exception(f"Error en análisis sintáctico: {str(e)}"))
-
-        # Si hay errores sintácticos, detener
-        if self.error_manager.tiene_errores() or self.ast is None:
-            return self._construir_resultado()
+        self._ejecutar_hasta(codigo, 'bytecode', metricas)
+        resultado = self._construir_resultado()
+        if metricas:
+            resultado["metricas"] = self._metricas_hasta('bytecode')
+        return resultado
 
-        # Fase 3: Análisis Semántico
-        try:
-            self.semantic_analyzer = AnalizadorSemantico(self.error_manager)
-            self.resultados_semanticos = self.semantic_analyzer.analizar(self.ast)
-        except Exception as e:
-            self.error_manager.agregar_error(Exception(f"Error en análisis semántico: {str(e)}"))
-
-        # Fase 4: Generación de Código TAC (v1.1)
-        # Solo si no hay errores semánticos
-        if not self.error_manager.tiene_errores():
-            try:
-                self.tac_generator = TACGenerator()
-                self.tac_instructions = self.tac_generator.generate(self.ast)
-            except Exception as e:
-                self.error_manager.agregar_error(Exception(f"Error en generación de TAC: {str(e)}"))
-
-        # Fase 5: Generación de Bytecode (v1.1)
-        # Solo si TAC fue generado exitosamente
-        if not self.error_manager.tiene_errores() and self.tac_instructions:
-            try:
-                self.bytecode_generator = BytecodeGenerator()
-                self.bytecode_instructions = self.bytecode_generator.generate(self.tac_instructions)
-            except Exception as e:
-                self.error_manager.agregar_error(Exception(f"Error en generación de bytecode: {str(e)}"))
-
-        # Retornar resultados
-        return self._construir_resultado()
-
-    def ejecutar_lexico(self, codigo: str) -> Dict[str, Any]:
+    def ejecutar_lexico(self, codigo: str, metricas: bool = False) -> Dict[str, Any]:
         """
         Ejecuta solo el análisis léxico.
 
         Args:
             codigo: Código fuente a analizar.
+            metricas: Si agregar la sección "metricas".
 
         Returns:
             Diccionario con tokens y errores léxicos.
         """
-        self.limpiar()
-
         if not codigo or codigo.strip() == "":
+            self.limpiar()
             return {
                 "tokens": [],
                 "errores": ["El código fuente está vacío"],
@@ -140,85 +110,126 @@ class CompiladorController:
                 "resumen": ""
             }
 
-        try:
-            self.lexer = Lexer(self.error_manager)
-            self.tokens = self.lexer.tokenizar(codigo)
-            resumen = self.lexer.obtener_resumen()
-        except Exception as e:
-            self.error_manager.agregar_error(Exception(f"Error en análisis léxico: {str(e)}"))
-            resumen = ""
+        self._ejecutar_hasta(codigo, 'lexico', metricas)
+        resumen = self.lexer.obtener_resumen() if self.lexer else ""
 
-        return {
+        resultado = {
             "tokens": self.tokens,
             "errores": [str(e) for e in self.error_manager.obtener_errores()],
             "exito": not self.error_manager.tiene_errores(),
             "resumen": resumen
         }
+        if metricas:
+            resultado["metricas"] = self._metricas_hasta('lexico')
+        return resultado
 
-    def ejecutar_sintactico(self, codigo: str) -> Dict[str, Any]:
+    def ejecutar_sintactico(self, codigo: str, metricas: bool = False) -> Dict[str, Any]:
         """
         Ejecuta análisis léxico y sintáctico.
 
         Args:
             codigo: Código fuente a analizar.
+            metricas: Si agregar la sección "metricas".
 
         Returns:
             Diccionario con tokens, AST y errores.
         """
-        self.limpiar()
-
-        # Primero ejecutar análisis léxico
-        resultado_lexico = self.ejecutar_lexico(codigo)
+        # Primero ejecutar análisis léxico (memoizado si ya se hizo)
+        resultado_lexico = self.ejecutar_lexico(codigo, metricas)
         if not resultado_lexico["exito"]:
-            return {
+            resultado = {
                 "tokens": resultado_lexico["tokens"],
                 "arbol": None,
                 "errores": resultado_lexico["errores"],
                 "exito": False,
                 "resumen": ""
             }
+            if metricas:
+                resultado["metricas"] = resultado_lexico["metricas"]
+            return resultado
 
-        # Ejecutar análisis sintáctico
-        try:
-            self.parser = Parser(self.tokens, self.error_manager)
-            self.ast = self.parser.parsear()
-            resumen = self._generar_resumen_ast()
-        except Exception as e:
-            self.error_manager.agregar_error(Exception(f"Error en análisis sintáctico: {str(e)}"))
-            resumen = ""
+        self._ejecutar_hasta(codigo, 'sintactico', metricas)
+        resumen = self._generar_resumen_ast() if self.parser else ""
 
-        return {
+        resultado = {
             "tokens": self.tokens,
             "arbol": self.ast,
             "errores": [str(e) for e in self.error_manager.obtener_errores()],
             "exito": not self.error_manager.tiene_errores() and self.ast is not None,
             "resumen": resumen
         }
+        if metricas:
+            resultado["metricas"] = self._metricas_hasta('sintactico')
+        return resultado
 
-    def ejecutar_semantico(self, codigo: str) -> Dict[str, Any]:
+    def _ejecutar_hasta(self, codigo: str, fase: str, metricas: bool = False):
+        """
+        Ejecuta el pipeline hasta `fase` y refleja su estado en el controlador.
+
+        Solo se exponen los resultados y errores de las fases hasta `fase`
+        (inclusive); las posteriores quedan vacías aunque estén memoizadas.
+
+        Args:
+            codigo: Código fuente a compilar.
+            fase: Última fase a ejecutar (ver CompilationPipeline.FASES).
+            metricas: Si medir las fases (ver CompilationPipeline.ejecutar_hasta).
+        """
+        pipeline = self.pipeline
+        pipeline.cargar(codigo)
+        pipeline.ejecutar_hasta(fase, metricas)
+
+        self.limpiar(invalidar_cache=False)
+        self.error_manager.errores = list(pipeline.errores_hasta(fase))
+
+        nivel = CompilationPipeline.FASES.index(fase)
+        self.lexer = pipeline.lexer
+        self.tokens = pipeline.tokens
+        if nivel >= 1:
+            self.parser = pipeline.parser
+            self.ast = pipeline.ast
+        if nivel >= 2:
+            self.semantic_analyzer = pipeline.semantic_analyzer
+            self.resultados_semanticos = pipeline.resultados_semanticos
+        if nivel >= 3:
+            self.tac_generator = pipeline.tac_generator
+            self.tac_instructions = pipeline.tac_instructions
+        if nivel >= 4:
+            self.bytecode_generator = pipeline.bytecode_generator
+            self.bytecode_instructions = pipeline.bytecode_instructions
+
+    def _metricas_hasta(self, fase: str) -> Dict[str, Any]:
+        """Métricas de las fases del pipeline hasta `fase` (inclusive)."""
+        fases = CompilationPipeline.FASES[:CompilationPipeline.FASES.index(fase) + 1]
+        if self.pipeline.metricas is None:
+            return MetricsCollector().to_dict()
+        return self.pipeline.metricas.to_dict(fases)
+
+    def ejecutar_semantico(self, codigo: str, metricas: bool = False) -> Dict[str, Any]:
         """
         Ejecuta análisis léxico, sintáctico y semántico.
 
         Args:
             codigo: Código fuente a analizar.
+            metricas: Si agregar la sección "metricas".
 
         Returns:
             Diccionario con resultados completos del análisis.
         """
-        return self.ejecutar(codigo)
+        return self.ejecutar(codigo, metricas)
 
-    def ejecutar_codegen(self, codigo: str) -> Dict[str, Any]:
+    def ejecutar_codegen(self, codigo: str, metricas: bool = False) -> Dict[str, Any]:
         """
         Ejecuta todas las fases incluyendo generación de código.
 
         Args:
             codigo: Código fuente a compilar.
+            metricas: Si agregar la sección "metricas".
 
         Returns:
             Diccionario con todos los resultados incluyendo código intermedio.
         """
         # Ejecutar análisis completo
-        resultado = self.ejecutar(codigo)
+        resultado = self.ejecutar(codigo, metricas)
 
         # Nota: La generación de código intermedio se hace en ejecutar_semantico()
         # que usa TAC y Bytecode generators (v1.1)
@@ -258,8 +269,16 @@ class CompiladorController:
         resumen += str(self.ast)
         return resumen
 
-    def limpiar(self):
-        """Limpia el estado del controlador."""
+    def limpiar(self, invalidar_cache: bool = True):
+        """
+        Limpia el estado del controlador.
+
+        Args:
+            invalidar_cache: Si es True también descarta los resultados
+                memoizados en el pipeline.
+        """
+        if invalidar_cache:
+            self.pipeline.invalidar()
         self.error_manager.limpiar()
         self.tokens = []
         self.ast = None
@@ -308,18 +327,25 @@ class CompiladorController:
         return resumen
 
     def ejecutar_jvm(self, codigo: str, class_name: str = "Main",
-                     output_path: str = None, java_version: int = 6) -> Dict[str, Any]:
+                     output_path: str = None, java_version: int = 6,
+                     metricas: bool = False) -> Dict[str, Any]:
         """
         Ejecuta compilacion completa a JVM bytecode (.class file).
 
         Este metodo ejecuta todas las fases del frontend (lexico, sintactico,
         semantico, TAC) y luego genera un archivo .class ejecutable.
 
+        Si el controlador tiene cache y el mismo codigo ya se compilo con las
+        mismas opciones, el resultado (TAC, bytecode y .class) se lee de disco
+        sin ejecutar ninguna fase; en ese caso tokens y AST quedan vacios.
+
         Args:
             codigo: Codigo fuente Kotlin
             class_name: Nombre de la clase a generar
             output_path: Ruta donde guardar el .class (None = no guardar)
             java_version: Version de Java target (6, 7, 8)
+            metricas: Si agregar la seccion "metricas" (incluye las fases de
+                generacion JVM y serializacion del .class)
 
         Returns:
             Diccionario con resultados:
@@ -333,10 +359,58 @@ class CompiladorController:
                 "resumen": str
             }
         """
+        clave = None
+        entrada = None
+        consulta_cache = MetricsCollector(memoria=metricas)
+        if self.cache is not None:
+            with consulta_cache.medir('cache') as registro:
+                clave = self.cache.clave(
+                    codigo,
+                    etapa='fuente',
+                    class_name=class_name,
+                    java_version=java_version,
+                    add_debug_info=True,
+                    optimizar=self.pipeline.optimizar
+                )
+                entrada = self.cache.obtener(clave)
+            registro.contadores = {"hit": int(entrada is not None)}
+
+        if entrada is not None:
+            # Acierto: no se ejecuta ninguna fase del compilador
+            self.limpiar()
+            self.tac_instructions = entrada["resultado"]["tac_instructions"]
+            self.bytecode_instructions = entrada["bytecode_instructions"]
+            resultado = self._finalizar_jvm(dict(entrada["resultado"]), class_name, output_path)
+            coleccion = consulta_cache
+        else:
+            resultado = self._compilar_jvm(codigo, class_name, java_version, metricas)
+
+            if self.cache is not None:
+                self.cache.guardar(clave, {
+                    "resultado": resultado,
+                    "bytecode_instructions": self.bytecode_instructions
+                })
+
+            resultado = self._finalizar_jvm(dict(resultado), class_name, output_path)
+            coleccion = self.pipeline.metricas or MetricsCollector()
+            coleccion.fases.update(consulta_cache.fases)
+
+        if metricas:
+            resultado["metricas"] = coleccion.to_dict()
+        return resultado
+
+    def _compilar_jvm(self, codigo: str, class_name: str, java_version: int,
+                      metricas: bool = False) -> Dict[str, Any]:
+        """
+        Ejecuta frontend y backend JVM sin escribir archivos.
+
+        Returns:
+            Diccionario de resultados de `ejecutar_jvm` (sin output_path)
+        """
         from core.jvm import compile_kotlin_to_jvm
 
         # Ejecutar frontend completo
-        resultado = self.ejecutar(codigo)
+        resultado = self.ejecutar(codigo, metricas)
 
         if not resultado["exito"]:
             return {
@@ -366,20 +440,17 @@ class CompiladorController:
             bytecode_jvm = compile_kotlin_to_jvm(
                 self.tac_instructions,
                 class_name=class_name,
-                output_path=output_path,
                 source_file=f"{class_name}.kt",
                 java_version=java_version,
-                add_debug_info=True
+                add_debug_info=True,
+                metricas=self.pipeline.metricas if metricas else None
             )
 
-            # Generar resumen
-            resumen = self._generar_resumen_jvm(class_name, bytecode_jvm, output_path)
-
             return {
                 "exito": True,
                 "errores": [],
                 "bytecode_jvm": bytecode_jvm,
-                "output_path": output_path,
+                "output_path": None,
                 "class_info": {
                     "class_name": class_name,
                     "java_version": java_version,
@@ -387,19 +458,51 @@ class CompiladorController:
                     "tac_instructions": len(self.tac_instructions)
                 },
                 "tac_instructions": self.tac_instructions,
-                "resumen": resumen
+                "resumen": ""
             }
 
         except Exception as e:
-            return {
-                "exito": False,
-                "errores": [f"Error en compilacion JVM: {str(e)}"],
-                "bytecode_jvm": None,
-                "output_path": None,
-                "class_info": None,
-                "tac_instructions": self.tac_instructions,
-                "resumen": f"Error durante la generacion de bytecode JVM: {str(e)}"
-            }
+            return self._error_jvm(e)
+
+    def _finalizar_jvm(self, resultado: Dict[str, Any], class_name: str,
+                       output_path: str = None) -> Dict[str, Any]:
+        """
+        Escribe el .class (si se pidio) y genera el resumen de una compilacion exitosa.
+
+        Args:
+            resultado: Resultado de `_compilar_jvm` (recien calculado o de la cache)
+            class_name: Nombre de la clase generada
+            output_path: Ruta donde guardar el .class (None = no guardar)
+
+        Returns:
+            Diccionario de resultados de `ejecutar_jvm`
+        """
+        from core.jvm import write_class_file
+
+        if not resultado["exito"]:
+            return resultado
+
+        try:
+            if output_path:
+                write_class_file(resultado["bytecode_jvm"], output_path)
+        except Exception as e:
+            return self._error_jvm(e)
+
+        resultado["output_path"] = output_path
+        resultado["resumen"] = self._generar_resumen_jvm(class_name, resultado["bytecode_jvm"], output_path)
+        return resultado
+
+    def _error_jvm(self, e: Exception) -> Dict[str, Any]:
+        """Construye el resultado de una falla del backend JVM."""
+        return {
+            "exito": False,
+            "errores": [f"Error en compilacion JVM: {str(e)}"],
+            "bytecode_jvm": None,
+            "output_path": None,
+            "class_info": None,
+            "tac_instructions": self.tac_instructions,
+            "resumen": f"Error durante la generacion de bytecode JVM: {str(e)}"
+        }
 
     def _generar_resumen_jvm(self, class_name: str, bytecode: bytes, output_path: str = None) -> str:
         """
@@ -5,12 +5,22 @@ Define las excepciones personalizadas para cada fase del análisis.
 
 class CompiladorError(Exception):
     """Clase base para todos los errores del compilador."""
-    def __init__(self, mensaje: str, linea: int = None, columna: int = None):
+    def __init__(self, mensaje: str, linea: int = None, columna: int = None, fuente=None):
         self.mensaje = mensaje
         self.linea = linea
         self.columna = columna
+        self.fuente = fuente  # SourceText opcional, para extracto()
         super().__init__(self.formato_mensaje())
 
+    def extracto(self) -> str:
+        """Línea del código con un marcador bajo la columna del error (vacío sin fuente)."""
+        if self.fuente is None or self.linea is None or not 1 <= self.linea <= self.fuente.num_lineas:
+            return ""
+        texto = self.fuente.texto_linea(self.linea)
+        if self.columna is None:
+            return texto
+        return f"{texto}\n{' ' * (self.columna - 1)}^"
+
     def formato_mensaje(self) -> str:
         """Formatea el mensaje de error con información de posición."""
         if self.linea is not None and self.columna is not None:
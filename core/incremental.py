@@ -0,0 +1,268 @@
+"""
+Reanálisis incremental por declaraciones de nivel superior.
+
+`IncrementalParser` divide el archivo en segmentos, uno por cada `fun` o
+sentencia de nivel superior, que van desde el primer token del elemento hasta
+el primer token del siguiente. Al actualizar el código se compara con el texto
+anterior (prefijo y sufijo comunes) y solo se vuelven a tokenizar y a parsear
+los segmentos que tocan la edición; los `NodoAST` del resto se reutilizan tal
+cual, ajustando su número de línea si la edición agregó o quitó líneas.
+
+El fragmento reanalizado incluye el elemento anterior si la edición toca el
+primer token del segmento (el elemento anterior podría absorber los tokens
+nuevos) y los que empiezan en la misma línea en que termina la edición (sus
+columnas cambian). Si el fragmento tiene errores, o su análisis
+aislado podría diferir del de todo el archivo (un `return` final sin valor, un
+token cortado en el borde, un sufijo numérico en el siguiente segmento), se
+reanaliza el archivo completo: el resultado es siempre el mismo AST que
+produciría `Parser` sobre el código completo.
+
+Example:
+    >>> incremental = IncrementalParser()
+    >>> ast = incremental.parsear(codigo)
+    >>> ast = incremental.actualizar(codigo_editado)
+    >>> incremental.modo
+    'incremental'
+"""
+
+import re
+from bisect import bisect_right
+from typing import List, Optional
+
+from core.errors import ErrorManager
+from core.lexer import Lexer
+from core.parser import Parser
+from core.token_buffer import TokenBuffer
+from core.utils import NodoAST, TipoNodo, TipoToken
+
+
+# Caracteres que se comparan por bloque al buscar el prefijo/sufijo común
+_BLOQUE_COMPARACION = 4096
+
+_IDENTIFICADOR = re.compile(r'[a-zA-Z_][a-zA-Z0-9_]*')
+
+
+def prefijo_comun(a: str, b: str) -> int:
+    """Longitud del prefijo común de dos textos."""
+    limite = min(len(a), len(b))
+    inicio = 0
+    while inicio < limite:
+        fin = min(inicio + _BLOQUE_COMPARACION, limite)
+        if a[inicio:fin] != b[inicio:fin]:
+            break
+        inicio = fin
+    else:
+        return limite
+    while a[inicio] == b[inicio]:
+        inicio += 1
+    return inicio
+
+
+def sufijo_comun(a: str, b: str, limite: int) -> int:
+    """Longitud del sufijo común de dos textos (como mucho `limite`)."""
+    largo_a, largo_b = len(a), len(b)
+    comun = 0
+    while comun < limite:
+        paso = min(_BLOQUE_COMPARACION, limite - comun)
+        if a[largo_a - comun - paso:largo_a - comun] != b[largo_b - comun - paso:largo_b - comun]:
+            break
+        comun += paso
+    else:
+        return limite
+    while a[largo_a - comun - 1] == b[largo_b - comun - 1]:
+        comun += 1
+    return comun
+
+
+class Segmento:
+    """Tramo del código con los elementos de nivel superior que empiezan en él."""
+
+    __slots__ = ('inicio', 'linea', 'columna', 'nodos', 'cabecera')
+
+    def __init__(self, inicio: int, linea: int, columna: int, nodos: tuple = ()):
+        self.inicio = inicio
+        self.linea = linea
+        self.columna = columna
+        self.nodos = nodos
+        # Caracteres desde `inicio` hasta el final del primer token (None si no hay elementos)
+        self.cabecera: Optional[int] = None
+
+    def __repr__(self) -> str:
+        return f"Segmento({self.inicio}, {self.linea}:{self.columna}, {len(self.nodos)} nodos)"
+
+
+class IncrementalParser:
+    """
+    Parser que reutiliza los subárboles de nivel superior no editados.
+
+    Attributes:
+        ast: AST del último código analizado (o None)
+        error_manager: Errores del último análisis
+        modo: 'completo', 'incremental' o 'sin_cambios' según la última actualización
+        reutilizados: Segmentos reutilizados en la última actualización
+    """
+
+    def __init__(self, motor_lexico: str = 'regex'):
+        """
+        Inicializa el parser sin código.
+
+        Args:
+            motor_lexico: Motor de escaneo del lexer ('regex' o 'dfa')
+        """
+        self.motor_lexico = motor_lexico
+        self.codigo: Optional[str] = None
+        self.segmentos: List[Segmento] = []
+        self.ast: Optional[NodoAST] = None
+        self.error_manager = ErrorManager()
+        self.modo: Optional[str] = None
+        self.reutilizados = 0
+
+    def parsear(self, codigo: str) -> Optional[NodoAST]:
+        """
+        Analiza el código completo.
+
+        Args:
+            codigo: Código fuente
+
+        Returns:
+            AST (o None si el análisis falló)
+        """
+        self.codigo = codigo
+        self.error_manager = ErrorManager()
+        tokens = Lexer(self.error_manager, motor=self.motor_lexico).tokenizar(codigo)
+        parser = Parser(tokens, self.error_manager)
+        self.ast = parser.parsear()
+        self.segmentos = self._segmentar(tokens, parser, 0, 1, 1)
+        self.modo = 'completo'
+        self.reutilizados = 0
+        return self.ast
+
+    def actualizar(self, codigo: str) -> Optional[NodoAST]:
+        """
+        Analiza una nueva versión del código reutilizando lo que no cambió.
+
+        Los subárboles reutilizados se comparten con el AST anterior (y se les
+        ajusta la línea en su lugar), así que el AST anterior no debe seguir
+        usándose tras la actualización.
+
+        Args:
+            codigo: Código fuente completo tras la edición
+
+        Returns:
+            AST (o None si el análisis falló)
+        """
+        if self.codigo is None or self.ast is None or self.error_manager.tiene_errores():
+            return self.parsear(codigo)
+        if codigo == self.codigo:
+            self.modo = 'sin_cambios'
+            self.reutilizados = len(self.segmentos)
+            return self.ast
+
+        viejo = self.codigo
+        segmentos = self.segmentos
+        prefijo = prefijo_comun(viejo, codigo)
+        sufijo = sufijo_comun(viejo, codigo, min(len(viejo), len(codigo)) - prefijo)
+        fin_edicion = len(viejo) - sufijo
+
+        # Segmentos afectados: desde el que contiene el inicio de la edición (o
+        # el anterior, si se edita su primer token) hasta el último que empieza
+        # en la línea donde termina
+        inicios = [segmento.inicio for segmento in segmentos]
+        primero = max(bisect_right(inicios, prefijo) - 1, 0)
+        cabecera = segmentos[primero].cabecera
+        if primero > 0 and (cabecera is None or prefijo <= segmentos[primero].inicio + cabecera):
+            primero -= 1
+        ultimo = max(bisect_right(inicios, fin_edicion) - 1, primero)
+        linea_fin = segmentos[ultimo].linea + viejo.count('\n', segmentos[ultimo].inicio, fin_edicion)
+        while ultimo + 1 < len(segmentos) and segmentos[ultimo + 1].linea <= linea_fin:
+            ultimo += 1
+
+        desplazamiento = len(codigo) - len(viejo)
+        inicio = segmentos[primero].inicio
+        fin_viejo = segmentos[ultimo + 1].inicio if ultimo + 1 < len(segmentos) else len(viejo)
+        fin = fin_viejo + desplazamiento
+        hay_siguiente = ultimo + 1 < len(segmentos)
+
+        error_manager = ErrorManager()
+        tokens = Lexer(error_manager, motor=self.motor_lexico).tokenizar(
+            codigo[inicio:fin], segmentos[primero].linea, segmentos[primero].columna)
+        parser = Parser(tokens, error_manager)
+        fragmento = parser.parsear()
+        if (fragmento is None or error_manager.tiene_errores()
+                or (hay_siguiente and not self._borde_seguro(tokens, parser, codigo, fin - inicio, fin))):
+            return self.parsear(codigo)
+
+        nuevos = self._segmentar(tokens, parser, inicio, segmentos[primero].linea, segmentos[primero].columna)
+
+        # Los segmentos siguientes se desplazan sin volver a analizarse
+        delta_lineas = codigo.count('\n', inicio, fin) - viejo.count('\n', inicio, fin_viejo)
+        for segmento in segmentos[ultimo + 1:]:
+            segmento.inicio += desplazamiento
+            if delta_lineas:
+                segmento.linea += delta_lineas
+                self._desplazar_lineas(segmento.nodos, delta_lineas)
+
+        segmentos[primero:ultimo + 1] = nuevos
+        self.codigo = codigo
+        self.error_manager = error_manager
+        self.ast = NodoAST(TipoNodo.PROGRAMA, "programa",
+                           [nodo for segmento in segmentos for nodo in segmento.nodos])
+        self.modo = 'incremental'
+        self.reutilizados = len(segmentos) - len(nuevos)
+        return self.ast
+
+    # ========== Auxiliares ==========
+
+    @staticmethod
+    def _segmentar(tokens: TokenBuffer, parser: Parser, inicio: int,
+                   linea: int, columna: int) -> List[Segmento]:
+        """Segmentos de un análisis; el primero empieza en `inicio` (offset del fragmento)."""
+        segmentos = [Segmento(inicio, linea, columna)]
+        for posicion, nodo in parser.elementos:
+            if segmentos[-1].nodos:
+                segmentos.append(Segmento(inicio + tokens.inicios[posicion], tokens.lineas[posicion],
+                                          tokens.columnas[posicion]))
+            segmento = segmentos[-1]
+            if not segmento.nodos:
+                segmento.cabecera = (inicio + tokens.inicios[posicion] + tokens.longitudes[posicion]
+                                     - segmento.inicio)
+            segmento.nodos += (nodo,)
+        return segmentos
+
+    @staticmethod
+    def _borde_seguro(tokens: TokenBuffer, parser: Parser, codigo: str, largo: int, fin: int) -> bool:
+        """
+        Indica si el fragmento se analiza igual aislado que seguido del resto del código.
+        """
+        if len(tokens) < 2:
+            return True
+        # El primer token podría ser un sufijo del último número del segmento anterior
+        if tokens.tipo(0) == TipoToken.IDENTIFIER and tokens.valor(0) in Lexer.SUFIJOS_NUMERICOS:
+            return False
+        # Un token que llega justo al final podría continuar en el segmento siguiente
+        if tokens.inicios[-2] + tokens.longitudes[-2] == largo:
+            return False
+        # return sin valor: seguido del siguiente segmento tomaría su primer token como valor
+        if parser.elementos:
+            nodo = parser.elementos[-1][1]
+            if nodo.tipo == TipoNodo.RETURN and not nodo.hijos:
+                return False
+        # Un número seguido de un sufijo (L, f, ...) es un error léxico
+        if tokens.tipo(-2) in (TipoToken.INT_LITERAL, TipoToken.DOUBLE_LITERAL):
+            coincidencia = _IDENTIFICADOR.match(codigo, fin)
+            if coincidencia and coincidencia.group() in Lexer.SUFIJOS_NUMERICOS:
+                return False
+        return True
+
+    @staticmethod
+    def _desplazar_lineas(nodos: tuple, delta: int):
+        """Suma `delta` a la línea de todos los nodos de los subárboles (y de sus parámetros)."""
+        pendientes = list(nodos)
+        while pendientes:
+            nodo = pendientes.pop()
+            if nodo.linea is not None:
+                nodo.linea += delta
+            if nodo.metadata:
+                for parametro in nodo.metadata.get('parametros', ()):
+                    parametro['linea'] += delta
+            pendientes.extend(nodo.hijos)
@@ -0,0 +1,51 @@
+"""
+Representación intermedia para análisis y optimización del TAC.
+
+- cfg: Bloques básicos, grafo de flujo de control, dominadores y bucles
+- dataflow: Análisis de flujo de datos con bitsets (variables vivas,
+  definiciones que alcanzan, expresiones y copias disponibles)
+- constprop: Plegado y propagación de constantes
+- copyprop: Propagación de copias y fusión de temporales
+- dce: Eliminación de código inalcanzable y almacenamientos muertos
+- optimizer: Pasadas de optimización por función (`TACOptimizer`)
+"""
+
+from core.ir.cfg import (
+    BasicBlock,
+    ControlFlowGraph,
+    Loop,
+    construir_cfgs,
+    dividir_funciones
+)
+from core.ir.dataflow import (
+    DataflowAnalysis,
+    Liveness,
+    ReachingDefinitions,
+    AvailableExpressions,
+    AvailableCopies,
+    VariableTable
+)
+from core.ir.constprop import propagar_constantes
+from core.ir.copyprop import propagar_copias, fusionar_temporales
+from core.ir.dce import eliminar_codigo_muerto
+from core.ir.optimizer import TACOptimizer, PASADAS
+
+__all__ = [
+    'BasicBlock',
+    'ControlFlowGraph',
+    'Loop',
+    'construir_cfgs',
+    'dividir_funciones',
+    'DataflowAnalysis',
+    'Liveness',
+    'ReachingDefinitions',
+    'AvailableExpressions',
+    'AvailableCopies',
+    'VariableTable',
+    'propagar_constantes',
+    'propagar_copias',
+    'fusionar_temporales',
+    'eliminar_codigo_muerto',
+    'TACOptimizer',
+    'PASADAS'
+]
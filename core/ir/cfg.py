@@ -0,0 +1,433 @@
+"""
+Grafo de flujo de control (CFG) sobre código de tres direcciones.
+
+`construir_cfgs` divide la salida de `TACGenerator` (una lista plana o un
+`TACBuffer`) en un `ControlFlowGraph` por función, y uno para todas las
+sentencias globales. Cada grafo es una lista de
+`BasicBlock` con sus aristas a sucesores y predecesores:
+
+- Un bloque empieza en la primera instrucción, en cada LABEL y después de
+  cada GOTO, IF_FALSE o RETURN.
+- GOTO salta a su etiqueta; IF_FALSE salta a su etiqueta o cae al bloque
+  siguiente; RETURN no tiene sucesores; el resto cae al bloque siguiente.
+
+Sobre el grafo se calculan bajo demanda:
+
+- el árbol de dominadores (`idom`, `domina`), con el algoritmo iterativo de
+  Cooper, Harvey y Kennedy sobre el orden postorden inverso; `domina`
+  responde en tiempo constante con la numeración en preorden del árbol, y
+- los bucles naturales (`bucles`, `profundidad_bucle`), uno por cabecera, a
+  partir de las aristas de retroceso, con su anidamiento.
+
+Todo se calcula sin recursión y en tiempo casi lineal en el número de
+instrucciones. Los bloques son dueños de su lista de instrucciones, así que
+las pasadas de optimización pueden reescribirlas y recomponer el TAC con
+`instrucciones()`.
+
+    >>> cfgs = construir_cfgs(TACGenerator().generate(ast))
+    >>> [cfg.nombre for cfg in cfgs]
+    ['f', 'main']
+    >>> cfgs[0].bucles[0].cabecera
+    1
+"""
+
+from typing import Dict, Iterable, List, Optional, Set
+
+from core.tac import TACInstruction
+
+
+# Instrucciones que terminan un bloque básico
+TERMINADORES = frozenset(['GOTO', 'IF_FALSE', 'RETURN'])
+
+# Prefijo de las etiquetas de inicio de función (ver TACGenerator._generate_function)
+PREFIJO_FUNCION = 'func_'
+
+# Nombre del grafo de las sentencias globales
+GLOBAL = '<global>'
+
+
+class BasicBlock:
+    """
+    Bloque básico: instrucciones que se ejecutan siempre en secuencia.
+
+    Attributes:
+        indice: Posición del bloque en `ControlFlowGraph.bloques`
+        instrucciones: Instrucciones del bloque (la primera puede ser un LABEL)
+        sucesores: Índices de los bloques a los que puede pasar el control
+        predecesores: Índices de los bloques desde los que se llega a este
+    """
+
+    __slots__ = ('indice', 'instrucciones', 'sucesores', 'predecesores')
+
+    def __init__(self, indice: int, instrucciones: List[TACInstruction]):
+        self.indice = indice
+        self.instrucciones = instrucciones
+        self.sucesores: List[int] = []
+        self.predecesores: List[int] = []
+
+    @property
+    def etiqueta(self) -> Optional[str]:
+        """Etiqueta con que empieza el bloque (None si no empieza con LABEL)."""
+        if self.instrucciones and self.instrucciones[0].op == 'LABEL':
+            return str(self.instrucciones[0].label)
+        return None
+
+    @property
+    def terminador(self) -> Optional[TACInstruction]:
+        """Última instrucción si es un salto o RETURN."""
+        if self.instrucciones and self.instrucciones[-1].op in TERMINADORES:
+            return self.instrucciones[-1]
+        return None
+
+    def __repr__(self) -> str:
+        return (f"BasicBlock({self.indice}, {len(self.instrucciones)} instrucciones, "
+                f"sucesores={self.sucesores})")
+
+
+class Loop:
+    """
+    Bucle natural.
+
+    Attributes:
+        cabecera: Índice del bloque cabecera (domina a todo el bucle)
+        bloques: Índices de los bloques del bucle (incluida la cabecera)
+        padre: Bucle que lo contiene directamente (None si es externo)
+        hijos: Bucles contenidos directamente
+        profundidad: 1 para los bucles externos, 2 para los anidados en ellos...
+    """
+
+    __slots__ = ('cabecera', 'bloques', 'padre', 'hijos', 'profundidad')
+
+    def __init__(self, cabecera: int, bloques: Set[int]):
+        self.cabecera = cabecera
+        self.bloques = bloques
+        self.padre: Optional['Loop'] = None
+        self.hijos: List['Loop'] = []
+        self.profundidad = 1
+
+    def __repr__(self) -> str:
+        return f"Loop(cabecera={self.cabecera}, {len(self.bloques)} bloques, profundidad={self.profundidad})"
+
+
+class ControlFlowGraph:
+    """
+    Grafo de flujo de control de una función.
+
+    El bloque 0 es la entrada. Los bloques inalcanzables (p. ej. código
+    después de un RETURN) siguen en `bloques`, sin predecesores, y no tienen
+    dominador inmediato.
+    """
+
+    def __init__(self, nombre: str, bloques: List[BasicBlock]):
+        """
+        Args:
+            nombre: Nombre de la función (GLOBAL para las sentencias globales)
+            bloques: Bloques con sus aristas ya calculadas
+        """
+        self.nombre = nombre
+        self.bloques = bloques
+        self._postorden: Optional[List[int]] = None
+        self._idom: Optional[List[Optional[int]]] = None
+        self._entrada_dom: Optional[List[int]] = None  # Preorden en el árbol de dominadores
+        self._salida_dom: Optional[List[int]] = None   # Último preorden del subárbol
+        self._bucles: Optional[List[Loop]] = None
+        self._bucle_de: Optional[List[Optional[Loop]]] = None
+
+    @classmethod
+    def desde_instrucciones(cls, instrucciones: Iterable[TACInstruction],
+                            nombre: str = GLOBAL) -> 'ControlFlowGraph':
+        """
+        Construye el grafo de una secuencia de instrucciones.
+
+        Args:
+            instrucciones: Instrucciones de una sola función
+            nombre: Nombre de la función
+
+        Returns:
+            Grafo con un bloque por bloque básico
+
+        Raises:
+            ValueError: Si un salto va a una etiqueta que no está en la función
+        """
+        bloques: List[BasicBlock] = []
+        actual: List[TACInstruction] = []
+        for inst in instrucciones:
+            if inst.op == 'LABEL' and actual:
+                bloques.append(BasicBlock(len(bloques), actual))
+                actual = []
+            actual.append(inst)
+            if inst.op in TERMINADORES:
+                bloques.append(BasicBlock(len(bloques), actual))
+                actual = []
+        if actual or not bloques:
+            bloques.append(BasicBlock(len(bloques), actual))
+
+        por_etiqueta: Dict[str, int] = {}
+        for bloque in bloques:
+            etiqueta = bloque.etiqueta
+            if etiqueta is not None:
+                por_etiqueta[etiqueta] = bloque.indice
+
+        def destino(etiqueta) -> int:
+            indice = por_etiqueta.get(str(etiqueta))
+            if indice is None:
+                raise ValueError(f"Salto a etiqueta desconocida en {nombre}: {etiqueta}")
+            return indice
+
+        ultimo = len(bloques) - 1
+        for bloque in bloques:
+            final = bloque.instrucciones[-1] if bloque.instrucciones else None
+            op = final.op if final is not None else None
+            if op == 'GOTO':
+                sucesores = [destino(final.arg1)]
+            elif op == 'IF_FALSE':
+                sucesores = [destino(final.arg2)]
+                if bloque.indice < ultimo:
+                    sucesores.append(bloque.indice + 1)
+            elif op == 'RETURN' or bloque.indice == ultimo:
+                sucesores = []
+            else:
+                sucesores = [bloque.indice + 1]
+            for sucesor in sucesores:
+                if sucesor not in bloque.sucesores:
+                    bloque.sucesores.append(sucesor)
+                    bloques[sucesor].predecesores.append(bloque.indice)
+
+        return cls(nombre, bloques)
+
+    # ========== Recorridos ==========
+
+    def __len__(self) -> int:
+        return len(self.bloques)
+
+    def instrucciones(self) -> List[TACInstruction]:
+        """Instrucciones de todos los bloques, en orden."""
+        return [inst for bloque in self.bloques for inst in bloque.instrucciones]
+
+    def postorden(self) -> List[int]:
+        """Bloques alcanzables desde la entrada en postorden (DFS iterativo)."""
+        if self._postorden is None:
+            orden: List[int] = []
+            visitado = [False] * len(self.bloques)
+            visitado[0] = True
+            # Pila de (bloque, siguiente sucesor a explorar)
+            pila = [(0, 0)]
+            while pila:
+                indice, siguiente = pila[-1]
+                sucesores = self.bloques[indice].sucesores
+                if siguiente < len(sucesores):
+                    pila[-1] = (indice, siguiente + 1)
+                    sucesor = sucesores[siguiente]
+                    if not visitado[sucesor]:
+                        visitado[sucesor] = True
+                        pila.append((sucesor, 0))
+                else:
+                    pila.pop()
+                    orden.append(indice)
+            self._postorden = orden
+        return self._postorden
+
+    def postorden_inverso(self) -> List[int]:
+        """Bloques alcanzables en postorden inverso (cada bloque antes que sus sucesores, salvo retrocesos)."""
+        return self.postorden()[::-1]
+
+    def alcanzables(self) -> Set[int]:
+        """Índices de los bloques alcanzables desde la entrada."""
+        return set(self.postorden())
+
+    # ========== Dominadores ==========
+
+    @property
+    def idom(self) -> List[Optional[int]]:
+        """
+        Dominador inmediato de cada bloque.
+
+        La entrada es su propio dominador inmediato; los bloques inalcanzables
+        tienen None.
+        """
+        if self._idom is None:
+            self._idom = self._calcular_dominadores()
+        return self._idom
+
+    def _calcular_dominadores(self) -> List[Optional[int]]:
+        """Algoritmo iterativo de Cooper, Harvey y Kennedy."""
+        postorden = self.postorden()
+        numero = [-1] * len(self.bloques)  # Posición en postorden
+        for posicion, indice in enumerate(postorden):
+            numero[indice] = posicion
+
+        idom: List[Optional[int]] = [None] * len(self.bloques)
+        idom[0] = 0
+        orden = postorden[::-1][1:]
+        cambio = True
+        while cambio:
+            cambio = False
+            for indice in orden:
+                nuevo = None
+                for pred in self.bloques[indice].predecesores:
+                    if idom[pred] is None:
+                        continue
+                    if nuevo is None:
+                        nuevo = pred
+                        continue
+                    # Intersección: subir por el árbol hasta el ancestro común
+                    a, b = pred, nuevo
+                    while a != b:
+                        while numero[a] < numero[b]:
+                            a = idom[a]
+                        while numero[b] < numero[a]:
+                            b = idom[b]
+                    nuevo = a
+                if idom[indice] != nuevo:
+                    idom[indice] = nuevo
+                    cambio = True
+        return idom
+
+    def domina(self, a: int, b: int) -> bool:
+        """
+        Indica si el bloque `a` domina al bloque `b` (todo bloque se domina a sí mismo).
+
+        Tiempo constante: `a` domina a `b` si `b` está en el subárbol de `a`
+        del árbol de dominadores, según su numeración en preorden.
+        """
+        if self._entrada_dom is None:
+            self._numerar_dominadores()
+        entrada = self._entrada_dom
+        if entrada[a] < 0 or entrada[b] < 0:
+            return False
+        return entrada[a] <= entrada[b] <= self._salida_dom[a]
+
+    def _numerar_dominadores(self):
+        """Numera el árbol de dominadores en preorden (DFS iterativo)."""
+        hijos = self.arbol_dominadores()
+        entrada = [-1] * len(self.bloques)
+        salida = [-1] * len(self.bloques)
+        contador = 0
+        pila = [(0, False)]
+        while pila:
+            indice, cerrar = pila.pop()
+            if cerrar:
+                salida[indice] = contador - 1
+                continue
+            entrada[indice] = contador
+            contador += 1
+            pila.append((indice, True))
+            pila.extend((hijo, False) for hijo in hijos[indice])
+        self._entrada_dom = entrada
+        self._salida_dom = salida
+
+    def arbol_dominadores(self) -> List[List[int]]:
+        """Hijos de cada bloque en el árbol de dominadores."""
+        hijos: List[List[int]] = [[] for _ in self.bloques]
+        for indice, padre in enumerate(self.idom):
+            if padre is not None and indice != 0:
+                hijos[padre].append(indice)
+        return hijos
+
+    # ========== Bucles ==========
+
+    @property
+    def bucles(self) -> List[Loop]:
+        """Bucles naturales, de los externos a los internos (un bucle por cabecera)."""
+        if self._bucles is None:
+            self._calcular_bucles()
+        return self._bucles
+
+    def _calcular_bucles(self):
+        """Bucles a partir de las aristas de retroceso (la cabecera domina al origen)."""
+        idom = self.idom
+        por_cabecera: Dict[int, Set[int]] = {}
+        for indice in self.postorden():
+            for sucesor in self.bloques[indice].sucesores:
+                if self.domina(sucesor, indice):
+                    # Cuerpo: bloques que llegan al origen sin pasar por la cabecera
+                    cuerpo = por_cabecera.setdefault(sucesor, {sucesor})
+                    pendientes = [indice]
+                    while pendientes:
+                        actual = pendientes.pop()
+                        if actual not in cuerpo and idom[actual] is not None:
+                            cuerpo.add(actual)
+                            pendientes.extend(self.bloques[actual].predecesores)
+
+        # Los bucles que contienen a otro son más grandes: se procesan primero
+        bucles = [Loop(cabecera, cuerpo) for cabecera, cuerpo in por_cabecera.items()]
+        bucles.sort(key=lambda bucle: len(bucle.bloques), reverse=True)
+        bucle_de: List[Optional[Loop]] = [None] * len(self.bloques)
+        for bucle in bucles:
+            padre = bucle_de[bucle.cabecera]
+            if padre is not None:
+                bucle.padre = padre
+                bucle.profundidad = padre.profundidad + 1
+                padre.hijos.append(bucle)
+            for indice in bucle.bloques:
+                bucle_de[indice] = bucle
+
+        self._bucles = bucles
+        self._bucle_de = bucle_de
+
+    def bucle_de(self, indice: int) -> Optional[Loop]:
+        """Bucle más interno que contiene al bloque (None si no está en un bucle)."""
+        if self._bucle_de is None:
+            self._calcular_bucles()
+        return self._bucle_de[indice]
+
+    def profundidad_bucle(self, indice: int) -> int:
+        """Número de bucles que contienen al bloque."""
+        bucle = self.bucle_de(indice)
+        return bucle.profundidad if bucle is not None else 0
+
+    def __repr__(self) -> str:
+        return f"ControlFlowGraph({self.nombre!r}, {len(self.bloques)} bloques)"
+
+
+def dividir_funciones(instrucciones: Iterable[TACInstruction]) -> List[tuple]:
+    """
+    Divide un programa TAC en funciones.
+
+    Una función va de su etiqueta `func_<nombre>` a su último RETURN
+    (`TACGenerator` termina cada función en RETURN y las sentencias globales
+    no tienen ninguno). Las sentencias globales, estén antes, entre o después
+    de las funciones, forman la unidad GLOBAL en el orden del programa.
+
+    Returns:
+        Lista de (nombre, instrucciones): GLOBAL primero (si hay sentencias
+        globales) y luego las funciones en el orden del programa
+    """
+    globales: List[TACInstruction] = []
+    funciones: List[tuple] = []
+    actual: Optional[List[TACInstruction]] = None  # Función abierta
+    fin = 0  # Longitud de la función abierta hasta su último RETURN
+
+    def cerrar():
+        if actual is not None:
+            globales.extend(actual[fin:])
+            del actual[fin:]
+
+    for inst in instrucciones:
+        if inst.op == 'LABEL' and str(inst.label).startswith(PREFIJO_FUNCION):
+            cerrar()
+            actual = [inst]
+            fin = 1
+            funciones.append((str(inst.label)[len(PREFIJO_FUNCION):], actual))
+        elif actual is None:
+            globales.append(inst)
+        else:
+            actual.append(inst)
+            if inst.op == 'RETURN':
+                fin = len(actual)
+    cerrar()
+    return ([(GLOBAL, globales)] if globales else []) + funciones
+
+
+def construir_cfgs(instrucciones: Iterable[TACInstruction]) -> List[ControlFlowGraph]:
+    """
+    Construye el grafo de flujo de control de cada función de un programa TAC.
+
+    Args:
+        instrucciones: Salida de `TACGenerator.generate` (lista o TACBuffer)
+
+    Returns:
+        Un grafo por función, en el orden del programa
+    """
+    return [ControlFlowGraph.desde_instrucciones(cuerpo, nombre)
+            for nombre, cuerpo in dividir_funciones(instrucciones)]
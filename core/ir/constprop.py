@@ -0,0 +1,313 @@
+"""
+Plegado y propagación de constantes sobre el TAC.
+
+`propagar_constantes` reescribe las instrucciones de un `ControlFlowGraph`:
+
+- Propagación: el uso de una variable se sustituye por un literal si todas las
+  definiciones que lo alcanzan (ver `ReachingDefinitions`) asignan ese mismo
+  literal. Un `val n: Int = 10` deja de cargarse del local en cada vuelta del
+  bucle.
+- Plegado: una operación pura con operandos literales se convierte en la
+  asignación de su resultado (`t0 = 2 + 3` -> `t0 = 5`), y las identidades
+  triviales (`x + 0`, `x * 1`, `b && true`...) en una copia.
+- Saltos: `IF_FALSE` con condición literal se elimina (siempre cae) o se
+  convierte en GOTO (siempre salta).
+
+Ambas cosas se repiten hasta que no hay cambios: un resultado plegado se
+propaga a sus usos, que pueden volver a plegarse. Las operaciones se evalúan
+con la semántica de Kotlin en la JVM (ver `evaluar`): Int de 32 bits con
+desbordamiento, división entera truncada hacia cero y resto con el signo del
+dividendo. No se pliega lo que fallaría o daría un valor no representable en
+tiempo de ejecución (división por cero, infinitos), ni las operaciones con
+String.
+"""
+
+import math
+from dataclasses import replace
+from typing import Optional
+
+from core.tac import TACInstruction, Const, Property, as_operand, COMPARACIONES
+from core.ir.cfg import ControlFlowGraph
+from core.ir.dataflow import ReachingDefinitions, iterar_bits
+from core.utils import TipoDato
+
+
+# Rango de Int (32 bits con complemento a dos)
+INT_MIN = -2 ** 31
+INT_MAX = 2 ** 31 - 1
+
+ARITMETICAS = frozenset(['ADD', 'SUB', 'MUL', 'DIV', 'MOD'])
+
+
+def a_int32(valor: int) -> int:
+    """Valor con el desbordamiento de un Int de la JVM."""
+    return (valor - INT_MIN) % 2 ** 32 + INT_MIN
+
+
+def constante(valor, tipo: TipoDato) -> Const:
+    """Literal TAC con el texto que usaría el generador para ese valor."""
+    return Const(str(valor), valor, tipo)
+
+
+def convertir(literal: Const, tipo: Optional[TipoDato]) -> Optional[Const]:
+    """
+    Literal convertido al tipo con que se asigna (Int -> Double).
+
+    Returns:
+        El literal, su conversión, o None si los tipos no son compatibles
+    """
+    if tipo is None or literal.tipo is None or literal.tipo == tipo:
+        return literal
+    if tipo == TipoDato.DOUBLE and literal.tipo == TipoDato.INT and type(literal.valor) is int:
+        return constante(float(literal.valor), TipoDato.DOUBLE)
+    return None
+
+
+def _tipo_numerico(inst: TACInstruction, *literales: Const) -> Optional[TipoDato]:
+    """Tipo con que opera una instrucción (como `JVMGenerator._numeric_type`)."""
+    if inst.tipo is not None:
+        return inst.tipo
+    if any(literal.tipo == TipoDato.DOUBLE for literal in literales):
+        return TipoDato.DOUBLE
+    return literales[0].tipo
+
+
+def evaluar(inst: TACInstruction, izquierdo: Const, derecho: Optional[Const] = None) -> Optional[Const]:
+    """
+    Resultado de una operación pura con operandos literales.
+
+    Returns:
+        El literal del resultado, o None si no se puede (o no se debe) plegar
+    """
+    op = inst.op
+    if op in ('AND', 'OR', 'NOT'):
+        valores = [izquierdo.valor] + ([derecho.valor] if derecho is not None else [])
+        if not all(type(valor) is bool for valor in valores):
+            return None
+        if op == 'NOT':
+            return constante(not valores[0], TipoDato.BOOLEAN)
+        resultado = (valores[0] and valores[1]) if op == 'AND' else (valores[0] or valores[1])
+        return constante(resultado, TipoDato.BOOLEAN)
+
+    literales = (izquierdo,) if derecho is None else (izquierdo, derecho)
+    tipo = _tipo_numerico(inst, *literales)
+    if tipo == TipoDato.BOOLEAN and op in ('EQ', 'NE'):
+        if not all(type(literal.valor) is bool for literal in literales):
+            return None
+        igual = izquierdo.valor == derecho.valor
+        return constante(igual if op == 'EQ' else not igual, TipoDato.BOOLEAN)
+    if tipo == TipoDato.INT:
+        if not all(type(literal.valor) is int for literal in literales):
+            return None
+        valores = [literal.valor for literal in literales]
+    elif tipo == TipoDato.DOUBLE:
+        if not all(type(literal.valor) in (int, float) for literal in literales):
+            return None
+        valores = [float(literal.valor) for literal in literales]
+    else:
+        # String, arrays o tipo desconocido
+        return None
+
+    if op == 'NEG':
+        resultado = -valores[0]
+    elif op in COMPARACIONES:
+        a, b = valores
+        resultado = {'LT': a < b, 'GT': a > b, 'LE': a <= b,
+                     'GE': a >= b, 'EQ': a == b, 'NE': a != b}[op]
+        return constante(resultado, TipoDato.BOOLEAN)
+    elif op in ARITMETICAS:
+        a, b = valores
+        if op in ('DIV', 'MOD') and b == 0:
+            return None  # ArithmeticException (Int) o infinito/NaN (Double)
+        if op == 'ADD':
+            resultado = a + b
+        elif op == 'SUB':
+            resultado = a - b
+        elif op == 'MUL':
+            resultado = a * b
+        elif tipo == TipoDato.DOUBLE:
+            resultado = a / b if op == 'DIV' else math.fmod(a, b)
+        else:
+            # idiv trunca hacia cero; irem tiene el signo del dividendo
+            cociente = abs(a) // abs(b)
+            if (a < 0) != (b < 0):
+                cociente = -cociente
+            resultado = cociente if op == 'DIV' else a - b * cociente
+    else:
+        return None
+
+    if tipo == TipoDato.INT:
+        return constante(a_int32(resultado), TipoDato.INT)
+    if math.isinf(resultado) or math.isnan(resultado):
+        return None
+    return constante(resultado, TipoDato.DOUBLE)
+
+
+def simplificar(inst: TACInstruction, izquierdo, derecho):
+    """
+    Identidades con un solo operando literal: `x + 0`, `x * 1`, `x * 0`,
+    `b && true`, `b || false`... (solo Int y Boolean; en Double `x + 0` no es
+    `x` si x es -0.0).
+
+    Returns:
+        El operando equivalente a la operación (literal o variable), o None
+    """
+    op = inst.op
+    for literal, otro, a_la_izquierda in ((derecho, izquierdo, False), (izquierdo, derecho, True)):
+        if not isinstance(literal, Const) or isinstance(otro, Const):
+            continue
+        valor = literal.valor
+        if op in ('AND', 'OR') and type(valor) is bool:
+            # true && b = b; false && b = false; false || b = b; true || b = true
+            neutro = valor if op == 'AND' else not valor
+            return otro if neutro else literal
+        if inst.tipo != TipoDato.INT or type(valor) is not int:
+            continue
+        if (op == 'ADD' and valor == 0) or (op == 'MUL' and valor == 1):
+            return otro
+        if op in ('SUB', 'DIV') and valor == (0 if op == 'SUB' else 1) and not a_la_izquierda:
+            return otro
+        if op == 'MUL' and valor == 0:
+            return literal
+    return None
+
+
+def usos_sustituibles(inst: TACInstruction):
+    """
+    Campos de una instrucción que leen un valor y admiten un literal.
+
+    No incluye el array de ARRAY_LOAD/ARRAY_STORE ni el objeto de una
+    propiedad (`arr.size`).
+    """
+    op = inst.op
+    if op in ('LABEL', 'GOTO', 'CALL'):
+        return ()
+    if op == 'ARRAY_LOAD':
+        return ('arg2',)
+    if op == 'ARRAY_STORE':
+        return ('arg1', 'arg2')
+    if op in ('ASSIGN', 'NOT', 'NEG', 'IF_FALSE', 'PARAM', 'RETURN'):
+        return ('arg1',)
+    return ('arg1', 'arg2')
+
+
+class _Propagador:
+    """Estado de `propagar_constantes` sobre un grafo."""
+
+    def __init__(self, cfg: ControlFlowGraph):
+        self.cfg = cfg
+        self.definiciones = ReachingDefinitions(cfg).resolver()
+        self.variables = self.definiciones.variables
+
+    def literal_de_definicion(self, numero: int) -> Optional[Const]:
+        """Literal que deja una definición (None si no es `v = literal`)."""
+        indice, posicion, variable = self.definiciones.definiciones[numero]
+        inst = self.cfg.bloques[indice].instrucciones[posicion]
+        if inst.op != 'ASSIGN' or self.variables.indices.get(str(inst.result)) != variable:
+            return None
+        literal = as_operand(inst.arg1)
+        if not isinstance(literal, Const):
+            return None
+        return convertir(literal, inst.tipo)
+
+    def valor(self, operando, alcanzan: int) -> Optional[Const]:
+        """Literal de una variable si todas sus definiciones que llegan lo asignan."""
+        variable = self.variables.indices.get(str(operando))
+        if variable is None:
+            return None
+        candidatas = alcanzan & self.definiciones.de_variable.get(variable, 0)
+        if not candidatas:
+            return None  # Parámetro, global o variable sin asignar
+        valor = None
+        for numero in iterar_bits(candidatas):
+            literal = self.literal_de_definicion(numero)
+            if literal is None:
+                return None
+            if valor is not None and (literal.tipo, repr(literal.valor)) != (valor.tipo, repr(valor.valor)):
+                return None
+            valor = literal
+        return valor
+
+    def reescribir(self, inst: TACInstruction, alcanzan: int) -> Optional[TACInstruction]:
+        """Instrucción con los usos constantes sustituidos y plegada (None si no cambia)."""
+        cambios = {}
+        for campo in usos_sustituibles(inst):
+            operando = as_operand(getattr(inst, campo))
+            if operando is None or isinstance(operando, (Const, Property)):
+                continue
+            literal = self.valor(operando, alcanzan)
+            if literal is not None:
+                cambios[campo] = literal
+        nueva = replace(inst, **cambios) if cambios else inst
+
+        plegada = self.plegar(nueva)
+        if plegada is not None:
+            return plegada
+        return nueva if cambios else None
+
+    @staticmethod
+    def plegar(inst: TACInstruction) -> Optional[TACInstruction]:
+        """La operación convertida en ASSIGN si su resultado se conoce."""
+        if inst.op not in ARITMETICAS and inst.op not in COMPARACIONES \
+                and inst.op not in ('AND', 'OR', 'NOT', 'NEG'):
+            return None
+        izquierdo = as_operand(inst.arg1)
+        derecho = as_operand(inst.arg2)
+        if isinstance(izquierdo, Const) and (derecho is None or isinstance(derecho, Const)):
+            resultado = evaluar(inst, izquierdo, derecho)
+        elif derecho is not None:
+            resultado = simplificar(inst, izquierdo, derecho)
+        else:
+            resultado = None
+        if resultado is None:
+            return None
+        return TACInstruction('ASSIGN', resultado, None, inst.result, linea=inst.linea,
+                              tipo=inst.tipo_resultado)
+
+    def ejecutar(self) -> int:
+        """Propaga y pliega hasta el punto fijo; luego resuelve los saltos."""
+        bloques = self.cfg.bloques
+        orden = self.cfg.postorden_inverso()
+        total = 0
+        while True:
+            cambios = 0
+            for indice in orden:
+                instrucciones = bloques[indice].instrucciones
+                for posicion, alcanzan in self.definiciones.recorrer(indice):
+                    nueva = self.reescribir(instrucciones[posicion], alcanzan)
+                    if nueva is not None:
+                        instrucciones[posicion] = nueva
+                        cambios += 1
+            total += cambios
+            if not cambios:
+                break
+
+        # Las definiciones ya no se consultan: los saltos pueden cambiar el grafo
+        for indice in orden:
+            bloque = bloques[indice]
+            terminador = bloque.terminador
+            if terminador is None or terminador.op != 'IF_FALSE':
+                continue
+            condicion = as_operand(terminador.arg1)
+            if not isinstance(condicion, Const) or type(condicion.valor) is not bool:
+                continue
+            if condicion.valor:
+                bloque.instrucciones.pop()
+            else:
+                bloque.instrucciones[-1] = TACInstruction('GOTO', terminador.arg2,
+                                                          linea=terminador.linea)
+            total += 1
+        return total
+
+
+def propagar_constantes(cfg: ControlFlowGraph) -> int:
+    """
+    Propaga y pliega las constantes de una función (reescribe sus bloques).
+
+    Args:
+        cfg: Grafo de la función; sus bloques se modifican en el sitio
+
+    Returns:
+        Número de instrucciones reescritas o eliminadas
+    """
+    return _Propagador(cfg).ejecutar()
@@ -0,0 +1,228 @@
+"""
+Propagación de copias y fusión de temporales sobre el TAC.
+
+El generador calcula cada valor en un temporal y luego lo copia a su destino
+(`x = a + b` es `t0 = a + b; x = t0`, y el incremento de un `for` es
+`t = i + 1; i = t`). El backend JVM da a cada nombre su propio slot, así que
+cada copia es un par `istore`/`iload` más y cada temporal un local más.
+
+- `fusionar_asignaciones`: `t = <op>; x = t` pasa a ser `x = <op>` si t no se
+  vuelve a leer y la copia no convierte el valor.
+- `propagar_usos_de_copias`: con `AvailableCopies`, los usos de x después de
+  una copia `x = y` leen y; la copia queda muerta si era el último uso y la
+  elimina la pasada de código muerto.
+- `fusionar_temporales`: los temporales del mismo tipo que nunca están vivos
+  a la vez (según `Liveness`) pasan a compartir un nombre, y con él un slot.
+
+`propagar_copias` aplica las dos primeras; la tercera es otra pasada que
+conviene aplicar al final, cuando ya no quedan copias por eliminar.
+"""
+
+from dataclasses import replace
+from typing import Dict, List, Optional, Set
+
+from core.tac import TACInstruction, Property, Temp, as_operand
+from core.ir.cfg import ControlFlowGraph
+from core.ir.dataflow import (
+    AvailableCopies, Liveness, iterar_bits, variable_definida, variables_usadas
+)
+
+
+def campos_leidos(inst: TACInstruction):
+    """Campos de una instrucción que leen una variable (ver `variables_usadas`)."""
+    op = inst.op
+    if op in ('LABEL', 'GOTO', 'CALL'):
+        return ()
+    if op == 'IF_FALSE':
+        return ('arg1',)
+    if op == 'ARRAY_STORE':
+        return ('result', 'arg1', 'arg2')
+    return ('arg1', 'arg2')
+
+
+def _fusionable(anterior: TACInstruction, inst: TACInstruction) -> bool:
+    """Si `anterior` calcula el temporal que `inst` solo copia a su destino."""
+    if inst.op != 'ASSIGN' or as_operand(inst.result) is None:
+        return False
+    fuente = as_operand(inst.arg1)
+    definida = variable_definida(anterior)
+    if not isinstance(fuente, Temp) or definida is None or str(definida) != str(fuente):
+        return False
+    tipo = anterior.tipo_resultado
+    return inst.tipo is None or tipo is None or inst.tipo == tipo
+
+
+def fusionar_asignaciones(cfg: ControlFlowGraph) -> int:
+    """
+    Escribe el resultado de una operación directamente en la variable a la
+    que se copiaba (`t = a + b; x = t` -> `x = a + b`).
+
+    Returns:
+        Copias eliminadas
+    """
+    vivas = Liveness(cfg).resolver()
+    bit = vivas.variables.bit
+    cambios = 0
+    for bloque in cfg.bloques:
+        if len(bloque.instrucciones) < 2:
+            continue
+        despues = vivas.vivas_despues(bloque.indice)
+        conservadas: List[TACInstruction] = []
+        for posicion, inst in enumerate(bloque.instrucciones):
+            if conservadas and _fusionable(conservadas[-1], inst) \
+                    and not despues[posicion] & bit(as_operand(inst.arg1)):
+                conservadas[-1] = replace(conservadas[-1], result=inst.result)
+                cambios += 1
+                continue
+            conservadas.append(inst)
+        bloque.instrucciones = conservadas
+    return cambios
+
+
+def _sustituir(operando, copias: AvailableCopies, disponibles: int):
+    """Operando leído de la fuente de una copia disponible (None si no hay)."""
+    objeto = operando.objeto if isinstance(operando, Property) else operando
+    variable = copias.variables.indices.get(str(objeto))
+    if variable is None:
+        return None
+    candidatas = disponibles & copias.de_destino.get(variable, 0)
+    if not candidatas:
+        return None
+    # Escribir x elimina las demás copias a x: solo puede haber una disponible
+    fuente = copias.fuentes[next(iterar_bits(candidatas))]
+    if isinstance(operando, Property):
+        return Property(fuente, operando.propiedad, operando.tipo)
+    return fuente
+
+
+def propagar_usos_de_copias(cfg: ControlFlowGraph) -> int:
+    """
+    Sustituye los usos de x por y mientras la copia `x = y` está disponible.
+
+    Returns:
+        Instrucciones reescritas
+    """
+    copias = AvailableCopies(cfg).resolver()
+    if not copias.copias:
+        return 0
+    cambios = 0
+    for indice in cfg.postorden_inverso():
+        instrucciones = cfg.bloques[indice].instrucciones
+        for posicion, disponibles in copias.recorrer(indice):
+            if not disponibles:
+                continue
+            inst = instrucciones[posicion]
+            nuevos = {}
+            for campo in campos_leidos(inst):
+                operando = as_operand(getattr(inst, campo))
+                if operando is None:
+                    continue
+                fuente = _sustituir(operando, copias, disponibles)
+                if fuente is not None:
+                    nuevos[campo] = fuente
+            if nuevos:
+                instrucciones[posicion] = replace(inst, **nuevos)
+                cambios += 1
+    return cambios
+
+
+def propagar_copias(cfg: ControlFlowGraph) -> int:
+    """
+    Elimina las copias a través de temporales y propaga las que quedan
+    (reescribe los bloques de la función).
+
+    Args:
+        cfg: Grafo de la función; sus bloques se modifican en el sitio
+
+    Returns:
+        Número de instrucciones eliminadas o reescritas
+    """
+    return fusionar_asignaciones(cfg) + propagar_usos_de_copias(cfg)
+
+
+def _renombrar(operando, nombres: Dict[str, Temp]):
+    """Operando con el temporal renombrado (None si no cambia)."""
+    if isinstance(operando, Property):
+        objeto = _renombrar(operando.objeto, nombres)
+        return Property(objeto, operando.propiedad, operando.tipo) if objeto is not None else None
+    if isinstance(operando, Temp):
+        return nombres.get(operando.texto)
+    return None
+
+
+def fusionar_temporales(cfg: ControlFlowGraph) -> int:
+    """
+    Da el mismo nombre a los temporales del mismo tipo cuyas vidas no se
+    solapan (reescribe los bloques de la función).
+
+    Dos temporales interfieren si uno se escribe mientras el otro está vivo.
+    Se colorean en orden de aparición con el primer nombre libre de su tipo,
+    que es el del primer temporal de ese color.
+
+    Args:
+        cfg: Grafo de la función; sus bloques se modifican en el sitio
+
+    Returns:
+        Número de instrucciones reescritas
+    """
+    vivas = Liveness(cfg).resolver()
+    variables = vivas.variables
+    temporales: Dict[int, Temp] = {}
+    for bloque in cfg.bloques:
+        for inst in bloque.instrucciones:
+            for operando in (*variables_usadas(inst), variable_definida(inst)):
+                if isinstance(operando, Temp):
+                    temporales.setdefault(variables.indice(operando), operando)
+    if len(temporales) < 2:
+        return 0
+    mascara = 0
+    for indice in temporales:
+        mascara |= 1 << indice
+
+    vecinos: Dict[int, Set[int]] = {indice: set() for indice in temporales}
+    for bloque in cfg.bloques:
+        despues = vivas.vivas_despues(bloque.indice)
+        for posicion, inst in enumerate(bloque.instrucciones):
+            definida = variable_definida(inst)
+            if not isinstance(definida, Temp):
+                continue
+            propio = variables.indice(definida)
+            for otro in iterar_bits(despues[posicion] & mascara & ~(1 << propio)):
+                vecinos[propio].add(otro)
+                vecinos[otro].add(propio)
+
+    # Un temporal que se lee antes de escribirse conserva su nombre
+    leidos_antes = vivas.entrada[0] & mascara if cfg.bloques else 0
+    colores: List[Optional[Temp]] = []  # Nombre de cada color (None si no se comparte)
+    color: Dict[int, int] = {}
+    nombres: Dict[str, Temp] = {}
+    for indice, temporal in temporales.items():
+        if leidos_antes >> indice & 1:
+            color[indice] = len(colores)
+            colores.append(None)
+            continue
+        ocupados = {color[otro] for otro in vecinos[indice] if otro in color}
+        elegido = next((c for c, nombre in enumerate(colores)
+                        if nombre is not None and c not in ocupados and nombre.tipo == temporal.tipo),
+                       None)
+        if elegido is None:
+            elegido = len(colores)
+            colores.append(temporal)
+        elif colores[elegido].texto != temporal.texto:
+            nombres[temporal.texto] = colores[elegido]
+        color[indice] = elegido
+    if not nombres:
+        return 0
+
+    cambios = 0
+    for bloque in cfg.bloques:
+        for posicion, inst in enumerate(bloque.instrucciones):
+            nuevos = {}
+            for campo in ('arg1', 'arg2', 'result'):
+                renombrado = _renombrar(as_operand(getattr(inst, campo)), nombres)
+                if renombrado is not None:
+                    nuevos[campo] = renombrado
+            if nuevos:
+                bloque.instrucciones[posicion] = replace(inst, **nuevos)
+                cambios += 1
+    return cambios
@@ -0,0 +1,568 @@
+"""
+Análisis de flujo de datos sobre el grafo de flujo de control.
+
+`DataflowAnalysis` es un resolvedor genérico por lista de trabajo para
+problemas de tipo gen/kill sobre los bloques de un `ControlFlowGraph`. Los
+conjuntos son enteros de Python usados como bitsets: el bit i representa la
+variable, definición o expresión con índice i, así que unión, intersección y
+diferencia son una sola operación sobre enteros aunque haya miles de
+temporales.
+
+Cada análisis define su dirección, su operador de confluencia y el gen/kill
+de cada bloque; el resolvedor visita los bloques en postorden inverso (o en
+postorden si el análisis es hacia atrás) y solo vuelve a encolar los vecinos
+de los bloques cuyo resultado cambió, en ese mismo orden. Se incluyen:
+
+- `Liveness`: variables vivas (hacia atrás, unión)
+- `ReachingDefinitions`: definiciones que alcanzan cada punto (hacia
+  adelante, unión)
+- `AvailableExpressions`: expresiones ya calculadas en todo camino
+  (hacia adelante, intersección)
+- `AvailableCopies`: copias `x = y` vigentes en todo camino (hacia adelante,
+  intersección)
+
+Las variables son los operandos `Var` y `Temp` (y el texto de TAC escrito a
+mano que no es un literal), con un índice por nombre en `VariableTable`. Las
+variables globales (`Var.es_global`) siguen vivas al salir de la función y
+una llamada (CALL) puede leerlas y modificarlas.
+
+    >>> cfg = construir_cfgs(tac)[1]
+    >>> vivas = Liveness(cfg).resolver()
+    >>> vivas.nombres(vivas.entrada[1])
+    {'a', 's'}
+"""
+
+import heapq
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from core.tac import TACInstruction, Const, Property, Var, as_operand
+from core.ir.cfg import ControlFlowGraph
+
+
+# Operaciones que calculan un valor solo a partir de sus operandos
+OPERACIONES_PURAS = frozenset([
+    'ADD', 'SUB', 'MUL', 'DIV', 'MOD',
+    'LT', 'GT', 'LE', 'GE', 'EQ', 'NE',
+    'AND', 'OR', 'NOT', 'NEG',
+])
+
+# Operaciones cuyo resultado no depende del orden de los operandos
+CONMUTATIVAS = frozenset(['ADD', 'MUL', 'EQ', 'NE', 'AND', 'OR'])
+
+
+def variables_usadas(inst: TACInstruction) -> Iterator:
+    """
+    Variables que lee una instrucción (operandos `Var`/`Temp`, no literales).
+
+    El nombre de la función y el número de argumentos de CALL no son
+    variables; ARRAY_STORE lee el array (`result`), el índice y el valor.
+    """
+    op = inst.op
+    if op in ('LABEL', 'GOTO'):
+        return
+    if op == 'CALL':
+        return
+    if op == 'IF_FALSE':
+        candidatos = (inst.arg1,)
+    elif op == 'ARRAY_STORE':
+        candidatos = (inst.result, inst.arg1, inst.arg2)
+    else:
+        candidatos = (inst.arg1, inst.arg2)
+    for candidato in candidatos:
+        operando = as_operand(candidato)
+        while isinstance(operando, Property):
+            operando = operando.objeto
+        if operando is not None and not isinstance(operando, Const):
+            yield operando
+
+
+def variable_definida(inst: TACInstruction):
+    """Variable que escribe una instrucción (None si no escribe ninguna)."""
+    if inst.op in ('LABEL', 'GOTO', 'IF_FALSE', 'PARAM', 'RETURN', 'ARRAY_STORE'):
+        return None
+    return as_operand(inst.result)
+
+
+def expresion(inst: TACInstruction) -> Optional[Tuple[str, str, Optional[str]]]:
+    """
+    Clave de la expresión que calcula una instrucción pura: (op, arg1, arg2).
+
+    Los operandos de las operaciones conmutativas se ordenan, así que `a + b`
+    y `b + a` son la misma expresión. None si la instrucción no es pura.
+    """
+    if inst.op not in OPERACIONES_PURAS:
+        return None
+    izquierdo = str(inst.arg1)
+    derecho = str(inst.arg2) if inst.arg2 is not None else None
+    if inst.op in CONMUTATIVAS and derecho is not None and derecho < izquierdo:
+        izquierdo, derecho = derecho, izquierdo
+    return (inst.op, izquierdo, derecho)
+
+
+def copia(inst: TACInstruction) -> Optional[Tuple[object, object]]:
+    """
+    Destino y fuente de una copia `x = y` entre variables.
+
+    No es copia la asignación de un literal o una propiedad, ni la que
+    convierte el valor (un Int asignado a una variable Double).
+
+    Returns:
+        (destino, fuente), o None si la instrucción no es una copia
+    """
+    if inst.op != 'ASSIGN':
+        return None
+    fuente = as_operand(inst.arg1)
+    destino = as_operand(inst.result)
+    if fuente is None or destino is None or isinstance(fuente, (Const, Property)):
+        return None
+    if str(fuente) == str(destino):
+        return None
+    if inst.tipo is not None and fuente.tipo is not None and inst.tipo != fuente.tipo:
+        return None
+    return destino, fuente
+
+
+class VariableTable:
+    """
+    Índice de las variables de una función: nombre -> bit.
+
+    Attributes:
+        nombres: Nombre de cada variable por índice
+        globales: Bitset de las variables globales
+    """
+
+    def __init__(self, cfg: Optional[ControlFlowGraph] = None):
+        self.nombres: List[str] = []
+        self.indices: Dict[str, int] = {}
+        self.globales = 0
+        if cfg is not None:
+            for bloque in cfg.bloques:
+                for inst in bloque.instrucciones:
+                    for variable in variables_usadas(inst):
+                        self.indice(variable)
+                    definida = variable_definida(inst)
+                    if definida is not None:
+                        self.indice(definida)
+
+    def indice(self, variable) -> int:
+        """Índice de una variable (la agrega si es nueva)."""
+        nombre = str(variable)
+        indice = self.indices.get(nombre)
+        if indice is None:
+            indice = len(self.nombres)
+            self.nombres.append(nombre)
+            self.indices[nombre] = indice
+            if isinstance(variable, Var) and variable.es_global:
+                self.globales |= 1 << indice
+        return indice
+
+    def bit(self, variable) -> int:
+        """Bitset con solo la variable."""
+        return 1 << self.indice(variable)
+
+    def nombres_de(self, bits: int) -> Set[str]:
+        """Nombres de las variables de un bitset."""
+        return {self.nombres[i] for i in iterar_bits(bits)}
+
+    def __len__(self) -> int:
+        return len(self.nombres)
+
+
+def iterar_bits(bits: int) -> Iterator[int]:
+    """Índices de los bits encendidos, de menor a mayor."""
+    while bits:
+        menor = bits & -bits
+        yield menor.bit_length() - 1
+        bits ^= menor
+
+
+class DataflowAnalysis:
+    """
+    Resolvedor genérico de problemas gen/kill por lista de trabajo.
+
+    Las subclases fijan `HACIA_ADELANTE` y `UNION` e implementan `gen_kill`
+    (y `frontera`/`universo` si los valores por defecto no sirven). Tras
+    `resolver()`, `entrada[b]` y `salida[b]` son los bitsets al inicio y al
+    final de cada bloque:
+
+        adelante: entrada[b] = confluencia(salida[p] para p en predecesores)
+                  salida[b] = gen[b] | (entrada[b] & ~kill[b])
+        atrás:    salida[b] = confluencia(entrada[s] para s en sucesores)
+                  entrada[b] = gen[b] | (salida[b] & ~kill[b])
+
+    En la entrada (adelante) o en los bloques sin sucesores (atrás) se usa
+    `frontera()`. Los análisis hacia adelante ignoran los bloques
+    inalcanzables.
+    """
+
+    HACIA_ADELANTE = True
+    UNION = True
+
+    def __init__(self, cfg: ControlFlowGraph, variables: Optional[VariableTable] = None):
+        """
+        Args:
+            cfg: Grafo de la función
+            variables: Índice de variables (se construye si no se da)
+        """
+        self.cfg = cfg
+        self.variables = variables if variables is not None else VariableTable(cfg)
+        self.gen: List[int] = []
+        self.kill: List[int] = []
+        self.entrada: List[int] = []
+        self.salida: List[int] = []
+        self.iteraciones = 0  # Bloques procesados por el resolvedor
+
+    # ========== Puntos de extensión ==========
+
+    def gen_kill(self, bloque) -> Tuple[int, int]:
+        """Bitsets gen y kill de un bloque."""
+        raise NotImplementedError
+
+    def frontera(self) -> int:
+        """Valor en la entrada de la función (adelante) o a la salida (atrás)."""
+        return 0
+
+    def universo(self) -> int:
+        """Valor inicial de los bloques interiores en los análisis de intersección."""
+        return 0
+
+    # ========== Resolución ==========
+
+    def resolver(self) -> 'DataflowAnalysis':
+        """Calcula entrada y salida de cada bloque hasta el punto fijo."""
+        bloques = self.cfg.bloques
+        pares = [self.gen_kill(bloque) for bloque in bloques]
+        self.gen = [gen for gen, _ in pares]
+        self.kill = [kill for _, kill in pares]
+
+        inicial = 0 if self.UNION else self.universo()
+        frontera = self.frontera()
+        n = len(bloques)
+        self.entrada = [inicial] * n
+        self.salida = [inicial] * n
+
+        if self.HACIA_ADELANTE:
+            orden = self.cfg.postorden_inverso()
+            alcanzables = set(orden)
+            anteriores = [[p for p in b.predecesores if p in alcanzables] for b in bloques]
+            siguientes = [b.sucesores for b in bloques]
+            confluye, produce = self.entrada, self.salida
+        else:
+            orden = self.cfg.postorden()
+            alcanzados = set(orden)
+            # Los inalcanzables también se resuelven (después de los demás)
+            orden = orden + [i for i in range(n) if i not in alcanzados]
+            anteriores = [b.sucesores for b in bloques]
+            siguientes = [b.predecesores for b in bloques]
+            confluye, produce = self.salida, self.entrada
+
+        gen, kill = self.gen, self.kill
+        union = self.UNION
+        # Lista de trabajo ordenada por la posición en `orden`: un bloque se
+        # procesa después de todos los anteriores pendientes y el punto fijo se
+        # alcanza en pocas pasadas aunque haya miles de bucles
+        posicion = [0] * n
+        for rango, indice in enumerate(orden):
+            posicion[indice] = rango
+        pendientes = list(range(len(orden)))
+        en_cola = [True] * n
+        inicio = orden[0] if self.HACIA_ADELANTE and orden else None
+
+        while pendientes:
+            indice = orden[heapq.heappop(pendientes)]
+            en_cola[indice] = False
+            self.iteraciones += 1
+
+            vecinos = anteriores[indice]
+            if indice == inicio or not vecinos:
+                valor = frontera
+            elif union:
+                valor = 0
+                for vecino in vecinos:
+                    valor |= produce[vecino]
+            else:
+                valor = -1
+                for vecino in vecinos:
+                    valor &= produce[vecino]
+            confluye[indice] = valor
+
+            nuevo = gen[indice] | (valor & ~kill[indice])
+            if nuevo != produce[indice]:
+                produce[indice] = nuevo
+                for siguiente in siguientes[indice]:
+                    if not en_cola[siguiente]:
+                        en_cola[siguiente] = True
+                        heapq.heappush(pendientes, posicion[siguiente])
+        return self
+
+    def nombres(self, bits: int) -> Set[str]:
+        """Nombres de las variables de un bitset (análisis sobre variables)."""
+        return self.variables.nombres_de(bits)
+
+
+class Liveness(DataflowAnalysis):
+    """
+    Variables vivas: las que se leen después sin volver a escribirse antes.
+
+    Las globales están vivas a la salida de la función y antes de cada CALL.
+    """
+
+    HACIA_ADELANTE = False
+    UNION = True
+
+    def gen_kill(self, bloque) -> Tuple[int, int]:
+        usos = definiciones = 0
+        bit = self.variables.bit
+        globales = self.variables.globales
+        for inst in bloque.instrucciones:
+            if inst.op == 'CALL':
+                usos |= globales & ~definiciones
+            for variable in variables_usadas(inst):
+                b = bit(variable)
+                if not definiciones & b:
+                    usos |= b
+            definida = variable_definida(inst)
+            if definida is not None:
+                definiciones |= bit(definida)
+        return usos, definiciones
+
+    def frontera(self) -> int:
+        return self.variables.globales
+
+    def vivas_despues(self, indice: int) -> List[int]:
+        """
+        Variables vivas después de cada instrucción de un bloque.
+
+        Returns:
+            Un bitset por instrucción, en el orden del bloque
+        """
+        bloque = self.cfg.bloques[indice]
+        bit = self.variables.bit
+        globales = self.variables.globales
+        vivas = self.salida[indice]
+        resultado = [0] * len(bloque.instrucciones)
+        for posicion in range(len(bloque.instrucciones) - 1, -1, -1):
+            resultado[posicion] = vivas
+            inst = bloque.instrucciones[posicion]
+            definida = variable_definida(inst)
+            if definida is not None:
+                vivas &= ~bit(definida)
+            if inst.op == 'CALL':
+                vivas |= globales
+            for variable in variables_usadas(inst):
+                vivas |= bit(variable)
+        return resultado
+
+
+class ReachingDefinitions(DataflowAnalysis):
+    """
+    Definiciones que alcanzan cada punto.
+
+    Cada escritura de una variable es una definición, con índice en
+    `definiciones` (bloque, posición, índice de variable). Un CALL es además
+    una definición ambigua de cada global: la agrega sin eliminar las otras.
+    """
+
+    HACIA_ADELANTE = True
+    UNION = True
+
+    def __init__(self, cfg: ControlFlowGraph, variables: Optional[VariableTable] = None):
+        super().__init__(cfg, variables)
+        self.definiciones: List[Tuple[int, int, int]] = []
+        self.de_variable: Dict[int, int] = {}  # índice de variable -> bitset de sus definiciones
+        # Por bloque: (número de definición, índice de variable, es ambigua)
+        self._por_bloque: List[List[Tuple[int, int, bool]]] = []
+        globales = list(iterar_bits(self.variables.globales))
+        for bloque in cfg.bloques:
+            propias = []
+            for posicion, inst in enumerate(bloque.instrucciones):
+                definida = variable_definida(inst)
+                afectadas = []
+                if definida is not None:
+                    afectadas.append((self.variables.indice(definida), False))
+                if inst.op == 'CALL':
+                    afectadas.extend((g, True) for g in globales
+                                     if not afectadas or g != afectadas[0][0])
+                for variable, ambigua in afectadas:
+                    numero = len(self.definiciones)
+                    self.definiciones.append((bloque.indice, posicion, variable))
+                    self.de_variable[variable] = self.de_variable.get(variable, 0) | (1 << numero)
+                    propias.append((numero, variable, ambigua))
+            self._por_bloque.append(propias)
+
+    def gen_kill(self, bloque) -> Tuple[int, int]:
+        gen = kill = 0
+        for numero, variable, ambigua in self._por_bloque[bloque.indice]:
+            bit = 1 << numero
+            if ambigua:
+                # Definición ambigua de una global: no elimina las anteriores
+                gen |= bit
+                continue
+            todas = self.de_variable[variable]
+            gen = (gen & ~todas) | bit
+            kill |= todas & ~bit
+        return gen, kill
+
+    def alcanzan(self, indice: int, posicion: int) -> int:
+        """
+        Definiciones que alcanzan una instrucción (antes de ejecutarla).
+
+        Returns:
+            Bitset de índices en `definiciones`
+        """
+        bits = self.entrada[indice]
+        for numero, variable, ambigua in self._por_bloque[indice]:
+            if self.definiciones[numero][1] >= posicion:
+                break
+            if not ambigua:
+                bits &= ~self.de_variable[variable]
+            bits |= 1 << numero
+        return bits
+
+    def recorrer(self, indice: int) -> Iterator[Tuple[int, int]]:
+        """
+        Recorre un bloque con las definiciones que alcanzan cada instrucción.
+
+        Yields:
+            (posición, bitset de definiciones antes de ejecutarla)
+        """
+        bits = self.entrada[indice]
+        propias = self._por_bloque[indice]
+        siguiente = 0
+        for posicion in range(len(self.cfg.bloques[indice].instrucciones)):
+            yield posicion, bits
+            while siguiente < len(propias) and self.definiciones[propias[siguiente][0]][1] == posicion:
+                numero, variable, ambigua = propias[siguiente]
+                if not ambigua:
+                    bits &= ~self.de_variable[variable]
+                bits |= 1 << numero
+                siguiente += 1
+
+
+class AvailableExpressions(DataflowAnalysis):
+    """
+    Expresiones disponibles: calculadas en todo camino desde la entrada y sin
+    que sus operandos cambien después.
+
+    `expresiones` tiene la clave (ver `expresion`) de cada expresión pura de
+    la función por índice. Escribir una variable elimina las expresiones que
+    la leen; un CALL elimina las que leen globales.
+    """
+
+    HACIA_ADELANTE = True
+    UNION = False
+
+    def __init__(self, cfg: ControlFlowGraph, variables: Optional[VariableTable] = None):
+        super().__init__(cfg, variables)
+        self.expresiones: List[Tuple] = []
+        self.indices: Dict[Tuple, int] = {}
+        self.leen: Dict[int, int] = {}  # índice de variable -> bitset de expresiones que la leen
+        for bloque in cfg.bloques:
+            for inst in bloque.instrucciones:
+                clave = expresion(inst)
+                if clave is None or clave in self.indices:
+                    continue
+                bit = 1 << len(self.expresiones)
+                self.indices[clave] = len(self.expresiones)
+                self.expresiones.append(clave)
+                for variable in variables_usadas(inst):
+                    indice = self.variables.indice(variable)
+                    self.leen[indice] = self.leen.get(indice, 0) | bit
+        self._de_globales = 0
+        for indice in iterar_bits(self.variables.globales):
+            self._de_globales |= self.leen.get(indice, 0)
+
+    def gen_kill(self, bloque) -> Tuple[int, int]:
+        gen = kill = 0
+        for inst in bloque.instrucciones:
+            eliminadas = 0
+            clave = expresion(inst)
+            if inst.op == 'CALL':
+                eliminadas |= self._de_globales
+            definida = variable_definida(inst)
+            if definida is not None:
+                eliminadas |= self.leen.get(self.variables.indice(definida), 0)
+            generada = 1 << self.indices[clave] if clave is not None else 0
+            # t = t + 1 no deja disponible t + 1
+            gen = ((gen | generada) & ~eliminadas)
+            kill = (kill | eliminadas) & ~(generada & ~eliminadas)
+        return gen, kill
+
+    def universo(self) -> int:
+        return (1 << len(self.expresiones)) - 1
+
+
+class AvailableCopies(DataflowAnalysis):
+    """
+    Copias disponibles: `x = y` (ver `copia`) ejecutada en todo camino desde
+    la entrada sin que x ni y cambien después, así que x se puede leer de y.
+
+    `copias` tiene (índice del destino, índice de la fuente) de cada copia por
+    índice. Escribir una variable elimina las copias en que aparece; un CALL
+    elimina las que tienen una global.
+    """
+
+    HACIA_ADELANTE = True
+    UNION = False
+
+    def __init__(self, cfg: ControlFlowGraph, variables: Optional[VariableTable] = None):
+        super().__init__(cfg, variables)
+        self.copias: List[Tuple[int, int]] = []
+        self.fuentes: List[object] = []  # Operando fuente de cada copia
+        self.indices: Dict[Tuple[int, int], int] = {}
+        self.de_destino: Dict[int, int] = {}  # índice de variable -> bitset de copias a ella
+        self.con: Dict[int, int] = {}  # índice de variable -> bitset de copias en que aparece
+        for bloque in cfg.bloques:
+            for inst in bloque.instrucciones:
+                par = copia(inst)
+                if par is None:
+                    continue
+                clave = (self.variables.indice(par[0]), self.variables.indice(par[1]))
+                if clave in self.indices:
+                    continue
+                bit = 1 << len(self.copias)
+                self.indices[clave] = len(self.copias)
+                self.copias.append(clave)
+                self.fuentes.append(par[1])
+                self.de_destino[clave[0]] = self.de_destino.get(clave[0], 0) | bit
+                for indice in clave:
+                    self.con[indice] = self.con.get(indice, 0) | bit
+        self._de_globales = 0
+        for indice in iterar_bits(self.variables.globales):
+            self._de_globales |= self.con.get(indice, 0)
+
+    def efecto(self, inst: TACInstruction) -> Tuple[int, int]:
+        """Copias que elimina y copia que genera una instrucción (bitsets)."""
+        eliminadas = self._de_globales if inst.op == 'CALL' else 0
+        definida = variable_definida(inst)
+        if definida is not None:
+            eliminadas |= self.con.get(self.variables.indice(definida), 0)
+        par = copia(inst)
+        if par is None:
+            return eliminadas, 0
+        clave = (self.variables.indice(par[0]), self.variables.indice(par[1]))
+        return eliminadas, 1 << self.indices[clave]
+
+    def gen_kill(self, bloque) -> Tuple[int, int]:
+        gen = kill = 0
+        for inst in bloque.instrucciones:
+            eliminadas, generada = self.efecto(inst)
+            gen = (gen & ~eliminadas) | generada
+            kill = (kill | eliminadas) & ~generada
+        return gen, kill
+
+    def universo(self) -> int:
+        return (1 << len(self.copias)) - 1
+
+    def recorrer(self, indice: int) -> Iterator[Tuple[int, int]]:
+        """
+        Recorre un bloque con las copias disponibles antes de cada instrucción.
+
+        Yields:
+            (posición, bitset de copias antes de ejecutarla)
+        """
+        bits = self.entrada[indice]
+        for posicion, inst in enumerate(self.cfg.bloques[indice].instrucciones):
+            yield posicion, bits
+            eliminadas, generada = self.efecto(inst)
+            bits = (bits & ~eliminadas) | generada
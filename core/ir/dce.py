@@ -0,0 +1,152 @@
+"""
+Eliminación de código muerto sobre el TAC.
+
+`eliminar_codigo_muerto` limpia los bloques de un `ControlFlowGraph`:
+
+- Código inalcanzable: los bloques sin camino desde la entrada (lo que sigue a
+  un RETURN, break o continue, o la rama que descartó el plegado de
+  constantes) se vacían.
+- Saltos inútiles: un GOTO o IF_FALSE a la instrucción siguiente y las
+  etiquetas a las que ya no salta nadie (salvo las de inicio de función).
+- Almacenamientos muertos: con `Liveness`, las instrucciones que escriben una
+  variable que no se vuelve a leer. Solo se eliminan si no tienen otro efecto:
+  las llamadas se conservan siempre (sin guardar el resultado si son de una
+  función Unit, como el temporal de cada `println`), y también las divisiones
+  Int entre algo que no es un literal distinto de cero y los accesos a arrays,
+  porque pueden lanzar una excepción. Las asignaciones `x = x` se eliminan
+  siempre.
+
+La eliminación de almacenamientos se repite hasta el punto fijo: al quitar
+`t1 = t0 + 1` puede quedar muerto `t0`.
+"""
+
+from dataclasses import replace
+from typing import List
+
+from core.tac import TACInstruction, Const, as_operand
+from core.ir.cfg import ControlFlowGraph, PREFIJO_FUNCION
+from core.ir.dataflow import Liveness, OPERACIONES_PURAS, variable_definida, variables_usadas
+from core.utils import TipoDato
+
+
+def sin_efectos(inst: TACInstruction) -> bool:
+    """Si eliminar la instrucción solo deja de calcular su resultado."""
+    if inst.op == 'ASSIGN':
+        return True
+    if inst.op in ('DIV', 'MOD') and inst.tipo != TipoDato.DOUBLE:
+        divisor = as_operand(inst.arg2)
+        return isinstance(divisor, Const) and type(divisor.valor) is int and divisor.valor != 0
+    return inst.op in OPERACIONES_PURAS
+
+
+def _siguiente_etiqueta(cfg: ControlFlowGraph, indice: int):
+    """Etiqueta con que empieza el siguiente bloque no vacío (None si no empieza con una)."""
+    for bloque in cfg.bloques[indice + 1:]:
+        if bloque.instrucciones:
+            primera = bloque.instrucciones[0]
+            return str(primera.label) if primera.op == 'LABEL' else None
+    return None
+
+
+def eliminar_inalcanzables(cfg: ControlFlowGraph) -> int:
+    """Vacía los bloques inalcanzables; devuelve las instrucciones eliminadas."""
+    alcanzables = cfg.alcanzables()
+    eliminadas = 0
+    for bloque in cfg.bloques:
+        if bloque.indice not in alcanzables and bloque.instrucciones:
+            eliminadas += len(bloque.instrucciones)
+            bloque.instrucciones = []
+    return eliminadas
+
+
+def eliminar_saltos_inutiles(cfg: ControlFlowGraph) -> int:
+    """
+    Quita los saltos al bloque siguiente y las etiquetas sin saltos.
+
+    No cambia las aristas del grafo: un salto al bloque siguiente y la caída
+    llevan al mismo sitio.
+    """
+    eliminadas = 0
+    for bloque in cfg.bloques:
+        terminador = bloque.terminador
+        if terminador is None or terminador.op not in ('GOTO', 'IF_FALSE'):
+            continue
+        destino = terminador.arg1 if terminador.op == 'GOTO' else terminador.arg2
+        if str(destino) == _siguiente_etiqueta(cfg, bloque.indice):
+            bloque.instrucciones.pop()
+            eliminadas += 1
+
+    referenciadas = set()
+    for bloque in cfg.bloques:
+        terminador = bloque.terminador
+        if terminador is not None and terminador.op == 'GOTO':
+            referenciadas.add(str(terminador.arg1))
+        elif terminador is not None and terminador.op == 'IF_FALSE':
+            referenciadas.add(str(terminador.arg2))
+    for bloque in cfg.bloques:
+        etiqueta = bloque.etiqueta
+        if etiqueta is not None and etiqueta not in referenciadas \
+                and not etiqueta.startswith(PREFIJO_FUNCION):
+            del bloque.instrucciones[0]
+            eliminadas += 1
+    return eliminadas
+
+
+def eliminar_almacenamientos_muertos(cfg: ControlFlowGraph) -> int:
+    """
+    Elimina una vez las escrituras que nadie lee (ver el docstring del módulo).
+
+    Returns:
+        Instrucciones eliminadas o reescritas
+    """
+    vivas = Liveness(cfg).resolver()
+    bit = vivas.variables.bit
+    globales = vivas.variables.globales
+    cambios = 0
+    for bloque in cfg.bloques:
+        actuales = vivas.salida[bloque.indice]
+        conservadas: List[TACInstruction] = []
+        for inst in reversed(bloque.instrucciones):
+            definida = variable_definida(inst)
+            if inst.op == 'ASSIGN' and definida is not None and str(inst.arg1) == str(definida) \
+                    and type(as_operand(inst.arg1)) is type(definida):
+                cambios += 1
+                continue
+            if definida is not None and not actuales & bit(definida):
+                if inst.op == 'CALL':
+                    if inst.tipo == TipoDato.VOID:
+                        inst = replace(inst, result=None)
+                        cambios += 1
+                elif sin_efectos(inst):
+                    cambios += 1
+                    continue
+            if definida is not None:
+                actuales &= ~bit(definida)
+            if inst.op == 'CALL':
+                actuales |= globales
+            for variable in variables_usadas(inst):
+                actuales |= bit(variable)
+            conservadas.append(inst)
+        conservadas.reverse()
+        bloque.instrucciones = conservadas
+    return cambios
+
+
+def eliminar_codigo_muerto(cfg: ControlFlowGraph) -> int:
+    """
+    Elimina el código inalcanzable, los saltos inútiles y los almacenamientos
+    muertos de una función (reescribe sus bloques).
+
+    Args:
+        cfg: Grafo de la función; sus bloques se modifican en el sitio
+
+    Returns:
+        Número de instrucciones eliminadas o reescritas
+    """
+    total = eliminar_inalcanzables(cfg)
+    total += eliminar_saltos_inutiles(cfg)
+    while True:
+        cambios = eliminar_almacenamientos_muertos(cfg)
+        if not cambios:
+            return total
+        total += cambios
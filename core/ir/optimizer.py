@@ -0,0 +1,103 @@
+"""
+Optimizador del código de tres direcciones.
+
+`TACOptimizer` divide el TAC en funciones (`dividir_funciones`), construye el
+grafo de flujo de control de cada una y le aplica en orden las pasadas de
+`PASADAS`. Cada pasada recibe un `ControlFlowGraph`, reescribe las
+instrucciones de sus bloques y devuelve cuántas cambió; el grafo se vuelve a
+construir antes de la siguiente porque una pasada puede cambiar los saltos.
+La secuencia se repite mientras alguna pasada encuentre algo que hacer (hasta
+`MAX_RONDAS` veces).
+
+El resultado tiene la misma forma que la entrada (lista o `TACBuffer`), así
+que los backends no cambian. Las sentencias globales quedan juntas al
+principio, antes de las funciones, en el orden del programa:
+
+    >>> tac = TACOptimizer().optimizar(TACGenerator().generate(ast))
+    >>> BytecodeGenerator().generate(tac)
+"""
+
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+from core.tac import TACInstruction
+from core.tac_buffer import TACBuffer
+from core.ir.cfg import GLOBAL, ControlFlowGraph, dividir_funciones
+from core.ir.constprop import propagar_constantes
+from core.ir.copyprop import propagar_copias, fusionar_temporales
+from core.ir.dce import eliminar_codigo_muerto
+
+
+# Pasadas disponibles: nombre -> función (grafo -> instrucciones cambiadas)
+PASADAS: Dict[str, Callable[[ControlFlowGraph], int]] = {
+    'constantes': propagar_constantes,
+    'copias': propagar_copias,
+    'codigo_muerto': eliminar_codigo_muerto,
+    'temporales': fusionar_temporales,
+}
+
+# Veces que se repite la secuencia de pasadas como máximo
+MAX_RONDAS = 4
+
+
+class TACOptimizer:
+    """
+    Aplica pasadas de optimización a cada función de un programa TAC.
+
+    Attributes:
+        pasadas: Nombres de las pasadas, en el orden en que se aplican
+        estadisticas: Instrucciones cambiadas por cada pasada en la última
+            llamada a `optimizar`
+    """
+
+    def __init__(self, pasadas: Optional[Sequence[str]] = None):
+        """
+        Args:
+            pasadas: Nombres de `PASADAS` a aplicar (todas si es None)
+
+        Raises:
+            ValueError: Si alguna pasada no existe
+        """
+        self.pasadas = list(PASADAS) if pasadas is None else list(pasadas)
+        for nombre in self.pasadas:
+            if nombre not in PASADAS:
+                raise ValueError(f"Pasada de optimización desconocida: {nombre}")
+        self.estadisticas: Dict[str, int] = {}
+
+    def optimizar(self, instrucciones: Iterable[TACInstruction]):
+        """
+        Optimiza un programa TAC.
+
+        Las instrucciones de entrada no se modifican.
+
+        Args:
+            instrucciones: Salida de `TACGenerator.generate` (lista o TACBuffer)
+
+        Returns:
+            Instrucciones optimizadas (TACBuffer si la entrada lo era)
+        """
+        self.estadisticas = {nombre: 0 for nombre in self.pasadas}
+        resultado: List[TACInstruction] = []
+        for nombre, cuerpo in dividir_funciones(instrucciones):
+            resultado.extend(self.optimizar_funcion(cuerpo, nombre))
+        if isinstance(instrucciones, TACBuffer):
+            return TACBuffer.desde_instrucciones(resultado)
+        return resultado
+
+    def optimizar_funcion(self, cuerpo: List[TACInstruction], nombre: str) -> List[TACInstruction]:
+        """Aplica las pasadas a una función hasta que dejan de encontrar cambios."""
+        for _ in range(MAX_RONDAS):
+            cambios = 0
+            for pasada in self.pasadas:
+                cfg = ControlFlowGraph.desde_instrucciones(cuerpo, nombre)
+                cambiadas = PASADAS[pasada](cfg)
+                if cambiadas:
+                    cuerpo = cfg.instrucciones()
+                    self.estadisticas[pasada] += cambiadas
+                    cambios += cambiadas
+            if not cambios:
+                break
+        # `dividir_funciones` cierra la función en su último RETURN: si el final
+        # era inalcanzable (return después de while (true)) se conserva uno
+        if nombre != GLOBAL and cuerpo[-1].op != 'RETURN':
+            cuerpo = cuerpo + [TACInstruction('RETURN', linea=cuerpo[-1].linea)]
+        return cuerpo
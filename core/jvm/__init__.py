@@ -84,7 +84,8 @@ from core.jvm.runtime import (
 
 from core.jvm.jvm_compiler import (
     JVMCompiler,
-    compile_kotlin_to_jvm
+    compile_kotlin_to_jvm,
+    write_class_file
 )
 
 __all__ = [
@@ -151,5 +152,6 @@ __all__ = [
 
     # Compiler (Integration)
     'JVMCompiler',
-    'compile_kotlin_to_jvm'
+    'compile_kotlin_to_jvm',
+    'write_class_file'
 ]
@@ -310,6 +310,11 @@ class JVMInstruction:
         """
         result = bytes([self.opcode.value])
 
+        if self.opcode == JVMOpcode.WIDE:
+            # wide <opcode> <indice de 2 bytes>: locales a partir del 256
+            opcode, indice = self.operands
+            return result + bytes([opcode]) + struct.pack('>H', indice)
+
         # Agregar operandos segun el tipo de instruccion
         if self.operands:
             for operand in self.operands:
@@ -377,6 +382,18 @@ def iconst(value: int) -> JVMInstruction:
         return None
 
 
+def _local(opcode: JVMOpcode, index: int) -> JVMInstruction:
+    """
+    Instruccion de carga/almacenamiento con indice explicito.
+
+    El indice ocupa 1 byte; a partir del slot 256 se antepone `wide` y
+    ocupa 2 (hasta 65535 locales).
+    """
+    if index <= 0xFF:
+        return JVMInstruction(opcode, [index])
+    return JVMInstruction(JVMOpcode.WIDE, [opcode.value, index])
+
+
 def iload(index: int) -> JVMInstruction:
     """Genera instruccion iload optimizada (iload_0..iload_3 o iload)."""
     if 0 <= index <= 3:
@@ -384,7 +401,7 @@ def iload(index: int) -> JVMInstruction:
                   JVMOpcode.ILOAD_2, JVMOpcode.ILOAD_3][index]
         return JVMInstruction(opcode)
     else:
-        return JVMInstruction(JVMOpcode.ILOAD, [index])
+        return _local(JVMOpcode.ILOAD, index)
 
 
 def istore(index: int) -> JVMInstruction:
@@ -394,7 +411,7 @@ def istore(index: int) -> JVMInstruction:
                   JVMOpcode.ISTORE_2, JVMOpcode.ISTORE_3][index]
         return JVMInstruction(opcode)
     else:
-        return JVMInstruction(JVMOpcode.ISTORE, [index])
+        return _local(JVMOpcode.ISTORE, index)
 
 
 def dload(index: int) -> JVMInstruction:
@@ -404,7 +421,7 @@ def dload(index: int) -> JVMInstruction:
                   JVMOpcode.DLOAD_2, JVMOpcode.DLOAD_3][index]
         return JVMInstruction(opcode)
     else:
-        return JVMInstruction(JVMOpcode.DLOAD, [index])
+        return _local(JVMOpcode.DLOAD, index)
 
 
 def dstore(index: int) -> JVMInstruction:
@@ -414,7 +431,7 @@ def dstore(index: int) -> JVMInstruction:
                   JVMOpcode.DSTORE_2, JVMOpcode.DSTORE_3][index]
         return JVMInstruction(opcode)
     else:
-        return JVMInstruction(JVMOpcode.DSTORE, [index])
+        return _local(JVMOpcode.DSTORE, index)
 
 
 def aload(index: int) -> JVMInstruction:
@@ -424,7 +441,7 @@ def aload(index: int) -> JVMInstruction:
                   JVMOpcode.ALOAD_2, JVMOpcode.ALOAD_3][index]
         return JVMInstruction(opcode)
     else:
-        return JVMInstruction(JVMOpcode.ALOAD, [index])
+        return _local(JVMOpcode.ALOAD, index)
 
 
 def astore(index: int) -> JVMInstruction:
@@ -434,7 +451,7 @@ def astore(index: int) -> JVMInstruction:
                   JVMOpcode.ASTORE_2, JVMOpcode.ASTORE_3][index]
         return JVMInstruction(opcode)
     else:
-        return JVMInstruction(JVMOpcode.ASTORE, [index])
+        return _local(JVMOpcode.ASTORE, index)
 
 
 # === ARRAY TYPE CODES ===
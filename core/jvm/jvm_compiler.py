@@ -10,6 +10,7 @@ Conecta todo el pipeline:
 Este modulo es el punto de entrada principal para compilacion JVM.
 """
 
+from dataclasses import astuple
 from typing import List, Optional
 from pathlib import Path
 
@@ -19,6 +20,7 @@ from core.jvm.jvm_generator import JVMGenerator
 from core.jvm.classfile import ClassFileWriter, MethodInfo, CodeAttribute, AccessFlags
 from core.jvm.runtime import RuntimeHelper, create_main_method
 from core.jvm.attributes import create_line_number_table, create_local_variable_table
+from core.metrics import medir_fase
 
 
 class JVMCompiler:
@@ -43,7 +45,8 @@ class JVMCompiler:
 
     def compile(self, tac_instructions: List[TACInstruction],
                 source_file: str = "Main.kt",
-                add_debug_info: bool = True) -> bytes:
+                add_debug_info: bool = True,
+                metricas=None) -> bytes:
         """
         Compila instrucciones TAC a bytecode JVM.
 
@@ -51,10 +54,36 @@ class JVMCompiler:
             tac_instructions: Lista de instrucciones TAC
             source_file: Nombre del archivo fuente
             add_debug_info: Si agregar LineNumberTable y LocalVariableTable
+            metricas: MetricsCollector opcional (fases 'jvm' y 'class')
 
         Returns:
             Bytecode del archivo .class completo
         """
+        with medir_fase(metricas, 'jvm') as registro:
+            generator = self.build(tac_instructions, source_file, add_debug_info)
+        registro.contadores = {"instrucciones_jvm": len(generator.instructions)}
+
+        # Generar archivo .class completo
+        with medir_fase(metricas, 'class') as registro:
+            bytecode = self.writer.to_bytes()
+        registro.contadores = {"bytes": len(bytecode)}
+
+        return bytecode
+
+    def build(self, tac_instructions: List[TACInstruction],
+              source_file: str = "Main.kt",
+              add_debug_info: bool = True) -> JVMGenerator:
+        """
+        Genera el metodo main y lo agrega a la clase, sin serializarla.
+
+        Args:
+            tac_instructions: Lista de instrucciones TAC
+            source_file: Nombre del archivo fuente
+            add_debug_info: Si agregar LineNumberTable y LocalVariableTable
+
+        Returns:
+            El JVMGenerator usado (instrucciones, variables locales)
+        """
         # Agregar SourceFile attribute
         self.writer.add_source_file(source_file)
 
@@ -76,9 +105,8 @@ class JVMCompiler:
 
         # Agregar debugging info si se solicita
         if add_debug_info:
-            # LineNumberTable - mapeo PC a lineas
-            # Por ahora usamos mapeo simple 1:1
-            pc_to_line = self._generate_line_mappings(tac_instructions)
+            # LineNumberTable - mapeo PC a lineas del codigo fuente
+            pc_to_line = self._generate_line_mappings(generator)
             if pc_to_line:
                 lnt = create_line_number_table(self.writer.constant_pool, pc_to_line)
                 code_attr.add_sub_attribute(lnt)
@@ -103,8 +131,7 @@ class JVMCompiler:
         # Agregar metodo a la clase
         self.writer.add_method(method)
 
-        # Generar archivo .class completo
-        return self.writer.to_bytes()
+        return generator
 
     def compile_to_file(self, tac_instructions: List[TACInstruction],
                         output_path: str,
@@ -124,45 +151,22 @@ class JVMCompiler:
         """
         # Compilar
         bytecode = self.compile(tac_instructions, source_file, add_debug_info)
+        return write_class_file(bytecode, output_path)
 
-        # Asegurar extension .class
-        if not output_path.endswith('.class'):
-            output_path += '.class'
-
-        # Escribir archivo
-        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-        with open(output_path, 'wb') as f:
-            f.write(bytecode)
-
-        return output_path
-
-    def _generate_line_mappings(self, tac_instructions: List[TACInstruction]) -> List[tuple]:
+    def _generate_line_mappings(self, generator: JVMGenerator) -> List[tuple]:
         """
         Genera mapeo de PC offset a lineas de codigo.
 
-        Por ahora implementacion simple: cada instruccion TAC = 1 linea.
+        Cada instruccion TAC lleva la linea de la sentencia que la origino; el
+        generador JVM registra el PC real donde empieza cada cambio de linea.
 
         Args:
-            tac_instructions: Instrucciones TAC
+            generator: Generador JVM ya ejecutado
 
         Returns:
             Lista de tuplas (pc_offset, line_number)
         """
-        mappings = []
-        pc = 0
-        line = 1
-
-        for instr in tac_instructions:
-            # Mapear PC actual a linea
-            mappings.append((pc, line))
-
-            # Estimar tamaño aproximado de la instruccion
-            # (esto es simplificado, el tamaño real depende de la instruccion)
-            pc += 3  # Estimacion promedio
-
-            line += 1
-
-        return mappings
+        return generator.get_line_mappings()
 
     def _generate_variable_info(self, generator: JVMGenerator) -> List[tuple]:
         """
@@ -193,8 +197,9 @@ class JVMCompiler:
                 descriptor = "Ljava/lang/Object;"
 
             # Por ahora: start_pc=0, length=todo el metodo
-            # (esto es simplificado, idealmente calculariamos el scope real)
-            variables.append((0, 100, var_name, descriptor, slot))
+            # (esto es simplificado, idealmente calculariamos el scope real).
+            # Las variables que ocultan a otra llevan '#<enlace>' en el TAC
+            variables.append((0, 100, var_name.split('#', 1)[0], descriptor, slot))
 
         return variables
 
@@ -208,12 +213,37 @@ class JVMCompiler:
         return self.writer.get_class_info()
 
 
+def write_class_file(bytecode: bytes, output_path: str) -> str:
+    """
+    Escribe bytes de un .class a disco.
+
+    Args:
+        bytecode: Contenido del archivo .class
+        output_path: Ruta destino (se agrega la extension .class si falta)
+
+    Returns:
+        Ruta del archivo .class escrito
+    """
+    # Asegurar extension .class
+    if not output_path.endswith('.class'):
+        output_path += '.class'
+
+    # Escribir archivo
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'wb') as f:
+        f.write(bytecode)
+
+    return output_path
+
+
 def compile_kotlin_to_jvm(tac_instructions: List[TACInstruction],
                           class_name: str = "Main",
                           output_path: Optional[str] = None,
                           source_file: str = "Main.kt",
                           java_version: int = 6,
-                          add_debug_info: bool = True) -> bytes:
+                          add_debug_info: bool = True,
+                          cache=None,
+                          metricas=None) -> bytes:
     """
     Helper function para compilar TAC a JVM bytecode.
 
@@ -224,6 +254,8 @@ def compile_kotlin_to_jvm(tac_instructions: List[TACInstruction],
         source_file: Nombre del archivo fuente
         java_version: Version de Java (6, 7, 8)
         add_debug_info: Si agregar LineNumberTable y LocalVariableTable
+        cache: CompilationCache opcional; la clave es el TAC mas las opciones
+        metricas: MetricsCollector opcional (fases 'jvm' y 'class')
 
     Returns:
         Bytecode del archivo .class
@@ -234,10 +266,29 @@ def compile_kotlin_to_jvm(tac_instructions: List[TACInstruction],
         >>> tac = tac_gen.generate(ast)
         >>> bytecode = compile_kotlin_to_jvm(tac, "MiPrograma")
     """
+    clave = None
+    if cache is not None:
+        clave = cache.clave(
+            "\n".join(repr(astuple(inst)) for inst in tac_instructions),
+            etapa='jvm',
+            class_name=class_name,
+            source_file=source_file,
+            java_version=java_version,
+            add_debug_info=add_debug_info
+        )
+        entrada = cache.obtener(clave)
+        if entrada is not None:
+            if output_path:
+                write_class_file(entrada['bytecode_jvm'], output_path)
+            return entrada['bytecode_jvm']
+
     compiler = JVMCompiler(class_name, java_version)
+    bytecode = compiler.compile(tac_instructions, source_file, add_debug_info, metricas)
 
     if output_path:
-        compiler.compile_to_file(tac_instructions, output_path, source_file, add_debug_info)
-        return compiler.writer.to_bytes()
-    else:
-        return compiler.compile(tac_instructions, source_file, add_debug_info)
+        write_class_file(bytecode, output_path)
+
+    if cache is not None:
+        cache.guardar(clave, {'bytecode_jvm': bytecode})
+
+    return bytecode
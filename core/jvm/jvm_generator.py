@@ -3,7 +3,11 @@ JVM Generator - Generador de bytecode JVM desde TAC
 
 Convierte el codigo intermedio TAC (Three-Address Code) a bytecode JVM real.
 Maneja:
-- Traduccion de operaciones TAC a instrucciones JVM
+- Traduccion de operaciones TAC a instrucciones JVM, con la variante que
+  corresponde al tipo anotado en cada instruccion (iadd/dadd, iaload/daload,
+  ireturn/dreturn/areturn) y conversiones i2d donde un Int se usa como Double
+- Carga de operandos segun su clase (Const, Var/Temp, Property), sin volver
+  a analizar el texto de cada operando
 - Gestion de variables locales (local variable slots)
 - Calculo de max_stack y max_locals
 - Generacion de metodos completos con Code attributes
@@ -14,7 +18,7 @@ Referencias:
 """
 
 from typing import Dict, List, Optional, Tuple
-from core.tac import TACInstruction
+from core.tac import TACInstruction, Operand, Const, Property, as_operand
 from core.jvm.instructions import (
     JVMInstruction, JVMOpcode, iconst, iload, istore,
     dload, dstore, aload, astore, ArrayType
@@ -24,6 +28,37 @@ from core.jvm.descriptors import TypeDescriptor
 from core.utils import TipoDato
 
 
+# Tipos que se guardan como referencia (aload/astore, areturn)
+TIPOS_REFERENCIA = frozenset([
+    TipoDato.STRING, TipoDato.ARRAY_INT, TipoDato.ARRAY_DOUBLE, TipoDato.ARRAY_STRING
+])
+
+# Tipo de los elementos de cada tipo de array y viceversa
+TIPO_ELEMENTO = {
+    TipoDato.ARRAY_INT: TipoDato.INT,
+    TipoDato.ARRAY_DOUBLE: TipoDato.DOUBLE,
+    TipoDato.ARRAY_STRING: TipoDato.STRING,
+}
+TIPO_ARRAY = {elemento: array for array, elemento in TIPO_ELEMENTO.items()}
+
+# Limites de un metodo en el formato .class (JVMS 4.7.3 y 4.11)
+MAX_BYTES_CODIGO = 65535
+MAX_LOCALES = 65535
+MAX_SALTO = 32767  # Offset de goto/if_xxx: 2 bytes con signo
+
+
+def categoria(tipo: Optional[TipoDato]) -> str:
+    """
+    Categoria JVM de un tipo: 'D' (double, 2 slots), 'A' (referencia) o 'I'
+    (int, boolean y los tipos desconocidos).
+    """
+    if tipo == TipoDato.DOUBLE:
+        return 'D'
+    if tipo in TIPOS_REFERENCIA:
+        return 'A'
+    return 'I'
+
+
 class LocalVariableManager:
     """
     Gestiona la asignacion de local variable slots.
@@ -59,8 +94,18 @@ class LocalVariableManager:
         """
         if var_name in self.var_to_slot:
             return self.var_to_slot[var_name]
+        return self.allocate(var_name, var_type)
+
+    def allocate(self, var_name: str, var_type: TipoDato = TipoDato.INT) -> int:
+        """
+        Asigna un slot nuevo a una variable (aunque ya tuviera uno).
 
-        # Asignar nuevo slot
+        Se usa cuando el mismo nombre pasa a guardar un valor de otra categoria
+        (por ejemplo, variables homonimas de distinto tipo en dos funciones).
+
+        Returns:
+            Indice del slot asignado
+        """
         slot = self.next_slot
         self.var_to_slot[var_name] = slot
         self.var_types[var_name] = var_type
@@ -130,6 +175,8 @@ class JVMGenerator:
         self.stack_tracker = StackDepthTracker()
         self.instructions: List[JVMInstruction] = []
         self.labels: Dict[str, int] = {}  # label -> instruction offset
+        self.line_marks: List[Tuple[int, int]] = []  # (indice de instruccion JVM, linea fuente)
+        self.positions: Dict[int, int] = {}  # indice de instruccion JVM -> pc
 
     def generate(self, tac_instructions: List[TACInstruction]) -> Tuple[bytes, int, int]:
         """
@@ -143,15 +190,21 @@ class JVMGenerator:
         """
         self.instructions = []
         self.labels = {}
+        self.line_marks = []
 
-        # Primera pasada: generar instrucciones JVM
+        # Primera pasada: generar instrucciones JVM (marcando donde cambia la linea fuente)
         for tac_inst in tac_instructions:
+            if tac_inst.linea is not None and (not self.line_marks or self.line_marks[-1][1] != tac_inst.linea):
+                self.line_marks.append((len(self.instructions), tac_inst.linea))
             self._translate_instruction(tac_inst)
 
         # Segunda pasada: resolver labels y offsets
+        max_locals = self.local_vars.get_max_locals()
+        if max_locals > MAX_LOCALES:
+            raise ValueError(f"El metodo usa {max_locals} variables locales (maximo JVM: {MAX_LOCALES})")
         bytecode = self._resolve_labels_and_generate_bytecode()
 
-        return bytecode, self.stack_tracker.get_max_stack(), self.local_vars.get_max_locals()
+        return bytecode, self.stack_tracker.get_max_stack(), max_locals
 
     def _translate_instruction(self, tac_inst: TACInstruction):
         """Traduce una instruccion TAC a una o mas instrucciones JVM."""
@@ -160,28 +213,32 @@ class JVMGenerator:
 
         if op == 'LABEL':
             # Marcar label (se resuelve en segunda pasada)
-            self.labels[tac_inst.label] = len(self.instructions)
+            self.labels[str(tac_inst.label)] = len(self.instructions)
 
         elif op == 'ASSIGN':
-            # result = arg1
-            self._generate_load(tac_inst.arg1)
-            self._generate_store(tac_inst.result)
+            # result = arg1 (convertido al tipo del destino)
+            tipo = tac_inst.tipo or self._operand_type(tac_inst.arg1)
+            self._generate_load(tac_inst.arg1, tipo)
+            self._generate_store(tac_inst.result, tipo)
 
         elif op in ['ADD', 'SUB', 'MUL',
                     'DIV', 'MOD']:
             # result = arg1 op arg2
-            self._generate_load(tac_inst.arg1)
-            self._generate_load(tac_inst.arg2)
-            self._generate_arithmetic(op)
-            self._generate_store(tac_inst.result)
+            tipo = self._numeric_type(tac_inst)
+            self._generate_load(tac_inst.arg1, tipo)
+            self._generate_load(tac_inst.arg2, tipo)
+            self._generate_arithmetic(op, tipo)
+            self._generate_store(tac_inst.result, tipo)
 
         elif op == 'NEG':
             # result = -arg1
-            self._generate_load(tac_inst.arg1)
-            self.instructions.append(JVMInstruction(JVMOpcode.INEG))
-            self.stack_tracker.pop()
-            self.stack_tracker.push()
-            self._generate_store(tac_inst.result)
+            tipo = self._numeric_type(tac_inst)
+            self._generate_load(tac_inst.arg1, tipo)
+            if tipo == TipoDato.DOUBLE:
+                self.instructions.append(JVMInstruction(JVMOpcode.DNEG))
+            else:
+                self.instructions.append(JVMInstruction(JVMOpcode.INEG))
+            self._generate_store(tac_inst.result, tipo)
 
         elif op == 'NOT':
             # result = !arg1
@@ -192,12 +249,13 @@ class JVMGenerator:
             self.instructions.append(JVMInstruction(JVMOpcode.IXOR))
             self.stack_tracker.pop(2)
             self.stack_tracker.push()
-            self._generate_store(tac_inst.result)
+            self._generate_store(tac_inst.result, TipoDato.BOOLEAN)
 
         elif op in ['LT', 'GT', 'LE',
                     'GE', 'EQ', 'NE']:
             # Comparaciones: result = arg1 op arg2
-            self._generate_comparison(op, tac_inst.arg1, tac_inst.arg2, tac_inst.result)
+            self._generate_comparison(op, tac_inst.arg1, tac_inst.arg2, tac_inst.result,
+                                      self._numeric_type(tac_inst))
 
         elif op in ['AND', 'OR']:
             # Operadores logicos
@@ -205,22 +263,24 @@ class JVMGenerator:
 
         elif op == 'GOTO':
             # goto label (label esta en arg1)
-            self.instructions.append(JVMInstruction(JVMOpcode.GOTO, [0], label=tac_inst.arg1))
+            self.instructions.append(JVMInstruction(JVMOpcode.GOTO, [0], label=str(tac_inst.arg1)))
 
         elif op == 'IF_FALSE':
             # if !arg1 goto arg2
-            self._generate_load(tac_inst.arg1)
-            self.instructions.append(JVMInstruction(JVMOpcode.IFEQ, [0], label=tac_inst.arg2))
+            self._generate_load(tac_inst.arg1, TipoDato.BOOLEAN)
+            self.instructions.append(JVMInstruction(JVMOpcode.IFEQ, [0], label=str(tac_inst.arg2)))
             self.stack_tracker.pop()
 
         elif op == 'RETURN':
             # return arg1 (o return si es void)
             if tac_inst.arg1:
-                self._generate_load(tac_inst.arg1)
-                # Determinar tipo de return
-                # Por ahora asumimos int, pero deberia verificarse el tipo
-                self.instructions.append(JVMInstruction(JVMOpcode.IRETURN))
-                self.stack_tracker.pop()
+                # El tipo de la instruccion es el de retorno de la funcion
+                tipo = tac_inst.tipo or self._operand_type(tac_inst.arg1)
+                self._generate_load(tac_inst.arg1, tipo)
+                opcode = {'D': JVMOpcode.DRETURN, 'A': JVMOpcode.ARETURN}.get(
+                    categoria(tipo), JVMOpcode.IRETURN)
+                self.instructions.append(JVMInstruction(opcode))
+                self.stack_tracker.pop(2 if tipo == TipoDato.DOUBLE else 1)
             else:
                 self.instructions.append(JVMInstruction(JVMOpcode.RETURN))
 
@@ -236,65 +296,162 @@ class JVMGenerator:
 
         elif op == 'ARRAY_LOAD':
             # result = arr[index]
-            self._generate_array_load(tac_inst.arg1, tac_inst.arg2, tac_inst.result)
+            self._generate_array_load(tac_inst.arg1, tac_inst.arg2, tac_inst.result,
+                                      tac_inst.tipo or TipoDato.INT)
 
         elif op == 'ARRAY_STORE':
             # arr[index] = value
-            self._generate_array_store(tac_inst.result, tac_inst.arg1, tac_inst.arg2)
+            self._generate_array_store(tac_inst.result, tac_inst.arg1, tac_inst.arg2,
+                                       tac_inst.tipo or TipoDato.INT)
+
+    def _operand_type(self, operand) -> TipoDato:
+        """Tipo de un operando: el de su literal, el de su variable local o el suyo."""
+        operand = as_operand(operand)
+        if isinstance(operand, Const):
+            return operand.tipo or TipoDato.INT
+        if operand.texto in self.local_vars.var_types:
+            return self.local_vars.var_types[operand.texto]
+        return operand.tipo or TipoDato.INT
+
+    def _numeric_type(self, tac_inst: TACInstruction) -> TipoDato:
+        """
+        Tipo con que opera una instruccion aritmetica o de comparacion.
 
-    def _generate_load(self, operand: str):
-        """Genera instruccion para cargar un operando al stack."""
-        # Verificar si es literal numerico
-        if operand.lstrip('-').isdigit():
-            value = int(operand)
-            inst = iconst(value)
-            if inst:
-                self.instructions.append(inst)
-                self.stack_tracker.push()
-            else:
-                # Necesita ldc (constant pool)
-                index = self.constant_pool.add_integer(value)
-                self.instructions.append(JVMInstruction(JVMOpcode.LDC, [index]))
-                self.stack_tracker.push()
-        # Verificar si es float/double
-        elif '.' in operand:
-            value = float(operand)
-            index = self.constant_pool.add_double(value)
-            self.instructions.append(JVMInstruction(JVMOpcode.LDC2_W, [index]))
-            self.stack_tracker.push(2)  # double ocupa 2 slots en stack
+        Es el que anoto el generador TAC; sin anotacion (TAC escrito a mano) es
+        Double si algun operando lo es.
+        """
+        if tac_inst.tipo is not None:
+            return TipoDato.DOUBLE if tac_inst.tipo == TipoDato.DOUBLE else TipoDato.INT
+        operandos = [tac_inst.arg1] + ([tac_inst.arg2] if tac_inst.arg2 is not None else [])
+        if any(self._operand_type(operando) == TipoDato.DOUBLE for operando in operandos):
+            return TipoDato.DOUBLE
+        return TipoDato.INT
+
+    def _generate_load(self, operand, tipo: Optional[TipoDato] = None):
+        """
+        Genera instruccion para cargar un operando al stack.
+
+        Args:
+            operand: `Operand` (o texto TAC, que se clasifica con `as_operand`)
+            tipo: Tipo con que se usara el valor; un Int que se usa como Double
+                se convierte (i2d, o directamente una constante double)
+        """
+        operand = as_operand(operand)
+        if isinstance(operand, Const):
+            self._generate_constant(operand, tipo)
+        elif isinstance(operand, Property):
+            self._generate_property(operand)
         else:
-            # Es una variable
-            slot = self.local_vars.get_or_allocate(operand)
-            var_type = self.local_vars.var_types.get(operand, TipoDato.INT)
+            # Es una variable (las no asignadas aun toman su tipo o el esperado)
+            nombre = operand.texto
+            slot = self.local_vars.get_or_allocate(nombre, operand.tipo or tipo or TipoDato.INT)
+            var_type = self.local_vars.var_types.get(nombre, TipoDato.INT)
 
             if var_type == TipoDato.DOUBLE:
                 self.instructions.append(dload(slot))
                 self.stack_tracker.push(2)
-            elif var_type in [TipoDato.STRING, TipoDato.ARRAY_INT, TipoDato.ARRAY_DOUBLE]:
+            elif var_type in TIPOS_REFERENCIA:
                 self.instructions.append(aload(slot))
                 self.stack_tracker.push()
             else:
                 self.instructions.append(iload(slot))
                 self.stack_tracker.push()
+                if tipo == TipoDato.DOUBLE:
+                    self.instructions.append(JVMInstruction(JVMOpcode.I2D))
+                    self.stack_tracker.push()
+
+    def _generate_constant(self, const: Const, tipo: Optional[TipoDato] = None):
+        """Carga un literal segun su tipo (un Int que se usa como Double se carga como double)."""
+        if const.tipo == TipoDato.DOUBLE or (tipo == TipoDato.DOUBLE and const.tipo == TipoDato.INT):
+            self._generate_double_constant(float(const.valor))
+        elif const.tipo == TipoDato.STRING:
+            index = self.constant_pool.add_string(str(const.valor))
+            self.instructions.append(JVMInstruction(JVMOpcode.LDC, [index]))
+            self.stack_tracker.push()
+        else:
+            # Int y Boolean (true/false son 1/0)
+            value = int(const.valor)
+            inst = iconst(value)
+            if inst:
+                self.instructions.append(inst)
+            else:
+                # Necesita ldc (constant pool)
+                index = self.constant_pool.add_integer(value)
+                self.instructions.append(JVMInstruction(JVMOpcode.LDC, [index]))
+            self.stack_tracker.push()
+
+    def _generate_property(self, prop: Property):
+        """Carga `x.size` (arraylength) o `x.length` de un String (String.length())."""
+        tipo_objeto = self._operand_type(prop.objeto)
+        if tipo_objeto == TipoDato.STRING:
+            self._generate_load(prop.objeto, TipoDato.STRING)
+            method_ref = self.constant_pool.add_methodref("java/lang/String", "length", "()I")
+            self.instructions.append(JVMInstruction(JVMOpcode.INVOKEVIRTUAL, [
+                (method_ref >> 8) & 0xFF,
+                method_ref & 0xFF
+            ]))
+        else:
+            self._generate_load(prop.objeto, tipo_objeto if tipo_objeto in TIPOS_REFERENCIA
+                                else TipoDato.ARRAY_INT)
+            self.instructions.append(JVMInstruction(JVMOpcode.ARRAYLENGTH))
+        # Consume la referencia y deja el Int
+        self.stack_tracker.pop()
+        self.stack_tracker.push()
+
+    def _generate_double_constant(self, value: float):
+        """Carga una constante double (dconst_0/1 o ldc2_w)."""
+        if str(value) == '0.0':
+            self.instructions.append(JVMInstruction(JVMOpcode.DCONST_0))
+        elif value == 1.0:
+            self.instructions.append(JVMInstruction(JVMOpcode.DCONST_1))
+        else:
+            index = self.constant_pool.add_double(value)
+            self.instructions.append(JVMInstruction(JVMOpcode.LDC2_W, [index]))
+        self.stack_tracker.push(2)  # double ocupa 2 slots en stack
 
-    def _generate_store(self, var_name: str):
-        """Genera instruccion para almacenar del stack a variable local."""
-        slot = self.local_vars.get_or_allocate(var_name)
+    def _generate_store(self, var_name: Operand, tipo: Optional[TipoDato] = None):
+        """
+        Genera instruccion para almacenar del stack a variable local.
+
+        Args:
+            var_name: Variable destino
+            tipo: Tipo del valor en el stack; si la variable ya tenia un slot de
+                otra categoria (otra funcion con el mismo nombre), recibe uno nuevo
+        """
+        var_name = str(var_name)
+        tipo = tipo or TipoDato.INT
+        if (var_name in self.local_vars.var_types
+                and categoria(self.local_vars.var_types[var_name]) != categoria(tipo)):
+            slot = self.local_vars.allocate(var_name, tipo)
+        else:
+            slot = self.local_vars.get_or_allocate(var_name, tipo)
         var_type = self.local_vars.var_types.get(var_name, TipoDato.INT)
 
         if var_type == TipoDato.DOUBLE:
             self.instructions.append(dstore(slot))
             self.stack_tracker.pop(2)
-        elif var_type in [TipoDato.STRING, TipoDato.ARRAY_INT, TipoDato.ARRAY_DOUBLE]:
+        elif var_type in TIPOS_REFERENCIA:
             self.instructions.append(astore(slot))
             self.stack_tracker.pop()
         else:
             self.instructions.append(istore(slot))
             self.stack_tracker.pop()
 
-    def _generate_arithmetic(self, op: str):
-        """Genera instruccion aritmetica JVM."""
-        # Por ahora asumimos int, deberia verificar tipos
+    def _generate_arithmetic(self, op: str, tipo: TipoDato = TipoDato.INT):
+        """Genera instruccion aritmetica JVM (variante int o double segun el tipo)."""
+        if tipo == TipoDato.DOUBLE:
+            opcode_map = {
+                'ADD': JVMOpcode.DADD,
+                'SUB': JVMOpcode.DSUB,
+                'MUL': JVMOpcode.DMUL,
+                'DIV': JVMOpcode.DDIV,
+                'MOD': JVMOpcode.DREM,
+            }
+            self.instructions.append(JVMInstruction(opcode_map[op]))
+            self.stack_tracker.pop(4)  # Consume 2 doubles
+            self.stack_tracker.push(2)  # Produce 1 double
+            return
+
         opcode_map = {
             'ADD': JVMOpcode.IADD,
             'SUB': JVMOpcode.ISUB,
@@ -307,21 +464,41 @@ class JVMGenerator:
         self.stack_tracker.pop(2)  # Consume 2 operandos
         self.stack_tracker.push()  # Produce 1 resultado
 
-    def _generate_comparison(self, op: str, arg1: str, arg2: str, result: str):
+    def _generate_comparison(self, op: str, arg1: str, arg2: str, result: str,
+                             tipo: TipoDato = TipoDato.INT):
         """Genera codigo para comparaciones."""
         # Cargar operandos
-        self._generate_load(arg1)
-        self._generate_load(arg2)
-
-        # Mapa de operaciones a opcodes
-        opcode_map = {
-            'EQ': JVMOpcode.IF_ICMPEQ,
-            'NE': JVMOpcode.IF_ICMPNE,
-            'LT': JVMOpcode.IF_ICMPLT,
-            'GE': JVMOpcode.IF_ICMPGE,
-            'GT': JVMOpcode.IF_ICMPGT,
-            'LE': JVMOpcode.IF_ICMPLE,
-        }
+        self._generate_load(arg1, tipo)
+        self._generate_load(arg2, tipo)
+
+        if tipo == TipoDato.DOUBLE:
+            # dcmpg/dcmpl dejan -1, 0 o 1 y se salta comparando con 0. Con NaN,
+            # dcmpg da 1 y dcmpl -1, asi que < y <= usan dcmpg y los demas
+            # dcmpl para que toda comparacion con NaN salvo != sea falsa
+            comparar = JVMOpcode.DCMPG if op in ('LT', 'LE') else JVMOpcode.DCMPL
+            self.instructions.append(JVMInstruction(comparar))
+            self.stack_tracker.pop(4)
+            self.stack_tracker.push()
+            opcode_map = {
+                'EQ': JVMOpcode.IFEQ,
+                'NE': JVMOpcode.IFNE,
+                'LT': JVMOpcode.IFLT,
+                'GE': JVMOpcode.IFGE,
+                'GT': JVMOpcode.IFGT,
+                'LE': JVMOpcode.IFLE,
+            }
+            operandos = 1
+        else:
+            # Mapa de operaciones a opcodes
+            opcode_map = {
+                'EQ': JVMOpcode.IF_ICMPEQ,
+                'NE': JVMOpcode.IF_ICMPNE,
+                'LT': JVMOpcode.IF_ICMPLT,
+                'GE': JVMOpcode.IF_ICMPGE,
+                'GT': JVMOpcode.IF_ICMPGT,
+                'LE': JVMOpcode.IF_ICMPLE,
+            }
+            operandos = 2
 
         # En JVM, comparaciones son branch instructions
         # Para obtener valor boolean, usamos patron:
@@ -336,7 +513,7 @@ class JVMGenerator:
         end_label = f"CMP_END_{len(self.instructions)}"
 
         self.instructions.append(JVMInstruction(opcode_map[op], [0], label=true_label))
-        self.stack_tracker.pop(2)
+        self.stack_tracker.pop(operandos)
 
         # False path
         self.instructions.append(iconst(0))
@@ -352,44 +529,69 @@ class JVMGenerator:
         self.labels[end_label] = len(self.instructions)
 
         # Almacenar resultado
-        self._generate_store(result)
+        self._generate_store(result, TipoDato.BOOLEAN)
 
     def _generate_logical(self, op: str, arg1: str, arg2: str, result: str):
         """Genera codigo para operadores logicos AND/OR."""
         if op == 'AND':
             # AND: arg1 && arg2
-            self._generate_load(arg1)
-            self._generate_load(arg2)
+            self._generate_load(arg1, TipoDato.BOOLEAN)
+            self._generate_load(arg2, TipoDato.BOOLEAN)
             self.instructions.append(JVMInstruction(JVMOpcode.IAND))
             self.stack_tracker.pop(2)
             self.stack_tracker.push()
-            self._generate_store(result)
+            self._generate_store(result, TipoDato.BOOLEAN)
 
         elif op == 'OR':
             # OR: arg1 || arg2
-            self._generate_load(arg1)
-            self._generate_load(arg2)
+            self._generate_load(arg1, TipoDato.BOOLEAN)
+            self._generate_load(arg2, TipoDato.BOOLEAN)
             self.instructions.append(JVMInstruction(JVMOpcode.IOR))
             self.stack_tracker.pop(2)
             self.stack_tracker.push()
-            self._generate_store(result)
-
-    def _generate_array_load(self, array: str, index: str, result: str):
-        """Genera codigo para cargar elemento de array."""
-        self._generate_load(array)  # Array reference
-        self._generate_load(index)  # Index
-        self.instructions.append(JVMInstruction(JVMOpcode.IALOAD))  # Por ahora int arrays
+            self._generate_store(result, TipoDato.BOOLEAN)
+
+    def _generate_array_load(self, array: str, index: str, result: str,
+                             tipo: TipoDato = TipoDato.INT):
+        """Genera codigo para cargar elemento de array (tipo: el del elemento)."""
+        self._generate_load(array, TIPO_ARRAY.get(tipo, TipoDato.ARRAY_INT))  # Array reference
+        self._generate_load(index, TipoDato.INT)  # Index
+        opcode = {'D': JVMOpcode.DALOAD, 'A': JVMOpcode.AALOAD}.get(categoria(tipo), JVMOpcode.IALOAD)
+        self.instructions.append(JVMInstruction(opcode))
         self.stack_tracker.pop(2)
-        self.stack_tracker.push()
-        self._generate_store(result)
+        self.stack_tracker.push(2 if tipo == TipoDato.DOUBLE else 1)
+        self._generate_store(result, tipo)
+
+    def _generate_array_store(self, array: str, index: str, value: str,
+                              tipo: TipoDato = TipoDato.INT):
+        """Genera codigo para almacenar en array (tipo: el del elemento)."""
+        self._generate_load(array, TIPO_ARRAY.get(tipo, TipoDato.ARRAY_INT))  # Array reference
+        self._generate_load(index, TipoDato.INT)  # Index
+        self._generate_load(value, tipo)  # Value
+        opcode = {'D': JVMOpcode.DASTORE, 'A': JVMOpcode.AASTORE}.get(categoria(tipo), JVMOpcode.IASTORE)
+        self.instructions.append(JVMInstruction(opcode))
+        self.stack_tracker.pop(4 if tipo == TipoDato.DOUBLE else 3)
+
+    def get_line_mappings(self) -> List[Tuple[int, int]]:
+        """
+        Mapeo PC -> linea del codigo fuente para la LineNumberTable.
+
+        Usa las lineas que el generador TAC asigna a cada instruccion (resueltas
+        por SourceText en el lexer) y los offsets reales de la segunda pasada.
 
-    def _generate_array_store(self, array: str, index: str, value: str):
-        """Genera codigo para almacenar en array."""
-        self._generate_load(array)  # Array reference
-        self._generate_load(index)  # Index
-        self._generate_load(value)  # Value
-        self.instructions.append(JVMInstruction(JVMOpcode.IASTORE))  # Por ahora int arrays
-        self.stack_tracker.pop(3)
+        Returns:
+            Lista de tuplas (pc, linea) en orden creciente de pc
+        """
+        mappings: List[Tuple[int, int]] = []
+        for index, line in self.line_marks:
+            if index >= len(self.instructions):
+                continue  # La linea no genero instrucciones JVM
+            pc = self.positions[index]
+            if mappings and mappings[-1][0] == pc:
+                mappings[-1] = (pc, line)
+            elif not mappings or mappings[-1][1] != line:
+                mappings.append((pc, line))
+        return mappings
 
     def _resolve_labels_and_generate_bytecode(self) -> bytes:
         """
@@ -404,11 +606,13 @@ class JVMGenerator:
         for i, inst in enumerate(self.instructions):
             positions[i] = current_pos
             current_pos += len(inst.to_bytes())
+        self.positions = positions
 
         # Resolver offsets de branches
         for i, inst in enumerate(self.instructions):
             if inst.label and inst.opcode in [
                 JVMOpcode.GOTO, JVMOpcode.IFEQ, JVMOpcode.IFNE,
+                JVMOpcode.IFLT, JVMOpcode.IFGE, JVMOpcode.IFGT, JVMOpcode.IFLE,
                 JVMOpcode.IF_ICMPEQ, JVMOpcode.IF_ICMPNE,
                 JVMOpcode.IF_ICMPLT, JVMOpcode.IF_ICMPGE,
                 JVMOpcode.IF_ICMPGT, JVMOpcode.IF_ICMPLE
@@ -420,10 +624,16 @@ class JVMGenerator:
                     target_pos = positions[target_index]
                     current_pos = positions[i]
                     offset = target_pos - current_pos
+                    if not -MAX_SALTO - 1 <= offset <= MAX_SALTO:
+                        raise ValueError(f"Salto de {offset} bytes a {target_label} fuera del rango "
+                                         f"de {inst.opcode.name} (maximo JVM: {MAX_SALTO})")
 
                     # Actualizar operando con offset
                     inst.operands = [offset & 0xFFFF]  # 2 bytes signed
 
         # Generar bytecode final
         bytecode = b''.join(inst.to_bytes() for inst in self.instructions)
+        if len(bytecode) > MAX_BYTES_CODIGO:
+            raise ValueError(f"El metodo ocupa {len(bytecode)} bytes de codigo "
+                             f"(maximo JVM: {MAX_BYTES_CODIGO})")
         return bytecode
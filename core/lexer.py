@@ -3,9 +3,14 @@ Analizador Léxico (Lexer) para el compilador de Kotlin.
 Convierte el código fuente en una secuencia de tokens.
 """
 
+import os
 import re
-from typing import List
+import mmap
+import codecs
+from typing import Iterator, Union
 from core.utils import Token, TipoToken
+from core.token_buffer import TokenBuffer
+from core.source import SourceText
 from core.errors import LexicalError, ErrorManager
 
 
@@ -100,16 +105,37 @@ class Lexer:
         ('MISMATCH', r'.'),
     ]
 
-    def __init__(self, error_manager: ErrorManager = None):
+    # Tipos que se reconocen pero no generan tokens
+    TIPOS_OMITIDOS = ('WHITESPACE', 'NEWLINE', 'COMMENT', 'BLOCK_COMMENT')
+
+    # Tipos cuyo texto no requiere validación: se agregan directamente
+    TIPOS_SIMPLES = frozenset(
+        nombre for nombre, _ in ESPECIFICACION_TOKENS if nombre in TipoToken.__members__
+    ) - {'IDENTIFIER', 'INT_LITERAL', 'DOUBLE_LITERAL', 'STRING_LITERAL'}
+
+    # Sufijos numéricos de Kotlin no soportados (ver _procesar_token)
+    SUFIJOS_NUMERICOS = frozenset(['L', 'f', 'F', 'd', 'D'])
+
+    # Motores de escaneo disponibles
+    MOTORES = ('regex', 'dfa')
+
+    def __init__(self, error_manager: ErrorManager = None, motor: str = 'regex'):
         """
         Inicializa el analizador léxico.
 
         Args:
             error_manager: Gestor de errores para registrar errores léxicos.
+            motor: 'regex' (alternancia de expresiones regulares) o 'dfa'
+                   (tabla de transiciones compilada de la misma especificación,
+                   ver core/scanner.py). Ambos producen los mismos tokens y errores.
         """
+        if motor not in self.MOTORES:
+            raise ValueError(f"Motor de escaneo desconocido: {motor!r} (opciones: {', '.join(self.MOTORES)})")
+        self.motor = motor
         self.error_manager = error_manager or ErrorManager()
-        self.tokens = []
+        self.tokens = TokenBuffer()
         self.codigo = ""
+        self.fuente = SourceText("")
         self.linea_actual = 1
         self.columna_actual = 1
 
@@ -119,146 +145,307 @@ class Lexer:
             partes.append(f'(?P<{nombre}>{patron})')
         self.patron_maestro = re.compile('|'.join(partes))
 
-    def tokenizar(self, codigo: str) -> List[Token]:
+        self.scanner = self._crear_scanner() if motor == 'dfa' else None
+
+    def tokenizar(self, codigo: str, linea_base: int = 1, columna_base: int = 1) -> TokenBuffer:
         """
         Tokeniza el código fuente.
 
         Args:
             codigo: Código fuente a analizar.
+            linea_base: Línea del primer carácter (para tokenizar un fragmento de un archivo).
+            columna_base: Columna del primer carácter.
 
         Returns:
-            Lista de tokens generados.
+            Buffer con los tokens generados (secuencia de Token).
         """
         self.codigo = codigo
-        self.tokens = []
+        self.fuente = SourceText(codigo)
+        self.tokens = TokenBuffer(codigo)
         self.linea_actual = 1
         self.columna_actual = 1
+        self._tipo_previo = None
+
+        if self.scanner is not None:
+            self._escanear_dfa(codigo, True, linea_base, columna_base)
+        else:
+            # Itera sobre todas las coincidencias
+            for coincidencia in self.patron_maestro.finditer(codigo):
+                tipo = coincidencia.lastgroup
+
+                # Ignorar comentarios, espacios en blanco y saltos de línea
+                # (las posiciones se resuelven con el índice de líneas de SourceText)
+                if tipo in self.TIPOS_OMITIDOS:
+                    continue
 
-        # Itera sobre todas las coincidencias
-        for coincidencia in self.patron_maestro.finditer(codigo):
-            tipo = coincidencia.lastgroup
-            valor = coincidencia.group()
-            columna = coincidencia.start() - codigo.rfind('\n', 0, coincidencia.start())
-
-            # Procesa el token según su tipo
-            if tipo == 'COMMENT' or tipo == 'WHITESPACE' or tipo == 'BLOCK_COMMENT':
-                # Ignorar comentarios y espacios en blanco
-                # Contar saltos de línea en comentarios de bloque
-                if tipo == 'BLOCK_COMMENT':
-                    self.linea_actual += valor.count('\n')
-                continue
+                inicio = coincidencia.start()
+                linea, columna = self.fuente.posicion(inicio)
+                if linea == 1:
+                    columna += columna_base - 1
+                self._procesar_token(tipo, coincidencia.group(), inicio, linea + linea_base - 1, columna)
 
-            elif tipo == 'UNCLOSED_BLOCK_COMMENT':
-                # Comentario de bloque sin cerrar
-                error = LexicalError(
-                    f"Comentario de bloque sin cerrar: falta '*/'",
-                    self.linea_actual,
-                    columna
-                )
-                self.error_manager.agregar_error(error)
-                continue
+        # Agregar token EOF al final (en la última línea)
+        self.linea_actual = self.fuente.num_lineas + linea_base - 1
+        self.tokens.agregar(TipoToken.EOF, len(codigo), 0, self.linea_actual, self.columna_actual,
+                            None, con_valor=True)
 
-            elif tipo == 'NEWLINE':
-                # Incrementar contador de líneas
-                self.linea_actual += 1
-                self.columna_actual = 1
-                continue
+        return self.tokens
 
-            elif tipo == 'MISMATCH':
-                # Carácter no reconocido
-                error = LexicalError(
-                    f"Carácter no reconocido: '{valor}'",
-                    self.linea_actual,
-                    columna
-                )
-                self.error_manager.agregar_error(error)
-                continue
+    def iter_tokens(self, origen: Union[str, os.PathLike, bytes, bytearray, memoryview],
+                    tam_bloque: int = 1 << 20, encoding: str = 'utf-8') -> Iterator[Token]:
+        """
+        Tokeniza un archivo (o buffer de bytes) por bloques, en memoria acotada.
 
-            elif tipo == 'IDENTIFIER':
-                # Verificar si es palabra clave
-                if valor in self.PALABRAS_CLAVE:
-                    tipo_token = self.PALABRAS_CLAVE[valor]
+        Los archivos se mapean en memoria (mmap) y se decodifican bloque a bloque.
+        Un token que llega al final de un bloque sin que el DFA haya terminado
+        (identificador, número, string o comentario partidos) se arrastra al
+        bloque siguiente. Los tokens de cada bloque se producen en cuanto se
+        escanea, así que el consumidor puede empezar antes de que termine el
+        análisis. Siempre usa el motor DFA; produce los mismos tokens y errores
+        que `tokenizar` sobre el texto completo, terminando con EOF.
+
+        Los tokens no se acumulan en `self.tokens`, y los errores léxicos se
+        registran en el error_manager sin extracto (el texto no se conserva).
+
+        Args:
+            origen: Ruta del archivo o buffer de bytes
+            tam_bloque: Bytes por bloque
+            encoding: Codificación del texto
+
+        Yields:
+            Tokens en orden
+        """
+        if isinstance(origen, (str, os.PathLike)):
+            with open(origen, 'rb') as archivo:
+                if os.fstat(archivo.fileno()).st_size == 0:
+                    datos = b''
                 else:
-                    tipo_token = TipoToken.IDENTIFIER
+                    datos = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                yield from self._iter_bloques(datos, tam_bloque, encoding)
+            finally:
+                if isinstance(datos, mmap.mmap):
+                    datos.close()
+        else:
+            yield from self._iter_bloques(origen, tam_bloque, encoding)
+
+    def _iter_bloques(self, datos, tam_bloque: int, encoding: str) -> Iterator[Token]:
+        """Escanea `datos` por bloques arrastrando el token pendiente (ver iter_tokens)."""
+        if self.scanner is None:
+            self.scanner = self._crear_scanner()
+        decodificador = codecs.getincrementaldecoder(encoding)()
+        self.codigo = ""
+        self._tipo_previo = None
+        self.linea_actual = 1
+        self.columna_actual = 1
 
-                    # Detectar sufijos de tipo inválidos (L, f, F, d, D)
-                    # si el token anterior era un número
-                    if self.tokens and valor in ['L', 'f', 'F', 'd', 'D']:
-                        ultimo_token = self.tokens[-1]
-                        if ultimo_token.tipo in [TipoToken.INT_LITERAL, TipoToken.DOUBLE_LITERAL]:
-                            error = LexicalError(
-                                f"Sufijo de tipo '{valor}' no soportado en literales numéricos",
-                                self.linea_actual,
-                                columna
-                            )
-                            self.error_manager.agregar_error(error)
-                            continue
+        pendiente = ""
+        linea_base, columna_base = 1, 1
+        total = len(datos)
+        for desde in range(0, total or 1, max(1, tam_bloque)):
+            final = desde + tam_bloque >= total
+            texto = pendiente + decodificador.decode(datos[desde:desde + tam_bloque], final)
+            if not texto and not final:
+                continue
 
-                token = Token(tipo_token, valor, self.linea_actual, columna)
+            self.fuente = SourceText(texto)
+            self.tokens = TokenBuffer(texto)
+            errores_previos = len(self.error_manager.errores)
+            reanudar = self._escanear_dfa(texto, final, linea_base, columna_base)
+            for error in self.error_manager.errores[errores_previos:]:
+                error.fuente = None
 
-            elif tipo == 'INT_LITERAL':
-                # Validar que no sea un número demasiado grande
-                try:
-                    valor_int = int(valor)
-                    token = Token(TipoToken.INT_LITERAL, valor_int, self.linea_actual, columna)
-                except ValueError:
-                    error = LexicalError(
-                        f"Número entero fuera de rango: '{valor}'",
-                        self.linea_actual,
-                        columna
-                    )
-                    self.error_manager.agregar_error(error)
-                    continue
+            yield from self.tokens
+            if self.tokens:
+                self._tipo_previo = self.tokens.tipo(-1)
 
-            elif tipo == 'DOUBLE_LITERAL':
-                # Validar formato de número decimal
-                if valor.count('.') > 1:
-                    error = LexicalError(
-                        f"Número decimal con formato inválido: múltiples puntos decimales",
-                        self.linea_actual,
-                        columna
-                    )
-                    self.error_manager.agregar_error(error)
-                    continue
+            linea, columna = self.fuente.posicion(reanudar)
+            columna_base = columna if linea > 1 else columna_base + reanudar
+            linea_base += linea - 1
+            pendiente = texto[reanudar:]
 
-                try:
-                    valor_float = float(valor)
-                    token = Token(TipoToken.DOUBLE_LITERAL, valor_float, self.linea_actual, columna)
-                except ValueError:
-                    error = LexicalError(
-                        f"Número decimal inválido: '{valor}'",
-                        self.linea_actual,
-                        columna
-                    )
-                    self.error_manager.agregar_error(error)
-                    continue
+        self.linea_actual = linea_base
+        yield Token(TipoToken.EOF, None, linea_base, self.columna_actual)
 
-            elif tipo == 'STRING_LITERAL':
-                # Remover comillas
-                valor_string = valor[1:-1]
+    def _crear_scanner(self):
+        """DFA compilado de ESPECIFICACION_TOKENS (las tablas se comparten entre instancias)."""
+        from core.scanner import DFAScanner
+        return DFAScanner(self.ESPECIFICACION_TOKENS, omitir=self.TIPOS_OMITIDOS)
 
-                # Validar secuencias de escape
-                if not self._validar_escape_sequences(valor_string, self.linea_actual, columna):
-                    # Si hay errores, ya fueron reportados en _validar_escape_sequences
-                    # Pero aún creamos el token para continuar parseando
-                    pass
+    def _escanear_dfa(self, texto: str, final: bool = True, linea_base: int = 1,
+                      columna_base: int = 1) -> int:
+        """
+        Tokeniza con el DFA: los tipos simples y los identificadores se agregan
+        directamente; el resto pasa por _procesar_token.
 
-                token = Token(TipoToken.STRING_LITERAL, valor_string, self.linea_actual, columna)
+        Args:
+            texto: Texto a escanear (self.fuente debe ser su SourceText)
+            final: False si el texto es un bloque y puede seguir más entrada
+            linea_base: Línea del primer carácter de `texto`
+            columna_base: Columna del primer carácter de `texto`
 
+        Returns:
+            Offset desde el que hay que reanudar con el siguiente bloque
+            (len(texto) si final)
+        """
+        nombres = self.scanner.tablas.nombres
+        simples = [TipoToken[n] if n in self.TIPOS_SIMPLES else None for n in nombres]
+        identificador = nombres.index('IDENTIFIER')
+        palabras_clave = self.PALABRAS_CLAVE
+        sufijos = self.SUFIJOS_NUMERICOS
+        agregar = self.tokens.agregar
+
+        # Los tokens llegan en orden: la línea avanza sobre el índice de SourceText
+        # sin bisección (equivale a self.fuente.posicion)
+        inicios_linea = self.fuente.inicios_linea
+        num_lineas = len(inicios_linea)
+        linea = linea_base
+        inicio_linea = 1 - columna_base
+        limite = len(texto) + 1
+        indice = 1
+        siguiente = inicios_linea[1] if num_lineas > 1 else limite
+
+        for codigo_tipo, inicio, fin in self.scanner.escanear(texto, final=final):
+            if codigo_tipo < 0:
+                return inicio
+            while inicio >= siguiente:
+                inicio_linea = siguiente
+                linea += 1
+                indice += 1
+                siguiente = inicios_linea[indice] if indice < num_lineas else limite
+
+            tipo_token = simples[codigo_tipo]
+            if tipo_token is None and codigo_tipo == identificador:
+                valor = texto[inicio:fin]
+                tipo_token = palabras_clave.get(valor)
+                if tipo_token is None and valor not in sufijos:
+                    tipo_token = TipoToken.IDENTIFIER
+            if tipo_token is None:
+                self._procesar_token(nombres[codigo_tipo], texto[inicio:fin], inicio,
+                                     linea, inicio - inicio_linea + 1)
             else:
-                # Otros tokens
-                tipo_token = TipoToken[tipo]
-                token = Token(tipo_token, valor, self.linea_actual, columna)
+                agregar(tipo_token, inicio, fin - inicio, linea, inicio - inicio_linea + 1)
+        return len(texto)
+
+    def _procesar_token(self, tipo: str, valor: str, inicio: int, linea: int, columna: int):
+        """
+        Valida y agrega un token (o registra el error léxico correspondiente).
 
-            self.tokens.append(token)
+        Args:
+            tipo: Nombre del tipo en ESPECIFICACION_TOKENS
+            valor: Texto del token
+            inicio: Offset del token en el texto de self.tokens
+            linea: Línea del token
+            columna: Columna del token
+        """
+        self.linea_actual = linea
+
+        # Procesa el token según su tipo
+        if tipo == 'UNCLOSED_BLOCK_COMMENT':
+            # Comentario de bloque sin cerrar
+            error = LexicalError(
+                f"Comentario de bloque sin cerrar: falta '*/'",
+                self.linea_actual,
+                columna,
+                self.fuente
+            )
+            self.error_manager.agregar_error(error)
+            return
+
+        elif tipo == 'MISMATCH':
+            # Carácter no reconocido
+            error = LexicalError(
+                f"Carácter no reconocido: '{valor}'",
+                self.linea_actual,
+                columna,
+                self.fuente
+            )
+            self.error_manager.agregar_error(error)
+            return
+
+        elif tipo == 'IDENTIFIER':
+            # Verificar si es palabra clave
+            if valor in self.PALABRAS_CLAVE:
+                tipo_token = self.PALABRAS_CLAVE[valor]
+            else:
+                tipo_token = TipoToken.IDENTIFIER
 
-        # Agregar token EOF al final
-        token_eof = Token(TipoToken.EOF, None, self.linea_actual, self.columna_actual)
-        self.tokens.append(token_eof)
+                # Detectar sufijos de tipo inválidos (L, f, F, d, D)
+                # si el token anterior era un número
+                if valor in self.SUFIJOS_NUMERICOS:
+                    anterior = self.tokens.tipo(-1) if self.tokens else self._tipo_previo
+                    if anterior in [TipoToken.INT_LITERAL, TipoToken.DOUBLE_LITERAL]:
+                        error = LexicalError(
+                            f"Sufijo de tipo '{valor}' no soportado en literales numéricos",
+                            self.linea_actual,
+                            columna,
+                            self.fuente
+                        )
+                        self.error_manager.agregar_error(error)
+                        return
 
-        return self.tokens
+            self.tokens.agregar(tipo_token, inicio, len(valor), self.linea_actual, columna)
+
+        elif tipo == 'INT_LITERAL':
+            # Validar que no sea un número demasiado grande
+            try:
+                valor_int = int(valor)
+                self.tokens.agregar(TipoToken.INT_LITERAL, inicio, len(valor), self.linea_actual, columna,
+                                    valor_int, con_valor=True)
+            except ValueError:
+                error = LexicalError(
+                    f"Número entero fuera de rango: '{valor}'",
+                    self.linea_actual,
+                    columna,
+                    self.fuente
+                )
+                self.error_manager.agregar_error(error)
+                return
+
+        elif tipo == 'DOUBLE_LITERAL':
+            # Validar formato de número decimal
+            if valor.count('.') > 1:
+                error = LexicalError(
+                    f"Número decimal con formato inválido: múltiples puntos decimales",
+                    self.linea_actual,
+                    columna,
+                    self.fuente
+                )
+                self.error_manager.agregar_error(error)
+                return
+
+            try:
+                valor_float = float(valor)
+                self.tokens.agregar(TipoToken.DOUBLE_LITERAL, inicio, len(valor), self.linea_actual, columna,
+                                    valor_float, con_valor=True)
+            except ValueError:
+                error = LexicalError(
+                    f"Número decimal inválido: '{valor}'",
+                    self.linea_actual,
+                    columna,
+                    self.fuente
+                )
+                self.error_manager.agregar_error(error)
+                return
+
+        elif tipo == 'STRING_LITERAL':
+            # Remover comillas
+            valor_string = valor[1:-1]
+
+            # Validar secuencias de escape
+            if not self._validar_escape_sequences(valor_string, self.linea_actual, columna):
+                # Si hay errores, ya fueron reportados en _validar_escape_sequences
+                # Pero aún creamos el token para continuar parseando
+                pass
+
+            self.tokens.agregar(TipoToken.STRING_LITERAL, inicio, len(valor), self.linea_actual, columna,
+                                valor_string, con_valor=True)
+
+        else:
+            # Otros tokens
+            self.tokens.agregar(TipoToken[tipo], inicio, len(valor), self.linea_actual, columna)
 
-    def obtener_tokens(self) -> List[Token]:
+    def obtener_tokens(self) -> TokenBuffer:
         """Obtiene la lista de tokens generados."""
         return self.tokens
 
@@ -315,7 +502,8 @@ class Lexer:
                             error = LexicalError(
                                 f"Secuencia de escape unicode inválida: '\\u{hex_digits}' (requiere 4 dígitos hexadecimales)",
                                 linea,
-                                columna + i
+                                columna + i,
+                                self.fuente
                             )
                             self.error_manager.agregar_error(error)
                             todas_validas = False
@@ -324,7 +512,8 @@ class Lexer:
                         error = LexicalError(
                             f"Secuencia de escape unicode incompleta: '\\u' (requiere 4 dígitos hexadecimales)",
                             linea,
-                            columna + i
+                            columna + i,
+                            self.fuente
                         )
                         self.error_manager.agregar_error(error)
                         todas_validas = False
@@ -334,7 +523,8 @@ class Lexer:
                     error = LexicalError(
                         f"Secuencia de escape no reconocida: '\\{siguiente}'",
                         linea,
-                        columna + i
+                        columna + i,
+                        self.fuente
                     )
                     self.error_manager.agregar_error(error)
                     todas_validas = False
@@ -0,0 +1,188 @@
+"""
+Métricas de compilación por fase.
+
+Mide, para cada fase del compilador, el tiempo real (perf_counter), el tiempo
+de CPU (process_time), el pico de memoria asignada durante la fase
+(tracemalloc) y contadores de tamaño (tokens, nodos, instrucciones...).
+
+Las métricas son opcionales: tracemalloc ralentiza la ejecución, así que solo
+se activan cuando se piden (por ejemplo `ejecutar(codigo, metricas=True)`).
+"""
+
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, Optional
+
+
+# Nombres legibles de cada fase, en orden de ejecución
+NOMBRES_FASES = {
+    'cache': 'Cache',
+    'lexico': 'Lexer',
+    'sintactico': 'Parser',
+    'semantico': 'Semantico',
+    'tac': 'TAC',
+    'bytecode': 'Bytecode',
+    'jvm': 'JVM',
+    'class': 'Class',
+}
+
+
+@dataclass
+class PhaseMetrics:
+    """Métricas de una fase."""
+    fase: str
+    wall_ms: float = 0.0
+    cpu_ms: float = 0.0
+    peak_bytes: int = 0
+    contadores: Dict[str, int] = field(default_factory=dict)
+    omitida: bool = False  # La fase no llegó a ejecutarse (errores previos)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convierte las métricas a diccionario serializable."""
+        return {
+            "fase": self.fase,
+            "wall_ms": self.wall_ms,
+            "cpu_ms": self.cpu_ms,
+            "peak_bytes": self.peak_bytes,
+            "contadores": dict(self.contadores),
+        }
+
+
+class MetricsCollector:
+    """
+    Acumula las métricas de las fases de una compilación.
+
+    Cada fase se guarda una sola vez (una nueva medición de la misma fase
+    reemplaza a la anterior).
+    """
+
+    def __init__(self, memoria: bool = True):
+        """
+        Inicializa el colector.
+
+        Args:
+            memoria: Si medir el pico de memoria con tracemalloc
+        """
+        self.memoria = memoria
+        self.fases: Dict[str, PhaseMetrics] = {}
+
+    @contextmanager
+    def medir(self, fase: str) -> Iterator[PhaseMetrics]:
+        """
+        Mide el bloque como la fase indicada.
+
+        Args:
+            fase: Nombre de la fase
+
+        Yields:
+            PhaseMetrics donde el bloque puede anotar contadores
+        """
+        registro = PhaseMetrics(fase)
+        iniciado_aqui = False
+        base = 0
+        if self.memoria:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                iniciado_aqui = True
+            elif hasattr(tracemalloc, 'reset_peak'):
+                tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+
+        inicio = time.perf_counter()
+        inicio_cpu = time.process_time()
+        try:
+            yield registro
+        finally:
+            registro.wall_ms = (time.perf_counter() - inicio) * 1000
+            registro.cpu_ms = (time.process_time() - inicio_cpu) * 1000
+            if self.memoria:
+                registro.peak_bytes = max(0, tracemalloc.get_traced_memory()[1] - base)
+                if iniciado_aqui:
+                    tracemalloc.stop()
+            if not registro.omitida:
+                self.fases[fase] = registro
+
+    def obtener(self, fase: str) -> Optional[PhaseMetrics]:
+        """Métricas de una fase (None si no se midió)."""
+        return self.fases.get(fase)
+
+    def to_dict(self, fases=None) -> Dict[str, Any]:
+        """
+        Convierte las métricas a diccionario serializable.
+
+        Args:
+            fases: Fases a incluir (None = todas las medidas)
+
+        Returns:
+            {"fases": [...], "total_wall_ms": float, "total_cpu_ms": float,
+             "peak_bytes": int}
+        """
+        registros = [r for f, r in self.fases.items() if fases is None or f in fases]
+        return {
+            "fases": [r.to_dict() for r in registros],
+            "total_wall_ms": sum(r.wall_ms for r in registros),
+            "total_cpu_ms": sum(r.cpu_ms for r in registros),
+            "peak_bytes": max((r.peak_bytes for r in registros), default=0),
+        }
+
+
+@contextmanager
+def medir_fase(metricas: Optional[MetricsCollector], fase: str) -> Iterator[PhaseMetrics]:
+    """
+    Igual que `MetricsCollector.medir`, pero sin efecto si no hay colector.
+
+    Args:
+        metricas: Colector o None
+        fase: Nombre de la fase
+    """
+    if metricas is None:
+        yield PhaseMetrics(fase)
+    else:
+        with metricas.medir(fase) as registro:
+            yield registro
+
+
+def formatear_metricas(metricas: Dict[str, Any]) -> str:
+    """
+    Formatea métricas en una línea corta (para la barra de estado).
+
+    Args:
+        metricas: Diccionario producido por `MetricsCollector.to_dict`
+
+    Returns:
+        Texto del estilo "Lexer 1.2ms | Parser 3.4ms | ... | Total 9.9ms"
+    """
+    partes = [
+        f"{NOMBRES_FASES.get(r['fase'], r['fase'])} {r['wall_ms']:.1f}ms"
+        for r in metricas.get("fases", [])
+    ]
+    partes.append(f"Total {metricas.get('total_wall_ms', 0.0):.1f}ms")
+    if metricas.get("peak_bytes"):
+        partes.append(f"Pico {metricas['peak_bytes'] / 1024:.0f}KB")
+    return " | ".join(partes)
+
+
+def formatear_tabla(metricas: Dict[str, Any]) -> str:
+    """
+    Formatea métricas como tabla de texto.
+
+    Args:
+        metricas: Diccionario producido por `MetricsCollector.to_dict`
+
+    Returns:
+        Tabla con tiempo real, CPU, pico de memoria y contadores por fase
+    """
+    lineas = [f"{'Fase':<12}{'Real (ms)':>12}{'CPU (ms)':>12}{'Pico (KB)':>12}  Contadores"]
+    lineas.append("-" * 70)
+    for r in metricas.get("fases", []):
+        contadores = ", ".join(f"{k}={v}" for k, v in r["contadores"].items())
+        lineas.append(
+            f"{NOMBRES_FASES.get(r['fase'], r['fase']):<12}"
+            f"{r['wall_ms']:>12.2f}{r['cpu_ms']:>12.2f}{r['peak_bytes'] / 1024:>12.1f}  {contadores}"
+        )
+    lineas.append("-" * 70)
+    lineas.append(f"{'Total':<12}{metricas.get('total_wall_ms', 0.0):>12.2f}"
+                  f"{metricas.get('total_cpu_ms', 0.0):>12.2f}")
+    return "\n".join(lineas)
@@ -3,38 +3,73 @@ Analizador Sintáctico (Parser) para el compilador de Kotlin.
 Genera un árbol sintáctico abstracto (AST) a partir de los tokens.
 """
 
-from typing import List, Optional
+from collections.abc import Sequence
+from typing import Iterable, List, Optional, Tuple, Union
 from core.utils import Token, TipoToken, NodoAST, TipoNodo, TipoDato
+from core.token_buffer import TokenRingBuffer
 from core.errors import SyntaxError, ErrorManager
 
 
 class Parser:
-    """Analizador sintáctico que genera un AST a partir de tokens."""
+    """
+    Analizador sintáctico que genera un AST a partir de tokens.
 
-    def __init__(self, tokens: List[Token], error_manager: ErrorManager = None):
+    Acepta una secuencia de tokens (lista o TokenBuffer) o un iterador, p. ej.
+    `Parser(Lexer().iter_tokens(ruta))`. Con un iterador, los tokens se leen a
+    través de un TokenRingBuffer: el lexer y el parser avanzan juntos y nunca
+    existe la lista completa de tokens.
+    """
+
+    # Tokens que conserva el buffer circular: lookahead de 1 y retroceso de 1
+    CAPACIDAD_FLUJO = 4
+
+    def __init__(self, tokens: Union[Sequence, Iterable[Token]], error_manager: ErrorManager = None):
         """
         Inicializa el analizador sintáctico.
 
         Args:
-            tokens: Lista de tokens del análisis léxico.
+            tokens: Secuencia de tokens del análisis léxico, o iterador de tokens.
             error_manager: Gestor de errores para registrar errores sintácticos.
         """
+        if not isinstance(tokens, (Sequence, TokenRingBuffer)):
+            tokens = TokenRingBuffer(tokens, self.CAPACIDAD_FLUJO)
+        self.flujo = tokens if isinstance(tokens, TokenRingBuffer) else None
         self.tokens = tokens
         self.error_manager = error_manager or ErrorManager()
         self.posicion = 0
-        self.token_actual = self.tokens[0] if tokens else None
+        self.token_actual = self.mirar(0)
+        # (posición del primer token, nodo) de cada declaración/sentencia de nivel superior
+        self.elementos: List[Tuple[int, NodoAST]] = []
+
+    def mirar(self, desplazamiento: int = 1) -> Optional[Token]:
+        """
+        Token a `desplazamiento` posiciones del actual, sin consumirlo.
+
+        Returns:
+            El token, o None fuera de la entrada
+        """
+        posicion = self.posicion + desplazamiento
+        if self.flujo is not None:
+            return self.flujo.obtener(posicion)
+        return self.tokens[posicion] if 0 <= posicion < len(self.tokens) else None
 
     def avanzar(self):
         """Avanza al siguiente token."""
-        if self.posicion < len(self.tokens) - 1:
+        if self.flujo is None:
+            if self.posicion < len(self.tokens) - 1:
+                self.posicion += 1
+                self.token_actual = self.tokens[self.posicion]
+            return
+        siguiente = self.flujo.obtener(self.posicion + 1)
+        if siguiente is not None:
             self.posicion += 1
-            self.token_actual = self.tokens[self.posicion]
+            self.token_actual = siguiente
 
     def retroceder(self):
         """Retrocede al token anterior."""
         if self.posicion > 0:
             self.posicion -= 1
-            self.token_actual = self.tokens[self.posicion]
+            self.token_actual = self.mirar(0)
 
     def verificar(self, tipo_token: TipoToken) -> bool:
         """Verifica si el token actual es del tipo especificado."""
@@ -87,16 +122,19 @@ class Parser:
         nodo_programa = NodoAST(TipoNodo.PROGRAMA, "programa")
 
         while not self.verificar(TipoToken.EOF):
+            inicio = self.posicion
             try:
                 # Verificar si es una declaración de función
                 if self.verificar(TipoToken.FUN):
                     funcion = self.declaracion_funcion()
                     if funcion:
                         nodo_programa.agregar_hijo(funcion)
+                        self.elementos.append((inicio, funcion))
                 else:
                     sentencia = self.sentencia()
                     if sentencia:
                         nodo_programa.agregar_hijo(sentencia)
+                        self.elementos.append((inicio, sentencia))
             except SyntaxError as e:
                 # Recuperación de errores: avanzar hasta el siguiente punto seguro
                 self.sincronizar()
@@ -135,7 +173,8 @@ class Parser:
         elif self.verificar(TipoToken.IDENTIFIER):
             # Puede ser asignación o llamada a función
             # Mirar adelante para decidir
-            if self.posicion + 1 < len(self.tokens) and self.tokens[self.posicion + 1].tipo == TipoToken.LPAREN:
+            siguiente = self.mirar(1)
+            if siguiente is not None and siguiente.tipo == TipoToken.LPAREN:
                 # Es una llamada a función
                 expr = self.expresion()
                 return expr
@@ -473,155 +512,105 @@ class Parser:
             self.error_manager.agregar_error(error)
             raise error
 
+    # Operadores binarios -> nivel de precedencia (mayor = liga más fuerte).
+    # Todos son asociativos por la izquierda; los unarios ligan más que todos.
+    PRECEDENCIA_BINARIA = {
+        TipoToken.OR: 1,
+        TipoToken.AND: 2,
+        TipoToken.EQUAL: 3, TipoToken.NOT_EQUAL: 3,
+        TipoToken.LESS_THAN: 3, TipoToken.LESS_EQUAL: 3,
+        TipoToken.GREATER_THAN: 3, TipoToken.GREATER_EQUAL: 3,
+        TipoToken.PLUS: 4, TipoToken.MINUS: 4,
+        TipoToken.MULTIPLY: 5, TipoToken.DIVIDE: 5, TipoToken.MODULO: 5,
+    }
+    NIVEL_SUMA = 4
+    NIVEL_UNARIO = 6
+    OPERADORES_UNARIOS = (TipoToken.NOT, TipoToken.MINUS)
+    TIPOS_LITERAL = (TipoToken.INT_LITERAL, TipoToken.DOUBLE_LITERAL, TipoToken.STRING_LITERAL)
+    TIPOS_SUFIJO = (TipoToken.LBRACKET, TipoToken.DOT)
+    TIPOS_RANGO = (TipoToken.RANGE, TipoToken.UNTIL)
+
     def expresion(self) -> NodoAST:
         """
-        expresion -> expresion_or
+        expresion -> operando (op_binario operando)*
+        operando  -> (! | -)* ( '(' expresion ')' sufijos | expresion_primaria )
         Jerarquía: OR -> AND -> comparación -> suma -> multiplicación -> unaria -> primaria
+        (ver PRECEDENCIA_BINARIA)
         """
-        return self.expresion_or()
-
-    def expresion_or(self) -> NodoAST:
-        """
-        expresion_or -> expresion_and (|| expresion_and)*
-        OR lógico tiene la menor precedencia
-        """
-        nodo = self.expresion_and()
-
-        while self.verificar(TipoToken.OR):
-            operador = self.token_actual
-            self.avanzar()
-            derecha = self.expresion_and()
-
-            nodo_nuevo = NodoAST(
-                TipoNodo.EXPRESION_BINARIA,
-                operador.valor,
-                linea=operador.linea,
-                columna=operador.columna
-            )
-            nodo_nuevo.agregar_hijo(nodo)
-            nodo_nuevo.agregar_hijo(derecha)
-            nodo = nodo_nuevo
-
-        return nodo
-
-    def expresion_and(self) -> NodoAST:
-        """
-        expresion_and -> expresion_comparacion (&& expresion_comparacion)*
-        AND lógico tiene mayor precedencia que OR
-        """
-        nodo = self.expresion_comparacion()
-
-        while self.verificar(TipoToken.AND):
-            operador = self.token_actual
-            self.avanzar()
-            derecha = self.expresion_comparacion()
-
-            nodo_nuevo = NodoAST(
-                TipoNodo.EXPRESION_BINARIA,
-                operador.valor,
-                linea=operador.linea,
-                columna=operador.columna
-            )
-            nodo_nuevo.agregar_hijo(nodo)
-            nodo_nuevo.agregar_hijo(derecha)
-            nodo = nodo_nuevo
-
-        return nodo
-
-    def expresion_comparacion(self) -> NodoAST:
-        """
-        expresion_comparacion -> expresion_suma ((==|!=|<|<=|>|>=) expresion_suma)*
-        """
-        nodo = self.expresion_suma()
-
-        while self.token_actual.tipo in [TipoToken.EQUAL, TipoToken.NOT_EQUAL,
-                                          TipoToken.LESS_THAN, TipoToken.LESS_EQUAL,
-                                          TipoToken.GREATER_THAN, TipoToken.GREATER_EQUAL]:
-            operador = self.token_actual
-            self.avanzar()
-            derecha = self.expresion_suma()
-
-            nodo_nuevo = NodoAST(
-                TipoNodo.EXPRESION_BINARIA,
-                operador.valor,
-                linea=operador.linea,
-                columna=operador.columna
-            )
-            nodo_nuevo.agregar_hijo(nodo)
-            nodo_nuevo.agregar_hijo(derecha)
-            nodo = nodo_nuevo
-
-        return nodo
+        return self._expresion_binaria(1)
 
     def expresion_suma(self) -> NodoAST:
         """
         expresion_suma -> expresion_multiplicacion ((+|-) expresion_multiplicacion)*
         """
-        nodo = self.expresion_multiplicacion()
-
-        while self.token_actual.tipo in [TipoToken.PLUS, TipoToken.MINUS]:
-            operador = self.token_actual
-            self.avanzar()
-            derecha = self.expresion_multiplicacion()
-
-            nodo_nuevo = NodoAST(
-                TipoNodo.EXPRESION_BINARIA,
-                operador.valor,
-                linea=operador.linea,
-                columna=operador.columna
-            )
-            nodo_nuevo.agregar_hijo(nodo)
-            nodo_nuevo.agregar_hijo(derecha)
-            nodo = nodo_nuevo
-
-        return nodo
+        return self._expresion_binaria(self.NIVEL_SUMA)
 
-    def expresion_multiplicacion(self) -> NodoAST:
+    def _expresion_binaria(self, nivel_minimo: int) -> NodoAST:
         """
-        expresion_multiplicacion -> expresion_unaria ((*|/|%) expresion_unaria)*
-        """
-        nodo = self.expresion_unaria()
-
-        while self.token_actual.tipo in [TipoToken.MULTIPLY, TipoToken.DIVIDE, TipoToken.MODULO]:
-            operador = self.token_actual
-            self.avanzar()
-            derecha = self.expresion_unaria()
+        Análisis por precedencia de operadores con pilas explícitas.
 
-            nodo_nuevo = NodoAST(
-                TipoNodo.EXPRESION_BINARIA,
-                operador.valor,
-                linea=operador.linea,
-                columna=operador.columna
-            )
-            nodo_nuevo.agregar_hijo(nodo)
-            nodo_nuevo.agregar_hijo(derecha)
-            nodo = nodo_nuevo
+        Los operadores binarios, los unarios prefijos y los paréntesis se
+        apilan en lugar de recurrir, así que ni las cadenas largas de
+        operadores ni el anidamiento profundo consumen pila de Python (solo
+        las llamadas, índices y extremos de rango vuelven a entrar en
+        `expresion`). Produce los mismos nodos y errores que la cadena de
+        reglas or/and/comparación/suma/multiplicación/unaria.
 
-        return nodo
+        Args:
+            nivel_minimo: Precedencia mínima de los operadores fuera de paréntesis
 
-    def expresion_unaria(self) -> NodoAST:
-        """
-        expresion_unaria -> (! | -) expresion_unaria | expresion_primaria
-        Soporta operadores unarios: ! (NOT lógico) y - (negativo)
-        """
-        # Verificar si hay operador unario
-        if self.token_actual.tipo in [TipoToken.NOT, TipoToken.MINUS]:
-            operador = self.token_actual
+        Returns:
+            Nodo de la expresión
+        """
+        precedencia = self.PRECEDENCIA_BINARIA
+        unarios = self.OPERADORES_UNARIOS
+        operandos = []
+        operadores = []  # (nivel, token); nivel 0 marca un paréntesis abierto
+        abiertos = 0
+
+        while True:
+            # Posición de operando: prefijos unarios y paréntesis
+            tipo = self.token_actual.tipo
+            while tipo in unarios or tipo == TipoToken.LPAREN:
+                if tipo == TipoToken.LPAREN:
+                    operadores.append((0, self.token_actual))
+                    abiertos += 1
+                else:
+                    operadores.append((self.NIVEL_UNARIO, self.token_actual))
+                self.avanzar()
+                tipo = self.token_actual.tipo
+            operandos.append(self.expresion_primaria())
+
+            # Posición de operador: cerrar paréntesis hasta encontrar uno
+            nivel = precedencia.get(self.token_actual.tipo)
+            while nivel is None or nivel < (1 if abiertos else nivel_minimo):
+                if not abiertos:
+                    while operadores:
+                        self._reducir(operandos, operadores.pop())
+                    return operandos[0]
+                self.consumir(TipoToken.RPAREN, "Se esperaba ')' después de la expresión")
+                while operadores[-1][0]:
+                    self._reducir(operandos, operadores.pop())
+                operadores.pop()
+                abiertos -= 1
+                operandos[-1] = self._sufijos(operandos[-1])
+                nivel = precedencia.get(self.token_actual.tipo)
+
+            while operadores and operadores[-1][0] >= nivel:
+                self._reducir(operandos, operadores.pop())
+            operadores.append((nivel, self.token_actual))
             self.avanzar()
-            # Recursivo para soportar múltiples operadores unarios: !!x, -(-x)
-            operando = self.expresion_unaria()
-
-            nodo = NodoAST(
-                TipoNodo.EXPRESION_UNARIA,
-                operador.valor,
-                linea=operador.linea,
-                columna=operador.columna
-            )
-            nodo.agregar_hijo(operando)
-            return nodo
 
-        # Si no hay operador unario, parsear expresión primaria
-        return self.expresion_primaria()
+    def _reducir(self, operandos: list, operador: tuple):
+        """Aplica un operador apilado (unario o binario) a los últimos operandos."""
+        nivel, token = operador
+        if nivel == self.NIVEL_UNARIO:
+            operandos[-1] = NodoAST(TipoNodo.EXPRESION_UNARIA, token.valor, (operandos[-1],),
+                                    linea=token.linea, columna=token.columna)
+        else:
+            derecha = operandos.pop()
+            operandos[-1] = NodoAST(TipoNodo.EXPRESION_BINARIA, token.valor, (operandos[-1], derecha),
+                                    linea=token.linea, columna=token.columna)
 
     def expresion_primaria(self) -> NodoAST:
         """
@@ -629,32 +618,21 @@ class Parser:
         Maneja también rangos después de parsear el valor inicial
         """
         nodo = None
+        token = self.token_actual
+        tipo = token.tipo
 
         # Literales
-        if self.verificar(TipoToken.INT_LITERAL):
-            token = self.token_actual
-            self.avanzar()
-            nodo = NodoAST(TipoNodo.EXPRESION_LITERAL, token.valor, linea=token.linea, columna=token.columna)
-
-        elif self.verificar(TipoToken.DOUBLE_LITERAL):
-            token = self.token_actual
+        if tipo in self.TIPOS_LITERAL:
             self.avanzar()
             nodo = NodoAST(TipoNodo.EXPRESION_LITERAL, token.valor, linea=token.linea, columna=token.columna)
 
-        elif self.verificar(TipoToken.STRING_LITERAL):
-            token = self.token_actual
-            self.avanzar()
-            nodo = NodoAST(TipoNodo.EXPRESION_LITERAL, token.valor, linea=token.linea, columna=token.columna)
-
-        elif self.verificar(TipoToken.BOOLEAN_LITERAL):
-            token = self.token_actual
+        elif tipo == TipoToken.BOOLEAN_LITERAL:
             self.avanzar()
             valor_bool = token.valor == 'true'
             nodo = NodoAST(TipoNodo.EXPRESION_LITERAL, valor_bool, linea=token.linea, columna=token.columna)
 
         # Identificador (puede ser variable o llamada a función)
-        elif self.verificar(TipoToken.IDENTIFIER):
-            token = self.token_actual
+        elif tipo == TipoToken.IDENTIFIER:
             self.avanzar()
 
             # Verificar si es una llamada a función
@@ -684,7 +662,7 @@ class Parser:
                 nodo = NodoAST(TipoNodo.EXPRESION_VARIABLE, token.valor, linea=token.linea, columna=token.columna)
 
         # Expresión entre paréntesis
-        elif self.verificar(TipoToken.LPAREN):
+        elif tipo == TipoToken.LPAREN:
             self.avanzar()
             nodo = self.expresion()
             self.consumir(TipoToken.RPAREN, "Se esperaba ')' después de la expresión")
@@ -698,9 +676,17 @@ class Parser:
             self.error_manager.agregar_error(error)
             raise error
 
+        if self.token_actual.tipo in self.TIPOS_SUFIJO or self.token_actual.tipo in self.TIPOS_RANGO:
+            return self._sufijos(nodo)
+        return nodo
+
+    def _sufijos(self, nodo: NodoAST) -> NodoAST:
+        """
+        Sufijos de un valor: accesos a índices/propiedades y rango (.. / until).
+        """
         # Verificar si hay acceso a índices o propiedades (soporta n dimensiones y encadenamiento)
         # Ejemplos: array[0], array[0].size, obj.property, obj.property[0]
-        while self.verificar(TipoToken.LBRACKET) or self.verificar(TipoToken.DOT):
+        while self.token_actual.tipo in self.TIPOS_SUFIJO:
             if self.verificar(TipoToken.LBRACKET):
                 # Acceso a índice: array[0]
                 bracket_token = self.token_actual
@@ -739,7 +725,7 @@ class Parser:
                 nodo = nodo_punto              # Actualizar para soportar encadenamiento
 
         # Verificar si es un rango (.. o until después del valor)
-        if self.verificar(TipoToken.RANGE) or self.verificar(TipoToken.UNTIL):
+        if self.token_actual.tipo in self.TIPOS_RANGO:
             token_range = self.token_actual
             operador = ".." if self.verificar(TipoToken.RANGE) else "until"
             self.avanzar()
@@ -772,8 +758,7 @@ class Parser:
                 # Verificar si hay operadores después (para soportar "n - 1" o "arr.size - 1")
                 if self.token_actual.tipo in [TipoToken.PLUS, TipoToken.MINUS, TipoToken.MULTIPLY, TipoToken.DIVIDE]:
                     # Convertir a expresión completa retrocediendo
-                    self.posicion -= 1
-                    self.token_actual = self.tokens[self.posicion]
+                    self.retroceder()
                     fin = self.expresion_suma()
             elif self.verificar(TipoToken.LPAREN):
                 # Expresión entre paréntesis
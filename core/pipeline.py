@@ -0,0 +1,226 @@
+"""
+Pipeline de compilación con resultados memoizados.
+
+Ejecuta cada fase del compilador (léxico, sintáctico, semántico, TAC y
+bytecode) a lo sumo una vez por revisión del código fuente y conserva sus
+salidas. Pedir el resultado de una fase posterior reutiliza lo que ya se
+calculó en las anteriores en lugar de volver a tokenizar y parsear.
+"""
+
+from typing import Dict, List, Optional
+
+from core.lexer import Lexer
+from core.parser import Parser
+from core.semantic import AnalizadorSemantico
+from core.tac import TACGenerator, TACInstruction
+from core.ir.optimizer import TACOptimizer
+from core.bytecode import BytecodeGenerator, BytecodeInstruction
+from core.errors import ErrorManager
+from core.metrics import MetricsCollector, medir_fase
+
+
+class CompilationPipeline:
+    """
+    Secuencia de fases del compilador con memoización por revisión.
+
+    Cada fase se ejecuta solo si la anterior terminó sin errores, igual que en
+    `CompiladorController.ejecutar`. Tras ejecutarse (o saltarse) una fase se
+    recuerda cuántos errores había acumulados, de modo que se pueden obtener
+    los errores "hasta la fase X" sin repetir el trabajo.
+    """
+
+    FASES = ('lexico', 'sintactico', 'semantico', 'tac', 'bytecode')
+
+    def __init__(self, motor_lexico: str = 'regex', tac_compacto: bool = False,
+                 optimizar: bool = False):
+        """
+        Inicializa un pipeline vacío (sin código cargado).
+
+        Args:
+            motor_lexico: Motor de escaneo del lexer ('regex' o 'dfa', ver Lexer.MOTORES)
+            tac_compacto: Si guardar el TAC en un TACBuffer (columnas) en lugar de una lista
+            optimizar: Si aplicar las pasadas de `TACOptimizer` al TAC generado
+        """
+        self.motor_lexico = motor_lexico
+        self.tac_compacto = tac_compacto
+        self.optimizar = optimizar
+        self.codigo: Optional[str] = None
+        self.revision = 0
+        self._reiniciar()
+
+    def _reiniciar(self):
+        """Descarta todos los resultados de la revisión actual."""
+        self.error_manager = ErrorManager()
+        self.lexer: Optional[Lexer] = None
+        self.parser: Optional[Parser] = None
+        self.semantic_analyzer: Optional[AnalizadorSemantico] = None
+        self.tac_generator: Optional[TACGenerator] = None
+        self.bytecode_generator: Optional[BytecodeGenerator] = None
+
+        self.tokens = []
+        self.ast = None
+        self.resultados_semanticos = []
+        self.tac_instructions: List[TACInstruction] = []
+        self.bytecode_instructions: List[BytecodeInstruction] = []
+
+        # fase -> número de errores acumulados al terminarla
+        self._fases_ejecutadas: Dict[str, int] = {}
+
+        # Métricas por fase (solo si se pidieron para esta revisión)
+        self.metricas: Optional[MetricsCollector] = None
+
+    def cargar(self, codigo: str) -> bool:
+        """
+        Fija el código fuente a compilar.
+
+        Args:
+            codigo: Código fuente.
+
+        Returns:
+            True si el código cambió y los resultados previos se descartaron.
+        """
+        if codigo == self.codigo:
+            return False
+        self.codigo = codigo
+        self.revision += 1
+        self._reiniciar()
+        return True
+
+    def invalidar(self):
+        """Olvida el código cargado y todos los resultados memoizados."""
+        self.codigo = None
+        self._reiniciar()
+
+    def ejecutada(self, fase: str) -> bool:
+        """Indica si la fase ya se ejecutó (o se saltó) en esta revisión."""
+        return fase in self._fases_ejecutadas
+
+    def errores_hasta(self, fase: str) -> list:
+        """
+        Obtiene los errores producidos hasta la fase indicada (inclusive).
+
+        Args:
+            fase: Nombre de la fase (ver FASES).
+
+        Returns:
+            Lista de errores en el orden en que se registraron.
+        """
+        limite = self._fases_ejecutadas.get(fase, len(self.error_manager.errores))
+        return self.error_manager.errores[:limite]
+
+    def ejecutar_hasta(self, fase: str, metricas: bool = False):
+        """
+        Ejecuta, en orden, todas las fases pendientes hasta la indicada.
+
+        Las fases ya ejecutadas en esta revisión no se repiten.
+
+        Args:
+            fase: Nombre de la última fase a ejecutar (ver FASES).
+            metricas: Si medir tiempos, memoria y contadores de cada fase. Si
+                alguna fase ya se ejecutó sin medir, la revisión se recalcula.
+        """
+        if self.codigo is None:
+            raise ValueError("No hay código cargado en el pipeline")
+        if fase not in self.FASES:
+            raise ValueError(f"Fase desconocida: {fase}")
+
+        if metricas and self.metricas is None:
+            if self._fases_ejecutadas:
+                self._reiniciar()
+            self.metricas = MetricsCollector()
+
+        for nombre in self.FASES[:self.FASES.index(fase) + 1]:
+            if nombre in self._fases_ejecutadas:
+                continue
+            with medir_fase(self.metricas, nombre) as registro:
+                registro.omitida = not getattr(self, f"_fase_{nombre}")()
+            self._fases_ejecutadas[nombre] = len(self.error_manager.errores)
+            # Los contadores se calculan fuera de la medición
+            if self.metricas is not None and not registro.omitida:
+                registro.contadores = self._contadores(nombre)
+
+    def _contadores(self, fase: str) -> Dict[str, int]:
+        """Contadores de tamaño de la salida de una fase."""
+        if fase == 'lexico':
+            return {"tokens": len(self.tokens)}
+        if fase == 'sintactico':
+            return {"nodos": contar_nodos(self.ast)}
+        if fase == 'semantico':
+            return {"nodos": contar_nodos(self.ast), "resultados": len(self.resultados_semanticos)}
+        if fase == 'tac':
+            return {"instrucciones_tac": len(self.tac_instructions)}
+        return {"instrucciones_bytecode": len(self.bytecode_instructions)}
+
+    # ========== Fases ==========
+
+    # Cada fase devuelve False si se saltó por errores de fases anteriores.
+
+    def _fase_lexico(self) -> bool:
+        """Fase 1: Análisis léxico."""
+        try:
+            self.lexer = Lexer(self.error_manager, motor=self.motor_lexico)
+            self.tokens = self.lexer.tokenizar(self.codigo)
+        except Exception as e:
+            self.error_manager.agregar_error(Exception(f"Error en análisis léxico: {str(e)}"))
+        return True
+
+    def _fase_sintactico(self) -> bool:
+        """Fase 2: Análisis sintáctico (solo si no hubo errores léxicos)."""
+        if self.error_manager.tiene_errores():
+            return False
+        try:
+            self.parser = Parser(self.tokens, self.error_manager)
+            self.ast = self.parser.parsear()
+        except Exception as e:
+            self.error_manager.agregar_error(Exception(f"Error en análisis sintáctico: {str(e)}"))
+        return True
+
+    def _fase_semantico(self) -> bool:
+        """Fase 3: Análisis semántico (solo si hay AST y no hubo errores)."""
+        if self.error_manager.tiene_errores() or self.ast is None:
+            return False
+        try:
+            self.semantic_analyzer = AnalizadorSemantico(self.error_manager)
+            self.resultados_semanticos = self.semantic_analyzer.analizar(self.ast)
+        except Exception as e:
+            self.error_manager.agregar_error(Exception(f"Error en análisis semántico: {str(e)}"))
+        return True
+
+    def _fase_tac(self) -> bool:
+        """Fase 4: Generación de código TAC (y su optimización, si se pidió)."""
+        if self.error_manager.tiene_errores() or self.ast is None:
+            return False
+        try:
+            self.tac_generator = TACGenerator(compacto=self.tac_compacto)
+            self.tac_instructions = self.tac_generator.generate(self.ast)
+            if self.optimizar:
+                self.tac_instructions = TACOptimizer().optimizar(self.tac_instructions)
+                # format_output (pestaña de código intermedio) muestra el TAC optimizado
+                self.tac_generator.instructions = self.tac_instructions
+        except Exception as e:
+            self.error_manager.agregar_error(Exception(f"Error en generación de TAC: {str(e)}"))
+        return True
+
+    def _fase_bytecode(self) -> bool:
+        """Fase 5: Generación de bytecode (solo si se generó TAC)."""
+        if self.error_manager.tiene_errores() or not self.tac_instructions:
+            return False
+        try:
+            self.bytecode_generator = BytecodeGenerator()
+            self.bytecode_instructions = self.bytecode_generator.generate(self.tac_instructions)
+        except Exception as e:
+            self.error_manager.agregar_error(Exception(f"Error en generación de bytecode: {str(e)}"))
+        return True
+
+
+def contar_nodos(raiz) -> int:
+    """Cuenta los nodos de un AST (recorrido iterativo)."""
+    if raiz is None:
+        return 0
+    total = 0
+    pendientes = [raiz]
+    while pendientes:
+        nodo = pendientes.pop()
+        total += 1
+        pendientes.extend(nodo.hijos)
+    return total
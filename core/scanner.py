@@ -0,0 +1,402 @@
+"""
+Motor de escaneo por tabla (DFA) para el lexer.
+
+Compila `Lexer.ESPECIFICACION_TOKENS` a un autómata finito determinista:
+
+1. Cada patrón (subconjunto de la sintaxis de `re`: literales, escapes, `.`,
+   clases `[...]`/`[^...]`, `\\d`, grupos, `|`, `*`, `+`, `?`) se convierte en
+   un NFA de Thompson cuyo estado de aceptación lleva el código del tipo.
+2. Los caracteres se agrupan en clases de equivalencia (los que ningún patrón
+   distingue comparten clase); todo lo que no es ASCII cae en una sola clase.
+3. La construcción por subconjuntos produce una tabla plana
+   `transiciones[estado * num_clases + clase]` y el código del tipo aceptado en
+   cada estado (a igualdad de longitud gana el patrón que aparece antes).
+
+El escaneo es de coincidencia más larga sobre la tabla: el texto se traduce a
+clases de una sola vez con `bytes.translate` y los espacios, saltos de línea
+y comentarios se saltan sin crear objetos match. Los cuantificadores no
+voraces (`.*?`) se interpretan como "el token termina en la primera
+aceptación", que es lo que necesita `/\\*.*?\\*/`.
+
+La regex maestra elige la primera alternativa que coincide, no la más larga;
+ESPECIFICACION_TOKENS está ordenada para que ambas reglas coincidan
+(`==` antes que `=`, decimales antes que enteros...), y tests/test_scanner.py
+comprueba que los dos motores producen los mismos tokens.
+"""
+
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterator, List, Optional, Sequence, Tuple
+
+
+# Símbolos del alfabeto: 0..127 son ASCII, OTRO representa cualquier otro carácter
+OTRO = 128
+ALFABETO = frozenset(range(OTRO + 1))
+
+# Estado muerto de la tabla (no hay transición posible)
+MUERTO = 0
+
+
+class PatternError(ValueError):
+    """Patrón fuera del subconjunto de expresiones regulares soportado."""
+
+
+# ========== NFA de Thompson ==========
+
+class _NFA:
+    """NFA con transiciones épsilon y transiciones por conjunto de símbolos."""
+
+    def __init__(self):
+        self.epsilon: List[List[int]] = []
+        self.simbolos: List[List[Tuple[FrozenSet[int], int]]] = []
+        self.acepta: Dict[int, int] = {}  # estado -> código de tipo
+
+    def estado(self) -> int:
+        self.epsilon.append([])
+        self.simbolos.append([])
+        return len(self.epsilon) - 1
+
+
+class _ParserPatron:
+    """Parser descendente del subconjunto de regex; construye fragmentos (inicio, fin) del NFA."""
+
+    ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'f': '\f', 'v': '\v'}
+    CLASES = {
+        'd': frozenset(range(ord('0'), ord('9') + 1)),
+        'w': frozenset(ord(c) for c in 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_'),
+        's': frozenset(ord(c) for c in ' \t\n\r\f\v'),
+    }
+
+    def __init__(self, patron: str, nfa: _NFA):
+        self.patron = patron
+        self.pos = 0
+        self.nfa = nfa
+        self.perezoso = False
+
+    def parsear(self) -> Tuple[int, int]:
+        fragmento = self._alternativa()
+        if self.pos != len(self.patron):
+            raise PatternError(f"Carácter inesperado en {self.patron!r}: posición {self.pos}")
+        return fragmento
+
+    def _ver(self) -> Optional[str]:
+        return self.patron[self.pos] if self.pos < len(self.patron) else None
+
+    def _alternativa(self) -> Tuple[int, int]:
+        opciones = [self._concatenacion()]
+        while self._ver() == '|':
+            self.pos += 1
+            opciones.append(self._concatenacion())
+        if len(opciones) == 1:
+            return opciones[0]
+        inicio, fin = self.nfa.estado(), self.nfa.estado()
+        for a, b in opciones:
+            self.nfa.epsilon[inicio].append(a)
+            self.nfa.epsilon[b].append(fin)
+        return inicio, fin
+
+    def _concatenacion(self) -> Tuple[int, int]:
+        inicio = fin = self.nfa.estado()
+        while self._ver() not in (None, '|', ')'):
+            a, b = self._repeticion()
+            self.nfa.epsilon[fin].append(a)
+            fin = b
+        return inicio, fin
+
+    def _repeticion(self) -> Tuple[int, int]:
+        a, b = self._atomo()
+        operador = self._ver()
+        if operador not in ('*', '+', '?'):
+            return a, b
+        self.pos += 1
+        if self._ver() == '?':
+            self.pos += 1
+            self.perezoso = True
+
+        inicio, fin = self.nfa.estado(), self.nfa.estado()
+        self.nfa.epsilon[inicio].append(a)
+        self.nfa.epsilon[b].append(fin)
+        if operador in ('*', '?'):
+            self.nfa.epsilon[inicio].append(fin)
+        if operador in ('*', '+'):
+            self.nfa.epsilon[b].append(a)
+        return inicio, fin
+
+    def _atomo(self) -> Tuple[int, int]:
+        c = self._ver()
+        if c is None:
+            raise PatternError(f"Patrón incompleto: {self.patron!r}")
+        self.pos += 1
+        if c == '(':
+            if self.patron.startswith('?:', self.pos):
+                self.pos += 2
+            fragmento = self._alternativa()
+            if self._ver() != ')':
+                raise PatternError(f"Falta ')' en {self.patron!r}")
+            self.pos += 1
+            return fragmento
+        if c == '[':
+            conjunto = self._clase()
+        elif c == '.':
+            conjunto = ALFABETO - {ord('\n')}
+        elif c == '\\':
+            conjunto = self._escape()
+        elif c in '*+?{}^$)':
+            raise PatternError(f"Construcción no soportada {c!r} en {self.patron!r}")
+        else:
+            conjunto = _simbolo(c)
+
+        inicio, fin = self.nfa.estado(), self.nfa.estado()
+        self.nfa.simbolos[inicio].append((conjunto, fin))
+        return inicio, fin
+
+    def _escape(self) -> FrozenSet[int]:
+        c = self._ver()
+        if c is None:
+            raise PatternError(f"Escape incompleto en {self.patron!r}")
+        self.pos += 1
+        if c in self.CLASES:
+            return self.CLASES[c]
+        if c in 'DWS':
+            return ALFABETO - self.CLASES[c.lower()]
+        return _simbolo(self.ESCAPES.get(c, c))
+
+    def _clase(self) -> FrozenSet[int]:
+        negada = self._ver() == '^'
+        if negada:
+            self.pos += 1
+        conjunto = set()
+        primero = True
+        while True:
+            c = self._ver()
+            if c is None:
+                raise PatternError(f"Falta ']' en {self.patron!r}")
+            if c == ']' and not primero:
+                self.pos += 1
+                break
+            primero = False
+            self.pos += 1
+            if c == '\\':
+                conjunto |= self._escape()
+                continue
+            if self._ver() == '-' and self.pos + 1 < len(self.patron) and self.patron[self.pos + 1] != ']':
+                hasta = self.patron[self.pos + 1]
+                self.pos += 2
+                conjunto |= set(range(ord(c), ord(hasta) + 1))
+            else:
+                conjunto |= _simbolo(c)
+        conjunto = frozenset(s for s in conjunto if s <= OTRO)
+        return ALFABETO - conjunto if negada else conjunto
+
+
+def _simbolo(c: str) -> FrozenSet[int]:
+    codigo = ord(c)
+    if codigo >= OTRO:
+        raise PatternError(f"Carácter no ASCII {c!r} en un patrón")
+    return frozenset((codigo,))
+
+
+# ========== Tablas del DFA ==========
+
+class DFATables:
+    """
+    Tablas del autómata compilado.
+
+    Attributes:
+        nombres: Nombre del tipo para cada código (orden de la especificación)
+        num_clases: Número de clases de caracteres
+        clases_bytes: Tabla de 256 bytes para `bytes.translate` (byte -> clase)
+        transiciones: Lista plana estado * num_clases + clase -> estado (0 = muerto)
+        aceptacion: Código de tipo aceptado por estado (-1 si no acepta)
+        inicial: Estado inicial
+    """
+
+    def __init__(self, nombres, num_clases, clases_bytes, transiciones, aceptacion, inicial):
+        self.nombres: Tuple[str, ...] = nombres
+        self.num_clases: int = num_clases
+        self.clases_bytes: bytes = clases_bytes
+        self.transiciones: List[int] = transiciones
+        self.aceptacion: List[int] = aceptacion
+        self.inicial: int = inicial
+
+    @property
+    def num_estados(self) -> int:
+        return len(self.aceptacion)
+
+    def codigo(self, nombre: str) -> int:
+        """Código de un tipo de la especificación."""
+        return self.nombres.index(nombre)
+
+    def clases(self, texto: str) -> bytes:
+        """
+        Traduce el texto a una clase por carácter.
+
+        Los caracteres no latin-1 se codifican como '?', que pertenece a la misma
+        clase que cualquier carácter no ASCII (ver compilar_especificacion).
+        """
+        return texto.encode('latin-1', 'replace').translate(self.clases_bytes)
+
+
+@lru_cache(maxsize=None)
+def compilar_especificacion(especificacion: Tuple[Tuple[str, str], ...]) -> DFATables:
+    """
+    Compila una especificación (nombre, patrón) a tablas de DFA.
+
+    Args:
+        especificacion: Tupla de pares (nombre del tipo, patrón regex) en orden de prioridad
+
+    Returns:
+        DFATables (memoizadas por especificación)
+
+    Raises:
+        PatternError: Si algún patrón usa construcciones no soportadas
+    """
+    nfa = _NFA()
+    inicio = nfa.estado()
+    perezosos = set()
+    for codigo, (nombre, patron) in enumerate(especificacion):
+        parser = _ParserPatron(patron, nfa)
+        a, b = parser.parsear()
+        nfa.epsilon[inicio].append(a)
+        nfa.acepta[b] = codigo
+        if parser.perezoso:
+            perezosos.add(codigo)
+
+    # Clases de equivalencia: símbolos con la misma pertenencia a todos los conjuntos
+    conjuntos = list({c for transiciones in nfa.simbolos for c, _ in transiciones})
+    firmas: Dict[tuple, int] = {}
+    clase_de = [0] * (OTRO + 1)
+    representantes: List[int] = []
+    for simbolo in range(OTRO + 1):
+        firma = tuple(simbolo in c for c in conjuntos)
+        if firma not in firmas:
+            firmas[firma] = len(representantes)
+            representantes.append(simbolo)
+        clase_de[simbolo] = firmas[firma]
+
+    if clase_de[ord('?')] != clase_de[OTRO]:
+        raise PatternError("'?' debe compartir clase con los caracteres no ASCII")
+    clases_bytes = bytes(clase_de[:OTRO] + [clase_de[OTRO]] * (256 - OTRO))
+
+    def cerradura(estados) -> FrozenSet[int]:
+        pila = list(estados)
+        visto = set(estados)
+        while pila:
+            for siguiente in nfa.epsilon[pila.pop()]:
+                if siguiente not in visto:
+                    visto.add(siguiente)
+                    pila.append(siguiente)
+        return frozenset(visto)
+
+    num_clases = len(representantes)
+    indices: Dict[FrozenSet[int], int] = {frozenset(): MUERTO}
+    pendientes = [cerradura([inicio])]
+    indices[pendientes[0]] = 1
+    filas: List[Optional[List[int]]] = [[MUERTO] * num_clases, None]
+    aceptacion = [-1, -1]
+
+    while pendientes:
+        actual = pendientes.pop()
+        indice = indices[actual]
+        codigos = [nfa.acepta[s] for s in actual if s in nfa.acepta]
+        aceptacion[indice] = min(codigos) if codigos else -1
+
+        fila = [MUERTO] * num_clases
+        filas[indice] = fila
+        if aceptacion[indice] in perezosos:
+            continue  # Token no voraz: termina en la primera aceptación
+
+        for clase, simbolo in enumerate(representantes):
+            destino = cerradura([t for s in actual for c, t in nfa.simbolos[s] if simbolo in c])
+            if destino not in indices:
+                indices[destino] = len(filas)
+                filas.append(None)
+                aceptacion.append(-1)
+                pendientes.append(destino)
+            fila[clase] = indices[destino]
+
+    transiciones = [estado for fila in filas for estado in fila]
+    return DFATables(
+        tuple(nombre for nombre, _ in especificacion),
+        num_clases, clases_bytes, transiciones, aceptacion, 1
+    )
+
+
+class DFAScanner:
+    """
+    Escáner de coincidencia más larga sobre las tablas del DFA.
+
+    Example:
+        >>> scanner = DFAScanner(Lexer.ESPECIFICACION_TOKENS, omitir=('WHITESPACE',))
+        >>> [(scanner.tablas.nombres[k], i, f) for k, i, f in scanner.escanear("x = 1")]
+        [('IDENTIFIER', 0, 1), ('ASSIGN', 2, 3), ('INT_LITERAL', 4, 5)]
+    """
+
+    def __init__(self, especificacion: Sequence[Tuple[str, str]], omitir: Sequence[str] = ()):
+        """
+        Compila la especificación.
+
+        Args:
+            especificacion: Pares (nombre, patrón) en orden de prioridad
+            omitir: Nombres de tipos que se saltan sin reportarse
+        """
+        self.tablas = compilar_especificacion(tuple(especificacion))
+        self.omitir = frozenset(self.tablas.codigo(n) for n in omitir)
+
+    def escanear(self, texto: str, inicio: int = 0, fin: Optional[int] = None,
+                 final: bool = True) -> Iterator[Tuple[int, int, int]]:
+        """
+        Recorre el texto produciendo los tokens no omitidos.
+
+        Args:
+            texto: Texto a escanear
+            inicio: Offset inicial
+            fin: Offset final (exclusivo; por defecto el final del texto)
+            final: False si el texto es un bloque y puede seguir más entrada. En
+                ese caso el escaneo se detiene en el primer token que llega al
+                final del bloque sin que el DFA haya muerto (podría crecer con
+                más texto) y produce la tupla (-1, offset, offset) para indicar
+                dónde reanudar.
+
+        Yields:
+            Tuplas (código de tipo, inicio, fin)
+        """
+        tablas = self.tablas
+        transiciones = tablas.transiciones
+        aceptacion = tablas.aceptacion
+        num_clases = tablas.num_clases
+        inicial = tablas.inicial * num_clases
+        omitir = self.omitir
+        clases = tablas.clases(texto)
+        n = len(texto) if fin is None else fin
+
+        pos = inicio
+        while pos < n:
+            estado = inicial
+            p = pos
+            tipo = -1
+            fin_token = pos
+            while p < n:
+                estado = transiciones[estado + clases[p]]
+                if estado == MUERTO:
+                    break
+                p += 1
+                if aceptacion[estado] >= 0:
+                    tipo = aceptacion[estado]
+                    fin_token = p
+                estado *= num_clases
+
+            if p == n and estado != MUERTO and not final:
+                # El token podría continuar en el siguiente bloque
+                yield -1, pos, pos
+                return
+
+            if tipo < 0:
+                # Ningún patrón coincide: un carácter suelto (la especificación
+                # del lexer lo evita con MISMATCH)
+                fin_token = pos + 1
+            elif tipo not in omitir:
+                yield tipo, pos, fin_token
+            pos = fin_token
+
+        if not final:
+            yield -1, n, n
@@ -1,22 +1,83 @@
 """
 Analizador Semántico para el compilador de Kotlin.
 Verifica la correctitud semántica del AST generado por el parser.
+
+En modo incremental (`AnalizadorSemantico(incremental=True)`) el analizador
+se reutiliza entre ediciones: de cada función guarda su `FuncionInfo`, sus
+diagnósticos y las dependencias que tuvo su análisis (firmas de las funciones
+que llama y estado de las variables globales que usa). En el siguiente
+`analizar` se reutiliza el resultado de toda función cuyo nodo es el mismo
+objeto que antes (como los subárboles que conserva `IncrementalParser`) y
+cuyas dependencias no cambiaron; las demás funciones y las sentencias
+globales se vuelven a analizar. El resultado es el mismo que el de un
+análisis completo.
 """
 
-from typing import Optional, Dict
+from functools import wraps
+from inspect import isgeneratorfunction
+from typing import Any, Optional, Dict, List, Tuple
 from core.utils import NodoAST, TipoNodo, TablaSimbolos, Simbolo, TipoDato, FuncionInfo, Parametro
 from core.errors import SemanticError, ErrorManager
-
-
-class AnalizadorSemantico:
-    """Analizador semántico que verifica la correctitud del AST."""
-
-    def __init__(self, error_manager: ErrorManager = None):
+from core.visitor import ASTVisitor
+
+
+def _anotar_tipo(metodo):
+    """
+    Decora un método de visita de expresión para que además guarde el tipo que
+    devuelve en `nodo.tipo_dato` (de ahí lo toma el generador TAC).
+    """
+    if isgeneratorfunction(metodo):
+        @wraps(metodo)
+        def visitar(self, nodo):
+            tipo = yield from metodo(self, nodo)
+            nodo.tipo_dato = tipo
+            return tipo
+    else:
+        @wraps(metodo)
+        def visitar(self, nodo):
+            nodo.tipo_dato = tipo = metodo(self, nodo)
+            return tipo
+    return visitar
+
+
+class FuncionAnalizada:
+    """Resultado guardado del análisis de una función (modo incremental)."""
+
+    __slots__ = ('nodo', 'linea', 'info', 'errores', 'resultados', 'dependencias',
+                 'locales', 'referencias_globales', 'escrituras')
+
+    def __init__(self, nodo: NodoAST, info: FuncionInfo, errores: list, resultados: list,
+                 dependencias: Dict[Tuple[str, str], Any], locales: List[Simbolo],
+                 referencias_globales: List[NodoAST], escrituras: List[str]):
+        self.nodo = nodo
+        self.linea = nodo.linea  # Línea al analizarla (para desplazar los errores)
+        self.info = info
+        self.errores = errores
+        self.resultados = resultados
+        # ('fun' | 'var', nombre) -> firma o estado observado (None si no existía)
+        self.dependencias = dependencias
+        self.locales = locales  # Enlaces declarados dentro de la función
+        self.referencias_globales = referencias_globales  # Nodos enlazados a globales
+        self.escrituras = escrituras  # Globales que la función marca como inicializadas
+
+
+class AnalizadorSemantico(ASTVisitor):
+    """
+    Analizador semántico que verifica la correctitud del AST.
+
+    Cada tipo de nodo se despacha a su método `visitar_<tipo>` (ver
+    `ASTVisitor`); los métodos que visitan hijos son generadores y reciben el
+    tipo de cada hijo con `yield`.
+    """
+
+    def __init__(self, error_manager: ErrorManager = None, incremental: bool = False):
         """
         Inicializa el analizador semántico.
 
         Args:
             error_manager: Gestor de errores para registrar errores semánticos.
+            incremental: Reutilizar entre llamadas a `analizar` el análisis de las
+                funciones que no cambiaron.
         """
         self.error_manager = error_manager or ErrorManager()
         self.tabla_simbolos_global = TablaSimbolos()
@@ -25,76 +86,63 @@ class AnalizadorSemantico:
         self.funcion_actual: Optional[FuncionInfo] = None  # Función que se está analizando
         self.resultados = []
         self.dentro_de_loop = False  # Flag para validar break/continue
+        self.enlaces: List[Simbolo] = []  # Variables declaradas, indexadas por Simbolo.id
+
+        # Modo incremental
+        self.incremental = incremental
+        self.funciones_analizadas: Dict[str, FuncionAnalizada] = {}
+        self.reutilizadas = 0  # Funciones reutilizadas en el último análisis
+        self._dependencias: Optional[Dict[Tuple[str, str], Any]] = None  # Solo dentro de una función
+        self._referencias_globales: List[NodoAST] = []
+        self._escrituras: List[str] = []
 
         # Inicializar funciones built-in
         self._inicializar_funciones_builtin()
 
-    def analizar(self, ast: NodoAST) -> list:
+    def analizar(self, ast: NodoAST, error_manager: ErrorManager = None) -> list:
         """
         Analiza semánticamente el AST.
 
         Args:
             ast: Árbol sintáctico abstracto a analizar.
+            error_manager: Gestor de errores para este análisis (por omisión, el actual).
 
         Returns:
             Lista de resultados del análisis semántico.
         """
+        if error_manager is not None:
+            self.error_manager = error_manager
         self.resultados = []
+        self.tabla_simbolos_global = TablaSimbolos()
         self.tabla_simbolos_actual = self.tabla_simbolos_global
+        self.tabla_funciones = {}
+        self._inicializar_funciones_builtin()
+        self.funcion_actual = None
+        self.dentro_de_loop = False
+        self.enlaces = []
+        self.reutilizadas = 0
 
         if ast:
             self.visitar(ast)
 
         return self.resultados
 
-    def visitar(self, nodo: NodoAST):
-        """
-        Visita un nodo del AST y delega al método correspondiente.
-
-        Args:
-            nodo: Nodo a visitar.
-        """
-        if nodo.tipo == TipoNodo.PROGRAMA:
-            self.visitar_programa(nodo)
-        elif nodo.tipo == TipoNodo.DECLARACION_VARIABLE:
-            self.visitar_declaracion_variable(nodo)
-        elif nodo.tipo == TipoNodo.ASIGNACION:
-            self.visitar_asignacion(nodo)
-        elif nodo.tipo == TipoNodo.IF:
-            self.visitar_if(nodo)
-        elif nodo.tipo == TipoNodo.WHILE:
-            self.visitar_while(nodo)
-        elif nodo.tipo == TipoNodo.FOR:
-            self.visitar_for(nodo)
-        elif nodo.tipo == TipoNodo.BREAK:
-            self.visitar_break(nodo)
-        elif nodo.tipo == TipoNodo.CONTINUE:
-            self.visitar_continue(nodo)
-        elif nodo.tipo == TipoNodo.FUNCION:
-            self.visitar_funcion(nodo)
-        elif nodo.tipo == TipoNodo.RETURN:
-            return self.visitar_return(nodo)
-        elif nodo.tipo == TipoNodo.LLAMADA_FUNCION:
-            return self.visitar_llamada_funcion(nodo)
-        elif nodo.tipo == TipoNodo.BLOQUE:
-            self.visitar_bloque(nodo)
-        elif nodo.tipo == TipoNodo.EXPRESION_BINARIA:
-            return self.visitar_expresion_binaria(nodo)
-        elif nodo.tipo == TipoNodo.EXPRESION_UNARIA:
-            return self.visitar_expresion_unaria(nodo)
-        elif nodo.tipo == TipoNodo.EXPRESION_LITERAL:
-            return self.visitar_expresion_literal(nodo)
-        elif nodo.tipo == TipoNodo.EXPRESION_VARIABLE:
-            return self.visitar_expresion_variable(nodo)
-        elif nodo.tipo == TipoNodo.EXPRESION_INDICE:
-            return self.visitar_expresion_indice(nodo)
-        elif nodo.tipo == TipoNodo.EXPRESION_PUNTO:
-            return self.visitar_expresion_punto(nodo)
-
     def visitar_programa(self, nodo: NodoAST):
         """Visita el nodo programa."""
+        anteriores = self.funciones_analizadas
+        self.funciones_analizadas = {}
         for hijo in nodo.hijos:
-            self.visitar(hijo)
+            if not self.incremental or hijo.tipo != TipoNodo.FUNCION:
+                yield hijo
+                continue
+            analizada = anteriores.get(hijo.valor)
+            if analizada is not None and self._vigente(analizada, hijo):
+                self._reutilizar(analizada, hijo)
+                self.reutilizadas += 1
+            else:
+                analizada = yield from self._analizar_funcion(hijo)
+            if analizada is not None:
+                self.funciones_analizadas[hijo.valor] = analizada
 
         # Resumen de la tabla de símbolos
         self.resultados.append("=== Tabla de Símbolos ===")
@@ -126,7 +174,7 @@ class AnalizadorSemantico:
 
         # Verificar tipo de la expresión de inicialización
         if nodo.hijos:
-            tipo_expresion = self.visitar(nodo.hijos[0])
+            tipo_expresion = yield nodo.hijos[0]
             if tipo_expresion and not self.tipos_compatibles(tipo_dato, tipo_expresion):
                 error = SemanticError(
                     f"Tipo incompatible en la declaración de '{nombre}': "
@@ -137,7 +185,7 @@ class AnalizadorSemantico:
                 self.error_manager.agregar_error(error)
 
         # Agregar a la tabla de símbolos
-        self.tabla_simbolos_actual.declarar(simbolo)
+        nodo.enlace = self._declarar(simbolo)
         tipo_declaracion = "val" if es_constante else "var"
         self.resultados.append(f"Declaración: {tipo_declaracion} {nombre}: {tipo_dato.value}")
 
@@ -147,7 +195,7 @@ class AnalizadorSemantico:
 
         if len(nodo.hijos) < 2:
             # Formato antiguo (compatible hacia atrás)
-            simbolo = self.tabla_simbolos_actual.buscar(nombre)
+            simbolo = self._buscar(nombre, nodo)
             if not simbolo:
                 error = SemanticError(
                     f"Variable '{nombre}' no declarada",
@@ -167,7 +215,7 @@ class AnalizadorSemantico:
                 return
 
             if nodo.hijos:
-                tipo_expresion = self.visitar(nodo.hijos[0])
+                tipo_expresion = yield nodo.hijos[0]
                 if tipo_expresion and not self.tipos_compatibles(simbolo.tipo, tipo_expresion):
                     error = SemanticError(
                         f"Tipo incompatible en la asignación a '{nombre}': "
@@ -178,7 +226,8 @@ class AnalizadorSemantico:
                     self.error_manager.agregar_error(error)
 
             # Marcar variable como inicializada
-            simbolo.inicializada = True
+            self._inicializar(simbolo)
+            nodo.enlace = simbolo
             self.resultados.append(f"Asignación válida: {nombre}")
         else:
             # Nuevo formato: hijos[0] = lado izquierdo, hijos[1] = valor
@@ -187,10 +236,10 @@ class AnalizadorSemantico:
 
             # Si es un acceso a índice, validar el arreglo base
             if nodo_izq.tipo == TipoNodo.EXPRESION_INDICE:
-                tipo_izq = self.visitar(nodo_izq)
+                tipo_izq = yield nodo_izq
             else:
                 # Asignación a variable simple
-                simbolo = self.tabla_simbolos_actual.buscar(nombre)
+                simbolo = self._buscar(nombre, nodo)
                 if not simbolo:
                     error = SemanticError(
                         f"Variable '{nombre}' no declarada",
@@ -210,9 +259,10 @@ class AnalizadorSemantico:
                     return
 
                 tipo_izq = simbolo.tipo
+                nodo.enlace = nodo_izq.enlace = simbolo
 
             # Verificar tipo del valor
-            tipo_valor = self.visitar(valor)
+            tipo_valor = yield valor
             if tipo_izq and tipo_valor and not self.tipos_compatibles(tipo_izq, tipo_valor):
                 error = SemanticError(
                     f"Tipo incompatible en la asignación: "
@@ -224,7 +274,7 @@ class AnalizadorSemantico:
 
             # Marcar variable como inicializada (si es asignación simple, no a índice)
             if nodo_izq.tipo != TipoNodo.EXPRESION_INDICE and simbolo:
-                simbolo.inicializada = True
+                self._inicializar(simbolo)
 
             self.resultados.append(f"Asignación válida: {nombre}")
 
@@ -232,7 +282,7 @@ class AnalizadorSemantico:
         """Visita el nodo if."""
         # Verificar condición
         if nodo.hijos:
-            tipo_condicion = self.visitar(nodo.hijos[0])
+            tipo_condicion = yield nodo.hijos[0]
             if tipo_condicion and tipo_condicion != TipoDato.BOOLEAN:
                 error = SemanticError(
                     f"La condición del 'if' debe ser de tipo Boolean, encontrado {tipo_condicion.value}",
@@ -243,11 +293,11 @@ class AnalizadorSemantico:
 
             # Visitar bloque verdadero
             if len(nodo.hijos) > 1:
-                self.visitar(nodo.hijos[1])
+                yield nodo.hijos[1]
 
             # Visitar bloque falso (else)
             if len(nodo.hijos) > 2:
-                self.visitar(nodo.hijos[2])
+                yield nodo.hijos[2]
 
         self.resultados.append("Sentencia 'if' válida")
 
@@ -255,7 +305,7 @@ class AnalizadorSemantico:
         """Visita el nodo while."""
         # Verificar condición
         if nodo.hijos:
-            tipo_condicion = self.visitar(nodo.hijos[0])
+            tipo_condicion = yield nodo.hijos[0]
             if tipo_condicion and tipo_condicion != TipoDato.BOOLEAN:
                 error = SemanticError(
                     f"La condición del 'while' debe ser de tipo Boolean, encontrado {tipo_condicion.value}",
@@ -270,7 +320,7 @@ class AnalizadorSemantico:
 
             # Visitar cuerpo
             if len(nodo.hijos) > 1:
-                self.visitar(nodo.hijos[1])
+                yield nodo.hijos[1]
 
             # Restaurar estado
             self.dentro_de_loop = estaba_en_loop
@@ -286,11 +336,11 @@ class AnalizadorSemantico:
         # Declarar variable del for (implícitamente de tipo Int y siempre inicializada)
         nombre_variable = nodo.valor
         simbolo = Simbolo(nombre_variable, TipoDato.INT, True, nodo.linea, nodo.columna, inicializada=True)
-        self.tabla_simbolos_actual.declarar(simbolo)
+        nodo.enlace = self._declarar(simbolo)
 
         # Verificar rango
         if nodo.hijos:
-            tipo_rango = self.visitar(nodo.hijos[0])
+            tipo_rango = yield nodo.hijos[0]
 
             # Marcar que estamos dentro de un loop
             estaba_en_loop = self.dentro_de_loop
@@ -298,7 +348,7 @@ class AnalizadorSemantico:
 
             # Visitar cuerpo
             if len(nodo.hijos) > 1:
-                self.visitar(nodo.hijos[1])
+                yield nodo.hijos[1]
 
             # Restaurar estado
             self.dentro_de_loop = estaba_en_loop
@@ -341,18 +391,19 @@ class AnalizadorSemantico:
 
         # Visitar sentencias del bloque
         for hijo in nodo.hijos:
-            self.visitar(hijo)
+            yield hijo
 
         # Restaurar scope anterior
         self.tabla_simbolos_actual = tabla_anterior
 
+    @_anotar_tipo
     def visitar_expresion_binaria(self, nodo: NodoAST) -> Optional[TipoDato]:
         """Visita el nodo de expresión binaria y retorna su tipo."""
         if len(nodo.hijos) < 2:
             return TipoDato.UNKNOWN
 
-        tipo_izq = self.visitar(nodo.hijos[0])
-        tipo_der = self.visitar(nodo.hijos[1])
+        tipo_izq = yield nodo.hijos[0]
+        tipo_der = yield nodo.hijos[1]
 
         operador = nodo.valor
 
@@ -414,12 +465,13 @@ class AnalizadorSemantico:
 
         return TipoDato.UNKNOWN
 
+    @_anotar_tipo
     def visitar_expresion_unaria(self, nodo: NodoAST) -> Optional[TipoDato]:
         """Visita el nodo de expresión unaria y retorna su tipo."""
         if len(nodo.hijos) < 1:
             return TipoDato.UNKNOWN
 
-        tipo_operando = self.visitar(nodo.hijos[0])
+        tipo_operando = yield nodo.hijos[0]
         operador = nodo.valor
 
         # Operador NOT (!)
@@ -454,22 +506,25 @@ class AnalizadorSemantico:
 
         # IMPORTANTE: Verificar bool PRIMERO porque bool es subclase de int en Python
         if isinstance(valor, bool):
-            return TipoDato.BOOLEAN
+            tipo = TipoDato.BOOLEAN
         elif isinstance(valor, int):
-            return TipoDato.INT
+            tipo = TipoDato.INT
         elif isinstance(valor, float):
-            return TipoDato.DOUBLE
+            tipo = TipoDato.DOUBLE
         elif isinstance(valor, str):
-            return TipoDato.STRING
+            tipo = TipoDato.STRING
+        else:
+            tipo = TipoDato.UNKNOWN
 
-        return TipoDato.UNKNOWN
+        nodo.tipo_dato = tipo
+        return tipo
 
     def visitar_expresion_variable(self, nodo: NodoAST) -> Optional[TipoDato]:
         """Visita el nodo de expresión variable y retorna su tipo."""
         nombre = nodo.valor
 
         # Buscar en la tabla de símbolos
-        simbolo = self.tabla_simbolos_actual.buscar(nombre)
+        simbolo = self._buscar(nombre, nodo)
         if not simbolo:
             error = SemanticError(
                 f"Variable '{nombre}' no declarada",
@@ -477,7 +532,10 @@ class AnalizadorSemantico:
                 nodo.columna
             )
             self.error_manager.agregar_error(error)
+            nodo.tipo_dato = TipoDato.UNKNOWN
             return TipoDato.UNKNOWN
+        nodo.enlace = simbolo
+        nodo.tipo_dato = simbolo.tipo
 
         # Verificar si la variable está inicializada antes de usarla
         if not simbolo.inicializada:
@@ -490,6 +548,7 @@ class AnalizadorSemantico:
 
         return simbolo.tipo
 
+    @_anotar_tipo
     def visitar_expresion_indice(self, nodo: NodoAST) -> Optional[TipoDato]:
         """
         Visita el nodo de expresión de acceso a índice y retorna su tipo.
@@ -499,10 +558,10 @@ class AnalizadorSemantico:
             return TipoDato.UNKNOWN
 
         # Visitar el arreglo/lista (hijo 0)
-        tipo_arreglo = self.visitar(nodo.hijos[0])
+        tipo_arreglo = yield nodo.hijos[0]
 
         # Visitar el índice (hijo 1)
-        tipo_indice = self.visitar(nodo.hijos[1])
+        tipo_indice = yield nodo.hijos[1]
 
         # Validar que el índice sea de tipo Int
         if tipo_indice and tipo_indice != TipoDato.INT:
@@ -524,6 +583,7 @@ class AnalizadorSemantico:
         # Para otros tipos, retornar el mismo tipo (simplificación)
         return tipo_arreglo
 
+    @_anotar_tipo
     def visitar_expresion_punto(self, nodo: NodoAST) -> Optional[TipoDato]:
         """
         Visita el nodo de expresión de acceso a propiedad con punto.
@@ -533,7 +593,7 @@ class AnalizadorSemantico:
             return TipoDato.UNKNOWN
 
         # Obtener el tipo del objeto base
-        tipo_objeto = self.visitar(nodo.hijos[0])
+        tipo_objeto = yield nodo.hijos[0]
 
         # Obtener el nombre de la propiedad
         propiedad = nodo.valor
@@ -575,6 +635,135 @@ class AnalizadorSemantico:
             self.error_manager.agregar_error(error)
             return TipoDato.UNKNOWN
 
+    def _buscar(self, nombre: str, nodo: Optional[NodoAST] = None) -> Optional[Simbolo]:
+        """
+        Busca una variable visible desde el scope actual.
+
+        Mientras se analiza una función en modo incremental, registra la
+        dependencia con la variable global (o con su ausencia) y el nodo que la
+        referencia.
+        """
+        simbolo = self.tabla_simbolos_actual.buscar(nombre)
+        if self._dependencias is not None and (simbolo is None or simbolo.profundidad == 0):
+            self._dependencias.setdefault(('var', nombre), self._estado(simbolo))
+            if simbolo is not None and nodo is not None:
+                self._referencias_globales.append(nodo)
+        return simbolo
+
+    def _inicializar(self, simbolo: Simbolo):
+        """Marca una variable como inicializada (y registra la escritura si es global)."""
+        simbolo.inicializada = True
+        if self._dependencias is not None and simbolo.profundidad == 0:
+            self._escrituras.append(simbolo.nombre)
+
+    def _declarar(self, simbolo: Simbolo) -> Simbolo:
+        """
+        Declara una variable en el scope actual y le asigna su enlace.
+
+        Args:
+            simbolo: Símbolo a declarar.
+
+        Returns:
+            El símbolo declarado (el existente si ya había uno con ese nombre en el scope).
+        """
+        tabla = self.tabla_simbolos_actual
+        oculta = self._buscar(simbolo.nombre) is not None
+        if not tabla.declarar(simbolo):
+            return tabla.simbolos[simbolo.nombre]
+        simbolo.id = len(self.enlaces)
+        simbolo.profundidad = tabla.profundidad
+        simbolo.oculta = oculta
+        self.enlaces.append(simbolo)
+        return simbolo
+
+    # ========== Análisis incremental ==========
+
+    @staticmethod
+    def _firma(funcion: Optional[FuncionInfo]) -> Optional[tuple]:
+        """Lo que una llamada necesita de una función: tipos de parámetros y de retorno."""
+        if funcion is None:
+            return None
+        return tuple(p.tipo for p in funcion.parametros), funcion.tipo_retorno
+
+    @staticmethod
+    def _estado(simbolo: Optional[Simbolo]) -> Optional[tuple]:
+        """Lo que una función puede observar de una variable global."""
+        if simbolo is None:
+            return None
+        return simbolo.tipo, simbolo.es_constante, simbolo.inicializada
+
+    def _analizar_funcion(self, nodo: NodoAST):
+        """
+        Analiza una función registrando sus dependencias (generador auxiliar).
+
+        Returns:
+            FuncionAnalizada, o None si la función estaba duplicada
+        """
+        if nodo.valor in self.tabla_funciones:
+            yield nodo
+            return None
+
+        errores = self.error_manager.obtener_errores()
+        inicio_errores, inicio_resultados, inicio_enlaces = len(errores), len(self.resultados), len(self.enlaces)
+        self._dependencias, self._referencias_globales, self._escrituras = {}, [], []
+        try:
+            yield nodo
+            return FuncionAnalizada(
+                nodo, self.tabla_funciones[nodo.valor], errores[inicio_errores:],
+                self.resultados[inicio_resultados:], self._dependencias,
+                self.enlaces[inicio_enlaces:], self._referencias_globales, self._escrituras)
+        finally:
+            self._dependencias = None
+
+    def _vigente(self, analizada: FuncionAnalizada, nodo: NodoAST) -> bool:
+        """Indica si el análisis guardado vale para el nodo en el estado actual."""
+        if analizada.nodo is not nodo or nodo.valor in self.tabla_funciones:
+            return False
+        globales = self.tabla_simbolos_global.simbolos
+        for (clase, nombre), observado in analizada.dependencias.items():
+            if clase == 'fun':
+                actual = self._firma(self.tabla_funciones.get(nombre))
+            else:
+                actual = self._estado(globales.get(nombre))
+            if actual != observado:
+                return False
+        return True
+
+    def _reutilizar(self, analizada: FuncionAnalizada, nodo: NodoAST):
+        """Aplica el análisis guardado de una función como si se hubiera vuelto a hacer."""
+        # Los errores se desplazan si la función cambió de línea
+        delta = (nodo.linea or 0) - (analizada.linea or 0)
+        if delta:
+            analizada.errores = [
+                SemanticError(e.mensaje, e.linea + delta if e.linea is not None else None, e.columna)
+                for e in analizada.errores
+            ]
+            analizada.linea = nodo.linea
+        for error in analizada.errores:
+            self.error_manager.agregar_error(error)
+        self.resultados.extend(analizada.resultados)
+
+        info = analizada.info
+        info.linea, info.columna = nodo.linea, nodo.columna
+        for parametro, meta in zip(info.parametros, nodo.metadata.get('parametros', ())):
+            parametro.linea = meta.get('linea')
+        self.tabla_funciones[nodo.valor] = info
+
+        # Enlaces: las variables locales reciben nuevos id; las referencias a
+        # globales apuntan a los símbolos globales de este análisis
+        for simbolo in analizada.locales:
+            simbolo.id = len(self.enlaces)
+            self.enlaces.append(simbolo)
+        globales = self.tabla_simbolos_global.simbolos
+        for referencia in analizada.referencias_globales:
+            simbolo = globales[referencia.valor]
+            referencia.enlace = simbolo
+            if referencia.tipo == TipoNodo.ASIGNACION and len(referencia.hijos) == 2:
+                if referencia.hijos[0].tipo == TipoNodo.EXPRESION_VARIABLE:
+                    referencia.hijos[0].enlace = simbolo
+        for nombre in analizada.escrituras:
+            globales[nombre].inicializada = True
+
     def tipos_compatibles(self, tipo_esperado: TipoDato, tipo_actual: TipoDato) -> bool:
         """
         Verifica si dos tipos son compatibles.
@@ -692,11 +881,14 @@ class AnalizadorSemantico:
                 columna=param.columna or nodo.columna,
                 inicializada=True  # Los parámetros siempre están inicializados
             )
-            self.tabla_simbolos_actual.declarar(simbolo)
+            # Quien llama enlaza los argumentos por el nombre de
+            # metadata['parametros']: un parámetro conserva su nombre aunque
+            # oculte a una global (Var.es_global los distingue en el TAC)
+            self._declarar(simbolo).oculta = False
 
         # Visitar cuerpo de la función
         if nodo.hijos:
-            self.visitar(nodo.hijos[0])
+            yield nodo.hijos[0]
 
         # Verificar que todas las rutas retornen si la función no es Unit
         if tipo_retorno != TipoDato.VOID and tipo_retorno != TipoDato.UNKNOWN:
@@ -729,7 +921,7 @@ class AnalizadorSemantico:
         # Determinar el tipo del valor de retorno
         tipo_retorno = TipoDato.VOID
         if nodo.hijos:
-            tipo_retorno = self.visitar(nodo.hijos[0])
+            tipo_retorno = yield nodo.hijos[0]
 
         # Verificar que el tipo coincida con la declaración de la función
         if not self.tipos_compatibles(self.funcion_actual.tipo_retorno, tipo_retorno):
@@ -743,12 +935,15 @@ class AnalizadorSemantico:
         self.resultados.append(f"Sentencia 'return' válida")
         return tipo_retorno
 
+    @_anotar_tipo
     def visitar_llamada_funcion(self, nodo: NodoAST) -> Optional[TipoDato]:
         """Visita el nodo de llamada a función."""
         nombre = nodo.valor
 
         # Buscar la función
         if nombre not in self.tabla_funciones:
+            if self._dependencias is not None:
+                self._dependencias.setdefault(('fun', nombre), None)
             error = SemanticError(
                 f"Función '{nombre}' no declarada",
                 nodo.linea,
@@ -758,6 +953,8 @@ class AnalizadorSemantico:
             return TipoDato.UNKNOWN
 
         funcion = self.tabla_funciones[nombre]
+        if self._dependencias is not None and funcion is not self.funcion_actual:
+            self._dependencias.setdefault(('fun', nombre), self._firma(funcion))
 
         # Validar número de argumentos (excepto para funciones varargs)
         if nombre not in ['intArrayOf', 'doubleArrayOf']:
@@ -772,7 +969,7 @@ class AnalizadorSemantico:
 
         # Validar tipo de cada argumento
         for i, arg_nodo in enumerate(nodo.hijos):
-            tipo_arg = self.visitar(arg_nodo)
+            tipo_arg = yield arg_nodo
 
             if nombre == 'intArrayOf':
                 # Para intArrayOf, todos los argumentos deben ser Int
@@ -0,0 +1,364 @@
+"""
+Servidor de compilación persistente con trabajadores precalentados.
+
+Evita pagar en cada compilación el arranque del intérprete y la importación de
+`core` y `core.jvm`: un proceso de larga duración escucha en un socket Unix o
+en TCP local y reparte las peticiones entre procesos trabajadores creados al
+arrancar (prefork). Cada trabajador construye su `CompiladorController` y
+compila un programa mínimo antes de aceptar trabajo, de modo que el lexer, las
+tablas de builtins y las referencias del runtime JVM ya están listas.
+
+Protocolo: JSON delimitado por saltos de línea sobre una conexión persistente.
+
+    Petición:  {"id": 1, "files": [{"name": "Main", "source": "...", "java_version": 6}]}
+    Respuesta: {"id": 1, "results": [{"name": "Main", "exito": true, "errores": [],
+                                      "class_bytes": "<base64>", "time_ms": 1.2}]}
+
+Comandos adicionales: {"cmd": "ping"}, {"cmd": "stats"} y {"cmd": "shutdown"}.
+"""
+
+import base64
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+import multiprocessing
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from core.controller import CompiladorController
+
+
+# Programa usado para precalentar cada trabajador
+PROGRAMA_CALENTAMIENTO = """
+fun main() {
+    val x: Int = 1
+    println(x + 1)
+}
+"""
+
+DEFAULT_PORT = 7878
+
+# Controlador del proceso trabajador (uno por proceso, creado en _iniciar_trabajador)
+_controlador: Optional[CompiladorController] = None
+
+
+def _iniciar_trabajador(cache_dir: Optional[str] = None):
+    """Crea y precalienta el controlador del proceso trabajador."""
+    global _controlador
+    cache = None
+    if cache_dir:
+        from core.cache import CompilationCache
+        cache = CompilationCache(cache_dir)
+    _controlador = CompiladorController(cache=cache)
+    # Ejecutar una compilación completa importa core.jvm y construye los
+    # generadores; el resultado se descarta
+    _controlador.ejecutar_jvm(PROGRAMA_CALENTAMIENTO, class_name="Calentamiento")
+    _controlador.limpiar()
+
+
+def _compilar_fuente(archivo: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Compila un archivo de una petición con el controlador del proceso.
+
+    Args:
+        archivo: {"name": str, "source": str, "java_version": int}
+
+    Returns:
+        Resultado serializable a JSON (bytes del .class en base64)
+    """
+    if _controlador is None:
+        _iniciar_trabajador()
+
+    nombre = archivo.get("name", "Main")
+    inicio = time.perf_counter()
+    try:
+        resultado = _controlador.ejecutar_jvm(
+            archivo.get("source", ""),
+            class_name=nombre,
+            java_version=int(archivo.get("java_version", 6))
+        )
+        exito = resultado["exito"]
+        errores = [str(e) for e in resultado["errores"]]
+        bytecode = resultado["bytecode_jvm"]
+    except Exception as e:
+        exito, errores, bytecode = False, [f"Error al compilar {nombre}: {e}"], None
+
+    return {
+        "name": nombre,
+        "exito": exito,
+        "errores": errores,
+        "class_bytes": base64.b64encode(bytecode).decode('ascii') if bytecode else None,
+        "time_ms": (time.perf_counter() - inicio) * 1000
+    }
+
+
+def _ping_trabajador(_: int) -> int:
+    """Tarea vacía usada para esperar el arranque de los trabajadores."""
+    return os.getpid()
+
+
+def parse_address(direccion: Union[str, int, None]) -> Union[str, Tuple[str, int]]:
+    """
+    Interpreta una dirección de servidor.
+
+    Args:
+        direccion: "unix:/ruta", ruta con '/', "host:puerto", puerto o None
+
+    Returns:
+        Ruta del socket Unix (str) o tupla (host, puerto)
+    """
+    if direccion is None:
+        return ("127.0.0.1", DEFAULT_PORT)
+    if isinstance(direccion, int):
+        return ("127.0.0.1", direccion)
+    if direccion.startswith("unix:"):
+        return direccion[len("unix:"):]
+    if "/" in direccion or direccion.endswith(".sock"):
+        return direccion
+    if ":" in direccion:
+        host, puerto = direccion.rsplit(":", 1)
+        return (host or "127.0.0.1", int(puerto))
+    return ("127.0.0.1", int(direccion))
+
+
+class _CompileRequestHandler(socketserver.StreamRequestHandler):
+    """Atiende una conexión: una petición JSON por línea."""
+
+    def handle(self):
+        for linea in self.rfile:
+            if not linea.strip():
+                continue
+            try:
+                peticion = json.loads(linea)
+                respuesta = self.server.compile_server.atender(peticion)
+            except Exception as e:
+                respuesta = {"error": f"Peticion invalida: {e}"}
+            self.wfile.write(json.dumps(respuesta).encode('utf-8') + b"\n")
+            self.wfile.flush()
+            if respuesta.get("shutdown"):
+                return
+
+
+class _TCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+if hasattr(socketserver, "UnixStreamServer"):
+    class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+else:
+    _UnixServer = None
+
+
+class CompileServer:
+    """
+    Servidor de compilación con un pool de trabajadores precalentados.
+
+    Con workers=0 compila en los hilos del propio servidor (un solo
+    controlador protegido con un lock), útil para pruebas y máquinas de un
+    solo núcleo.
+    """
+
+    def __init__(self, address: Union[str, int, None] = None, workers: Optional[int] = None,
+                 cache_dir: Optional[str] = None):
+        """
+        Inicializa el servidor (no empieza a escuchar hasta `start`).
+
+        Args:
+            address: Dirección (ver parse_address)
+            workers: Número de procesos trabajadores (None = número de CPUs)
+            cache_dir: Directorio de CompilationCache compartido por los trabajadores
+        """
+        self.address = parse_address(address)
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.cache_dir = cache_dir
+
+        self._pool = None
+        self._lock = threading.Lock()
+        self._servidor = None
+        self._hilo = None
+        self._inicio = None
+        self.peticiones = 0
+        self.archivos_compilados = 0
+
+    def start(self, background: bool = True):
+        """
+        Arranca los trabajadores y empieza a escuchar.
+
+        Args:
+            background: Si es False bloquea hasta recibir "shutdown"
+        """
+        if self.workers > 0:
+            self._pool = multiprocessing.Pool(self.workers, initializer=_iniciar_trabajador,
+                                              initargs=(self.cache_dir,))
+            # Esperar a que los trabajadores (ya precalentados) acepten tareas
+            self._pool.map(_ping_trabajador, range(self.workers), chunksize=1)
+        else:
+            _iniciar_trabajador(self.cache_dir)
+
+        if isinstance(self.address, str):
+            if _UnixServer is None:
+                raise OSError("Sockets Unix no disponibles en esta plataforma")
+            if os.path.exists(self.address):
+                os.unlink(self.address)
+            self._servidor = _UnixServer(self.address, _CompileRequestHandler)
+        else:
+            self._servidor = _TCPServer(self.address, _CompileRequestHandler)
+            self.address = self._servidor.server_address[:2]
+        self._servidor.compile_server = self
+        self._inicio = time.time()
+
+        if background:
+            self._hilo = threading.Thread(target=self._servidor.serve_forever, daemon=True)
+            self._hilo.start()
+        else:
+            try:
+                self._servidor.serve_forever()
+            finally:
+                self._cerrar()
+
+    def stop(self):
+        """Detiene el servidor y los trabajadores."""
+        if self._servidor is not None:
+            self._servidor.shutdown()
+            if self._hilo is not None:
+                self._hilo.join()
+            self._cerrar()
+
+    def _cerrar(self):
+        """Libera el socket y el pool."""
+        if self._servidor is None:
+            return
+        self._servidor.server_close()
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.unlink(self.address)
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+        self._servidor = None
+
+    def atender(self, peticion: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Procesa una petición ya decodificada.
+
+        Args:
+            peticion: Diccionario de la petición
+
+        Returns:
+            Diccionario de la respuesta
+        """
+        comando = peticion.get("cmd", "compile")
+        respuesta: Dict[str, Any] = {"id": peticion.get("id")}
+
+        if comando == "ping":
+            respuesta["pong"] = True
+        elif comando == "stats":
+            respuesta.update(self.obtener_estadisticas())
+        elif comando == "shutdown":
+            respuesta["shutdown"] = True
+            threading.Thread(target=self._servidor.shutdown, daemon=True).start()
+        elif comando == "compile":
+            archivos = peticion.get("files", [])
+            respuesta["results"] = self.compilar(archivos)
+        else:
+            respuesta["error"] = f"Comando desconocido: {comando}"
+        return respuesta
+
+    def compilar(self, archivos: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Compila un lote de archivos en los trabajadores."""
+        with self._lock:
+            self.peticiones += 1
+            self.archivos_compilados += len(archivos)
+
+        if self._pool is None:
+            with self._lock:
+                return [_compilar_fuente(a) for a in archivos]
+        if len(archivos) == 1:
+            return [self._pool.apply(_compilar_fuente, (archivos[0],))]
+        return self._pool.map(_compilar_fuente, archivos, chunksize=1)
+
+    def obtener_estadisticas(self) -> Dict[str, Any]:
+        """Estadísticas del servidor."""
+        return {
+            "workers": self.workers,
+            "requests": self.peticiones,
+            "files": self.archivos_compilados,
+            "uptime_s": time.time() - self._inicio if self._inicio else 0.0
+        }
+
+
+class CompileClient:
+    """
+    Cliente del servidor de compilación (conexión persistente).
+
+    Example:
+        >>> with CompileClient("127.0.0.1:7878") as cliente:
+        ...     resultado = cliente.compile(codigo, "Main")
+        ...     clase = resultado["class_bytes"]  # bytes del .class
+    """
+
+    def __init__(self, address: Union[str, int, None] = None, timeout: float = 60.0):
+        """
+        Conecta con el servidor.
+
+        Args:
+            address: Dirección (ver parse_address)
+            timeout: Tiempo máximo de espera por respuesta en segundos
+        """
+        direccion = parse_address(address)
+        if isinstance(direccion, str):
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        else:
+            self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._socket.settimeout(timeout)
+        self._socket.connect(direccion)
+        self._archivo = self._socket.makefile('rb')
+        self._siguiente_id = 0
+
+    def request(self, peticion: Dict[str, Any]) -> Dict[str, Any]:
+        """Envía una petición y espera su respuesta."""
+        self._siguiente_id += 1
+        peticion = dict(peticion, id=self._siguiente_id)
+        self._socket.sendall(json.dumps(peticion).encode('utf-8') + b"\n")
+        linea = self._archivo.readline()
+        if not linea:
+            raise ConnectionError("El servidor cerro la conexion")
+        return json.loads(linea)
+
+    def compile_many(self, archivos: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Compila un lote de archivos en una sola petición.
+
+        Args:
+            archivos: Lista de {"name", "source", "java_version"}
+
+        Returns:
+            Resultados en el mismo orden; "class_bytes" ya decodificado a bytes
+        """
+        respuesta = self.request({"cmd": "compile", "files": archivos})
+        if "error" in respuesta:
+            raise RuntimeError(respuesta["error"])
+        for resultado in respuesta["results"]:
+            if resultado["class_bytes"] is not None:
+                resultado["class_bytes"] = base64.b64decode(resultado["class_bytes"])
+        return respuesta["results"]
+
+    def compile(self, source: str, name: str = "Main", java_version: int = 6) -> Dict[str, Any]:
+        """Compila un único programa."""
+        return self.compile_many([{"name": name, "source": source, "java_version": java_version}])[0]
+
+    def close(self):
+        """Cierra la conexión."""
+        self._archivo.close()
+        self._socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,78 @@
+"""
+Texto fuente con índice de inicios de línea.
+
+`SourceText` calcula una sola vez el offset donde empieza cada línea y
+resuelve offset -> (línea, columna) por bisección, en O(log n). Lo comparten
+el lexer, los errores del compilador, el resaltado del editor y (a través de
+las líneas del AST y del TAC) la LineNumberTable del backend JVM, de modo que
+todas las fases numeran posiciones igual: líneas y columnas 1-based.
+"""
+
+import re
+from array import array
+from bisect import bisect_right
+from typing import Tuple
+
+
+_SALTO = re.compile('\n')
+
+
+class SourceText:
+    """
+    Código fuente con resolución rápida de posiciones.
+
+    Example:
+        >>> fuente = SourceText("val x = 1\\nprintln(x)")
+        >>> fuente.posicion(14)
+        (2, 5)
+        >>> fuente.texto_linea(2)
+        'println(x)'
+    """
+
+    __slots__ = ('texto', 'inicios_linea')
+
+    def __init__(self, texto: str):
+        """
+        Indexa el código fuente.
+
+        Args:
+            texto: Código fuente completo
+        """
+        self.texto = texto
+        self.inicios_linea = array('i', [0])
+        self.inicios_linea.extend(m.end() for m in _SALTO.finditer(texto))
+
+    @property
+    def num_lineas(self) -> int:
+        """Número de líneas (un texto vacío tiene una línea)."""
+        return len(self.inicios_linea)
+
+    def linea(self, offset: int) -> int:
+        """Línea (1-based) del offset."""
+        return bisect_right(self.inicios_linea, offset)
+
+    def posicion(self, offset: int) -> Tuple[int, int]:
+        """
+        Resuelve un offset a posición.
+
+        Args:
+            offset: Índice del carácter en el texto
+
+        Returns:
+            Tupla (línea, columna), ambas 1-based
+        """
+        linea = bisect_right(self.inicios_linea, offset)
+        return linea, offset - self.inicios_linea[linea - 1] + 1
+
+    def offset(self, linea: int, columna: int = 1) -> int:
+        """Offset de una posición (inversa de `posicion`)."""
+        return self.inicios_linea[linea - 1] + columna - 1
+
+    def texto_linea(self, linea: int) -> str:
+        """Contenido de una línea sin el salto final."""
+        inicio = self.inicios_linea[linea - 1]
+        fin = self.inicios_linea[linea] - 1 if linea < len(self.inicios_linea) else len(self.texto)
+        return self.texto[inicio:fin]
+
+    def __len__(self) -> int:
+        return len(self.texto)
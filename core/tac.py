@@ -9,9 +9,167 @@ Autor: Gabriel Alejandro Medina Miramontes
 Versión: 1.1
 """
 
-from dataclasses import dataclass
-from typing import List, Optional, Any
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Any, Union
 from core.utils import NodoAST, TipoNodo, TipoDato
+from core.visitor import ASTVisitor
+
+
+class Operand:
+    """
+    Operando de una instrucción TAC (inmutable).
+
+    El generador TAC crea cada operando una sola vez con su clase (`Const`,
+    `Var`, `Temp`, `Property`, `Label`) y su tipo, así que los backends y las
+    pasadas de optimización distinguen literales de variables por la clase y
+    no analizando el texto.
+
+    `texto` es como se imprime en el TAC. Un operando es igual a su texto y
+    tiene su mismo hash: el código que compara o indexa por nombre (tests,
+    diccionarios de slots) sigue funcionando con cadenas. Dos `Const` solo
+    son iguales si además tienen el mismo tipo y valor: el literal String
+    "7" y el Int 7 se imprimen igual pero no son intercambiables.
+    """
+
+    __slots__ = ('texto', 'tipo')
+
+    def __init__(self, texto: str, tipo: Optional[TipoDato] = None):
+        object.__setattr__(self, 'texto', texto)
+        object.__setattr__(self, 'tipo', tipo)
+
+    def __setattr__(self, nombre, valor):
+        raise AttributeError(f"{type(self).__name__} es inmutable")
+
+    def __delattr__(self, nombre):
+        raise AttributeError(f"{type(self).__name__} es inmutable")
+
+    def __str__(self) -> str:
+        return self.texto
+
+    def __repr__(self) -> str:
+        tipo = f", {self.tipo.value}" if self.tipo is not None else ""
+        return f"{type(self).__name__}({self.texto!r}{tipo})"
+
+    def __eq__(self, otro):
+        if isinstance(otro, Operand):
+            return otro.__class__ is self.__class__ and otro.texto == self.texto
+        if isinstance(otro, str):
+            return otro == self.texto
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.texto)
+
+    def __reduce__(self):
+        return (self.__class__, (self.texto, self.tipo))
+
+    # Inmutables: copiar (astuple, deepcopy) devuelve el mismo objeto
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+class Const(Operand):
+    """Literal; `valor` es el valor Python (int, float, bool o str)."""
+
+    __slots__ = ('valor',)
+
+    def __init__(self, texto: str, valor: Any, tipo: Optional[TipoDato] = None):
+        super().__init__(texto, tipo)
+        object.__setattr__(self, 'valor', valor)
+
+    def __eq__(self, otro):
+        if isinstance(otro, Const):
+            return (otro.texto == self.texto and otro.tipo == self.tipo
+                    and type(otro.valor) is type(self.valor) and otro.valor == self.valor)
+        return super().__eq__(otro)
+
+    __hash__ = Operand.__hash__
+
+    def __reduce__(self):
+        return (Const, (self.texto, self.valor, self.tipo))
+
+
+class Var(Operand):
+    """
+    Variable del programa (`texto` es su nombre TAC, con `#<id>` si oculta a otra).
+
+    `es_global` indica que se declaró en el nivel superior: las funciones
+    llamadas pueden leerla y modificarla.
+    """
+
+    __slots__ = ('es_global',)
+
+    def __init__(self, texto: str, tipo: Optional[TipoDato] = None, es_global: bool = False):
+        super().__init__(texto, tipo)
+        object.__setattr__(self, 'es_global', es_global)
+
+    def __reduce__(self):
+        return (Var, (self.texto, self.tipo, self.es_global))
+
+
+class Temp(Operand):
+    """Temporal creado por el generador TAC."""
+
+    __slots__ = ()
+
+
+class Label(Operand):
+    """Etiqueta de salto o de inicio de función."""
+
+    __slots__ = ()
+
+
+class Property(Operand):
+    """Propiedad de un valor (`arr.size`, `texto.length`)."""
+
+    __slots__ = ('objeto', 'propiedad')
+
+    def __init__(self, objeto: Operand, propiedad: str, tipo: Optional[TipoDato] = TipoDato.INT):
+        super().__init__(f"{objeto}.{propiedad}", tipo)
+        object.__setattr__(self, 'objeto', objeto)
+        object.__setattr__(self, 'propiedad', propiedad)
+
+    def __reduce__(self):
+        return (Property, (self.objeto, self.propiedad, self.tipo))
+
+
+_NUMERO_DECIMAL = re.compile(r'-?\d+\.\d*(?:[eE][-+]?\d+)?')
+
+
+def as_operand(valor: Union[Operand, str, None]) -> Optional[Operand]:
+    """
+    Operando de un valor de una instrucción TAC.
+
+    Los `Operand` se devuelven tal cual; el texto (TAC escrito a mano o de una
+    versión anterior) se clasifica una vez: números, booleanos y cadenas entre
+    comillas son `Const`, `x.size`/`x.length` son `Property` y el resto `Var`.
+    """
+    if valor is None or isinstance(valor, Operand):
+        return valor
+    texto = str(valor)
+    if texto.lstrip('-').isdigit():
+        return Const(texto, int(texto), TipoDato.INT)
+    if _NUMERO_DECIMAL.fullmatch(texto):
+        return Const(texto, float(texto), TipoDato.DOUBLE)
+    if texto in ('true', 'false', 'True', 'False'):
+        return Const(texto, texto in ('true', 'True'), TipoDato.BOOLEAN)
+    if len(texto) >= 2 and texto[0] == texto[-1] and texto[0] in '"\'':
+        return Const(texto, texto[1:-1], TipoDato.STRING)
+    objeto, punto, propiedad = texto.rpartition('.')
+    if punto and propiedad in ('size', 'length'):
+        return Property(as_operand(objeto), propiedad)
+    return Var(texto)
+
+
+# Tipo de un literal del AST según su valor Python (si el semántico no lo anotó)
+TIPOS_LITERAL = {bool: TipoDato.BOOLEAN, int: TipoDato.INT, float: TipoDato.DOUBLE, str: TipoDato.STRING}
+
+# Operaciones cuyo resultado es Boolean aunque operen con otro tipo
+COMPARACIONES = frozenset(['LT', 'GT', 'LE', 'GE', 'EQ', 'NE'])
 
 
 @dataclass
@@ -26,12 +184,34 @@ class TACInstruction:
         x = 5           -> TACInstruction('ASSIGN', '5', None, 'x')
         IF_FALSE t1 L1  -> TACInstruction('IF_FALSE', 't1', 'L1', None)
         L1:             -> TACInstruction('LABEL', None, None, None, 'L1')
+
+    El generador TAC usa objetos `Operand` (`Var('a')`, `Const('5', 5)`,
+    `Label('L1')`...); también se aceptan cadenas, que los backends clasifican
+    con `as_operand`. El nombre de la función y el número de argumentos de
+    CALL son siempre texto.
+
+    `tipo` es el tipo con que opera la instrucción, el que elige la variante
+    tipada en los backends (IADD o DADD, IRETURN o ARETURN): el del resultado
+    en las operaciones, asignaciones y llamadas; el de los operandos en las
+    comparaciones; el del elemento en ARRAY_LOAD/ARRAY_STORE; el del valor en
+    RETURN y PARAM. Sale de los tipos que infirió el análisis semántico y es
+    None en las instrucciones de control (LABEL, GOTO, IF_FALSE) o si no se
+    conoce.
     """
     op: str                         # Operación (ADD, SUB, ASSIGN, etc.)
-    arg1: Optional[str] = None      # Primer operando
-    arg2: Optional[str] = None      # Segundo operando
-    result: Optional[str] = None    # Resultado
-    label: Optional[str] = None     # Etiqueta (para LABEL, GOTO, IF_FALSE)
+    arg1: Optional[Union[Operand, str]] = None      # Primer operando
+    arg2: Optional[Union[Operand, str]] = None      # Segundo operando
+    result: Optional[Union[Operand, str]] = None    # Resultado
+    label: Optional[Union[Label, str]] = None       # Etiqueta (para LABEL)
+    linea: Optional[int] = field(default=None, compare=False, repr=False)  # Línea del código fuente
+    tipo: Optional[TipoDato] = field(default=None, compare=False, repr=False)  # Tipo de la operación
+
+    @property
+    def tipo_resultado(self) -> Optional[TipoDato]:
+        """Tipo del valor que la instrucción deja en `result`."""
+        if self.op in COMPARACIONES:
+            return TipoDato.BOOLEAN
+        return self.tipo
 
     def __str__(self) -> str:
         """Representación legible de la instrucción TAC"""
@@ -72,7 +252,7 @@ class TACInstruction:
             return f"{self.op} {self.arg1} {self.arg2} {self.result}"
 
 
-class TACGenerator:
+class TACGenerator(ASTVisitor):
     """
     Generador de código de tres direcciones (TAC) desde el AST.
 
@@ -81,33 +261,90 @@ class TACGenerator:
     - Usan temporales para expresiones complejas
     - Facilitan optimizaciones posteriores
     - Permiten generación de múltiples backends (bytecode, C, LLVM)
+
+    Cada tipo de nodo se despacha a su método `_generate_*` (ver `ASTVisitor`);
+    las expresiones devuelven el operando con su resultado. Los tipos salen de
+    `nodo.tipo_dato` y de los enlaces que deja el análisis semántico: cada
+    instrucción lleva el suyo y `temp_types` guarda el de cada temporal.
+
+    Con `compacto=True` las instrucciones se guardan en un `TACBuffer` (en
+    columnas, ver core/tac_buffer.py) en lugar de una lista de TACInstruction.
     """
 
-    def __init__(self):
-        """Inicializa el generador TAC"""
+    METODOS = {
+        TipoNodo.PROGRAMA: '_generate_program',
+        TipoNodo.FUNCION: '_generate_function',
+        TipoNodo.BLOQUE: '_generate_block',
+        TipoNodo.DECLARACION_VARIABLE: '_generate_var_declaration',
+        TipoNodo.ASIGNACION: '_generate_assignment',
+        TipoNodo.IF: '_generate_if',
+        TipoNodo.WHILE: '_generate_while',
+        TipoNodo.FOR: '_generate_for',
+        TipoNodo.RETURN: '_generate_return',
+        TipoNodo.BREAK: '_generate_break',
+        TipoNodo.CONTINUE: '_generate_continue',
+        TipoNodo.LLAMADA_FUNCION: '_generate_function_call',
+        TipoNodo.EXPRESION_LITERAL: '_generate_literal',
+        TipoNodo.EXPRESION_VARIABLE: '_generate_variable',
+        TipoNodo.EXPRESION_BINARIA: '_generate_binary_expression',
+        TipoNodo.EXPRESION_UNARIA: '_generate_unary_expression',
+        TipoNodo.EXPRESION_INDICE: '_generate_array_access',
+        TipoNodo.EXPRESION_PUNTO: '_generate_property_access',
+    }
+
+    # Nodos que generan código en posición de sentencia
+    SENTENCIAS = frozenset([
+        TipoNodo.BLOQUE, TipoNodo.DECLARACION_VARIABLE, TipoNodo.ASIGNACION,
+        TipoNodo.IF, TipoNodo.WHILE, TipoNodo.FOR, TipoNodo.RETURN,
+        TipoNodo.BREAK, TipoNodo.CONTINUE, TipoNodo.LLAMADA_FUNCION,
+    ])
+
+    # Operador del AST -> operación TAC
+    OPERACIONES = {
+        '+': 'ADD', '-': 'SUB', '*': 'MUL', '/': 'DIV', '%': 'MOD',
+        '<': 'LT', '>': 'GT', '<=': 'LE', '>=': 'GE', '==': 'EQ', '!=': 'NE',
+        '&&': 'AND', '||': 'OR'
+    }
+
+    def __init__(self, compacto: bool = False):
+        """
+        Inicializa el generador TAC
+
+        Args:
+            compacto: Si guardar las instrucciones en un TACBuffer
+        """
+        self.compacto = compacto
         self.instructions: List[TACInstruction] = []
         self.temp_counter: int = 0
         self.label_counter: int = 0
         self.current_function: Optional[str] = None
         self.loop_stack: List[tuple] = []  # Stack de (start_label, end_label) para break/continue
+        self.linea_actual: Optional[int] = None  # Línea de la sentencia en generación
+        self.temp_types: Dict[str, Optional[TipoDato]] = {}  # Temporal -> tipo de su valor
+        self.return_type: Optional[TipoDato] = None  # Tipo de retorno de la función actual
+        self.variables: Dict[tuple, Var] = {}  # (nombre TAC, id del enlace) -> operando
 
-    def new_temp(self) -> str:
-        """Genera un nuevo nombre de variable temporal"""
+    def new_temp(self, tipo: Optional[TipoDato] = None) -> Temp:
+        """Genera un nuevo temporal (y registra su tipo)"""
         temp_name = f"t{self.temp_counter}"
         self.temp_counter += 1
-        return temp_name
+        self.temp_types[temp_name] = tipo
+        return Temp(temp_name, tipo)
 
-    def new_label(self) -> str:
-        """Genera un nuevo nombre de etiqueta"""
+    def new_label(self) -> Label:
+        """Genera una nueva etiqueta"""
         label_name = f"L{self.label_counter}"
         self.label_counter += 1
-        return label_name
+        return Label(label_name)
 
-    def emit(self, op: str, arg1: Optional[str] = None, arg2: Optional[str] = None,
-             result: Optional[str] = None, label: Optional[str] = None):
+    def emit(self, op: str, arg1: Optional[Operand] = None, arg2: Optional[Operand] = None,
+             result: Optional[Operand] = None, label: Optional[Label] = None,
+             tipo: Optional[TipoDato] = None):
         """Emite una nueva instrucción TAC"""
-        instruction = TACInstruction(op, arg1, arg2, result, label)
-        self.instructions.append(instruction)
+        if self.compacto:
+            self.instructions.agregar(op, arg1, arg2, result, label, self.linea_actual, tipo)
+        else:
+            self.instructions.append(TACInstruction(op, arg1, arg2, result, label, self.linea_actual, tipo))
 
     def generate(self, ast: NodoAST) -> List[TACInstruction]:
         """
@@ -117,108 +354,82 @@ class TACGenerator:
             ast: Nodo raíz del AST validado
 
         Returns:
-            Lista de instrucciones TAC
+            Lista de instrucciones TAC (TACBuffer si el generador es compacto)
         """
-        self.instructions = []
+        if self.compacto:
+            from core.tac_buffer import TACBuffer
+            self.instructions = TACBuffer()
+        else:
+            self.instructions = []
         self.temp_counter = 0
         self.label_counter = 0
+        self.linea_actual = None
+        self.temp_types = {}
+        self.variables = {}
 
         # Generar código para el programa completo
-        self._generate_program(ast)
+        if ast.tipo == TipoNodo.PROGRAMA:
+            self.visitar(ast)
 
         return self.instructions
 
     def _generate_program(self, nodo: NodoAST):
         """Genera código para el programa completo"""
-        if nodo.tipo != TipoNodo.PROGRAMA:
-            return
-
         # Generar código para cada declaración
         for hijo in nodo.hijos:
             if hijo.tipo == TipoNodo.FUNCION:
-                self._generate_function(hijo)
+                yield hijo
             else:
                 # Generar código para sentencias globales (variables, loops, etc.)
-                self._generate_statement(hijo)
+                yield from self._generate_statement(hijo)
 
     def _generate_function(self, nodo: NodoAST):
         """Genera código para una declaración de función"""
         nombre_funcion = nodo.valor
         self.current_function = nombre_funcion
+        self.return_type = TipoDato.desde_string(nodo.metadata.get('tipo_retorno'))
+        self.linea_actual = nodo.linea
 
         # Emitir etiqueta de inicio de función
-        self.emit('LABEL', label=f"func_{nombre_funcion}")
+        self.emit('LABEL', label=Label(f"func_{nombre_funcion}"))
 
         # El cuerpo de la función está en el último hijo
         cuerpo = nodo.hijos[-1]
 
         # Generar código para el cuerpo
-        self._generate_statement(cuerpo)
+        yield from self._generate_statement(cuerpo)
 
-        # Si es función Unit y no tiene return explícito, agregar RETURN
-        if nombre_funcion == "main" or not self._has_return(cuerpo):
+        # Toda función termina en RETURN: si el cuerpo no acaba en un return
+        # (función Unit, o returns solo dentro de un if), se agrega uno.
+        # `dividir_funciones` cierra la función en su último RETURN.
+        if nombre_funcion == "main" or self.instructions[-1].op != 'RETURN':
             self.emit('RETURN')
 
         self.current_function = None
-
-    def _has_return(self, nodo: NodoAST) -> bool:
-        """Verifica si un nodo contiene una sentencia return"""
-        if nodo.tipo == TipoNodo.RETURN:
-            return True
-        for hijo in nodo.hijos:
-            if self._has_return(hijo):
-                return True
-        return False
+        self.return_type = None
 
     def _generate_statement(self, nodo: NodoAST):
-        """Genera código para una sentencia"""
-        if nodo.tipo == TipoNodo.BLOQUE:
-            # Generar código para cada sentencia del bloque
-            for hijo in nodo.hijos:
-                self._generate_statement(hijo)
-
-        elif nodo.tipo == TipoNodo.DECLARACION_VARIABLE:
-            self._generate_var_declaration(nodo)
-
-        elif nodo.tipo == TipoNodo.ASIGNACION:
-            self._generate_assignment(nodo)
-
-        elif nodo.tipo == TipoNodo.IF:
-            self._generate_if(nodo)
-
-        elif nodo.tipo == TipoNodo.WHILE:
-            self._generate_while(nodo)
+        """Genera código para una sentencia (generador auxiliar, usar con `yield from`)"""
+        if nodo.tipo != TipoNodo.BLOQUE and nodo.linea:
+            self.linea_actual = nodo.linea
 
-        elif nodo.tipo == TipoNodo.FOR:
-            self._generate_for(nodo)
+        # Las expresiones sueltas (salvo llamadas) no generan código
+        if nodo.tipo in self.SENTENCIAS:
+            yield nodo
 
-        elif nodo.tipo == TipoNodo.RETURN:
-            self._generate_return(nodo)
-
-        elif nodo.tipo == TipoNodo.BREAK:
-            # Break salta al final del loop actual
-            if self.loop_stack:
-                _, end_label = self.loop_stack[-1]
-                self.emit('GOTO', end_label)
-
-        elif nodo.tipo == TipoNodo.CONTINUE:
-            # Continue salta al inicio del loop actual
-            if self.loop_stack:
-                start_label, _ = self.loop_stack[-1]
-                self.emit('GOTO', start_label)
-
-        elif nodo.tipo == TipoNodo.LLAMADA_FUNCION:
-            # Llamada a función como sentencia (sin usar resultado)
-            self._generate_expression(nodo)
+    def _generate_block(self, nodo: NodoAST):
+        """Genera código para cada sentencia del bloque"""
+        for hijo in nodo.hijos:
+            yield from self._generate_statement(hijo)
 
     def _generate_var_declaration(self, nodo: NodoAST):
         """Genera código para declaración de variable"""
-        nombre_var = nodo.valor
+        variable = self._variable(nodo)
 
         # Si tiene inicialización
         if len(nodo.hijos) > 0:
-            expr_temp = self._generate_expression(nodo.hijos[0])
-            self.emit('ASSIGN', expr_temp, None, nombre_var)
+            expr_temp = yield nodo.hijos[0]
+            self.emit('ASSIGN', expr_temp, None, variable, tipo=variable.tipo)
 
     def _generate_assignment(self, nodo: NodoAST):
         """Genera código para asignación"""
@@ -235,18 +446,18 @@ class TACGenerator:
             indice_expr = hijo_izq.hijos[1]
 
             if base_expr.tipo == TipoNodo.EXPRESION_VARIABLE:
-                nombre_array = base_expr.valor
+                nombre_array = self._variable(base_expr)
             else:
-                nombre_array = self._generate_expression(base_expr)
+                nombre_array = yield base_expr
 
-            indice_temp = self._generate_expression(indice_expr)
-            valor_temp = self._generate_expression(hijo_der)
-            self.emit('ARRAY_STORE', indice_temp, valor_temp, nombre_array)
+            indice_temp = yield indice_expr
+            valor_temp = yield hijo_der
+            self.emit('ARRAY_STORE', indice_temp, valor_temp, nombre_array, tipo=hijo_izq.tipo_dato)
         else:
             # Asignación simple: var = expr
-            nombre_var = hijo_izq.valor
-            expr_temp = self._generate_expression(hijo_der)
-            self.emit('ASSIGN', expr_temp, None, nombre_var)
+            variable = self._variable(hijo_izq)
+            expr_temp = yield hijo_der
+            self.emit('ASSIGN', expr_temp, None, variable, tipo=variable.tipo)
 
     def _generate_if(self, nodo: NodoAST):
         """Genera código para if/else"""
@@ -255,7 +466,7 @@ class TACGenerator:
         bloque_else = nodo.hijos[2] if len(nodo.hijos) > 2 else None
 
         # Generar código para condición
-        cond_temp = self._generate_expression(condicion)
+        cond_temp = yield condicion
 
         # Etiquetas
         else_label = self.new_label()
@@ -265,7 +476,7 @@ class TACGenerator:
         self.emit('IF_FALSE', cond_temp, else_label)
 
         # Código del bloque then
-        self._generate_statement(bloque_then)
+        yield from self._generate_statement(bloque_then)
 
         if bloque_else:
             # GOTO end_label (saltar el else)
@@ -275,7 +486,7 @@ class TACGenerator:
             self.emit('LABEL', label=else_label)
 
             # Código del bloque else
-            self._generate_statement(bloque_else)
+            yield from self._generate_statement(bloque_else)
 
             # end_label:
             self.emit('LABEL', label=end_label)
@@ -299,13 +510,14 @@ class TACGenerator:
         self.emit('LABEL', label=start_label)
 
         # Evaluar condición
-        cond_temp = self._generate_expression(condicion)
+        cond_temp = yield condicion
 
         # IF_FALSE cond GOTO end_label
         self.emit('IF_FALSE', cond_temp, end_label)
 
         # Código del cuerpo
-        self._generate_statement(cuerpo)
+        yield from self._generate_statement(cuerpo)
+        self.linea_actual = nodo.linea
 
         # GOTO start_label
         self.emit('GOTO', start_label)
@@ -319,13 +531,13 @@ class TACGenerator:
     def _generate_for(self, nodo: NodoAST):
         """Genera código para for..in"""
         # for (var in inicio..fin) o for (var in inicio until fin)
-        nombre_var = nodo.valor
+        nombre_var = self._variable(nodo)
         rango = nodo.hijos[0]
         cuerpo = nodo.hijos[1]
 
         # Obtener inicio y fin del rango
-        inicio_temp = self._generate_expression(rango.hijos[0])
-        fin_temp = self._generate_expression(rango.hijos[1])
+        inicio_temp = yield rango.hijos[0]
+        fin_temp = yield rango.hijos[1]
 
         # Etiquetas
         start_label = self.new_label()
@@ -335,28 +547,29 @@ class TACGenerator:
         self.loop_stack.append((start_label, end_label))
 
         # var = inicio
-        self.emit('ASSIGN', inicio_temp, None, nombre_var)
+        self.emit('ASSIGN', inicio_temp, None, nombre_var, tipo=TipoDato.INT)
 
         # start_label:
         self.emit('LABEL', label=start_label)
 
         # Generar condición (var <= fin o var < fin)
-        cond_temp = self.new_temp()
+        cond_temp = self.new_temp(TipoDato.BOOLEAN)
         if rango.valor == 'until':
-            self.emit('LT', nombre_var, fin_temp, cond_temp)
+            self.emit('LT', nombre_var, fin_temp, cond_temp, tipo=TipoDato.INT)
         else:  # '..'
-            self.emit('LE', nombre_var, fin_temp, cond_temp)
+            self.emit('LE', nombre_var, fin_temp, cond_temp, tipo=TipoDato.INT)
 
         # IF_FALSE cond GOTO end_label
         self.emit('IF_FALSE', cond_temp, end_label)
 
         # Código del cuerpo
-        self._generate_statement(cuerpo)
+        yield from self._generate_statement(cuerpo)
+        self.linea_actual = nodo.linea
 
         # var = var + 1
-        temp_inc = self.new_temp()
-        self.emit('ADD', nombre_var, '1', temp_inc)
-        self.emit('ASSIGN', temp_inc, None, nombre_var)
+        temp_inc = self.new_temp(TipoDato.INT)
+        self.emit('ADD', nombre_var, Const('1', 1, TipoDato.INT), temp_inc, tipo=TipoDato.INT)
+        self.emit('ASSIGN', temp_inc, None, nombre_var, tipo=TipoDato.INT)
 
         # GOTO start_label
         self.emit('GOTO', start_label)
@@ -371,102 +584,125 @@ class TACGenerator:
         """Genera código para return"""
         if len(nodo.hijos) > 0:
             # return expr
-            expr_temp = self._generate_expression(nodo.hijos[0])
-            self.emit('RETURN', expr_temp)
+            expr_temp = yield nodo.hijos[0]
+            tipo = self.return_type
+            if tipo is None or tipo in (TipoDato.VOID, TipoDato.UNKNOWN):
+                tipo = nodo.hijos[0].tipo_dato
+            self.emit('RETURN', expr_temp, tipo=tipo)
         else:
             # return (sin valor)
             self.emit('RETURN')
 
-    def _generate_expression(self, nodo: NodoAST) -> str:
-        """
-        Genera código para una expresión y retorna el temporal con el resultado.
+    def _generate_break(self, nodo: NodoAST):
+        """Break salta al final del loop actual"""
+        if self.loop_stack:
+            _, end_label = self.loop_stack[-1]
+            self.emit('GOTO', end_label)
 
-        Returns:
-            Nombre del temporal que contiene el resultado de la expresión
+    def _generate_continue(self, nodo: NodoAST):
+        """Continue salta al inicio del loop actual"""
+        if self.loop_stack:
+            start_label, _ = self.loop_stack[-1]
+            self.emit('GOTO', start_label)
+
+    @staticmethod
+    def _variable_name(nodo: NodoAST) -> str:
         """
-        if nodo.tipo == TipoNodo.EXPRESION_LITERAL:
-            # Literal: retornar el valor directamente
-            return str(nodo.valor)
+        Nombre TAC de la variable que nombra un nodo.
 
-        elif nodo.tipo == TipoNodo.EXPRESION_VARIABLE:
-            # Variable: retornar el nombre
+        Es el nombre del código fuente, salvo que el análisis semántico haya
+        resuelto el nodo a una variable que oculta a otra visible con el mismo
+        nombre: entonces se le agrega `#<id del enlace>` para que cada variable
+        tenga su propio local en el backend. Los parámetros nunca se renombran
+        (los argumentos se enlazan por su nombre en `metadata['parametros']`).
+        """
+        simbolo = nodo.enlace
+        if simbolo is None or not simbolo.oculta:
             return nodo.valor
+        return f"{nodo.valor}#{simbolo.id}"
+
+    def _variable(self, nodo: NodoAST) -> Var:
+        """Operando de la variable que nombra un nodo, con su tipo declarado (uno por variable)."""
+        nombre = self._variable_name(nodo)
+        simbolo = nodo.enlace
+        clave = (nombre, simbolo.id if simbolo is not None else None)
+        variable = self.variables.get(clave)
+        if variable is None:
+            if simbolo is not None:
+                variable = Var(nombre, simbolo.tipo, simbolo.profundidad == 0)
+            else:
+                variable = Var(nombre)
+            self.variables[clave] = variable
+        return variable
 
-        elif nodo.tipo == TipoNodo.EXPRESION_BINARIA:
-            return self._generate_binary_expression(nodo)
-
-        elif nodo.tipo == TipoNodo.EXPRESION_UNARIA:
-            return self._generate_unary_expression(nodo)
-
-        elif nodo.tipo == TipoNodo.LLAMADA_FUNCION:
-            return self._generate_function_call(nodo)
+    def _generate_literal(self, nodo: NodoAST) -> Const:
+        """Literal: retornar el valor directamente"""
+        tipo = nodo.tipo_dato or TIPOS_LITERAL.get(type(nodo.valor))
+        return Const(str(nodo.valor), nodo.valor, tipo)
 
-        elif nodo.tipo == TipoNodo.EXPRESION_INDICE:
-            return self._generate_array_access(nodo)
+    def _generate_variable(self, nodo: NodoAST) -> Var:
+        """Variable: retornar su operando"""
+        return self._variable(nodo)
 
-        elif nodo.tipo == TipoNodo.EXPRESION_PUNTO:
-            return self._generate_property_access(nodo)
+    def visitar_generico(self, nodo: NodoAST) -> Const:
+        """Caso por defecto para expresiones no soportadas"""
+        return Const("0", 0, TipoDato.INT)
 
-        else:
-            # Caso por defecto
-            return "0"
-
-    def _generate_binary_expression(self, nodo: NodoAST) -> str:
+    def _generate_binary_expression(self, nodo: NodoAST) -> Temp:
         """Genera código para expresión binaria"""
         operador = nodo.valor
-        izq_temp = self._generate_expression(nodo.hijos[0])
-        der_temp = self._generate_expression(nodo.hijos[1])
+        izq_temp = yield nodo.hijos[0]
+        der_temp = yield nodo.hijos[1]
 
-        result_temp = self.new_temp()
+        result_temp = self.new_temp(nodo.tipo_dato)
 
         # Mapear operador a operación TAC
-        op_map = {
-            '+': 'ADD', '-': 'SUB', '*': 'MUL', '/': 'DIV', '%': 'MOD',
-            '<': 'LT', '>': 'GT', '<=': 'LE', '>=': 'GE', '==': 'EQ', '!=': 'NE',
-            '&&': 'AND', '||': 'OR'
-        }
-
-        tac_op = op_map.get(operador, operador)
-        self.emit(tac_op, izq_temp, der_temp, result_temp)
+        tac_op = self.OPERACIONES.get(operador, operador)
+        tipo = nodo.tipo_dato
+        if tac_op in COMPARACIONES:
+            # Las comparaciones operan con el tipo de sus operandos (Double si alguno lo es)
+            tipo_izq, tipo_der = nodo.hijos[0].tipo_dato, nodo.hijos[1].tipo_dato
+            tipo = TipoDato.DOUBLE if TipoDato.DOUBLE in (tipo_izq, tipo_der) else tipo_izq
+        self.emit(tac_op, izq_temp, der_temp, result_temp, tipo=tipo)
 
         return result_temp
 
-    def _generate_unary_expression(self, nodo: NodoAST) -> str:
+    def _generate_unary_expression(self, nodo: NodoAST) -> Temp:
         """Genera código para expresión unaria"""
         operador = nodo.valor
-        operando_temp = self._generate_expression(nodo.hijos[0])
+        operando_temp = yield nodo.hijos[0]
 
-        result_temp = self.new_temp()
+        result_temp = self.new_temp(nodo.tipo_dato)
 
         if operador == '!':
-            self.emit('NOT', operando_temp, None, result_temp)
+            self.emit('NOT', operando_temp, None, result_temp, tipo=nodo.tipo_dato)
         elif operador == '-':
-            self.emit('NEG', operando_temp, None, result_temp)
+            self.emit('NEG', operando_temp, None, result_temp, tipo=nodo.tipo_dato)
 
         return result_temp
 
-    def _generate_function_call(self, nodo: NodoAST) -> str:
+    def _generate_function_call(self, nodo: NodoAST) -> Temp:
         """Genera código para llamada a función"""
         nombre_funcion = nodo.valor
 
         # Generar código para argumentos (en orden inverso para stack)
         args_temps = []
         for arg in nodo.hijos:
-            arg_temp = self._generate_expression(arg)
+            arg_temp = yield arg
             args_temps.append(arg_temp)
 
         # Emitir PARAMs
-        for arg_temp in args_temps:
-            self.emit('PARAM', arg_temp)
+        for arg, arg_temp in zip(nodo.hijos, args_temps):
+            self.emit('PARAM', arg_temp, tipo=arg.tipo_dato)
 
         # Llamada a función
-        result_temp = self.new_temp()
+        result_temp = self.new_temp(nodo.tipo_dato)
         num_args = len(args_temps)
-        self.emit('CALL', nombre_funcion, str(num_args), result_temp)
+        self.emit('CALL', nombre_funcion, str(num_args), result_temp, tipo=nodo.tipo_dato)
 
         return result_temp
 
-    def _generate_array_access(self, nodo: NodoAST) -> str:
+    def _generate_array_access(self, nodo: NodoAST) -> Temp:
         """Genera código para acceso a array"""
         # El nodo EXPRESION_INDICE tiene la estructura:
         # nodo.hijos[0] = expresión base (la variable array)
@@ -476,29 +712,30 @@ class TACGenerator:
 
         # Generar código para la base (normalmente una variable)
         if base_expr.tipo == TipoNodo.EXPRESION_VARIABLE:
-            nombre_array = base_expr.valor
+            nombre_array = self._variable(base_expr)
         else:
-            nombre_array = self._generate_expression(base_expr)
+            nombre_array = yield base_expr
 
         # Generar código para el índice
-        indice_temp = self._generate_expression(indice_expr)
+        indice_temp = yield indice_expr
 
-        result_temp = self.new_temp()
-        self.emit('ARRAY_LOAD', nombre_array, indice_temp, result_temp)
+        result_temp = self.new_temp(nodo.tipo_dato)
+        self.emit('ARRAY_LOAD', nombre_array, indice_temp, result_temp, tipo=nodo.tipo_dato)
 
         return result_temp
 
-    def _generate_property_access(self, nodo: NodoAST) -> str:
+    def _generate_property_access(self, nodo: NodoAST) -> Temp:
         """Genera código para acceso a propiedad (.size, .length)"""
-        objeto_temp = self._generate_expression(nodo.hijos[0])
+        objeto_temp = yield nodo.hijos[0]
         propiedad = nodo.valor
 
-        result_temp = self.new_temp()
+        result_temp = self.new_temp(nodo.tipo_dato)
 
         # Para .size y .length, generamos una operación especial
         # que será manejada por el backend específico
         if propiedad == 'size' or propiedad == 'length':
-            self.emit('ASSIGN', f"{objeto_temp}.{propiedad}", None, result_temp)
+            self.emit('ASSIGN', Property(objeto_temp, propiedad, nodo.tipo_dato), None, result_temp,
+                      tipo=nodo.tipo_dato)
 
         return result_temp
 
@@ -0,0 +1,276 @@
+"""
+Código de tres direcciones almacenado en columnas.
+
+En lugar de un `TACInstruction` por instrucción, `TACBuffer` guarda la
+operación (un byte con su índice en `OPERACIONES`), los operandos, la línea y
+el tipo en columnas paralelas `array` (22 bytes por instrucción). Cada
+operando distinto se guarda una sola vez en una tabla de operandos y las
+columnas solo tienen su índice: un temporal que aparece en tres
+instrucciones es un único objeto.
+
+Se comporta como una secuencia de `TACInstruction` de solo lectura:
+`buffer[i]` crea una vista (una instrucción efímera) a partir de las columnas,
+así que los backends, `TACGenerator.format_output` y la pestaña de código de
+la UI funcionan sin cambios. Las pasadas que solo necesitan recorrer las
+operaciones usan las columnas directamente (`codigos`, `posiciones`) sin crear
+instrucciones:
+
+    >>> tac = TACGenerator(compacto=True).generate(ast)
+    >>> tac[0]
+    TACInstruction(op='LABEL', arg1=None, arg2=None, result=None, label=Label('func_main'))
+    >>> list(tac.posiciones('CALL'))
+    [5, 9]
+"""
+
+from array import array
+from collections.abc import Sequence
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from core.tac import TACInstruction, Const, Var, Temp, Label, Property
+from core.utils import TipoDato
+
+
+# Operaciones TAC; el código de una operación es su índice
+OPERACIONES = (
+    'LABEL', 'ASSIGN',
+    'ADD', 'SUB', 'MUL', 'DIV', 'MOD',
+    'LT', 'GT', 'LE', 'GE', 'EQ', 'NE',
+    'AND', 'OR', 'NOT', 'NEG',
+    'GOTO', 'IF_FALSE', 'PARAM', 'CALL', 'RETURN',
+    'ARRAY_LOAD', 'ARRAY_STORE',
+)
+CODIGOS = {op: codigo for codigo, op in enumerate(OPERACIONES)}
+
+# TipoDato por índice (la columna de tipos guarda el índice)
+_TIPOS = tuple(TipoDato)
+_INDICE_TIPO = {tipo: indice for indice, tipo in enumerate(_TIPOS)}
+
+# Operando, línea o tipo ausente (None en TACInstruction)
+_NINGUNO = -1
+
+# Operandos que son su propia clave en la tabla (se comparan por clase y texto)
+_CLAVE_PROPIA = frozenset([Temp, Label])
+
+
+def _clave(operando: Any):
+    """
+    Clave de un operando en la tabla de operandos.
+
+    Las variables incluyen el tipo: las homónimas de distinto tipo (en
+    funciones distintas) conservan cada una el suyo. Los literales incluyen
+    además la clase de su valor (el String "7" y el Int 7 se imprimen igual)
+    y las propiedades la clave de su objeto. El texto plano (nombre y número
+    de argumentos de CALL) lleva su clase para no confundirse con el operando
+    de igual texto.
+    """
+    clase = type(operando)
+    if clase in _CLAVE_PROPIA:
+        return operando
+    if clase is Const:
+        return (Const, operando.texto, operando.tipo, type(operando.valor))
+    if clase is Property:
+        return (Property, operando.texto, operando.tipo, _clave(operando.objeto))
+    if clase is Var:
+        return (Var, operando.texto, operando.tipo, operando.es_global)
+    return (clase, str(operando), getattr(operando, 'tipo', None))
+
+
+class TACBuffer(Sequence):
+    """
+    Secuencia de instrucciones TAC almacenada en columnas.
+
+    Example:
+        >>> buffer = TACBuffer.desde_instrucciones(instrucciones)
+        >>> buffer.op(0)
+        'LABEL'
+        >>> buffer[1] == instrucciones[1]
+        True
+    """
+
+    __slots__ = ('codigos', 'args1', 'args2', 'resultados', 'etiquetas', 'lineas', 'tipos',
+                 'operandos', '_indices')
+
+    def __init__(self):
+        """Inicializa un buffer vacío."""
+        self.codigos = array('B')
+        self.args1 = array('i')
+        self.args2 = array('i')
+        self.resultados = array('i')
+        self.etiquetas = array('i')
+        self.lineas = array('i')
+        self.tipos = array('b')
+        # Tabla de operandos: cada operando distinto una sola vez
+        self.operandos: List[Any] = []
+        self._indices: Dict[Any, int] = {}
+
+    @classmethod
+    def desde_instrucciones(cls, instrucciones: Iterable[TACInstruction]) -> 'TACBuffer':
+        """
+        Copia una secuencia de instrucciones TAC a un buffer.
+
+        Args:
+            instrucciones: Instrucciones en orden
+
+        Returns:
+            Buffer con las mismas instrucciones
+        """
+        buffer = cls()
+        for inst in instrucciones:
+            buffer.agregar(inst.op, inst.arg1, inst.arg2, inst.result, inst.label,
+                           inst.linea, inst.tipo)
+        return buffer
+
+    def agregar(self, op: str, arg1: Any = None, arg2: Any = None, result: Any = None,
+                label: Any = None, linea: Optional[int] = None, tipo: Optional[TipoDato] = None):
+        """
+        Agrega una instrucción al final del buffer.
+
+        Args:
+            op: Operación (ver OPERACIONES)
+            arg1, arg2, result, label: Operandos (`Operand`, texto o None)
+            linea: Línea del código fuente
+            tipo: Tipo de la operación (ver TACInstruction)
+
+        Raises:
+            ValueError: Si la operación no es una operación TAC
+        """
+        codigo = CODIGOS.get(op)
+        if codigo is None:
+            raise ValueError(f"Operación TAC desconocida: {op}")
+        self.codigos.append(codigo)
+        self.args1.append(self.internar(arg1))
+        self.args2.append(self.internar(arg2))
+        self.resultados.append(self.internar(result))
+        self.etiquetas.append(self.internar(label))
+        self.lineas.append(_NINGUNO if linea is None else linea)
+        self.tipos.append(_NINGUNO if tipo is None else _INDICE_TIPO[tipo])
+
+    def internar(self, operando: Any) -> int:
+        """
+        Índice de un operando en la tabla de operandos (lo agrega si es nuevo).
+
+        Dos operandos son el mismo si tienen la misma clave (ver `_clave`):
+        misma clase, texto y tipo, y para los literales la misma clase de
+        valor.
+
+        Returns:
+            Índice del operando, o -1 para None
+        """
+        if operando is None:
+            return _NINGUNO
+        clave = operando if type(operando) in _CLAVE_PROPIA else _clave(operando)
+        indice = self._indices.get(clave)
+        if indice is None:
+            indice = len(self.operandos)
+            self.operandos.append(operando)
+            self._indices[clave] = indice
+        return indice
+
+    # ========== Acceso por columnas (sin crear instrucciones) ==========
+
+    def op(self, indice: int) -> str:
+        """Operación de la instrucción en `indice`."""
+        return OPERACIONES[self.codigos[indice]]
+
+    def operando(self, id_operando: int) -> Any:
+        """Operando de la tabla por su índice (None para -1)."""
+        return None if id_operando == _NINGUNO else self.operandos[id_operando]
+
+    def linea(self, indice: int) -> Optional[int]:
+        """Línea de la instrucción (None si no tiene)."""
+        linea = self.lineas[indice]
+        return None if linea == _NINGUNO else linea
+
+    def tipo(self, indice: int) -> Optional[TipoDato]:
+        """Tipo de la instrucción (None si no tiene)."""
+        tipo = self.tipos[indice]
+        return None if tipo == _NINGUNO else _TIPOS[tipo]
+
+    def posiciones(self, *ops: str) -> Iterator[int]:
+        """
+        Índices de las instrucciones con alguna de las operaciones dadas.
+
+        Recorre solo la columna de operaciones.
+        """
+        buscados = {CODIGOS[op] for op in ops}
+        if len(buscados) == 1:
+            codigo = buscados.pop()
+            codigos = self.codigos
+            inicio = 0
+            # array.index busca en C
+            while True:
+                try:
+                    inicio = codigos.index(codigo, inicio)
+                except ValueError:
+                    return
+                yield inicio
+                inicio += 1
+        else:
+            for indice, codigo in enumerate(self.codigos):
+                if codigo in buscados:
+                    yield indice
+
+    def contar(self, op: str) -> int:
+        """Número de instrucciones con la operación dada."""
+        return self.codigos.count(CODIGOS[op])
+
+    # ========== Protocolo de secuencia ==========
+
+    def __len__(self) -> int:
+        return len(self.codigos)
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return self._cortar(indice)
+        if indice < 0:
+            indice += len(self.codigos)
+        operando = self.operando
+        return TACInstruction(
+            OPERACIONES[self.codigos[indice]],
+            operando(self.args1[indice]),
+            operando(self.args2[indice]),
+            operando(self.resultados[indice]),
+            operando(self.etiquetas[indice]),
+            self.linea(indice),
+            self.tipo(indice),
+        )
+
+    def __iter__(self) -> Iterator[TACInstruction]:
+        for indice in range(len(self.codigos)):
+            yield self[indice]
+
+    def _cortar(self, corte: slice) -> 'TACBuffer':
+        """Buffer con las instrucciones de un corte (comparte la tabla de operandos)."""
+        buffer = TACBuffer()
+        buffer.codigos = self.codigos[corte]
+        buffer.args1 = self.args1[corte]
+        buffer.args2 = self.args2[corte]
+        buffer.resultados = self.resultados[corte]
+        buffer.etiquetas = self.etiquetas[corte]
+        buffer.lineas = self.lineas[corte]
+        buffer.tipos = self.tipos[corte]
+        buffer.operandos = self.operandos
+        buffer._indices = self._indices
+        return buffer
+
+    def __eq__(self, otro):
+        if isinstance(otro, TACBuffer) or isinstance(otro, list):
+            return len(self) == len(otro) and all(a == b for a, b in zip(self, otro))
+        return NotImplemented
+
+    def __getstate__(self):
+        return {nombre: getattr(self, nombre) for nombre in self.__slots__ if nombre != '_indices'}
+
+    def __setstate__(self, estado):
+        for nombre, valor in estado.items():
+            setattr(self, nombre, valor)
+        self._indices = {_clave(op): indice for indice, op in enumerate(self.operandos)}
+
+    def nbytes(self) -> int:
+        """Memoria aproximada de las columnas (sin la tabla de operandos)."""
+        return sum(c.itemsize * len(c) for c in
+                   (self.codigos, self.args1, self.args2, self.resultados,
+                    self.etiquetas, self.lineas, self.tipos))
+
+    def __repr__(self) -> str:
+        return f"TACBuffer({len(self)} instrucciones, {len(self.operandos)} operandos)"
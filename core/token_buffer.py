@@ -0,0 +1,229 @@
+"""
+Buffer compacto de tokens.
+
+En lugar de un objeto `Token` por token, `TokenBuffer` guarda tipo, offset de
+inicio, longitud, línea y columna en columnas paralelas `array('i')` (20 bytes
+por token) y los valores convertidos de los literales (enteros, decimales y
+cadenas sin comillas) en una tabla aparte. El resto de valores se obtiene
+recortando el código fuente.
+
+Se comporta como una secuencia de `Token` de solo lectura: `buffer[i]` crea
+una vista (un `Token` efímero) a partir de las columnas, así que `Parser` y
+`ConsolePanel.show_tokens` funcionan sin cambios. Los cortes (`buffer[a:b]`)
+devuelven otro `TokenBuffer` que comparte el código fuente.
+
+`TokenRingBuffer` es la alternativa para flujos (`Lexer.iter_tokens`): guarda
+solo una ventana circular de tokens alrededor de la posición del parser.
+"""
+
+from array import array
+from sys import intern
+from collections.abc import Sequence
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from core.utils import Token, TipoToken
+
+
+# TipoToken por valor del enum (auto() empieza en 1)
+_TIPOS = [None] * (max(t.value for t in TipoToken) + 1)
+for _tipo in TipoToken:
+    _TIPOS[_tipo.value] = _tipo
+del _tipo
+
+
+class TokenBuffer(Sequence):
+    """
+    Secuencia de tokens almacenada en columnas.
+
+    Example:
+        >>> buffer = Lexer().tokenizar("val x: Int = 5")
+        >>> buffer[0].tipo
+        <TipoToken.VAL: 2>
+        >>> buffer.tipo(-1)
+        <TipoToken.EOF: 49>
+    """
+
+    __slots__ = ('fuente', 'tipos', 'inicios', 'longitudes', 'lineas', 'columnas', 'valores', '_linea')
+
+    def __init__(self, fuente: str = ""):
+        """
+        Inicializa un buffer vacío.
+
+        Args:
+            fuente: Código fuente del que se recortan los valores de los tokens
+        """
+        self.fuente = fuente
+        self.tipos = array('i')
+        self.inicios = array('i')
+        self.longitudes = array('i')
+        self.lineas = array('i')
+        self.columnas = array('i')
+        # Valores que no son el texto del token (literales convertidos, EOF)
+        self.valores: Dict[int, Any] = {}
+        # Último número de línea entregado: los tokens consecutivos de una línea
+        # (y los nodos del AST creados con ellos) comparten el mismo objeto int
+        self._linea = 0
+
+    def agregar(self, tipo: TipoToken, inicio: int, longitud: int, linea: int, columna: int,
+                valor: Any = None, con_valor: bool = False):
+        """
+        Agrega un token al final del buffer.
+
+        Args:
+            tipo: Tipo del token
+            inicio: Offset del token en el código fuente
+            longitud: Longitud del texto del token
+            linea: Línea (1-based)
+            columna: Columna (1-based)
+            valor: Valor del token si no es su texto
+            con_valor: Si `valor` debe guardarse en la tabla de valores
+        """
+        if con_valor:
+            self.valores[len(self.tipos)] = valor
+        self.tipos.append(tipo.value)
+        self.inicios.append(inicio)
+        self.longitudes.append(longitud)
+        self.lineas.append(linea)
+        self.columnas.append(columna)
+
+    # ========== Acceso por columnas (sin crear Tokens) ==========
+
+    def tipo(self, indice: int) -> TipoToken:
+        """Tipo del token en `indice`."""
+        return _TIPOS[self.tipos[indice]]
+
+    def valor(self, indice: int) -> Any:
+        """Valor del token en `indice` (literal convertido o texto)."""
+        if indice < 0:
+            indice += len(self.tipos)
+        if indice in self.valores:
+            return self.valores[indice]
+        inicio = self.inicios[indice]
+        return intern(self.fuente[inicio:inicio + self.longitudes[indice]])
+
+    def texto(self, indice: int) -> str:
+        """Texto fuente del token en `indice`."""
+        inicio = self.inicios[indice]
+        return self.fuente[inicio:inicio + self.longitudes[indice]]
+
+    # ========== Protocolo de secuencia ==========
+
+    def __len__(self) -> int:
+        return len(self.tipos)
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return self._cortar(indice)
+        if indice < 0:
+            indice += len(self.tipos)
+        linea = self.lineas[indice]
+        if linea == self._linea:
+            linea = self._linea
+        else:
+            self._linea = linea
+        return Token(_TIPOS[self.tipos[indice]], self.valor(indice), linea, self.columnas[indice])
+
+    def __iter__(self) -> Iterator[Token]:
+        for indice in range(len(self.tipos)):
+            yield self[indice]
+
+    def __repr__(self) -> str:
+        return f"TokenBuffer({len(self)} tokens)"
+
+    def _cortar(self, corte: slice):
+        inicio, fin, paso = corte.indices(len(self.tipos))
+        if paso != 1:
+            return [self[i] for i in range(inicio, fin, paso)]
+
+        nuevo = TokenBuffer(self.fuente)
+        nuevo.tipos = self.tipos[inicio:fin]
+        nuevo.inicios = self.inicios[inicio:fin]
+        nuevo.longitudes = self.longitudes[inicio:fin]
+        nuevo.lineas = self.lineas[inicio:fin]
+        nuevo.columnas = self.columnas[inicio:fin]
+        nuevo.valores = {i - inicio: v for i, v in self.valores.items() if inicio <= i < fin}
+        return nuevo
+
+    # ========== Serialización ==========
+
+    def __getstate__(self):
+        return (self.fuente, self.tipos.tobytes(), self.inicios.tobytes(),
+                self.longitudes.tobytes(), self.lineas.tobytes(), self.columnas.tobytes(),
+                self.valores)
+
+    def __setstate__(self, estado):
+        self.fuente = estado[0]
+        for nombre, datos in zip(('tipos', 'inicios', 'longitudes', 'lineas', 'columnas'), estado[1:6]):
+            columna = array('i')
+            columna.frombytes(datos)
+            setattr(self, nombre, columna)
+        self.valores = estado[6]
+        self._linea = 0
+
+    def nbytes(self) -> int:
+        """Memoria aproximada de las columnas (sin el código fuente ni la tabla de valores)."""
+        return sum(c.itemsize * len(c) for c in
+                   (self.tipos, self.inicios, self.longitudes, self.lineas, self.columnas))
+
+
+class TokenRingBuffer:
+    """
+    Ventana acotada sobre un iterador de tokens.
+
+    Los tokens se piden al iterador a medida que se consultan y se indexan por
+    su posición absoluta en el flujo. Solo se conservan los últimos `capacidad`
+    tokens leídos, así que el lookahead y el retroceso del parser deben caber en
+    la ventana; consultar un token ya descartado lanza IndexError.
+
+    Example:
+        >>> flujo = TokenRingBuffer(Lexer().iter_tokens(b"fun main() {}"))
+        >>> flujo.obtener(1).valor
+        'main'
+    """
+
+    __slots__ = ('_iterador', '_ventana', '_capacidad', 'leidos', 'agotado')
+
+    def __init__(self, tokens: Iterable[Token], capacidad: int = 8):
+        """
+        Inicializa la ventana.
+
+        Args:
+            tokens: Iterador (o iterable) de tokens
+            capacidad: Tokens que se conservan (lookahead + retroceso + 1)
+        """
+        if capacidad < 2:
+            raise ValueError("La capacidad del buffer circular debe ser al menos 2")
+        self._iterador = iter(tokens)
+        self._ventana: List[Optional[Token]] = [None] * capacidad
+        self._capacidad = capacidad
+        self.leidos = 0
+        self.agotado = False
+
+    def obtener(self, posicion: int) -> Optional[Token]:
+        """
+        Token en una posición absoluta del flujo.
+
+        Args:
+            posicion: Índice del token desde el inicio del flujo
+
+        Returns:
+            El token, o None si la posición es negativa o el flujo terminó antes
+        """
+        if posicion < 0:
+            return None
+        if posicion < self.leidos - self._capacidad:
+            raise IndexError(f"Token {posicion} fuera de la ventana de {self._capacidad} tokens")
+        while posicion >= self.leidos:
+            if self.agotado:
+                return None
+            try:
+                token = next(self._iterador)
+            except StopIteration:
+                self.agotado = True
+                return None
+            self._ventana[self.leidos % self._capacidad] = token
+            self.leidos += 1
+        return self._ventana[posicion % self._capacidad]
+
+    def __repr__(self) -> str:
+        return f"TokenRingBuffer({self.leidos} leidos, capacidad {self._capacidad})"
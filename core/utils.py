@@ -4,7 +4,8 @@ Contiene estructuras de datos y funciones auxiliares.
 """
 
 from dataclasses import dataclass
-from typing import Any, List, Optional
+from types import MappingProxyType
+from typing import Any, List, Optional, Sequence
 from enum import Enum, auto
 
 
@@ -109,25 +110,75 @@ class TipoNodo(Enum):
     RETURN = auto()
 
 
-@dataclass
-class NodoAST:
-    """Nodo base del árbol sintáctico abstracto."""
-    tipo: TipoNodo
-    valor: Any = None
-    hijos: List['NodoAST'] = None
-    linea: int = None
-    columna: int = None
-    metadata: dict = None
+# Centinelas compartidos por los nodos sin hijos o sin metadata (de solo lectura:
+# agregar_hijo y la asignación de `metadata` los reemplazan por objetos propios)
+SIN_HIJOS = ()
+SIN_METADATA = MappingProxyType({})
+
+# Hasta este número de hijos se guardan en una tupla exacta; después, en una lista
+MAX_HIJOS_TUPLA = 4
 
-    def __post_init__(self):
-        if self.hijos is None:
-            self.hijos = []
-        if self.metadata is None:
-            self.metadata = {}
+
+class NodoAST:
+    """
+    Nodo base del árbol sintáctico abstracto.
+
+    Usa __slots__ y comparte SIN_HIJOS/SIN_METADATA entre las hojas, así que un
+    literal o una variable no reservan lista ni diccionario propios. Los nodos
+    con pocos hijos (operaciones, if, asignaciones) los guardan en una tupla del
+    tamaño justo; los bloques y programas pasan a una lista al crecer. `hijos`
+    es por tanto una secuencia de solo lectura: para agregar se usa agregar_hijo.
+
+    `enlace` lo completa el análisis semántico en los nodos que nombran una
+    variable (declaraciones, referencias, asignaciones y el for): es el
+    `Simbolo` al que se resolvió el nombre. `tipo_dato` es el tipo que el
+    análisis semántico infirió para los nodos de expresión. Ninguno de los dos
+    participa en la igualdad.
+    """
+
+    __slots__ = ('tipo', 'valor', 'hijos', 'linea', 'columna', 'metadata', 'enlace', 'tipo_dato')
+
+    def __init__(self, tipo: 'TipoNodo', valor: Any = None, hijos: Optional[Sequence['NodoAST']] = None,
+                 linea: int = None, columna: int = None, metadata: dict = None):
+        self.tipo = tipo
+        self.valor = valor
+        self.hijos = SIN_HIJOS if hijos is None else hijos
+        self.linea = linea
+        self.columna = columna
+        self.metadata = SIN_METADATA if metadata is None else metadata
+        self.enlace: Optional['Simbolo'] = None
+        self.tipo_dato: Optional['TipoDato'] = None
 
     def agregar_hijo(self, hijo: 'NodoAST'):
         """Agrega un hijo al nodo."""
-        self.hijos.append(hijo)
+        hijos = self.hijos
+        if hijos.__class__ is list:
+            hijos.append(hijo)
+        elif len(hijos) < MAX_HIJOS_TUPLA:
+            self.hijos = hijos + (hijo,)
+        else:
+            self.hijos = [*hijos, hijo]
+
+    def __eq__(self, otro):
+        if not isinstance(otro, NodoAST):
+            return NotImplemented
+        return (self.tipo == otro.tipo and self.valor == otro.valor
+                and self.linea == otro.linea and self.columna == otro.columna
+                and dict(self.metadata) == dict(otro.metadata)
+                and list(self.hijos) == list(otro.hijos))
+
+    __hash__ = None
+
+    def __getstate__(self):
+        return (self.tipo, self.valor, self.hijos, self.linea, self.columna,
+                dict(self.metadata) if self.metadata else None, self.enlace, self.tipo_dato)
+
+    def __setstate__(self, estado):
+        self.tipo, self.valor, hijos, self.linea, self.columna, metadata = estado[:6]
+        self.hijos = hijos if hijos else SIN_HIJOS
+        self.metadata = metadata if metadata else SIN_METADATA
+        self.enlace = estado[6] if len(estado) > 6 else None
+        self.tipo_dato = estado[7] if len(estado) > 7 else None
 
     def __repr__(self, nivel=0):
         indent = "  " * nivel
@@ -211,6 +262,9 @@ class Simbolo:
     columna: int
     valor: Any = None
     inicializada: bool = False  # True si la variable tiene un valor asignado
+    id: int = -1  # Enlace único asignado por el análisis semántico
+    profundidad: int = 0  # Profundidad del scope donde se declaró (0 = global)
+    oculta: bool = False  # True si oculta otro símbolo visible con el mismo nombre
 
     def __repr__(self):
         return f"Simbolo({self.nombre}, {self.tipo.value}, {'val' if self.es_constante else 'var'})"
@@ -222,6 +276,7 @@ class TablaSimbolos:
     def __init__(self, padre: Optional['TablaSimbolos'] = None):
         self.simbolos = {}
         self.padre = padre
+        self.profundidad = padre.profundidad + 1 if padre is not None else 0
 
     def declarar(self, simbolo: Simbolo):
         """Declara un nuevo símbolo en la tabla."""
@@ -232,10 +287,12 @@ class TablaSimbolos:
 
     def buscar(self, nombre: str) -> Optional[Simbolo]:
         """Busca un símbolo en la tabla o en las tablas padre."""
-        if nombre in self.simbolos:
-            return self.simbolos[nombre]
-        if self.padre:
-            return self.padre.buscar(nombre)
+        tabla = self
+        while tabla is not None:
+            simbolo = tabla.simbolos.get(nombre)
+            if simbolo is not None:
+                return simbolo
+            tabla = tabla.padre
         return None
 
     def existe(self, nombre: str) -> bool:
@@ -0,0 +1,183 @@
+"""
+Recorrido del AST con despacho por tabla y pila explícita.
+
+`ASTVisitor` reemplaza las cadenas if/elif sobre `nodo.tipo`: al definir una
+subclase se arma una tabla TipoNodo -> método (por nombre, `visitar_<tipo>`,
+o con el diccionario `METODOS`) y `visitar` la consulta con un solo acceso.
+Los tipos sin método van a `visitar_generico`.
+
+Los métodos de visita pueden ser funciones normales, que devuelven su
+resultado directamente, o generadores, que piden la visita de un hijo con
+`yield` y reciben su resultado:
+
+    class Tipos(ASTVisitor):
+        def visitar_expresion_literal(self, nodo):
+            return type(nodo.valor).__name__
+
+        def visitar_expresion_binaria(self, nodo):
+            izquierdo = yield nodo.hijos[0]
+            derecho = yield nodo.hijos[1]
+            return izquierdo if izquierdo == derecho else 'Unknown'
+
+`visitar` ejecuta los generadores sobre una pila propia y no sobre la pila de
+Python, así que la profundidad del árbol no está limitada por el límite de
+recursión. Los auxiliares que también visitan hijos se escriben como
+generadores y se llaman con `yield from`. Las excepciones de la visita de un
+hijo se lanzan dentro del generador que la pidió, como en una llamada normal.
+"""
+
+from types import GeneratorType
+from typing import Any, Callable, Dict, Iterator, List
+
+from core.utils import MAX_HIJOS_TUPLA, NodoAST, TipoNodo
+
+
+def iterar_nodos(raiz: NodoAST) -> Iterator[NodoAST]:
+    """
+    Recorre un subárbol en preorden sin recursión.
+
+    Args:
+        raiz: Nodo inicial (se incluye en el recorrido)
+
+    Yields:
+        Cada nodo del subárbol, el padre antes que sus hijos
+    """
+    pendientes = [raiz]
+    while pendientes:
+        nodo = pendientes.pop()
+        yield nodo
+        if nodo.hijos:
+            pendientes.extend(reversed(nodo.hijos))
+
+
+class ASTVisitor:
+    """
+    Base de las pasadas que recorren el AST.
+
+    Attributes:
+        PREFIJO: Prefijo de los métodos que se registran por nombre
+        METODOS: Métodos registrados explícitamente (TipoNodo -> nombre del
+            método); tienen prioridad sobre los nombres con prefijo
+    """
+
+    PREFIJO = 'visitar_'
+    METODOS: Dict[TipoNodo, str] = {}
+
+    # Tabla de métodos indexada por el valor del TipoNodo, calculada una vez
+    # por clase (una lista evita el hash de Enum, que es código Python)
+    _despacho: List[Callable] = []
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._despacho = cls._construir_despacho()
+
+    @classmethod
+    def _construir_despacho(cls) -> List[Callable]:
+        """Arma la tabla de despacho de la clase."""
+        tabla = [cls.visitar_generico] * (max(tipo.value for tipo in TipoNodo) + 1)
+        for tipo in TipoNodo:
+            metodo = getattr(cls, cls.METODOS.get(tipo, cls.PREFIJO + tipo.name.lower()), None)
+            if metodo is not None:
+                tabla[tipo.value] = metodo
+        return tabla
+
+    def visitar(self, nodo: NodoAST) -> Any:
+        """
+        Visita un nodo y todo lo que su método pida visitar.
+
+        Args:
+            nodo: Nodo a visitar
+
+        Returns:
+            Resultado del método de visita del nodo
+        """
+        despacho = self._despacho
+        resultado = despacho[nodo.tipo._value_](self, nodo)
+        if type(resultado) is not GeneratorType:
+            return resultado
+
+        pila = [resultado]
+        enviar = resultado.send
+        valor = None
+        error = None
+        while True:
+            try:
+                if error is None:
+                    hijo = enviar(valor)
+                else:
+                    # La visita del último hijo falló: se lanza en quien la pidió
+                    excepcion, error = error, None
+                    hijo = pila[-1].throw(excepcion)
+            except StopIteration as fin:
+                pila.pop()
+                if not pila:
+                    return fin.value
+                valor = fin.value
+                enviar = pila[-1].send
+                continue
+            except Exception as excepcion:
+                pila.pop()
+                if not pila:
+                    raise
+                error = excepcion
+                enviar = pila[-1].send
+                continue
+
+            try:
+                valor = despacho[hijo.tipo._value_](self, hijo)
+            except Exception as excepcion:
+                error = excepcion
+                continue
+            if type(valor) is GeneratorType:
+                pila.append(valor)
+                enviar = valor.send
+                valor = None
+
+    def visitar_generico(self, nodo: NodoAST) -> Any:
+        """Método para los tipos de nodo sin método propio (no visita los hijos)."""
+        return None
+
+    def visitar_hijos(self, nodo: NodoAST):
+        """
+        Generador auxiliar que visita los hijos en orden (usar con `yield from`).
+
+        Returns:
+            Lista con el resultado de cada hijo
+        """
+        resultados = []
+        for hijo in nodo.hijos:
+            resultados.append((yield hijo))
+        return resultados
+
+
+class ASTTransformer(ASTVisitor):
+    """
+    Visitante que reescribe el árbol.
+
+    Cada método devuelve el nodo que reemplaza al visitado: el mismo nodo si no
+    cambia, otro nodo, o None para quitarlo de los hijos de su padre. Por
+    omisión se transforman los hijos y se conserva el nodo (modificado en su
+    lugar si algún hijo cambió).
+    """
+
+    def visitar_generico(self, nodo: NodoAST) -> Any:
+        if not nodo.hijos:
+            return nodo
+        return self.transformar_hijos(nodo)
+
+    def transformar_hijos(self, nodo: NodoAST):
+        """Generador auxiliar que reemplaza los hijos por su transformación."""
+        hijos = []
+        cambio = False
+        for hijo in nodo.hijos:
+            nuevo = yield hijo
+            if nuevo is not hijo:
+                cambio = True
+            if nuevo is not None:
+                hijos.append(nuevo)
+        if cambio:
+            nodo.hijos = tuple(hijos) if len(hijos) <= MAX_HIJOS_TUPLA else hijos
+        return nodo
+
+
+ASTVisitor._despacho = ASTVisitor._construir_despacho()
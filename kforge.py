@@ -0,0 +1,120 @@
+"""
+KForge - Compilador Kotlin (Linea de comandos)
+Punto de entrada sin interfaz grafica.
+
+Uso:
+    python kforge.py build <directorio> [-o salida] [-j procesos] [--cache-dir dir]
+    python kforge.py serve [--address host:puerto|unix:/ruta] [-j procesos] [--cache-dir dir]
+    python kforge.py bench [--sizes 1000,10000] [--repeat n] [-o resultados.json]
+"""
+
+import sys
+import os
+import json
+import argparse
+
+# Agregar el directorio actual al path para importaciones
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def cmd_build(args) -> int:
+    """Compila todos los .kt de un directorio y escribe el resumen JSON."""
+    from core.batch import compile_directory
+
+    if not os.path.exists(args.source):
+        print(f"Error: no existe {args.source}", file=sys.stderr)
+        return 2
+
+    resumen = compile_directory(
+        args.source,
+        args.output,
+        jobs=args.jobs,
+        cache_dir=args.cache_dir,
+        java_version=args.java_version,
+        metricas=args.metrics
+    )
+
+    summary_path = args.summary or os.path.join(args.output, "kforge-build.json")
+    os.makedirs(os.path.dirname(os.path.abspath(summary_path)), exist_ok=True)
+    with open(summary_path, 'w', encoding='utf-8') as f:
+        json.dump(resumen, f, indent=2, ensure_ascii=False)
+
+    for archivo in resumen["files"]:
+        if not archivo["exito"]:
+            print(f"[ERROR] {archivo['source']}")
+            for error in archivo["errores"]:
+                print(f"    {error}")
+
+    if args.metrics:
+        for fase, total in resumen["metricas"].items():
+            print(f"  {fase:<12}{total['wall_ms']:>10.1f} ms  {total['cpu_ms']:>10.1f} ms CPU  "
+                  f"pico {total['peak_bytes'] / 1024:.0f} KB")
+
+    print(f"{resumen['compiled']}/{resumen['total']} archivos compilados "
+          f"en {resumen['wall_time_ms']:.0f} ms con {resumen['jobs']} procesos "
+          f"(resumen: {summary_path})")
+    return 0 if resumen["failed"] == 0 else 1
+
+
+def cmd_serve(args) -> int:
+    """Arranca el servidor de compilacion en primer plano."""
+    from core.server import CompileServer
+
+    servidor = CompileServer(args.address, workers=args.jobs, cache_dir=args.cache_dir)
+    print(f"Precalentando {servidor.workers} trabajadores...")
+    try:
+        servidor.start(background=False)
+    except KeyboardInterrupt:
+        print("\nServidor detenido por el usuario.")
+    return 0
+
+
+def cmd_bench(args) -> int:
+    """Ejecuta el benchmark de escalabilidad con programas sinteticos."""
+    from benchmarks.run import main_from_args
+    return main_from_args(args)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Construye el parser de argumentos de la linea de comandos."""
+    parser = argparse.ArgumentParser(prog="kforge", description="Compilador KForge (Kotlin -> JVM)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build = subparsers.add_parser("build", help="Compila todos los .kt de un directorio a .class")
+    build.add_argument("source", help="Directorio con archivos .kt (o un archivo .kt)")
+    build.add_argument("-o", "--output", default="build", help="Directorio de salida (default: build)")
+    build.add_argument("-j", "--jobs", type=int, default=None,
+                       help="Numero de procesos (default: numero de CPUs)")
+    build.add_argument("--cache-dir", default=None, help="Directorio de cache de compilacion")
+    build.add_argument("--java-version", type=int, default=6, choices=(6, 7, 8),
+                       help="Version de Java target (default: 6)")
+    build.add_argument("--summary", default=None,
+                       help="Ruta del resumen JSON (default: <salida>/kforge-build.json)")
+    build.add_argument("--metrics", action="store_true",
+                       help="Incluir tiempo, CPU, memoria y contadores por fase en el resumen")
+    build.set_defaults(func=cmd_build)
+
+    serve = subparsers.add_parser("serve", help="Servidor de compilacion con trabajadores precalentados")
+    serve.add_argument("--address", default=None,
+                       help="host:puerto, puerto o unix:/ruta (default: 127.0.0.1:7878)")
+    serve.add_argument("-j", "--jobs", type=int, default=None,
+                       help="Numero de procesos trabajadores (default: numero de CPUs)")
+    serve.add_argument("--cache-dir", default=None, help="Directorio de cache de compilacion")
+    serve.set_defaults(func=cmd_serve)
+
+    from benchmarks.run import add_arguments
+    bench = subparsers.add_parser("bench", help="Mide cada fase con programas sinteticos de varios tamaños")
+    add_arguments(bench)
+    bench.set_defaults(func=cmd_bench)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    """Funcion principal de la linea de comandos."""
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
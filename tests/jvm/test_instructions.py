@@ -211,6 +211,13 @@ def test_iload_istore_helpers():
     assert inst.opcode == JVMOpcode.ISTORE
     assert inst.operands == [5]
 
+    # A partir del slot 256 el indice es de 2 bytes con prefijo wide
+    assert iload(255).to_bytes() == bytes([0x15, 255])
+    assert iload(300).to_bytes() == bytes([0xC4, 0x15, 0x01, 0x2C])
+    assert istore(65535).to_bytes() == bytes([0xC4, 0x36, 0xFF, 0xFF])
+    assert dstore(256).to_bytes() == bytes([0xC4, 0x39, 0x01, 0x00])
+    assert aload(1000).to_bytes() == bytes([0xC4, 0x19, 0x03, 0xE8])
+
     print("  ✓ iload/istore helpers funcionan correctamente")
     print()
 
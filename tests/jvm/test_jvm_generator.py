@@ -13,7 +13,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 # Fix encoding para Windows
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
-from core.tac import TACInstruction
+from core.tac import TACInstruction, Const, Var, Temp, Property
 from core.jvm.jvm_generator import JVMGenerator, LocalVariableManager, StackDepthTracker
 from core.jvm.constant_pool import ConstantPool
 from core.jvm.instructions import JVMOpcode
@@ -313,6 +313,116 @@ def test_complex_expression():
     print()
 
 
+def test_typed_instructions():
+    """Test instrucciones segun el tipo anotado en el TAC."""
+    print("[TEST 11] Instrucciones tipadas")
+
+    cp = ConstantPool()
+    generator = JVMGenerator(cp)
+
+    # val x: Double = 1; arr[0] = x; t = arr[1] * 2; RETURN t (funcion Double)
+    tac = [
+        TACInstruction('ASSIGN', "1", None, "x", tipo=TipoDato.DOUBLE),
+        TACInstruction('ASSIGN', "datos", None, "arr", tipo=TipoDato.ARRAY_DOUBLE),
+        TACInstruction('ARRAY_STORE', "0", "x", "arr", tipo=TipoDato.DOUBLE),
+        TACInstruction('ARRAY_LOAD', "arr", "1", "t0", tipo=TipoDato.DOUBLE),
+        TACInstruction('ASSIGN', "2", None, "n", tipo=TipoDato.INT),
+        TACInstruction('MUL', "t0", "n", "t1", tipo=TipoDato.DOUBLE),
+        TACInstruction('GT', "t1", "x", "t2", tipo=TipoDato.DOUBLE),
+        TACInstruction('RETURN', "t1", tipo=TipoDato.DOUBLE),
+    ]
+
+    bytecode, max_stack, max_locals = generator.generate(tac)
+    opcodes = [inst.opcode for inst in generator.instructions]
+
+    for opcode in [JVMOpcode.DCONST_1, JVMOpcode.DASTORE, JVMOpcode.DALOAD, JVMOpcode.I2D,
+                   JVMOpcode.DMUL, JVMOpcode.DCMPL, JVMOpcode.IFGT, JVMOpcode.DRETURN]:
+        assert opcode in opcodes, f"Debe contener {opcode.name}"
+    for opcode in [JVMOpcode.IMUL, JVMOpcode.IALOAD, JVMOpcode.IRETURN]:
+        assert opcode not in opcodes, f"No debe contener {opcode.name}"
+
+    # Slots de ancho exacto: double 2, referencia e int 1
+    slots = generator.local_vars.var_to_slot
+    assert slots['datos'] == slots['x'] + 2, "x (double) ocupa 2 slots"
+    assert slots['arr'] == slots['datos'] + 1, "Una referencia ocupa 1 slot"
+    assert generator.local_vars.var_types['t2'] == TipoDato.BOOLEAN
+    assert max_stack >= 4, "Dos doubles en el stack ocupan 4"
+
+    # Referencias: areturn
+    generator = JVMGenerator(ConstantPool())
+    generator.generate([
+        TACInstruction('ASSIGN', "s0", None, "s", tipo=TipoDato.STRING),
+        TACInstruction('RETURN', "s", tipo=TipoDato.STRING),
+    ])
+    opcodes = [inst.opcode for inst in generator.instructions]
+    assert JVMOpcode.ARETURN in opcodes and JVMOpcode.ASTORE_1 in opcodes
+
+    print(f"  ✓ Opcodes double y conversiones generados")
+    print(f"  ✓ max_stack: {max_stack}, max_locals: {max_locals}")
+    print()
+
+
+def test_typed_operands():
+    """Test carga de operandos segun su clase (Const, Var, Property)."""
+    print("[TEST 12] Operandos tipados")
+
+    cp = ConstantPool()
+    generator = JVMGenerator(cp)
+
+    arr = Var("arr", TipoDato.ARRAY_INT)
+    texto = Var("s", TipoDato.STRING)
+    tac = [
+        TACInstruction('ASSIGN', Const("-2.5", -2.5, TipoDato.DOUBLE), None, Var("d", TipoDato.DOUBLE),
+                       tipo=TipoDato.DOUBLE),
+        TACInstruction('ASSIGN', Const("True", True, TipoDato.BOOLEAN), None, Var("b", TipoDato.BOOLEAN),
+                       tipo=TipoDato.BOOLEAN),
+        TACInstruction('ASSIGN', Const("hola", "hola", TipoDato.STRING), None, texto, tipo=TipoDato.STRING),
+        TACInstruction('ASSIGN', Property(arr, "size"), None, Temp("t0", TipoDato.INT), tipo=TipoDato.INT),
+        TACInstruction('ASSIGN', Property(texto, "length"), None, Temp("t1", TipoDato.INT), tipo=TipoDato.INT),
+    ]
+
+    generator.generate(tac)
+    opcodes = [inst.opcode for inst in generator.instructions]
+
+    # -2.5 es una constante double (no una variable ni un int)
+    assert opcodes[0] == JVMOpcode.LDC2_W, "-2.5 se carga con ldc2_w"
+    assert generator.local_vars.var_types['d'] == TipoDato.DOUBLE
+    assert JVMOpcode.ICONST_1 in opcodes, "true se carga como 1"
+    assert JVMOpcode.LDC in opcodes, "Un String literal se carga con ldc"
+    assert JVMOpcode.ARRAYLENGTH in opcodes, "arr.size usa arraylength"
+    assert JVMOpcode.INVOKEVIRTUAL in opcodes, "s.length llama a String.length()"
+    assert "b" in generator.local_vars.var_to_slot and "True" not in generator.local_vars.var_to_slot
+
+    print(f"  ✓ Constantes, propiedades y variables cargadas por clase de operando")
+    print()
+
+
+def test_method_limits():
+    """Test slots con wide y limites de un metodo."""
+    print("[TEST 13] Limites del metodo")
+
+    # 300 variables: las del slot 256 en adelante se acceden con wide
+    tac = [TACInstruction('ASSIGN', Const(str(i), i, TipoDato.INT), None, Var(f"v{i}", TipoDato.INT),
+                          tipo=TipoDato.INT) for i in range(300)]
+    generator = JVMGenerator(ConstantPool())
+    bytecode, _, max_locals = generator.generate(tac)
+    assert max_locals == 300
+    assert generator.instructions[-1].opcode == JVMOpcode.WIDE
+    assert bytecode.endswith(bytes([0xC4, 0x36, 0x01, 0x2B]))  # wide istore 299
+
+    # Un metodo de mas de 64 KiB de codigo no es valido: error en lugar de un .class corrupto
+    tac = [TACInstruction('ASSIGN', Const("1000", 1000, TipoDato.INT), None, Var("x", TipoDato.INT),
+                          tipo=TipoDato.INT)] * 20000
+    try:
+        JVMGenerator(ConstantPool()).generate(tac)
+        assert False, "Debe rechazar mas de 65535 bytes de codigo"
+    except ValueError as e:
+        assert "65535" in str(e)
+
+    print(f"  ✓ wide para slots >= 256 y error al exceder 64 KiB de codigo")
+    print()
+
+
 def run_all_tests():
     """Ejecuta todos los tests."""
     print("=" * 70)
@@ -330,6 +440,9 @@ def run_all_tests():
     test_if_false()
     test_return_statement()
     test_complex_expression()
+    test_typed_instructions()
+    test_typed_operands()
+    test_method_limits()
 
     print("=" * 70)
     print("TODOS LOS TESTS PASARON EXITOSAMENTE")
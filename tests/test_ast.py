@@ -0,0 +1,107 @@
+"""
+Tests para la representación compacta del AST (NodoAST con __slots__ y ASTArena).
+"""
+
+import sys
+import os
+import pickle
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.lexer import Lexer
+from core.parser import Parser
+from core.ast_arena import ASTArena
+from core.utils import NodoAST, TipoNodo, SIN_HIJOS, SIN_METADATA
+from benchmarks.generator import generate_program
+
+
+def parsear(codigo):
+    return Parser(Lexer().tokenizar(codigo)).parsear()
+
+
+def test_hojas_comparten_centinelas():
+    """Las hojas no reservan lista de hijos ni diccionario de metadata"""
+    print("\n[TEST] Centinelas compartidos")
+    a = NodoAST(TipoNodo.EXPRESION_LITERAL, 1)
+    b = NodoAST(TipoNodo.EXPRESION_VARIABLE, "x")
+    assert a.hijos is SIN_HIJOS and b.hijos is SIN_HIJOS
+    assert a.metadata is SIN_METADATA and not a.metadata
+    assert not hasattr(a, '__dict__')
+    try:
+        a.metadata['tipo'] = 'Int'
+        assert False, "La metadata compartida debe ser de solo lectura"
+    except TypeError:
+        pass
+
+
+def test_agregar_hijo():
+    """Tupla exacta para pocos hijos, lista al crecer"""
+    print("\n[TEST] agregar_hijo")
+    nodo = NodoAST(TipoNodo.BLOQUE)
+    hojas = [NodoAST(TipoNodo.EXPRESION_LITERAL, i) for i in range(10)]
+    nodo.agregar_hijo(hojas[0])
+    nodo.agregar_hijo(hojas[1])
+    assert nodo.hijos == (hojas[0], hojas[1])
+    for hoja in hojas[2:]:
+        nodo.agregar_hijo(hoja)
+    assert isinstance(nodo.hijos, list) and nodo.hijos == hojas
+
+
+def test_igualdad_y_pickle():
+    """Igualdad estructural y serialización"""
+    print("\n[TEST] Igualdad y pickle")
+    codigo = generate_program(100, seed=7)
+    ast = parsear(codigo)
+    assert ast == parsear(codigo)
+    copia = pickle.loads(pickle.dumps(ast))
+    assert copia == ast
+    assert parsear("val x: Int = 1") != parsear("val x: Int = 2")
+
+
+def test_arena():
+    """La arena reproduce el árbol y sus hijos son índices consecutivos"""
+    print("\n[TEST] ASTArena")
+    ast = parsear(generate_program(200, seed=3))
+    arena = ASTArena.desde_arbol(ast)
+    assert arena.tipo(0) == TipoNodo.PROGRAMA
+    assert len(arena.hijos(0)) == len(ast.hijos)
+    assert arena.nodo() == ast
+
+    primera = arena.hijos(0)[0]
+    assert arena.nodo(primera) == ast.hijos[0]
+    declaraciones = [i for i in range(len(arena)) if arena.tipo(i) == TipoNodo.DECLARACION_VARIABLE]
+    assert declaraciones and all(arena.metadata(i).get('tipo') for i in declaraciones)
+    print(f"  [OK] {len(arena)} nodos, {arena.nbytes() // 1024} KiB en columnas")
+
+
+def test_fases_sobre_ast_compacto():
+    """Semántico y TAC funcionan sobre el AST compacto"""
+    print("\n[TEST] Fases sobre el AST compacto")
+    from core.pipeline import CompilationPipeline
+    pipeline = CompilationPipeline()
+    pipeline.cargar(generate_program(300, seed=1))
+    pipeline.ejecutar_hasta('bytecode')
+    assert not pipeline.error_manager.tiene_errores(), pipeline.error_manager.errores[:3]
+    assert pipeline.tac_instructions and pipeline.bytecode_instructions
+
+
+def run_all_tests():
+    """Ejecuta todos los tests del AST compacto"""
+    print("=" * 70)
+    print("TESTS DE AST COMPACTO")
+    print("=" * 70)
+
+    test_hojas_comparten_centinelas()
+    test_agregar_hijo()
+    test_igualdad_y_pickle()
+    test_arena()
+    test_fases_sobre_ast_compacto()
+
+    print("\n" + "=" * 70)
+    print("[OK] TODOS LOS TESTS DE AST COMPACTO PASARON")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,128 @@
+"""
+Tests para la compilación por lotes (core/batch.py) y el comando `kforge build`.
+"""
+
+import sys
+import os
+import json
+import tempfile
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.batch import compile_directory, find_sources, class_name_for
+import kforge
+
+
+PROGRAMA_OK = """
+fun main() {
+    val x: Int = {n}
+    val y: Int = x * 2
+    println(y)
+}
+"""
+
+PROGRAMA_ERROR = """
+fun main() {
+    val x: Int = y
+}
+"""
+
+
+def crear_fuentes(directorio: Path):
+    """Crea un árbol de fuentes .kt de prueba (uno con errores)."""
+    (directorio / "sub").mkdir(parents=True)
+    for i in range(4):
+        (directorio / f"prog{i}.kt").write_text(PROGRAMA_OK.replace("{n}", str(i)), encoding='utf-8')
+    (directorio / "sub" / "2-malo.kt").write_text(PROGRAMA_ERROR, encoding='utf-8')
+    (directorio / "notas.txt").write_text("no es kotlin", encoding='utf-8')
+
+
+def test_find_sources_y_nombres():
+    """Solo se recogen .kt y los nombres de clase son identificadores válidos"""
+    print("\n[TEST] Búsqueda de fuentes")
+    with tempfile.TemporaryDirectory() as tmp:
+        crear_fuentes(Path(tmp))
+        fuentes = find_sources(tmp)
+        assert len(fuentes) == 5
+        assert all(p.suffix == '.kt' for p in fuentes)
+    assert class_name_for(Path("2-malo.kt")) == "_2_malo"
+    assert class_name_for(Path("Main.kt")) == "Main"
+    print("  [OK] 5 fuentes encontradas")
+
+
+def verificar_resumen(resumen, salida: Path):
+    """Comprueba el resumen y los .class generados."""
+    assert resumen["total"] == 5
+    assert resumen["compiled"] == 4
+    assert resumen["failed"] == 1
+
+    por_fuente = {r["source"]: r for r in resumen["files"]}
+    malo = por_fuente[os.path.join("sub", "2-malo.kt")]
+    assert not malo["exito"] and malo["errores"]
+
+    for i in range(4):
+        r = por_fuente[f"prog{i}.kt"]
+        assert r["exito"] and r["time_ms"] >= 0
+        with open(salida / f"prog{i}.class", 'rb') as f:
+            assert f.read(4) == b'\xca\xfe\xba\xbe'
+
+
+def test_compile_directory_secuencial():
+    """jobs=1 compila en el proceso actual"""
+    print("\n[TEST] Compilación secuencial")
+    with tempfile.TemporaryDirectory() as tmp:
+        crear_fuentes(Path(tmp) / "src")
+        resumen = compile_directory(os.path.join(tmp, "src"), os.path.join(tmp, "out"), jobs=1)
+        verificar_resumen(resumen, Path(tmp) / "out")
+    print("  [OK] 4/5 compilados")
+
+
+def test_compile_directory_paralelo_con_cache():
+    """Varios procesos comparten la caché en disco"""
+    print("\n[TEST] Compilación paralela")
+    with tempfile.TemporaryDirectory() as tmp:
+        crear_fuentes(Path(tmp) / "src")
+        cache_dir = os.path.join(tmp, "cache")
+        for _ in range(2):
+            resumen = compile_directory(os.path.join(tmp, "src"), os.path.join(tmp, "out"),
+                                        jobs=2, cache_dir=cache_dir)
+            assert resumen["jobs"] == 2
+            verificar_resumen(resumen, Path(tmp) / "out")
+    print("  [OK] Resultados iguales con 2 procesos")
+
+
+def test_cli_build():
+    """`kforge build` escribe los .class y el resumen JSON"""
+    print("\n[TEST] kforge build")
+    with tempfile.TemporaryDirectory() as tmp:
+        crear_fuentes(Path(tmp) / "src")
+        salida = os.path.join(tmp, "out")
+        codigo = kforge.main(["build", os.path.join(tmp, "src"), "-o", salida, "-j", "1"])
+        assert codigo == 1  # Hay un archivo con errores
+
+        with open(os.path.join(salida, "kforge-build.json"), encoding='utf-8') as f:
+            resumen = json.load(f)
+        verificar_resumen(resumen, Path(salida))
+    print("  [OK] Resumen JSON escrito")
+
+
+def run_all_tests():
+    """Ejecuta todos los tests de compilación por lotes"""
+    print("=" * 70)
+    print("TESTS DE COMPILACION POR LOTES")
+    print("=" * 70)
+
+    test_find_sources_y_nombres()
+    test_compile_directory_secuencial()
+    test_compile_directory_paralelo_con_cache()
+    test_cli_build()
+
+    print("\n" + "=" * 70)
+    print("[OK] TODOS LOS TESTS DE BATCH PASARON")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    run_all_tests()
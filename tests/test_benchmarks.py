@@ -0,0 +1,131 @@
+"""
+Tests para el generador de programas sintéticos y el benchmark (benchmarks/).
+"""
+
+import sys
+import os
+import json
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.controller import CompiladorController
+from benchmarks.generator import ProgramGenerator, generate_program
+from benchmarks.run import run_benchmark, scaling_exponents, bench_size, MAX_LINEAS_JVM, _medir_una_vez
+
+
+def test_generador_determinista():
+    """La misma semilla produce el mismo programa"""
+    print("\n[TEST] Generador determinista")
+    assert generate_program(200, seed=3) == generate_program(200, seed=3)
+    assert generate_program(200, seed=3) != generate_program(200, seed=4)
+    print("  [OK] Salida reproducible")
+
+
+def test_generador_tamano():
+    """El programa tiene al menos las líneas pedidas"""
+    print("\n[TEST] Tamaño del programa")
+    for lineas in (50, 500, 2000):
+        codigo = generate_program(lineas)
+        assert len(codigo.splitlines()) >= lineas
+        assert "fun main()" in codigo
+    print("  [OK] Tamaños alcanzados")
+
+
+def test_programas_validos():
+    """Los programas generados pasan todas las fases sin errores"""
+    print("\n[TEST] Programas válidos")
+    controlador = CompiladorController()
+    for seed in range(8):
+        codigo = ProgramGenerator(seed=seed).generate(150)
+        resultado = controlador.ejecutar(codigo)
+        assert resultado["exito"], f"seed {seed}: {resultado['errores'][:3]}"
+    print("  [OK] 8 semillas sin errores")
+
+
+def test_programa_pequeno_compila_jvm():
+    """Un programa pequeño también se compila a .class"""
+    print("\n[TEST] Programa generado a JVM")
+    generador = ProgramGenerator(seed=1, statements_per_function=(1, 3), max_block_depth=2)
+    resultado = CompiladorController().ejecutar_jvm(generador.generate(30))
+    assert resultado["exito"], resultado["errores"]
+    assert resultado["bytecode_jvm"][:4] == b'\xca\xfe\xba\xbe'
+    print("  [OK] Archivo .class generado")
+
+
+def test_benchmark_jvm():
+    """Con jvm=True se mide la generación JVM hasta el tamaño por defecto más chico"""
+    print("\n[TEST] Benchmark con JVM")
+    reporte = run_benchmark([200, MAX_LINEAS_JVM], seed=0, repeat=1, jvm=True)
+    for resultado in reporte["sizes"]:
+        assert resultado["errores"] == [] and resultado["jvm"]
+        assert {'jvm', 'class'} <= set(resultado["fases"])
+        assert resultado["fases"]["class"]["contadores"]["bytes"] > 0
+
+    # Más grande no cabe en un método: no se mide, y se indica en el reporte
+    assert bench_size(MAX_LINEAS_JVM + 200, jvm=True)["jvm"] is False
+
+    # Un fallo de la generación JVM hace fallar el benchmark
+    try:
+        _medir_una_vez(generate_program(2000), memoria=False, jvm=True)
+        assert False, "La generación JVM debe fallar (más de 64 KiB de código)"
+    except RuntimeError as e:
+        assert "65535" in str(e)
+    print(f"  [OK] JVM medida hasta {MAX_LINEAS_JVM} lineas")
+
+
+def test_reporte_benchmark():
+    """run_benchmark reporta throughput por fase y exponentes de escala"""
+    print("\n[TEST] Reporte del benchmark")
+    reporte = run_benchmark([100, 300], seed=0, repeat=1, jvm=False)
+    json.dumps(reporte)
+
+    assert [r["lines"] >= s for r, s in zip(reporte["sizes"], (100, 300))] == [True, True]
+    for resultado in reporte["sizes"]:
+        assert resultado["errores"] == []
+        assert list(resultado["fases"]) == ['lexico', 'sintactico', 'semantico', 'tac', 'bytecode']
+        for medida in resultado["fases"].values():
+            assert medida["lines_per_s"] > 0
+            assert medida["tokens_per_s"] > medida["lines_per_s"]
+            assert medida["nodes_per_s"] > 0
+
+    curva = reporte["scaling"][0]
+    assert set(curva["exponentes"]) == set(reporte["sizes"][1]["fases"])
+    print(f"  [OK] Exponentes: {curva['exponentes']}")
+
+
+def test_exponentes_escala():
+    """Un tiempo que crece con el cuadrado del tamaño da exponente 2"""
+    print("\n[TEST] Exponentes de escala")
+    resultados = [
+        {"lines": 1000, "fases": {"lexico": {"wall_ms": 10.0}, "tac": {"wall_ms": 10.0}}},
+        {"lines": 4000, "fases": {"lexico": {"wall_ms": 40.0}, "tac": {"wall_ms": 160.0}}},
+    ]
+    curva = scaling_exponents(resultados)[0]
+    assert abs(curva["exponentes"]["lexico"] - 1.0) < 1e-9
+    assert abs(curva["exponentes"]["tac"] - 2.0) < 1e-9
+    assert curva["superlineales"] == ["tac"]
+    print("  [OK] Lineal y cuadrático detectados")
+
+
+def run_all_tests():
+    """Ejecuta todos los tests del benchmark"""
+    print("=" * 70)
+    print("TESTS DE BENCHMARKS")
+    print("=" * 70)
+
+    test_generador_determinista()
+    test_generador_tamano()
+    test_programas_validos()
+    test_programa_pequeno_compila_jvm()
+    test_benchmark_jvm()
+    test_reporte_benchmark()
+    test_exponentes_escala()
+
+    print("\n" + "=" * 70)
+    print("[OK] TODOS LOS TESTS DE BENCHMARKS PASARON")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    run_all_tests()
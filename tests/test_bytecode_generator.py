@@ -423,6 +423,83 @@ def test_comparisons():
     return True
 
 
+def test_double_operations():
+    """Test 11: Operaciones Double y conversiones de Int"""
+    print("\n[TEST 11] Operaciones Double")
+    codigo = """
+    fun main() {
+        var a: Double = 2.5
+        var n: Int = 2
+        var b: Double = a * n
+        var c: Boolean = b > a
+        var d: Int = n + 1
+    }
+    """
+
+    exito, bytecode, tac, errores = compilar_y_generar_bytecode(codigo)
+
+    if not exito:
+        print(f"ERROR: Compilación falló")
+        return False
+
+    for inst in bytecode:
+        print(f"  {inst}")
+
+    opcodes = [inst.opcode for inst in bytecode]
+
+    # a * n: n se convierte a Double y se usa la variante D
+    if opcodes.count('I2D') != 1 or 'DMUL' not in opcodes or 'MUL' in opcodes:
+        print("ERROR: a * n debe ser LOAD n, I2D, DMUL")
+        return False
+
+    if 'DGT' not in opcodes:
+        print("ERROR: La comparación de Doubles debe ser DGT")
+        return False
+
+    # Las operaciones Int no cambian
+    if 'ADD' not in opcodes:
+        print("ERROR: n + 1 debe seguir siendo ADD")
+        return False
+
+    print("OK: Operaciones Double funcionan correctamente")
+    return True
+
+
+def test_typed_operands():
+    """Test 12: Literales y variables según la clase del operando"""
+    print("\n[TEST 12] Operandos tipados")
+    from core.tac import TACInstruction
+    from core.utils import TipoDato
+
+    # TAC escrito a mano: los operandos de texto se clasifican una sola vez
+    tac = [
+        TACInstruction('ASSIGN', '-2.5', None, 'x', tipo=TipoDato.DOUBLE),
+        TACInstruction('ADD', 'x', '1', 't0', tipo=TipoDato.DOUBLE),
+        TACInstruction('ASSIGN', 'arr.size', None, 'n', tipo=TipoDato.INT),
+    ]
+    bytecode = BytecodeGenerator().generate(tac)
+
+    for inst in bytecode:
+        print(f"  {inst}")
+
+    pares = [(inst.opcode, inst.operand) for inst in bytecode]
+    if ('PUSH', '-2.5') not in pares:
+        print("ERROR: -2.5 es un literal (PUSH)")
+        return False
+    if ('LOAD', 'arr.size') not in pares:
+        print("ERROR: arr.size es una propiedad (LOAD)")
+        return False
+
+    # 1 es un literal Int que se usa como Double
+    opcodes = [inst.opcode for inst in bytecode]
+    if opcodes[opcodes.index('DADD') - 1] != 'I2D':
+        print("ERROR: El literal Int 1 debe convertirse con I2D")
+        return False
+
+    print("OK: Operandos clasificados por su clase")
+    return True
+
+
 def main():
     """Ejecuta todos los tests"""
     print("=" * 70)
@@ -439,7 +516,9 @@ def main():
         test_format_output,
         test_logical_operators,
         test_comparisons,
-        test_bubble_sort
+        test_bubble_sort,
+        test_double_operations,
+        test_typed_operands
     ]
 
     resultados = []
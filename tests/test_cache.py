@@ -0,0 +1,161 @@
+"""
+Tests para la caché de compilación en disco (core/cache.py).
+
+Verifica claves por contenido y opciones, aciertos en el controlador y en
+compile_kotlin_to_jvm, expulsión LRU acotada y tolerancia a entradas corruptas.
+"""
+
+import sys
+import os
+import time
+import tempfile
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.cache import CompilationCache
+from core.controller import CompiladorController
+from core.jvm import compile_kotlin_to_jvm
+
+
+CODIGO = """
+fun main() {
+    val x: Int = 5
+    val y: Int = x + 3
+    println(y)
+}
+"""
+
+
+def test_clave_depende_de_contenido_y_opciones():
+    """La clave cambia con el código y con cada opción"""
+    print("\n[TEST] Claves de caché")
+    with tempfile.TemporaryDirectory() as directorio:
+        cache = CompilationCache(directorio)
+        base = cache.clave(CODIGO, java_version=6)
+        assert base == cache.clave(CODIGO, java_version=6)
+        assert base != cache.clave(CODIGO + " ", java_version=6)
+        assert base != cache.clave(CODIGO, java_version=8)
+        assert base != cache.clave(CODIGO, java_version=6, add_debug_info=False)
+    print("  [OK] Claves deterministas")
+
+
+def test_controlador_reutiliza_resultado():
+    """El segundo ejecutar_jvm con el mismo código no ejecuta el frontend"""
+    print("\n[TEST] Acierto en CompiladorController.ejecutar_jvm")
+    with tempfile.TemporaryDirectory() as directorio:
+        cache = CompilationCache(os.path.join(directorio, 'cache'))
+
+        primero = CompiladorController(cache=cache).ejecutar_jvm(CODIGO, class_name="Cacheado")
+        assert primero["exito"]
+        assert cache.stats.misses == 1 and cache.stats.writes == 1
+
+        controlador = CompiladorController(cache=cache)
+        salida = os.path.join(directorio, 'out', 'Cacheado.class')
+        segundo = controlador.ejecutar_jvm(CODIGO, class_name="Cacheado", output_path=salida)
+        assert segundo["exito"]
+        assert cache.stats.hits == 1
+        assert segundo["bytecode_jvm"] == primero["bytecode_jvm"]
+        assert controlador.lexer is None  # No se tokenizó
+        assert [str(i) for i in controlador.tac_instructions] == [str(i) for i in primero["tac_instructions"]]
+        assert controlador.bytecode_instructions
+        with open(salida, 'rb') as f:
+            assert f.read() == primero["bytecode_jvm"]
+
+        # Otra clase es otra entrada
+        CompiladorController(cache=cache).ejecutar_jvm(CODIGO, class_name="Otra")
+        assert cache.stats.misses == 2
+    print("  [OK] .class servido desde la caché")
+
+
+def test_errores_tambien_se_cachean():
+    """Los resultados con errores se reutilizan igual que los exitosos"""
+    print("\n[TEST] Errores en caché")
+    with tempfile.TemporaryDirectory() as directorio:
+        cache = CompilationCache(directorio)
+        codigo = "fun main() {\n    val x: Int = y\n}\n"
+        primero = CompiladorController(cache=cache).ejecutar_jvm(codigo)
+        segundo = CompiladorController(cache=cache).ejecutar_jvm(codigo)
+        assert not primero["exito"] and not segundo["exito"]
+        assert segundo["errores"] == primero["errores"]
+        assert cache.stats.hits == 1
+    print("  [OK] Errores reutilizados")
+
+
+def test_compile_kotlin_to_jvm_con_cache():
+    """compile_kotlin_to_jvm usa el TAC y las opciones como clave"""
+    print("\n[TEST] Caché en compile_kotlin_to_jvm")
+    controlador = CompiladorController()
+    assert controlador.ejecutar(CODIGO)["exito"]
+    tac = controlador.tac_instructions
+
+    with tempfile.TemporaryDirectory() as directorio:
+        cache = CompilationCache(directorio)
+        primero = compile_kotlin_to_jvm(tac, "Tac", cache=cache)
+        segundo = compile_kotlin_to_jvm(tac, "Tac", cache=cache)
+        assert primero == segundo
+        assert cache.stats.hits == 1 and cache.stats.misses == 1
+        compile_kotlin_to_jvm(tac, "Tac", add_debug_info=False, cache=cache)
+        assert cache.stats.misses == 2
+    print("  [OK] TAC -> .class reutilizado")
+
+
+def test_expulsion_lru():
+    """Al superar max_bytes se expulsan las entradas menos usadas"""
+    print("\n[TEST] Expulsión LRU")
+    with tempfile.TemporaryDirectory() as directorio:
+        cache = CompilationCache(directorio, max_bytes=2500)
+        claves = [cache.clave(str(i)) for i in range(3)]
+
+        cache.guardar(claves[0], {'datos': b'a' * 1000})
+        cache.guardar(claves[1], {'datos': b'b' * 1000})
+        # Asegurar mtimes distintos y usar la primera entrada
+        antigua = time.time() - 60
+        os.utime(cache._ruta(claves[1]), (antigua, antigua))
+        os.utime(cache._ruta(claves[0]), (antigua - 60, antigua - 60))
+        assert cache.obtener(claves[0]) is not None
+
+        cache.guardar(claves[2], {'datos': b'c' * 1000})
+        assert cache.stats.evictions == 1
+        assert cache.tamano_total() <= 2500
+        assert cache.obtener(claves[1]) is None
+        assert cache.obtener(claves[0]) is not None
+        assert cache.obtener(claves[2]) is not None
+    print("  [OK] Entrada menos usada expulsada")
+
+
+def test_entrada_corrupta_es_fallo():
+    """Una entrada ilegible cuenta como fallo y se elimina"""
+    print("\n[TEST] Entrada corrupta")
+    with tempfile.TemporaryDirectory() as directorio:
+        cache = CompilationCache(directorio)
+        clave = cache.clave("x")
+        cache.guardar(clave, {'ok': True})
+        with open(cache._ruta(clave), 'wb') as f:
+            f.write(b'no es pickle')
+        assert cache.obtener(clave) is None
+        assert not cache._ruta(clave).exists()
+        assert cache.obtener_estadisticas()['misses'] == 1
+    print("  [OK] Entrada descartada")
+
+
+def run_all_tests():
+    """Ejecuta todos los tests de la caché"""
+    print("=" * 70)
+    print("TESTS DE LA CACHE DE COMPILACION")
+    print("=" * 70)
+
+    test_clave_depende_de_contenido_y_opciones()
+    test_controlador_reutiliza_resultado()
+    test_errores_tambien_se_cachean()
+    test_compile_kotlin_to_jvm_con_cache()
+    test_expulsion_lru()
+    test_entrada_corrupta_es_fallo()
+
+    print("\n" + "=" * 70)
+    print("[OK] TODOS LOS TESTS DE CACHE PASARON")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    run_all_tests()
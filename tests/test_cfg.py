@@ -0,0 +1,207 @@
+"""
+Tests para el grafo de flujo de control sobre TAC (core/ir/cfg.py).
+"""
+
+import sys
+import os
+import time
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.controller import CompiladorController
+from core.tac import TACGenerator, TACInstruction
+from core.ir import ControlFlowGraph, construir_cfgs
+from core.ir.cfg import GLOBAL
+
+
+CODIGO = """
+val g: Int = 3
+
+fun f(a: Int): Int {
+    var s: Int = 0
+    while (s < a) {
+        for (j in 0..s) {
+            if (j == 2) {
+                break
+            }
+        }
+        s = s + 1
+    }
+    return s
+}
+
+fun main() {
+    for (i in 0..3) {
+        println(f(i))
+    }
+}
+"""
+
+
+def generar_tac(codigo: str, compacto: bool = False):
+    """Compila el código y genera su TAC"""
+    controlador = CompiladorController()
+    controlador.ejecutar(codigo)
+    assert not controlador.error_manager.tiene_errores(), controlador.error_manager.errores
+    return TACGenerator(compacto=compacto).generate(controlador.ast)
+
+
+def test_bloques_y_aristas():
+    """Un grafo por función con bloques y aristas de los saltos"""
+    print("\n[TEST] Bloques y aristas")
+    tac = generar_tac(CODIGO)
+    cfgs = construir_cfgs(tac)
+    assert [cfg.nombre for cfg in cfgs] == [GLOBAL, 'f', 'main']
+    assert sum(len(cfg.instrucciones()) for cfg in cfgs) == len(tac)
+
+    f = cfgs[1]
+    for bloque in f.bloques:
+        # Solo la primera instrucción puede ser LABEL y solo la última un salto
+        assert all(inst.op != 'LABEL' for inst in bloque.instrucciones[1:])
+        assert all(inst.op not in ('GOTO', 'IF_FALSE', 'RETURN') for inst in bloque.instrucciones[:-1])
+        for sucesor in bloque.sucesores:
+            assert bloque.indice in f.bloques[sucesor].predecesores
+        terminador = bloque.terminador
+        if terminador is not None and terminador.op == 'IF_FALSE':
+            assert len(bloque.sucesores) == 2
+            assert f.bloques[bloque.sucesores[0]].etiqueta == str(terminador.arg2)
+        elif terminador is not None and terminador.op == 'RETURN':
+            assert bloque.sucesores == []
+
+    # Mismo grafo desde el TAC en columnas
+    compacto = construir_cfgs(generar_tac(CODIGO, compacto=True))
+    assert [[b.sucesores for b in cfg.bloques] for cfg in compacto] == \
+        [[b.sucesores for b in cfg.bloques] for cfg in cfgs]
+    print(f"  [OK] {sum(len(cfg) for cfg in cfgs)} bloques")
+
+
+def test_dominadores():
+    """La entrada domina todo y la cabecera de un bucle a su cuerpo"""
+    print("\n[TEST] Dominadores")
+    f = construir_cfgs(generar_tac(CODIGO))[1]
+    assert f.idom[0] == 0
+    for indice in range(len(f)):
+        assert f.domina(0, indice)
+        assert f.domina(indice, indice)
+        if indice:
+            assert f.domina(f.idom[indice], indice)
+    hijos = f.arbol_dominadores()
+    assert sum(len(h) for h in hijos) == len(f) - 1
+
+    # El bloque después del if no está dominado por la rama then
+    rama = next(b for b in f.bloques if b.terminador is not None and b.terminador.op == 'GOTO'
+                and len(b.instrucciones) == 1)
+    assert not any(f.domina(rama.indice, s) for s in range(len(f)) if s != rama.indice)
+    print("  [OK] Árbol de dominadores consistente")
+
+
+def test_bucles_anidados():
+    """while con for anidado: dos bucles con su profundidad"""
+    print("\n[TEST] Bucles")
+    f = construir_cfgs(generar_tac(CODIGO))[1]
+    externo, interno = f.bucles
+    assert interno.padre is externo and externo.hijos == [interno]
+    assert (externo.profundidad, interno.profundidad) == (1, 2)
+    assert interno.bloques < externo.bloques
+    assert f.profundidad_bucle(0) == 0
+    assert f.profundidad_bucle(interno.cabecera) == 2
+    assert f.bloques[externo.cabecera].etiqueta == 'L0'
+    print(f"  [OK] {f.bucles}")
+
+
+def test_codigo_inalcanzable():
+    """El código después de RETURN queda sin predecesores ni dominador"""
+    print("\n[TEST] Código inalcanzable")
+    tac = [
+        TACInstruction('LABEL', label='func_h'),
+        TACInstruction('RETURN', 'x'),
+        TACInstruction('ASSIGN', '1', None, 'y'),
+        TACInstruction('GOTO', 'L9'),
+        TACInstruction('LABEL', label='L9'),
+        TACInstruction('RETURN'),
+    ]
+    cfg = ControlFlowGraph.desde_instrucciones(tac, 'h')
+    assert len(cfg) == 3
+    assert cfg.alcanzables() == {0}
+    assert cfg.idom == [0, None, None]
+    assert cfg.bucles == []
+
+    try:
+        ControlFlowGraph.desde_instrucciones([TACInstruction('GOTO', 'L1')])
+        assert False, "Debe rechazar saltos a etiquetas desconocidas"
+    except ValueError:
+        pass
+    print("  [OK] Bloques inalcanzables")
+
+
+def test_globales_despues_de_funciones():
+    """Las sentencias globales entre y después de funciones van a GLOBAL"""
+    print("\n[TEST] Globales después de funciones")
+    codigo = """
+fun f(a: Int): Int { return a + 1 }
+val x: Int = f(2)
+println(x)
+fun g(b: Boolean): Int {
+    if (b) { return 1 } else { return 2 }
+}
+var y: Int = 10
+y = y + g(true)
+println(y)
+"""
+    tac = generar_tac(codigo)
+    cfgs = construir_cfgs(tac)
+    assert [cfg.nombre for cfg in cfgs] == [GLOBAL, 'f', 'g']
+    assert sum(len(cfg.instrucciones()) for cfg in cfgs) == len(tac)
+    # Cada función termina en su último RETURN
+    for cfg in cfgs[1:]:
+        assert cfg.instrucciones()[-1].op == 'RETURN'
+    globales = cfgs[0].instrucciones()
+    assert [str(inst.result) for inst in globales if inst.op == 'ASSIGN'] == ['x', 'y', 'y']
+    assert [inst.op for inst in globales].count('CALL') == 4
+    assert cfgs[0].alcanzables() == set(range(len(cfgs[0])))
+
+    # El optimizador conserva todas las sentencias globales
+    controlador = CompiladorController(optimizar=True)
+    resultado = controlador.ejecutar(codigo)
+    assert resultado['exito']
+    llamadas = [str(inst.arg1) for inst in controlador.tac_instructions if inst.op == 'CALL']
+    assert llamadas == ['f', 'println', 'g', 'println']
+    print(f"  [OK] {len(globales)} instrucciones globales")
+
+
+def test_escala():
+    """Una función con miles de bucles se analiza en tiempo casi lineal"""
+    print("\n[TEST] Escala")
+    cuerpo = "\n".join(
+        f"    while (x < {i}) {{ if (x > 2) {{ x = x + 1 }} else {{ x = x + 2 }} }}"
+        for i in range(2000))
+    tac = generar_tac(f"fun main() {{\n    var x: Int = 0\n{cuerpo}\n}}\n")
+    inicio = time.perf_counter()
+    cfg = construir_cfgs(tac)[0]
+    assert len(cfg.bucles) == 2000 and cfg.idom[-1] is not None
+    duracion = time.perf_counter() - inicio
+    assert duracion < 5, duracion
+    print(f"  [OK] {len(tac)} instrucciones en {duracion * 1000:.0f} ms")
+
+
+def run_all_tests():
+    """Ejecuta todos los tests del CFG"""
+    print("=" * 70)
+    print("TESTS DE CFG")
+    print("=" * 70)
+
+    test_bloques_y_aristas()
+    test_dominadores()
+    test_bucles_anidados()
+    test_codigo_inalcanzable()
+    test_globales_despues_de_funciones()
+    test_escala()
+
+    print("\n" + "=" * 70)
+    print("[OK] TODOS LOS TESTS DE CFG PASARON")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,210 @@
+"""
+Tests para el análisis de flujo de datos (core/ir/dataflow.py).
+"""
+
+import sys
+import os
+import time
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.controller import CompiladorController
+from core.tac import TACGenerator, TACInstruction, Var
+from core.ir import (ControlFlowGraph, construir_cfgs, Liveness, ReachingDefinitions,
+                     AvailableExpressions)
+from core.utils import TipoDato
+
+
+CODIGO = """
+var g: Int = 3
+
+fun f(a: Int): Int {
+    var s: Int = 0
+    while (s < a) {
+        for (j in 0..s) {
+            if (j == 2) {
+                break
+            }
+        }
+        s = s + 1
+    }
+    return s
+}
+
+fun main() {
+    for (i in 0..3) {
+        println(f(i) + g)
+    }
+}
+"""
+
+
+def generar_tac(codigo: str):
+    """Compila el código y genera su TAC"""
+    controlador = CompiladorController()
+    controlador.ejecutar(codigo)
+    assert not controlador.error_manager.tiene_errores(), controlador.error_manager.errores
+    return TACGenerator().generate(controlador.ast)
+
+
+def bloque_con(cfg, op, resultado=None):
+    """Índice del primer bloque con una instrucción dada"""
+    for bloque in cfg.bloques:
+        for inst in bloque.instrucciones:
+            if inst.op == op and (resultado is None or inst.result == resultado):
+                return bloque.indice
+    raise AssertionError(f"No hay {op} {resultado}")
+
+
+def test_variables_vivas():
+    """Vivas en la cabecera del bucle y después de cada instrucción"""
+    print("\n[TEST] Variables vivas")
+    cfgs = construir_cfgs(generar_tac(CODIGO))
+    f = cfgs[1]
+    vivas = Liveness(f).resolver()
+    assert vivas.nombres(vivas.entrada[0]) == {'a'}
+    cabecera = f.bucles[0].cabecera
+    assert vivas.nombres(vivas.entrada[cabecera]) == {'a', 's'}
+    # En el return solo queda s (y ningún temporal)
+    retorno = bloque_con(f, 'RETURN')
+    assert vivas.nombres(vivas.entrada[retorno]) == {'s'}
+
+    # Cada temporal muere en su único uso
+    for bloque in f.bloques:
+        despues = vivas.vivas_despues(bloque.indice)
+        for inst, bits in zip(bloque.instrucciones, despues):
+            if inst.op == 'IF_FALSE':
+                assert str(inst.arg1) not in vivas.nombres(bits)
+
+    # La global sigue viva al salir de main y el resultado de println está muerto
+    main = cfgs[2]
+    vivas = Liveness(main).resolver()
+    assert vivas.variables.nombres_de(vivas.variables.globales) == {'g'}
+    llamada = bloque_con(main, 'CALL')
+    bloque = main.bloques[llamada]
+    despues = vivas.vivas_despues(llamada)
+    for inst, bits in zip(bloque.instrucciones, despues):
+        if inst.op == 'CALL' and inst.arg1 == 'println':
+            assert str(inst.result) not in vivas.nombres(bits)
+            assert 'g' in vivas.nombres(bits)
+    print("  [OK] Vivas por bloque e instrucción")
+
+
+def test_globales_y_llamadas():
+    """Una llamada lee las globales: siguen vivas antes de CALL"""
+    print("\n[TEST] Globales y llamadas")
+    g = Var('g', TipoDato.INT, es_global=True)
+    x = Var('x', TipoDato.INT)
+    tac = [
+        TACInstruction('LABEL', label='func_h'),
+        TACInstruction('ASSIGN', '1', None, g),
+        TACInstruction('ASSIGN', '2', None, x),
+        TACInstruction('CALL', 'k', '0', 't0'),
+        TACInstruction('ASSIGN', '5', None, g),
+        TACInstruction('RETURN'),
+    ]
+    cfg = ControlFlowGraph.desde_instrucciones(tac, 'h')
+    vivas = Liveness(cfg).resolver()
+    despues = [vivas.nombres(bits) for bits in vivas.vivas_despues(0)]
+    assert despues[1] == {'g'}      # g = 1 la lee la llamada
+    assert despues[2] == {'g'}      # x = 2 es un almacenamiento muerto
+    assert despues[3] == set()      # g se reescribe antes de salir
+    assert despues[5] == {'g'}      # viva a la salida
+
+    # La llamada es una definición ambigua de g: no elimina g = 1
+    definiciones = ReachingDefinitions(cfg).resolver()
+    antes_de_g5 = definiciones.alcanzan(0, 4)
+    de_g = [definiciones.definiciones[i][1] for i in range(len(definiciones.definiciones))
+            if antes_de_g5 >> i & 1 and definiciones.definiciones[i][2] == vivas.variables.indice(g)]
+    assert de_g == [1, 3]
+    assert [d[1] for d in definiciones.definiciones if d[2] == vivas.variables.indice(g)] == [1, 3, 4]
+    print("  [OK] CALL lee y define las globales")
+
+
+def test_definiciones_que_alcanzan():
+    """En la cabecera del bucle llegan la inicial y la del cuerpo"""
+    print("\n[TEST] Definiciones que alcanzan")
+    f = construir_cfgs(generar_tac(CODIGO))[1]
+    definiciones = ReachingDefinitions(f).resolver()
+    s = definiciones.variables.indice('s')
+    cabecera = f.bucles[0].cabecera
+    llegan = [definiciones.definiciones[i] for i in range(len(definiciones.definiciones))
+              if definiciones.entrada[cabecera] >> i & 1 and definiciones.definiciones[i][2] == s]
+    assert len(llegan) == 2
+    valores = {str(f.bloques[b].instrucciones[p].arg1) for b, p, _ in llegan}
+    assert '0' in valores and len(valores) == 2
+    # A la entrada no llega ninguna
+    assert definiciones.entrada[0] == 0
+    print(f"  [OK] {len(definiciones.definiciones)} definiciones")
+
+
+def test_expresiones_disponibles():
+    """s < a deja de estar disponible en la cabecera porque s cambia en el bucle"""
+    print("\n[TEST] Expresiones disponibles")
+    f = construir_cfgs(generar_tac(CODIGO))[1]
+    disponibles = AvailableExpressions(f).resolver()
+    comparacion = disponibles.indices[('LT', 's', 'a')]
+    cabecera = f.bucles[0].cabecera
+    assert not disponibles.entrada[cabecera] >> comparacion & 1
+    assert disponibles.salida[cabecera] >> comparacion & 1
+    # Dentro del bucle interno s < a sigue disponible (s no cambia ahí)
+    interna = f.bucles[1].cabecera
+    assert disponibles.entrada[interna] >> comparacion & 1
+
+    # a + b y b + a son la misma expresión; t = t + 1 no deja t + 1 disponible
+    tac = [
+        TACInstruction('ADD', 'a', 'b', 't0'),
+        TACInstruction('ADD', 'b', 'a', 't1'),
+        TACInstruction('ADD', 't', '1', 't'),
+        TACInstruction('RETURN'),
+    ]
+    cfg = ControlFlowGraph.desde_instrucciones(tac)
+    disponibles = AvailableExpressions(cfg).resolver()
+    assert disponibles.expresiones == [('ADD', 'a', 'b'), ('ADD', '1', 't')]
+    assert disponibles.salida[0] == 0b01
+    print("  [OK] Intersección en las uniones de caminos")
+
+
+def test_escala():
+    """Miles de temporales y bucles se resuelven en tiempo casi lineal"""
+    print("\n[TEST] Escala")
+    cuerpo = "\n".join(
+        f"    while (x < {i}) {{ if (x > 2) {{ x = x + {i} }} else {{ y = x * y }} }}"
+        for i in range(2000))
+    tac = generar_tac(f"fun main() {{\n    var x: Int = 0\n    var y: Int = 1\n{cuerpo}\n"
+                      f"    println(y)\n}}\n")
+    cfg = construir_cfgs(tac)[0]
+    inicio = time.perf_counter()
+    vivas = Liveness(cfg).resolver()
+    definiciones = ReachingDefinitions(cfg, vivas.variables).resolver()
+    disponibles = AvailableExpressions(cfg, vivas.variables).resolver()
+    duracion = time.perf_counter() - inicio
+    assert len(vivas.variables) > 6000
+    assert vivas.nombres(vivas.entrada[0]) == set()
+    assert vivas.iteraciones < 4 * len(cfg)
+    assert len(definiciones.definiciones) > 8000 and disponibles.expresiones
+    assert duracion < 10, duracion
+    print(f"  [OK] {len(tac)} instrucciones, {len(vivas.variables)} variables en "
+          f"{duracion * 1000:.0f} ms")
+
+
+def run_all_tests():
+    """Ejecuta todos los tests de flujo de datos"""
+    print("=" * 70)
+    print("TESTS DE FLUJO DE DATOS")
+    print("=" * 70)
+
+    test_variables_vivas()
+    test_globales_y_llamadas()
+    test_definiciones_que_alcanzan()
+    test_expresiones_disponibles()
+    test_escala()
+
+    print("\n" + "=" * 70)
+    print("[OK] TODOS LOS TESTS DE FLUJO DE DATOS PASARON")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    run_all_tests()
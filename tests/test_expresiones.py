@@ -0,0 +1,104 @@
+"""
+Tests para el análisis de expresiones por precedencia de operadores.
+"""
+
+import sys
+import os
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.lexer import Lexer
+from core.parser import Parser
+from core.utils import TipoNodo
+
+
+def parsear_expresion(texto):
+    parser = Parser(Lexer().tokenizar(texto))
+    return parser.expresion(), parser
+
+
+def forma(nodo):
+    """Representación compacta con paréntesis explícitos."""
+    if nodo.tipo == TipoNodo.EXPRESION_BINARIA:
+        return f"({forma(nodo.hijos[0])} {nodo.valor} {forma(nodo.hijos[1])})"
+    if nodo.tipo == TipoNodo.EXPRESION_UNARIA:
+        return f"({nodo.valor}{forma(nodo.hijos[0])})"
+    if nodo.tipo == TipoNodo.EXPRESION_PUNTO:
+        return f"{forma(nodo.hijos[0])}.{nodo.valor}"
+    if nodo.tipo == TipoNodo.EXPRESION_INDICE:
+        return f"{forma(nodo.hijos[0])}[{forma(nodo.hijos[1])}]"
+    return str(nodo.valor)
+
+
+def test_precedencia_y_asociatividad():
+    """Mismas formas que la cadena or/and/comparación/suma/multiplicación/unaria"""
+    print("\n[TEST] Precedencia y asociatividad")
+    casos = {
+        "a + b * c": "(a + (b * c))",
+        "a - b - c": "((a - b) - c)",
+        "a * b / c % d": "(((a * b) / c) % d)",
+        "a || b && c == d + e": "(a || (b && (c == (d + e))))",
+        "a < b < c": "((a < b) < c)",
+        "-a * -b": "((-a) * (-b))",
+        "!!a && -(b + c)": "((!(!a)) && (-(b + c)))",
+        "(a + b) * c": "((a + b) * c)",
+        "-x.size + arr[i + 1]": "((-x.size) + arr[(i + 1)])",
+        "(a).size * 2": "(a.size * 2)",
+    }
+    for texto, esperado in casos.items():
+        nodo, _ = parsear_expresion(texto)
+        assert forma(nodo) == esperado, (texto, forma(nodo))
+        print(f"  [OK] {texto}  ->  {esperado}")
+
+
+def test_rangos():
+    """Los rangos siguen tomando el valor inicial como primaria"""
+    print("\n[TEST] Rangos")
+    nodo, _ = parsear_expresion("0 until n - 1")
+    assert forma(nodo) == "(0 until (n - 1))"
+    nodo, _ = parsear_expresion("(a + 1)..10")
+    assert forma(nodo) == "((a + 1) .. 10)"
+
+
+def test_anidamiento_profundo():
+    """Miles de paréntesis, unarios y operadores sin RecursionError"""
+    print("\n[TEST] Anidamiento profundo")
+    profundidad = 5000
+    nodo, _ = parsear_expresion("(" * profundidad + "1" + ")" * profundidad)
+    assert nodo.valor == 1
+    nodo, _ = parsear_expresion("-" * profundidad + "x")
+    assert nodo.tipo == TipoNodo.EXPRESION_UNARIA
+    nodo, _ = parsear_expresion(" + ".join(f"x{i}" for i in range(profundidad)))
+    assert nodo.hijos[1].valor == f"x{profundidad - 1}"
+    print(f"  [OK] Profundidad {profundidad}")
+
+
+def test_parentesis_sin_cerrar():
+    """El error de paréntesis sin cerrar se mantiene"""
+    print("\n[TEST] Paréntesis sin cerrar")
+    try:
+        parsear_expresion("(a + b * c")
+        assert False, "Debió lanzar SyntaxError"
+    except Exception as e:
+        assert "Se esperaba ')' después de la expresión" in str(e)
+
+
+def run_all_tests():
+    """Ejecuta todos los tests de expresiones"""
+    print("=" * 70)
+    print("TESTS DE EXPRESIONES")
+    print("=" * 70)
+
+    test_precedencia_y_asociatividad()
+    test_rangos()
+    test_anidamiento_profundo()
+    test_parentesis_sin_cerrar()
+
+    print("\n" + "=" * 70)
+    print("[OK] TODOS LOS TESTS DE EXPRESIONES PASARON")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    run_all_tests()
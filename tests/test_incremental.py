@@ -0,0 +1,213 @@
+"""
+Tests para el reanálisis incremental (core/incremental.py).
+"""
+
+import sys
+import os
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.incremental import IncrementalParser, prefijo_comun, sufijo_comun
+from core.lexer import Lexer
+from core.parser import Parser
+from core.semantic import AnalizadorSemantico
+from core.errors import ErrorManager
+from benchmarks.generator import generate_program
+
+
+CODIGO = """fun doble(n: Int): Int {
+    return n * 2
+}
+
+fun main() {
+    val x: Int = 5
+    println(doble(x))
+}
+
+val y: Int = 3
+println(y)
+"""
+
+
+def completo(codigo):
+    lexer = Lexer()
+    parser = Parser(lexer.tokenizar(codigo), lexer.error_manager)
+    return parser.parsear(), [str(e) for e in lexer.error_manager.obtener_errores()]
+
+
+def verificar(incremental, codigo):
+    ast = incremental.actualizar(codigo)
+    errores = [str(e) for e in incremental.error_manager.obtener_errores()]
+    assert (ast, errores) == completo(codigo), incremental.modo
+    return ast
+
+
+def test_prefijo_sufijo():
+    """Prefijo y sufijo comunes"""
+    print("\n[TEST] Prefijo y sufijo comunes")
+    a = "x" * 10000 + "abc" + "y" * 9000
+    b = "x" * 10000 + "aZc" + "y" * 9000
+    assert prefijo_comun(a, b) == 10001
+    assert sufijo_comun(a, b, len(a) - 10001) == 9001
+    assert prefijo_comun("abc", "abc") == 3
+
+
+def test_edicion_dentro_de_funcion():
+    """Editar una función reutiliza las demás declaraciones"""
+    print("\n[TEST] Edición dentro de una función")
+    incremental = IncrementalParser()
+    ast = incremental.parsear(CODIGO)
+    doble, anteriores = ast.hijos[0], list(ast.hijos[2:])
+
+    ast = verificar(incremental, CODIGO.replace("val x: Int = 5", "val x: Int = 42"))
+    assert incremental.modo == 'incremental'
+    assert ast.hijos[0] is doble
+    assert all(a is b for a, b in zip(ast.hijos[2:], anteriores))
+    print(f"  [OK] {incremental.reutilizados} segmentos reutilizados")
+
+
+def test_lineas_agregadas():
+    """Las declaraciones siguientes conservan el nodo y ajustan su línea"""
+    print("\n[TEST] Líneas agregadas")
+    incremental = IncrementalParser()
+    ast = incremental.parsear(CODIGO)
+    ultima = ast.hijos[-1]
+    linea = ultima.linea
+
+    codigo = CODIGO.replace("    val x: Int = 5\n", "    val x: Int = 5\n    println(x)\n\n")
+    ast = verificar(incremental, codigo)
+    assert incremental.modo == 'incremental'
+    assert ast.hijos[-1] is ultima and ultima.linea == linea + 2
+
+
+def test_recurre_al_analisis_completo():
+    """Ediciones que no pueden aislarse se reanalizan completas"""
+    print("\n[TEST] Análisis completo cuando hace falta")
+    incremental = IncrementalParser()
+    incremental.parsear(CODIGO)
+
+    # Una llave sin cerrar afecta al resto del archivo
+    verificar(incremental, CODIGO.replace("fun main() {", "fun main() {{"))
+    assert incremental.modo == 'completo'
+    verificar(incremental, CODIGO)
+
+    # return sin valor seguido de otra sentencia
+    codigo = CODIGO.replace("val y: Int = 3\n", "return\n")
+    verificar(incremental, codigo)
+    assert incremental.modo == 'completo'
+
+
+def test_secuencia_de_ediciones():
+    """Una secuencia de ediciones produce siempre el AST del análisis completo"""
+    print("\n[TEST] Secuencia de ediciones")
+    codigo = generate_program(120, seed=8)
+    incremental = IncrementalParser()
+    incremental.parsear(codigo)
+    modos = set()
+    for i in range(0, len(codigo), max(1, len(codigo) // 40)):
+        if codigo[i].isdigit():
+            codigo = codigo[:i] + str((int(codigo[i]) + 1) % 10) + codigo[i + 1:]
+        elif codigo[i] == '\n':
+            codigo = codigo[:i] + "\nprintln(1)" + codigo[i:]
+        else:
+            continue
+        verificar(incremental, codigo)
+        modos.add(incremental.modo)
+    assert 'incremental' in modos
+    print(f"  [OK] Modos: {sorted(modos)}")
+
+
+def analizar(analizador, ast):
+    """Analiza con un ErrorManager nuevo y compara con un análisis completo"""
+    error_manager = ErrorManager()
+    resultados = analizador.analizar(ast, error_manager)
+    errores = [str(e) for e in error_manager.obtener_errores()]
+    completo_ = AnalizadorSemantico()
+    assert resultados == completo_.analizar(ast)
+    assert errores == [str(e) for e in completo_.error_manager.obtener_errores()]
+    return errores
+
+
+def test_semantico_incremental():
+    """Solo se reanalizan las funciones editadas y las que dependen de su firma"""
+    print("\n[TEST] Análisis semántico incremental")
+    codigo = CODIGO.replace("fun main() {", "fun otra(): Int {\n    return 1\n}\n\nfun main() {")
+    incremental = IncrementalParser()
+    analizador = AnalizadorSemantico(incremental=True)
+    analizar(analizador, incremental.parsear(codigo))
+    assert analizador.reutilizadas == 0
+
+    # Cambia el cuerpo de doble: main solo depende de su firma
+    codigo = codigo.replace("return n * 2", "return n * 3")
+    analizar(analizador, incremental.actualizar(codigo))
+    assert analizador.reutilizadas == 2
+
+    # Cambia la firma de doble: main (que la llama) también se reanaliza
+    codigo = codigo.replace("fun doble(n: Int): Int", "fun doble(n: String): Int")
+    errores = analizar(analizador, incremental.actualizar(codigo))
+    assert analizador.reutilizadas == 1
+    assert any("Argumento 1 de 'doble'" in e for e in errores)
+
+
+def test_diagnosticos_reutilizados():
+    """Los errores de una función reutilizada se desplazan con sus líneas"""
+    print("\n[TEST] Diagnósticos reutilizados")
+    codigo = CODIGO.replace("val x: Int = 5", "val x: Int = true")
+    incremental = IncrementalParser()
+    analizador = AnalizadorSemantico(incremental=True)
+    antes = analizar(analizador, incremental.parsear(codigo))
+    assert any("Línea 6" in e for e in antes)
+
+    # Dos líneas más en doble: main se reutiliza dos líneas más abajo
+    codigo = codigo.replace("    return n * 2\n", "    val k: Int = n\n\n    return k * 2\n")
+    despues = analizar(analizador, incremental.actualizar(codigo))
+    assert analizador.reutilizadas == 1
+    assert any("Línea 8" in e for e in despues)
+
+
+def test_semantico_secuencia_de_ediciones():
+    """Ediciones sucesivas dan siempre el resultado del análisis completo"""
+    print("\n[TEST] Secuencia de ediciones (semántico)")
+    codigo = generate_program(120, seed=8)
+    incremental = IncrementalParser()
+    analizador = AnalizadorSemantico(incremental=True)
+    analizar(analizador, incremental.parsear(codigo))
+    reutilizadas = 0
+    for i in range(0, len(codigo), max(1, len(codigo) // 40)):
+        if codigo[i].isdigit():
+            codigo = codigo[:i] + str((int(codigo[i]) + 1) % 10) + codigo[i + 1:]
+        elif codigo.startswith("Int", i):
+            codigo = codigo[:i] + "Double" + codigo[i + 3:]
+        else:
+            continue
+        ast = incremental.actualizar(codigo)
+        if ast is not None and not incremental.error_manager.tiene_errores():
+            analizar(analizador, ast)
+            reutilizadas += analizador.reutilizadas
+    assert reutilizadas > 0
+    print(f"  [OK] {reutilizadas} funciones reutilizadas en total")
+
+
+def run_all_tests():
+    """Ejecuta todos los tests de reanálisis incremental"""
+    print("=" * 70)
+    print("TESTS DE REANÁLISIS INCREMENTAL")
+    print("=" * 70)
+
+    test_prefijo_sufijo()
+    test_edicion_dentro_de_funcion()
+    test_lineas_agregadas()
+    test_recurre_al_analisis_completo()
+    test_secuencia_de_ediciones()
+    test_semantico_incremental()
+    test_diagnosticos_reutilizados()
+    test_semantico_secuencia_de_ediciones()
+
+    print("\n" + "=" * 70)
+    print("[OK] TODOS LOS TESTS DE REANÁLISIS INCREMENTAL PASARON")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    run_all_tests()
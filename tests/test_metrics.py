@@ -0,0 +1,143 @@
+"""
+Tests para las métricas por fase (core/metrics.py).
+"""
+
+import sys
+import os
+import tempfile
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.controller import CompiladorController
+from core.metrics import MetricsCollector, formatear_metricas, formatear_tabla
+from core.cache import CompilationCache
+from core.batch import compile_directory
+
+
+CODIGO = """
+fun main() {
+    val x: Int = 5
+    val y: Int = x * 2
+    println(y)
+}
+"""
+
+
+def fases_de(metricas):
+    return [r["fase"] for r in metricas["fases"]]
+
+
+def test_metricas_opcionales():
+    """Sin metricas=True el resultado no cambia"""
+    print("\n[TEST] Métricas opcionales")
+    controlador = CompiladorController()
+    assert "metricas" not in controlador.ejecutar(CODIGO)
+    assert "metricas" not in controlador.ejecutar_jvm(CODIGO)
+    print("  [OK] Sin sección de métricas")
+
+
+def test_metricas_ejecutar():
+    """ejecutar(metricas=True) mide las cinco fases del frontend"""
+    print("\n[TEST] Métricas de ejecutar")
+    controlador = CompiladorController()
+    resultado = controlador.ejecutar(CODIGO, metricas=True)
+    metricas = resultado["metricas"]
+
+    assert fases_de(metricas) == ['lexico', 'sintactico', 'semantico', 'tac', 'bytecode']
+    por_fase = {r["fase"]: r for r in metricas["fases"]}
+    assert por_fase["lexico"]["contadores"]["tokens"] == len(resultado["tokens"])
+    assert por_fase["sintactico"]["contadores"]["nodos"] > 0
+    assert por_fase["tac"]["contadores"]["instrucciones_tac"] == len(resultado["tac"])
+    assert por_fase["bytecode"]["contadores"]["instrucciones_bytecode"] == len(resultado["bytecode_instructions"])
+    assert all(r["wall_ms"] >= 0 and r["cpu_ms"] >= 0 for r in metricas["fases"])
+    assert metricas["peak_bytes"] > 0
+    print(formatear_tabla(metricas))
+
+
+def test_metricas_por_fase_solicitada():
+    """Las métricas de ejecutar_lexico solo incluyen el lexer"""
+    print("\n[TEST] Métricas acotadas a la fase")
+    controlador = CompiladorController()
+    assert fases_de(controlador.ejecutar_lexico(CODIGO, metricas=True)["metricas"]) == ['lexico']
+    assert fases_de(controlador.ejecutar_sintactico(CODIGO, metricas=True)["metricas"]) == ['lexico', 'sintactico']
+    print("  [OK] Fases posteriores excluidas")
+
+
+def test_metricas_omiten_fases_no_ejecutadas():
+    """Con errores semánticos no se reportan TAC ni bytecode"""
+    print("\n[TEST] Fases omitidas")
+    controlador = CompiladorController()
+    metricas = controlador.ejecutar("fun main() {\n    val x: Int = y\n}\n", metricas=True)["metricas"]
+    assert fases_de(metricas) == ['lexico', 'sintactico', 'semantico']
+    print("  [OK] Solo fases ejecutadas")
+
+
+def test_metricas_jvm():
+    """ejecutar_jvm agrega generación JVM y serialización del .class"""
+    print("\n[TEST] Métricas JVM")
+    controlador = CompiladorController()
+    resultado = controlador.ejecutar_jvm(CODIGO, metricas=True)
+    metricas = resultado["metricas"]
+    assert fases_de(metricas)[-2:] == ['jvm', 'class']
+    por_fase = {r["fase"]: r for r in metricas["fases"]}
+    assert por_fase["jvm"]["contadores"]["instrucciones_jvm"] > 0
+    assert por_fase["class"]["contadores"]["bytes"] == len(resultado["bytecode_jvm"])
+    print("  " + formatear_metricas(metricas))
+
+    with tempfile.TemporaryDirectory() as directorio:
+        cache = CompilationCache(directorio)
+        CompiladorController(cache=cache).ejecutar_jvm(CODIGO)
+        metricas = CompiladorController(cache=cache).ejecutar_jvm(CODIGO, metricas=True)["metricas"]
+        assert fases_de(metricas) == ['cache']
+        assert metricas["fases"][0]["contadores"]["hit"] == 1
+    print("  [OK] Acierto de caché medido")
+
+
+def test_colector_sin_memoria():
+    """memoria=False no usa tracemalloc"""
+    print("\n[TEST] Colector sin memoria")
+    colector = MetricsCollector(memoria=False)
+    with colector.medir('lexico') as registro:
+        sum(range(1000))
+        registro.contadores["n"] = 1
+    assert colector.obtener('lexico').peak_bytes == 0
+    assert colector.to_dict()["fases"][0]["contadores"] == {"n": 1}
+    print("  [OK] Solo tiempos")
+
+
+def test_metricas_batch():
+    """compile_directory(metricas=True) agrega totales por fase"""
+    print("\n[TEST] Métricas en compilación por lotes")
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(2):
+            with open(os.path.join(tmp, f"p{i}.kt"), 'w', encoding='utf-8') as f:
+                f.write(CODIGO)
+        resumen = compile_directory(tmp, os.path.join(tmp, "out"), jobs=1, metricas=True)
+        assert resumen["metricas"]["lexico"]["archivos"] == 2
+        assert resumen["metricas"]["class"]["bytes"] > 0
+        assert all("metricas" in r for r in resumen["files"])
+    print("  [OK] Totales por fase")
+
+
+def run_all_tests():
+    """Ejecuta todos los tests de métricas"""
+    print("=" * 70)
+    print("TESTS DE METRICAS POR FASE")
+    print("=" * 70)
+
+    test_metricas_opcionales()
+    test_metricas_ejecutar()
+    test_metricas_por_fase_solicitada()
+    test_metricas_omiten_fases_no_ejecutadas()
+    test_metricas_jvm()
+    test_colector_sin_memoria()
+    test_metricas_batch()
+
+    print("\n" + "=" * 70)
+    print("[OK] TODOS LOS TESTS DE METRICAS PASARON")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,583 @@
+"""
+Tests para el optimizador de TAC (core/ir/optimizer.py y sus pasadas).
+
+Cada programa se ejecuta con un intérprete de TAC mínimo antes y después de
+optimizar: la salida (los println) debe ser la misma.
+"""
+
+import sys
+import os
+import math
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.controller import CompiladorController
+from core.tac import TACGenerator, TACInstruction, Const, Property, Temp, Var, as_operand
+from core.tac_buffer import TACBuffer
+from core.bytecode import BytecodeGenerator
+from core.jvm.jvm_compiler import JVMCompiler
+from core.ir import (
+    ControlFlowGraph, TACOptimizer, propagar_constantes, eliminar_codigo_muerto,
+    propagar_copias, fusionar_temporales, dividir_funciones
+)
+from core.ir.constprop import evaluar
+from core.utils import TipoNodo, TipoDato
+
+
+PROGRAMA = """
+var contador: Int = 0
+
+fun incrementar(paso: Int): Int {
+    contador = contador + paso
+    return contador
+}
+
+fun main() {
+    val n: Int = 10
+    val limite: Int = 2147483647
+    var x: Double = n
+    var suma: Int = 0
+    val arr: IntArray = intArrayOf(4, 8, 15)
+    for (i in 0..n) {
+        suma = suma + i * (n / 3) - (-7 % 3)
+        if (suma > 100) {
+            break
+        }
+    }
+    println(suma)
+    println(limite + 1)
+    println(x / 4)
+    contador = 5
+    println(incrementar(2))
+    println(contador)
+    var j: Int = 0
+    while (j < arr.size) {
+        arr[j] = arr[j] * n
+        j = j + 1
+    }
+    println(arr[2])
+    if (n > 5 && true) {
+        println("mayor")
+    } else {
+        println("menor")
+    }
+    val b: Boolean = !(n == 10)
+    println(b)
+}
+"""
+
+CODIGO_MUERTO = """
+fun dividir(a: Int, b: Int): Int {
+    val sinUso: Int = a / b
+    val tambienSinUso: Int = a * 2
+    return a
+}
+
+fun buscar(arr: IntArray, x: Int): Int {
+    var i: Int = 0
+    while (true) {
+        if (arr[i] == x) {
+            return i
+        }
+        i = i + 1
+    }
+    return -1
+}
+
+fun main() {
+    println(dividir(7, 2))
+    println(buscar(intArrayOf(3, 5, 9), 9))
+    var k: Int = 0
+    while (k < 10) {
+        k = k + 3
+        if (k > 6) {
+            break
+            println(k)
+        }
+    }
+    println(k)
+}
+"""
+
+GLOBALES_DESPUES = """
+var total: Int = 1
+
+fun doble(a: Int): Int {
+    return a * 2
+}
+
+val x: Int = doble(3)
+println(x)
+
+fun signo(a: Int): Int {
+    if (a < 0) {
+        return -1
+    } else {
+        return 1
+    }
+}
+
+fun main() {
+    println(total)
+    println(signo(total - 10))
+}
+
+total = total + x
+println(total)
+println(signo(x))
+"""
+
+
+def compilar(codigo: str):
+    """Compila el código y devuelve (TAC, parámetros de cada función)"""
+    controlador = CompiladorController()
+    controlador.ejecutar(codigo)
+    assert not controlador.error_manager.tiene_errores(), controlador.error_manager.errores
+    parametros = {}
+    for nodo in controlador.ast.hijos:
+        if nodo.tipo == TipoNodo.FUNCION:
+            parametros[nodo.valor] = [p['nombre'] for p in nodo.metadata.get('parametros', [])]
+    return TACGenerator().generate(controlador.ast), parametros
+
+
+def a_int32(valor: int) -> int:
+    """Desbordamiento de Int (32 bits)"""
+    return (valor + 2 ** 31) % 2 ** 32 - 2 ** 31
+
+
+def interpretar(tac, parametros, max_pasos: int = 1_000_000):
+    """
+    Ejecuta un programa TAC: primero todas las sentencias globales, en el
+    orden del programa, y luego main.
+
+    Returns:
+        Lista con el texto de cada println
+    """
+    instrucciones = list(tac)
+    etiquetas = {str(inst.label): i for i, inst in enumerate(instrucciones) if inst.op == 'LABEL'}
+    # Cada función termina en su último RETURN (las globales no tienen ninguno)
+    fin_funcion = {}
+    inicio = None
+    for i, inst in enumerate(instrucciones):
+        if inst.op == 'LABEL' and str(inst.label).startswith('func_'):
+            inicio = i
+        elif inst.op == 'RETURN' and inicio is not None:
+            fin_funcion[inicio] = i + 1
+    globales = {}
+    salida = []
+    pasos = [0]
+
+    def leer(operando, locales):
+        operando = as_operand(operando)
+        if isinstance(operando, Const):
+            return operando.valor
+        if isinstance(operando, Property):
+            return len(leer(operando.objeto, locales))
+        nombre = str(operando)
+        return locales[nombre] if nombre in locales else globales[nombre]
+
+    def escribir(destino, valor, tipo, locales):
+        if tipo == TipoDato.DOUBLE and type(valor) is int:
+            valor = float(valor)
+        es_global = isinstance(destino, Var) and destino.es_global
+        (globales if es_global else locales)[str(destino)] = valor
+
+    def texto(valor):
+        if type(valor) is bool:
+            return 'true' if valor else 'false'
+        return str(valor)
+
+    def ejecutar(pc, locales, solo_globales=False):
+        pila = []
+        while pc < len(instrucciones):
+            pasos[0] += 1
+            assert pasos[0] < max_pasos, "El programa no termina"
+            inst = instrucciones[pc]
+            pc += 1
+            op = inst.op
+            if op == 'LABEL':
+                if solo_globales and str(inst.label).startswith('func_'):
+                    pc = fin_funcion[pc - 1]
+            elif op == 'GOTO':
+                pc = etiquetas[str(inst.arg1)]
+            elif op == 'IF_FALSE':
+                if not leer(inst.arg1, locales):
+                    pc = etiquetas[str(inst.arg2)]
+            elif op == 'ASSIGN':
+                escribir(inst.result, leer(inst.arg1, locales), inst.tipo, locales)
+            elif op == 'PARAM':
+                pila.append(leer(inst.arg1, locales))
+            elif op == 'CALL':
+                cantidad = int(str(inst.arg2))
+                argumentos = pila[len(pila) - cantidad:]
+                del pila[len(pila) - cantidad:]
+                nombre = str(inst.arg1)
+                if nombre in ('println', 'print'):
+                    salida.append(texto(argumentos[0]))
+                    valor = None
+                elif nombre in ('intArrayOf', 'doubleArrayOf'):
+                    valor = list(argumentos)
+                else:
+                    valor = ejecutar(etiquetas[f"func_{nombre}"] + 1,
+                                     dict(zip(parametros[nombre], argumentos)))
+                if inst.result is not None:
+                    escribir(inst.result, valor, inst.tipo, locales)
+            elif op == 'RETURN':
+                return leer(inst.arg1, locales) if inst.arg1 is not None else None
+            elif op == 'ARRAY_LOAD':
+                escribir(inst.result, leer(inst.arg1, locales)[leer(inst.arg2, locales)],
+                         inst.tipo, locales)
+            elif op == 'ARRAY_STORE':
+                valor = leer(inst.arg2, locales)
+                if inst.tipo == TipoDato.DOUBLE:
+                    valor = float(valor)
+                leer(inst.result, locales)[leer(inst.arg1, locales)] = valor
+            else:
+                a = leer(inst.arg1, locales)
+                b = leer(inst.arg2, locales) if inst.arg2 is not None else None
+                escribir(inst.result, operar(inst, a, b), inst.tipo_resultado, locales)
+        return None
+
+    def operar(inst, a, b):
+        op = inst.op
+        if op == 'NOT':
+            return not a
+        if op == 'AND':
+            return a and b
+        if op == 'OR':
+            return a or b
+        doble = inst.tipo == TipoDato.DOUBLE
+        if doble:
+            a = float(a)
+            b = float(b) if b is not None else None
+        if op == 'NEG':
+            return -a if doble else a_int32(-a)
+        comparaciones = {'LT': a < b, 'GT': a > b, 'LE': a <= b, 'GE': a >= b,
+                         'EQ': a == b, 'NE': a != b} if b is not None else {}
+        if op in comparaciones:
+            return comparaciones[op]
+        if doble:
+            if op == 'DIV':
+                return a / b
+            if op == 'MOD':
+                return math.fmod(a, b)
+            return {'ADD': a + b, 'SUB': a - b, 'MUL': a * b}[op]
+        if op in ('DIV', 'MOD'):
+            cociente = int(abs(a) // abs(b)) * (1 if (a < 0) == (b < 0) else -1)
+            return a_int32(cociente) if op == 'DIV' else a - b * cociente
+        return a_int32({'ADD': a + b, 'SUB': a - b, 'MUL': a * b}[op])
+
+    ejecutar(0, globales, solo_globales=True)
+    if 'func_main' in etiquetas:
+        ejecutar(etiquetas['func_main'] + 1, {})
+    return salida
+
+
+def test_evaluar_semantica_int():
+    """Desbordamiento, división truncada y resto con el signo del dividendo"""
+    print("\n[TEST] Evaluación de Int")
+
+    def entero(op, a, b=None):
+        inst = TACInstruction(op, tipo=TipoDato.INT)
+        resultado = evaluar(inst, Const(str(a), a, TipoDato.INT),
+                            Const(str(b), b, TipoDato.INT) if b is not None else None)
+        return resultado.valor if resultado is not None else None
+
+    assert entero('ADD', 2147483647, 1) == -2147483648
+    assert entero('MUL', 65536, 65536) == 0
+    assert entero('SUB', -2147483648, 1) == 2147483647
+    assert entero('NEG', -2147483648) == -2147483648
+    assert entero('DIV', -7, 2) == -3
+    assert entero('DIV', 7, -2) == -3
+    assert entero('MOD', -7, 3) == -1
+    assert entero('MOD', 7, -3) == 1
+    assert entero('DIV', -2147483648, -1) == -2147483648
+    assert entero('DIV', 1, 0) is None
+    assert entero('MOD', 1, 0) is None
+    assert entero('LE', 3, 3) is True
+
+    doble = TACInstruction('DIV', tipo=TipoDato.DOUBLE)
+    assert evaluar(doble, Const('1', 1, TipoDato.INT), Const('4.0', 4.0, TipoDato.DOUBLE)).valor == 0.25
+    assert evaluar(doble, Const('1.0', 1.0, TipoDato.DOUBLE), Const('0.0', 0.0, TipoDato.DOUBLE)) is None
+    cadena = TACInstruction('ADD', tipo=TipoDato.STRING)
+    assert evaluar(cadena, Const('a', 'a', TipoDato.STRING), Const('b', 'b', TipoDato.STRING)) is None
+    print("  [OK] Semántica de la JVM")
+
+
+def test_propagacion():
+    """Un val se propaga a los usos del bucle; la variable del bucle no"""
+    print("\n[TEST] Propagación de constantes")
+    tac, _ = compilar(PROGRAMA)
+    optimizado = TACOptimizer(['constantes']).optimizar(tac)
+    texto = [str(inst) for inst in optimizado]
+    assert 't2 = i <= 10' in texto       # n se sustituyó en la condición del for
+    assert 't22 = t21 * 10' in texto     # y en el cuerpo del while
+    assert 't12 = -2147483648' in texto  # limite + 1 con desbordamiento
+    assert 't14 = 2.5' in texto          # x es Double aunque se inicializó con un Int
+    assert 'PARAM contador' in texto     # la llamada pudo cambiar la global
+    assert not any(inst.op == 'IF_FALSE' and isinstance(inst.arg1, Const) for inst in optimizado)
+    # La entrada no se modificó
+    assert [str(inst) for inst in tac] != texto
+    assert 't2 = i <= n' in [str(inst) for inst in tac]
+    print(f"  [OK] {len(tac)} -> {len(optimizado)} instrucciones")
+
+
+def test_uniones_y_saltos():
+    """Dos ramas que asignan el mismo literal se propagan; si difieren, no"""
+    print("\n[TEST] Uniones de caminos")
+    x, y, c = Var('x', TipoDato.INT), Var('y', TipoDato.INT), Var('c', TipoDato.BOOLEAN)
+    uno = Const('1', 1, TipoDato.INT)
+
+    def programa(valor_else):
+        return [
+            TACInstruction('LABEL', label='func_h'),
+            TACInstruction('IF_FALSE', c, 'L0'),
+            TACInstruction('ASSIGN', uno, None, x, tipo=TipoDato.INT),
+            TACInstruction('ASSIGN', uno, None, y, tipo=TipoDato.INT),
+            TACInstruction('GOTO', 'L1'),
+            TACInstruction('LABEL', label='L0'),
+            TACInstruction('ASSIGN', uno, None, x, tipo=TipoDato.INT),
+            TACInstruction('ASSIGN', valor_else, None, y, tipo=TipoDato.INT),
+            TACInstruction('LABEL', label='L1'),
+            TACInstruction('ADD', x, y, 't0', tipo=TipoDato.INT),
+            TACInstruction('RETURN', 't0', tipo=TipoDato.INT),
+        ]
+
+    cfg = ControlFlowGraph.desde_instrucciones(programa(uno), 'h')
+    assert propagar_constantes(cfg)
+    assert str(cfg.instrucciones()[-2]) == 't0 = 2'
+    assert str(cfg.instrucciones()[-1]) == 'RETURN 2'
+
+    cfg = ControlFlowGraph.desde_instrucciones(programa(Const('2', 2, TipoDato.INT)), 'h')
+    propagar_constantes(cfg)
+    assert str(cfg.instrucciones()[-2]) == 't0 = 1 + y'
+
+    # IF_FALSE false salta siempre; IF_FALSE true desaparece
+    tac = [
+        TACInstruction('NOT', Const('True', True, TipoDato.BOOLEAN), None, 't0', tipo=TipoDato.BOOLEAN),
+        TACInstruction('IF_FALSE', 't0', 'L0'),
+        TACInstruction('LABEL', label='L0'),
+        TACInstruction('IF_FALSE', Const('True', True, TipoDato.BOOLEAN), 'L1'),
+        TACInstruction('LABEL', label='L1'),
+        TACInstruction('RETURN'),
+    ]
+    cfg = ControlFlowGraph.desde_instrucciones(tac)
+    propagar_constantes(cfg)
+    assert [str(inst) for inst in cfg.instrucciones()] == \
+        ['t0 = False', 'GOTO L0', 'L0:', 'L1:', 'RETURN']
+    print("  [OK] Confluencia y saltos constantes")
+
+
+def test_codigo_inalcanzable():
+    """Lo que sigue a return/break y la salida de while (true) desaparecen"""
+    print("\n[TEST] Código inalcanzable")
+    tac, _ = compilar(CODIGO_MUERTO)
+    optimizado = TACOptimizer().optimizar(tac)
+    texto = [str(inst) for inst in optimizado]
+    # return -1 después de while (true)
+    assert any(inst.op == 'NEG' for inst in tac) and not any(inst.op == 'NEG' for inst in optimizado)
+    # buscar conserva un RETURN final (inalcanzable) que cierra la función
+    assert sum(1 for inst in optimizado if inst.op == 'RETURN') == 4
+    assert all(cuerpo[-1].op == 'RETURN' for nombre, cuerpo in dividir_funciones(optimizado))
+    assert TACOptimizer().optimizar(optimizado) == optimizado
+    assert texto.count('PARAM k') == 1            # el println después del break
+    assert not any(inst.op == 'IF_FALSE' and isinstance(inst.arg1, Const) for inst in optimizado)
+
+    # Ninguna etiqueta sin saltos ni salto a la instrucción siguiente
+    destinos = {str(inst.arg1 if inst.op == 'GOTO' else inst.arg2)
+                for inst in optimizado if inst.op in ('GOTO', 'IF_FALSE')}
+    for anterior, inst in zip(optimizado, optimizado[1:]):
+        if inst.op == 'LABEL':
+            assert str(inst.label) in destinos or str(inst.label).startswith('func_')
+            if anterior.op == 'GOTO':
+                assert str(anterior.arg1) != str(inst.label)
+
+    despues_de_return = [
+        TACInstruction('LABEL', label='func_h'),
+        TACInstruction('RETURN', 'x'),
+        TACInstruction('ASSIGN', '1', None, 'y'),
+        TACInstruction('GOTO', 'L9'),
+        TACInstruction('LABEL', label='L9'),
+        TACInstruction('RETURN'),
+    ]
+    cfg = ControlFlowGraph.desde_instrucciones(despues_de_return, 'h')
+    assert eliminar_codigo_muerto(cfg) == 4
+    assert [str(inst) for inst in cfg.instrucciones()] == ['func_h:', 'RETURN x']
+    print(f"  [OK] {len(tac)} -> {len(optimizado)} instrucciones")
+
+
+def test_almacenamientos_muertos():
+    """Sin temporales de println ni variables sin usar; llamadas y divisiones se conservan"""
+    print("\n[TEST] Almacenamientos muertos")
+    tac, _ = compilar(CODIGO_MUERTO)
+    optimizado = TACOptimizer().optimizar(tac)
+    llamadas = [inst for inst in optimizado if inst.op == 'CALL']
+    # Todas menos el println inalcanzable después del break
+    assert len(llamadas) == sum(1 for inst in tac if inst.op == 'CALL') - 1
+    assert all(inst.result is None for inst in llamadas if inst.arg1 == 'println')
+    assert all(inst.result is not None for inst in llamadas if inst.arg1 != 'println')
+    texto = [str(inst) for inst in optimizado]
+    assert 'sinUso = a / b' in texto              # b puede ser 0
+    assert not any('tambienSinUso' in linea or 'a * 2' in linea for linea in texto)
+
+    # Una global escrita antes de una llamada o de salir sigue viva; x = x sobra
+    g = Var('g', TipoDato.INT, es_global=True)
+    tac = [
+        TACInstruction('LABEL', label='func_h'),
+        TACInstruction('ASSIGN', '1', None, g, tipo=TipoDato.INT),
+        TACInstruction('ASSIGN', '2', None, 'x', tipo=TipoDato.INT),
+        TACInstruction('CALL', 'k', '0', 't0', tipo=TipoDato.VOID),
+        TACInstruction('ASSIGN', 'x', None, 'x', tipo=TipoDato.INT),
+        TACInstruction('ASSIGN', '3', None, g, tipo=TipoDato.INT),
+        TACInstruction('RETURN'),
+    ]
+    cfg = ControlFlowGraph.desde_instrucciones(tac, 'h')
+    eliminar_codigo_muerto(cfg)
+    assert [str(inst) for inst in cfg.instrucciones()] == \
+        ['func_h:', 'g = 1', 'CALL k, 0', 'g = 3', 'RETURN']
+    print("  [OK] Solo se eliminan escrituras sin efectos")
+
+
+def test_copias_y_temporales():
+    """Los resultados van directo a su variable y los temporales comparten nombre"""
+    print("\n[TEST] Copias y temporales")
+    tac, _ = compilar(PROGRAMA)
+    optimizado = TACOptimizer().optimizar(tac)
+    texto = [str(inst) for inst in optimizado]
+    assert 'i = i + 1' in texto and 'j = j + 1' in texto
+    assert 'arr = CALL intArrayOf, 3' in texto
+    # Ninguna copia de un temporal recién calculado
+    for anterior, inst in zip(optimizado, optimizado[1:]):
+        if inst.op == 'ASSIGN' and isinstance(inst.arg1, Temp):
+            assert str(anterior.result) != str(inst.arg1)
+    temporales = {str(inst.result) for inst in optimizado if isinstance(inst.result, Temp)}
+    assert len(temporales) <= 3, temporales
+
+    a, b, c = (Var(nombre, TipoDato.INT) for nombre in 'abc')
+    d, f = Var('d', TipoDato.DOUBLE), Var('f', TipoDato.DOUBLE)
+    t0, t1 = Temp('t0', TipoDato.INT), Temp('t1', TipoDato.INT)
+    tac = [
+        TACInstruction('LABEL', label='func_h'),
+        TACInstruction('ADD', a, Const('1', 1, TipoDato.INT), t0, tipo=TipoDato.INT),
+        TACInstruction('ASSIGN', t0, None, c, tipo=TipoDato.INT),
+        TACInstruction('ASSIGN', b, None, a, tipo=TipoDato.INT),
+        TACInstruction('ADD', a, c, t1, tipo=TipoDato.INT),
+        TACInstruction('ASSIGN', a, None, d, tipo=TipoDato.DOUBLE),   # convierte: no es copia
+        TACInstruction('MUL', d, Const('2.0', 2.0, TipoDato.DOUBLE), f, tipo=TipoDato.DOUBLE),
+        TACInstruction('ASSIGN', Const('5', 5, TipoDato.INT), None, b, tipo=TipoDato.INT),
+        TACInstruction('SUB', a, t1, c, tipo=TipoDato.INT),            # b cambió: a se queda
+        TACInstruction('PARAM', f, tipo=TipoDato.DOUBLE),
+        TACInstruction('RETURN', t1, tipo=TipoDato.INT),
+    ]
+    cfg = ControlFlowGraph.desde_instrucciones(tac, 'h')
+    assert propagar_copias(cfg) == 3
+    assert [str(inst) for inst in cfg.instrucciones()] == [
+        'func_h:', 'c = a + 1', 'a = b', 't1 = b + c', 'd = b', 'f = d * 2.0',
+        'b = 5', 'c = a - t1', 'PARAM f', 'RETURN t1']
+
+    # t2 se calcula cuando t0 y t1 ya no se leen; t3 es Double
+    t2, t3 = Temp('t2', TipoDato.INT), Temp('t3', TipoDato.DOUBLE)
+    tac = [
+        TACInstruction('LABEL', label='func_h'),
+        TACInstruction('MUL', d, Const('2.0', 2.0, TipoDato.DOUBLE), t3, tipo=TipoDato.DOUBLE),
+        TACInstruction('PARAM', t3, tipo=TipoDato.DOUBLE),
+        TACInstruction('CALL', 'println', '1', tipo=TipoDato.VOID),
+        TACInstruction('ADD', a, Const('1', 1, TipoDato.INT), t0, tipo=TipoDato.INT),
+        TACInstruction('MUL', a, Const('2', 2, TipoDato.INT), t1, tipo=TipoDato.INT),
+        TACInstruction('ADD', t0, t1, t2, tipo=TipoDato.INT),
+        TACInstruction('RETURN', t2, tipo=TipoDato.INT),
+    ]
+    cfg = ControlFlowGraph.desde_instrucciones(tac, 'h')
+    assert fusionar_temporales(cfg) == 2
+    assert [str(inst) for inst in cfg.instrucciones()][4:] == \
+        ['t0 = a + 1', 't1 = a * 2', 't0 = t0 + t1', 'RETURN t0']
+
+    # Menos locales en la JVM que solo con constantes y código muerto
+    tac, _ = compilar(PROGRAMA)
+    sin_copias = TACOptimizer(['constantes', 'codigo_muerto']).optimizar(tac)
+    antes = JVMCompiler("SinCopias").build(sin_copias)
+    despues = JVMCompiler("Optimizado").build(optimizado)
+    assert len(despues.instructions) < len(antes.instructions)
+    assert despues.local_vars.get_max_locals() < antes.local_vars.get_max_locals()
+    print(f"  [OK] JVM {len(antes.instructions)} -> {len(despues.instructions)} instrucciones, "
+          f"max_locals {antes.local_vars.get_max_locals()} -> {despues.local_vars.get_max_locals()}")
+
+
+def test_misma_salida():
+    """El programa optimizado imprime lo mismo que el original"""
+    print("\n[TEST] Equivalencia")
+    tac, parametros = compilar(PROGRAMA)
+    esperado = interpretar(tac, parametros)
+    assert esperado == ['117', '-2147483648', '2.5', '7', '7', '150', 'mayor', 'false']
+    optimizado = TACOptimizer().optimizar(tac)
+    assert interpretar(optimizado, parametros) == esperado
+
+    tac, parametros = compilar(CODIGO_MUERTO)
+    assert interpretar(tac, parametros) == ['7', '2', '9']
+    assert interpretar(TACOptimizer().optimizar(tac), parametros) == ['7', '2', '9']
+
+    # Parámetro que oculta a una global
+    tac, parametros = compilar("var x: Int = 1\nfun f(x: Int): Int { return x * 10 }\n"
+                               "fun main() {\n println(f(4))\n println(x)\n}")
+    assert interpretar(tac, parametros) == ['40', '1']
+    assert interpretar(TACOptimizer().optimizar(tac), parametros) == ['40', '1']
+
+    # Sentencias globales entre y después de las funciones
+    tac, parametros = compilar(GLOBALES_DESPUES)
+    assert interpretar(tac, parametros) == ['6', '7', '1', '7', '-1']
+    assert interpretar(TACOptimizer().optimizar(tac), parametros) == ['6', '7', '1', '7', '-1']
+    print(f"  [OK] {esperado}")
+
+
+def test_backends_mas_cortos():
+    """Bytecode y JVM más cortos; el controlador lo activa con optimizar=True"""
+    print("\n[TEST] Backends")
+    tac, _ = compilar(PROGRAMA)
+    optimizado = TACOptimizer().optimizar(tac)
+    assert len(BytecodeGenerator().generate(optimizado)) < len(BytecodeGenerator().generate(tac))
+    original = JVMCompiler("Original").build(tac)
+    reducido = JVMCompiler("Optimizado").build(optimizado)
+    jvm, jvm_optimizado = len(original.instructions), len(reducido.instructions)
+    assert jvm_optimizado < jvm
+    assert reducido.local_vars.get_max_locals() < original.local_vars.get_max_locals()
+
+    # Con TACBuffer el resultado también es un TACBuffer
+    compacto = TACOptimizer().optimizar(TACBuffer.desde_instrucciones(tac))
+    assert isinstance(compacto, TACBuffer) and list(compacto) == list(optimizado)
+
+    controlador = CompiladorController(optimizar=True)
+    resultado = controlador.ejecutar_jvm(PROGRAMA, class_name="Optimizado")
+    assert resultado["exito"], resultado["errores"]
+    assert list(controlador.tac_instructions) == list(optimizado)
+    assert 'i <= 10' in controlador.ejecutar(PROGRAMA)["codigo_intermedio"]
+    try:
+        TACOptimizer(['inexistente'])
+        assert False, "Debe rechazar pasadas desconocidas"
+    except ValueError:
+        pass
+    print(f"  [OK] JVM {jvm} -> {jvm_optimizado} instrucciones")
+
+
+def run_all_tests():
+    """Ejecuta todos los tests del optimizador"""
+    print("=" * 70)
+    print("TESTS DEL OPTIMIZADOR TAC")
+    print("=" * 70)
+
+    test_evaluar_semantica_int()
+    test_propagacion()
+    test_uniones_y_saltos()
+    test_codigo_inalcanzable()
+    test_almacenamientos_muertos()
+    test_copias_y_temporales()
+    test_misma_salida()
+    test_backends_mas_cortos()
+
+    print("\n" + "=" * 70)
+    print("[OK] TODOS LOS TESTS DEL OPTIMIZADOR PASARON")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    run_all_tests()
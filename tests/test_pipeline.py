@@ -0,0 +1,136 @@
+"""
+Tests para el pipeline de compilación memoizado (core/pipeline.py).
+
+Verifica que cada fase se ejecute una sola vez por revisión del código y que
+el controlador reutilice los resultados entre ejecutar_lexico,
+ejecutar_sintactico y ejecutar_semantico.
+"""
+
+import sys
+import os
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.controller import CompiladorController
+from core.pipeline import CompilationPipeline
+
+
+CODIGO = """
+fun main() {
+    var x: Int = 5
+    var y: Int = x * 2
+    println(y)
+}
+"""
+
+
+def test_fases_se_ejecutan_una_vez():
+    """Las fases ya ejecutadas no se repiten para el mismo código"""
+    print("\n[TEST] Fases memoizadas por revisión")
+    pipeline = CompilationPipeline()
+    pipeline.cargar(CODIGO)
+
+    pipeline.ejecutar_hasta('sintactico')
+    lexer, tokens, ast = pipeline.lexer, pipeline.tokens, pipeline.ast
+    assert pipeline.ejecutada('lexico') and pipeline.ejecutada('sintactico')
+    assert not pipeline.ejecutada('semantico')
+
+    pipeline.ejecutar_hasta('bytecode')
+    assert pipeline.lexer is lexer
+    assert pipeline.tokens is tokens
+    assert pipeline.ast is ast
+    assert pipeline.tac_instructions and pipeline.bytecode_instructions
+
+    # Volver a cargar el mismo código no invalida nada
+    assert pipeline.cargar(CODIGO) is False
+    assert pipeline.ast is ast
+    print("  [OK] Tokens y AST reutilizados")
+
+
+def test_cambio_de_codigo_invalida():
+    """Un código distinto descarta los resultados previos"""
+    print("\n[TEST] Invalidación al cambiar el código")
+    pipeline = CompilationPipeline()
+    pipeline.cargar(CODIGO)
+    pipeline.ejecutar_hasta('bytecode')
+    ast = pipeline.ast
+
+    assert pipeline.cargar(CODIGO + "\n") is True
+    assert not pipeline.ejecutada('lexico')
+    pipeline.ejecutar_hasta('sintactico')
+    assert pipeline.ast is not ast
+    print("  [OK] Resultados recalculados")
+
+
+def test_errores_por_fase():
+    """errores_hasta solo incluye los errores de las fases pedidas"""
+    print("\n[TEST] Errores acotados por fase")
+    pipeline = CompilationPipeline()
+    pipeline.cargar("fun main() {\n    var x: Int = y\n}\n")
+    pipeline.ejecutar_hasta('bytecode')
+
+    assert pipeline.errores_hasta('sintactico') == []
+    assert len(pipeline.errores_hasta('semantico')) > 0
+    assert not pipeline.tac_instructions
+    print("  [OK] Error semántico fuera del resultado sintáctico")
+
+
+def test_controlador_reutiliza_fases():
+    """El flujo de la UI (léxico -> sintáctico -> semántico) tokeniza una vez"""
+    print("\n[TEST] Controlador con fases memoizadas")
+    controlador = CompiladorController()
+
+    resultado_lexico = controlador.ejecutar_lexico(CODIGO)
+    assert resultado_lexico["exito"]
+    assert controlador.ast is None
+
+    resultado_sintactico = controlador.ejecutar_sintactico(CODIGO)
+    assert resultado_sintactico["exito"]
+    assert resultado_sintactico["tokens"] is resultado_lexico["tokens"]
+    assert not controlador.tac_instructions
+
+    resultado = controlador.ejecutar_semantico(CODIGO)
+    assert resultado["exito"]
+    assert resultado["arbol"] is resultado_sintactico["arbol"]
+    assert resultado["codigo_intermedio"] and resultado["bytecode"]
+
+    # limpiar() descarta también lo memoizado
+    controlador.limpiar()
+    assert controlador.ejecutar_sintactico(CODIGO)["arbol"] is not resultado["arbol"]
+    print("  [OK] Tokens y AST compartidos entre fases")
+
+
+def test_controlador_errores_sin_fases_posteriores():
+    """ejecutar_sintactico no reporta errores semánticos memoizados"""
+    print("\n[TEST] Errores del controlador por fase")
+    codigo = "fun main() {\n    var x: Int = y\n}\n"
+    controlador = CompiladorController()
+
+    assert not controlador.ejecutar(codigo)["exito"]
+    resultado = controlador.ejecutar_sintactico(codigo)
+    assert resultado["exito"]
+    assert resultado["errores"] == []
+    assert not controlador.ejecutar_semantico(codigo)["exito"]
+    print("  [OK] Errores semánticos solo en la fase semántica")
+
+
+def run_all_tests():
+    """Ejecuta todos los tests del pipeline"""
+    print("=" * 70)
+    print("TESTS DEL PIPELINE MEMOIZADO")
+    print("=" * 70)
+
+    test_fases_se_ejecutan_una_vez()
+    test_cambio_de_codigo_invalida()
+    test_errores_por_fase()
+    test_controlador_reutiliza_fases()
+    test_controlador_errores_sin_fases_posteriores()
+
+    print("\n" + "=" * 70)
+    print("[OK] TODOS LOS TESTS DEL PIPELINE PASARON")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,123 @@
+"""
+Tests para el motor de escaneo DFA (core/scanner.py).
+"""
+
+import sys
+import os
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.lexer import Lexer
+from core.scanner import DFAScanner, PatternError, compilar_especificacion
+from core.controller import CompiladorController
+from benchmarks.generator import generate_program
+
+
+CASOS = [
+    "fun main() {\n    val x: Int = 5\n    println(x)\n}\n",
+    'val s = "a\\"b\\n" + "c\nd" // comentario "x"\n',
+    "a<=b && c!=d || !e == f >= 1..10 until 2.5 % 3",
+    "/* bloque */ x /* otro */ */ y /* sin cerrar",
+    "val x = 10L + 2.5f; @ # é ñ 漢字 ?",
+    "",
+    "\n\n   \t\n",
+    'println("\\q \\u12")',
+    "1.2.3 007 99999999999999999999",
+]
+
+
+def tokens_y_errores(codigo, motor):
+    lexer = Lexer(motor=motor)
+    tokens = list(lexer.tokenizar(codigo))
+    return tokens, [str(e) for e in lexer.error_manager.obtener_errores()]
+
+
+def test_equivalencia_con_regex():
+    """El DFA produce los mismos tokens y errores que la regex maestra"""
+    print("\n[TEST] Equivalencia DFA / regex")
+    for codigo in CASOS + [generate_program(300, seed=5)]:
+        assert tokens_y_errores(codigo, 'dfa') == tokens_y_errores(codigo, 'regex'), codigo[:40]
+    print(f"  [OK] {len(CASOS) + 1} entradas idénticas")
+
+
+def test_escaneo_omite_espacios():
+    """escanear() no reporta espacios, saltos ni comentarios"""
+    print("\n[TEST] Tipos omitidos")
+    scanner = DFAScanner(Lexer.ESPECIFICACION_TOKENS, omitir=Lexer.TIPOS_OMITIDOS)
+    nombres = scanner.tablas.nombres
+    codigo = "x  =\n1 // c\n/* b */ y"
+    assert [(nombres[k], codigo[i:f]) for k, i, f in scanner.escanear(codigo)] == [
+        ('IDENTIFIER', 'x'), ('ASSIGN', '='), ('INT_LITERAL', '1'), ('IDENTIFIER', 'y')
+    ]
+    print("  [OK] Solo tokens significativos")
+
+
+def test_tablas():
+    """Las tablas se comparten y usan clases de caracteres"""
+    print("\n[TEST] Tablas del DFA")
+    tablas = compilar_especificacion(tuple(Lexer.ESPECIFICACION_TOKENS))
+    assert tablas is compilar_especificacion(tuple(Lexer.ESPECIFICACION_TOKENS))
+    assert len(tablas.transiciones) == tablas.num_estados * tablas.num_clases
+    assert tablas.num_clases < 128
+    clases = tablas.clases("aZ_ é漢?")
+    assert clases[0] == clases[1] == clases[2]
+    assert clases[4] == clases[5] == clases[6]
+    print(f"  [OK] {tablas.num_estados} estados, {tablas.num_clases} clases")
+
+
+def test_prioridad_y_no_voraz():
+    """A igual longitud gana el primer patrón; .*? termina en la primera aceptación"""
+    print("\n[TEST] Prioridad y cuantificador no voraz")
+    scanner = DFAScanner([('CLAVE', r'if'), ('ID', r'[a-z]+'), ('COM', r'<.*?>'), ('X', r'.')])
+    nombres = scanner.tablas.nombres
+    resultado = [(nombres[k], f - i) for k, i, f in scanner.escanear("if ifx <a> b>")]
+    assert resultado == [('CLAVE', 2), ('X', 1), ('ID', 3), ('X', 1), ('COM', 3), ('X', 1), ('ID', 1), ('X', 1)]
+    print("  [OK] Coincidencia más larga con prioridad")
+
+
+def test_patron_no_soportado():
+    """Construcciones fuera del subconjunto se rechazan"""
+    print("\n[TEST] Patrones no soportados")
+    for patron in (r'a{2}', r'^a', r'(a'):
+        try:
+            DFAScanner([('X', patron)])
+            assert False, patron
+        except PatternError:
+            pass
+    try:
+        Lexer(motor='lalr')
+        assert False
+    except ValueError:
+        pass
+    print("  [OK] Errores claros")
+
+
+def test_controlador_con_dfa():
+    """El controlador compila con el motor DFA"""
+    print("\n[TEST] Controlador con motor DFA")
+    resultado = CompiladorController(motor_lexico='dfa').ejecutar_jvm(CASOS[0])
+    assert resultado["exito"], resultado["errores"]
+    print("  [OK] .class generado")
+
+
+def run_all_tests():
+    """Ejecuta todos los tests del motor DFA"""
+    print("=" * 70)
+    print("TESTS DE SCANNER DFA")
+    print("=" * 70)
+
+    test_equivalencia_con_regex()
+    test_escaneo_omite_espacios()
+    test_tablas()
+    test_prioridad_y_no_voraz()
+    test_patron_no_soportado()
+    test_controlador_con_dfa()
+
+    print("\n" + "=" * 70)
+    print("[OK] TODOS LOS TESTS DE SCANNER DFA PASARON")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    run_all_tests()
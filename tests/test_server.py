@@ -0,0 +1,126 @@
+"""
+Tests para el servidor de compilación persistente (core/server.py).
+"""
+
+import sys
+import os
+import socket
+import tempfile
+import time
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.server import CompileServer, CompileClient, parse_address
+
+
+CODIGO = """
+fun main() {
+    val x: Int = 20
+    println(x + 1)
+}
+"""
+
+
+def test_parse_address():
+    """Direcciones TCP y Unix"""
+    print("\n[TEST] parse_address")
+    assert parse_address(None) == ("127.0.0.1", 7878)
+    assert parse_address(9000) == ("127.0.0.1", 9000)
+    assert parse_address("localhost:9000") == ("localhost", 9000)
+    assert parse_address("unix:/tmp/kforge.sock") == "/tmp/kforge.sock"
+    assert parse_address("/tmp/kforge.sock") == "/tmp/kforge.sock"
+    print("  [OK] Direcciones interpretadas")
+
+
+def verificar_servidor(servidor: CompileServer, direccion):
+    """Compila un lote y un archivo con errores contra un servidor en marcha."""
+    with CompileClient(direccion) as cliente:
+        assert cliente.request({"cmd": "ping"})["pong"]
+
+        resultados = cliente.compile_many([
+            {"name": "Uno", "source": CODIGO},
+            {"name": "Dos", "source": "fun main() {\n    val x: Int = y\n}\n"},
+        ])
+        assert [r["name"] for r in resultados] == ["Uno", "Dos"]
+        assert resultados[0]["exito"]
+        assert resultados[0]["class_bytes"][:4] == b'\xca\xfe\xba\xbe'
+        assert not resultados[1]["exito"] and resultados[1]["errores"]
+        assert resultados[1]["class_bytes"] is None
+
+        # Conexión persistente: varias peticiones seguidas
+        inicio = time.perf_counter()
+        for _ in range(5):
+            assert cliente.compile(CODIGO, "Rapido")["exito"]
+        promedio_ms = (time.perf_counter() - inicio) * 1000 / 5
+        print(f"  Latencia promedio: {promedio_ms:.2f} ms")
+
+        estadisticas = cliente.request({"cmd": "stats"})
+        assert estadisticas["files"] == 7
+        assert "error" in cliente.request({"cmd": "desconocido"})
+
+
+def test_servidor_tcp_sin_trabajadores():
+    """workers=0 compila en el proceso del servidor"""
+    print("\n[TEST] Servidor TCP (en proceso)")
+    servidor = CompileServer("127.0.0.1:0", workers=0)
+    servidor.start()
+    try:
+        host, puerto = servidor.address
+        verificar_servidor(servidor, f"{host}:{puerto}")
+    finally:
+        servidor.stop()
+    print("  [OK] Lote compilado")
+
+
+def test_servidor_con_trabajadores():
+    """Trabajadores prefork precalentados (socket Unix si está disponible)"""
+    print("\n[TEST] Servidor con 2 trabajadores")
+    with tempfile.TemporaryDirectory() as tmp:
+        if hasattr(socket, "AF_UNIX"):
+            direccion = "unix:" + os.path.join(tmp, "kforge.sock")
+        else:
+            direccion = "127.0.0.1:0"
+        servidor = CompileServer(direccion, workers=2)
+        servidor.start()
+        try:
+            if isinstance(servidor.address, tuple):
+                direccion = "%s:%d" % servidor.address
+            verificar_servidor(servidor, direccion)
+        finally:
+            servidor.stop()
+    print("  [OK] Lote compilado")
+
+
+def test_shutdown_remoto():
+    """El comando shutdown detiene el servidor"""
+    print("\n[TEST] shutdown remoto")
+    servidor = CompileServer("127.0.0.1:0", workers=0)
+    servidor.start()
+    direccion = "%s:%d" % servidor.address
+    with CompileClient(direccion) as cliente:
+        assert cliente.request({"cmd": "shutdown"})["shutdown"]
+    servidor._hilo.join(timeout=5)
+    assert not servidor._hilo.is_alive()
+    servidor.stop()
+    print("  [OK] Servidor detenido")
+
+
+def run_all_tests():
+    """Ejecuta todos los tests del servidor"""
+    print("=" * 70)
+    print("TESTS DEL SERVIDOR DE COMPILACION")
+    print("=" * 70)
+
+    test_parse_address()
+    test_servidor_tcp_sin_trabajadores()
+    test_servidor_con_trabajadores()
+    test_shutdown_remoto()
+
+    print("\n" + "=" * 70)
+    print("[OK] TODOS LOS TESTS DEL SERVIDOR PASARON")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    run_all_tests()
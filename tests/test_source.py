@@ -0,0 +1,92 @@
+"""
+Tests para el índice de líneas del código fuente (core/source.py).
+"""
+
+import sys
+import os
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.source import SourceText
+from core.lexer import Lexer
+from core.controller import CompiladorController
+from core.jvm.jvm_compiler import JVMCompiler
+from core.utils import TipoToken
+
+
+def test_posiciones():
+    """offset -> (línea, columna) y su inversa"""
+    print("\n[TEST] Posiciones")
+    texto = "abc\n\nde\nf"
+    fuente = SourceText(texto)
+    assert fuente.num_lineas == 4
+    for offset, esperado in [(0, (1, 1)), (2, (1, 3)), (3, (1, 4)), (4, (2, 1)),
+                             (5, (3, 1)), (6, (3, 2)), (8, (4, 1)), (9, (4, 2))]:
+        assert fuente.posicion(offset) == esperado, (offset, fuente.posicion(offset))
+        assert fuente.offset(*esperado) == offset
+    assert [fuente.texto_linea(n) for n in range(1, 5)] == ["abc", "", "de", "f"]
+    assert SourceText("").num_lineas == 1
+    print("  [OK] Bisección correcta")
+
+
+def test_lexer_usa_indice():
+    """Las posiciones de los tokens salen del índice de líneas"""
+    print("\n[TEST] Posiciones del lexer")
+    codigo = 'val s: String = "a\nb"\n  var x: Int = 1 // fin\n'
+    tokens = Lexer().tokenizar(codigo)
+    fuente = SourceText(codigo)
+    for i in range(len(tokens) - 1):
+        assert (tokens.lineas[i], tokens.columnas[i]) == fuente.posicion(tokens.inicios[i])
+
+    var = next(t for t in tokens if t.tipo == TipoToken.VAR)
+    assert (var.linea, var.columna) == (3, 3)
+    assert tokens[-1].linea == 4
+    print("  [OK] Strings multilínea no desplazan las líneas")
+
+
+def test_extracto_error():
+    """Los errores léxicos muestran la línea con un marcador"""
+    print("\n[TEST] Extracto de error")
+    lexer = Lexer()
+    lexer.tokenizar("val x: Int = 1\nval y: Int = 2 @ 3\n")
+    error = lexer.error_manager.obtener_errores()[0]
+    assert (error.linea, error.columna) == (2, 16)
+    assert error.extracto() == "val y: Int = 2 @ 3\n               ^"
+    print("  " + error.extracto().replace("\n", "\n  "))
+
+
+def test_line_number_table():
+    """La LineNumberTable usa líneas reales y PCs reales"""
+    print("\n[TEST] LineNumberTable")
+    codigo = 'fun main() {\n    var x: Int = 5\n\n    x = x + 1\n    println(x)\n}\n'
+    resultado = CompiladorController().ejecutar_jvm(codigo)
+    assert resultado["exito"], resultado["errores"]
+
+    generador = JVMCompiler("Main").build(resultado["tac_instructions"])
+    mapeo = generador.get_line_mappings()
+    assert [linea for _, linea in mapeo] == [2, 4, 5]
+    pcs = [pc for pc, _ in mapeo]
+    assert pcs[0] == 0 and pcs == sorted(set(pcs))
+    assert all(pc in generador.positions.values() for pc in pcs)
+    print(f"  [OK] {mapeo}")
+
+
+def run_all_tests():
+    """Ejecuta todos los tests del índice de líneas"""
+    print("=" * 70)
+    print("TESTS DE SOURCE TEXT")
+    print("=" * 70)
+
+    test_posiciones()
+    test_lexer_usa_indice()
+    test_extracto_error()
+    test_line_number_table()
+
+    print("\n" + "=" * 70)
+    print("[OK] TODOS LOS TESTS DE SOURCE TEXT PASARON")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,113 @@
+"""
+Tests para la tokenización por bloques (Lexer.iter_tokens).
+"""
+
+import sys
+import os
+import tempfile
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.lexer import Lexer
+from core.scanner import DFAScanner
+from core.utils import TipoToken
+from benchmarks.generator import generate_program
+
+
+CASOS = [
+    "fun main() {\n    val x: Int = 5\n    println(x)\n}\n",
+    'val s = "héllo wörld ñ 漢字"\n// comentário "x"\nval y = 12.5 + 3L\n',
+    "identificador_muy_largo_que_cruza_bloques = 1234567 <= 89 && a != b\n",
+    "val x = 10L + 2.5f; @ # é ?\n\"sin cerrar\nval z = 1",
+    "a",
+    "",
+]
+
+
+def tokens_y_errores(lexer, tokens):
+    return list(tokens), [str(e) for e in lexer.error_manager.obtener_errores()]
+
+
+def referencia(codigo):
+    lexer = Lexer()
+    return tokens_y_errores(lexer, lexer.tokenizar(codigo))
+
+
+def test_bloques_equivalen_a_tokenizar():
+    """Cualquier tamaño de bloque produce los tokens y errores de tokenizar"""
+    print("\n[TEST] Equivalencia por bloques")
+    for codigo in CASOS + [generate_program(200, seed=11)]:
+        esperado = referencia(codigo)
+        datos = codigo.encode('utf-8')
+        for tam_bloque in (1, 2, 7, 64, 1 << 20):
+            lexer = Lexer()
+            obtenido = tokens_y_errores(lexer, lexer.iter_tokens(datos, tam_bloque))
+            assert obtenido == esperado, (codigo[:30], tam_bloque)
+    print("  [OK] Tokens, posiciones y errores idénticos")
+
+
+def test_desde_archivo():
+    """iter_tokens acepta una ruta (mmap), incluido un archivo vacío"""
+    print("\n[TEST] Tokenización desde archivo")
+    for codigo in (CASOS[1], ""):
+        with tempfile.NamedTemporaryFile('wb', suffix='.kt', delete=False) as archivo:
+            archivo.write(codigo.encode('utf-8'))
+        try:
+            lexer = Lexer()
+            obtenido = tokens_y_errores(lexer, lexer.iter_tokens(archivo.name, tam_bloque=5))
+        finally:
+            os.unlink(archivo.name)
+        assert obtenido == referencia(codigo)
+    print("  [OK] Archivo y archivo vacío")
+
+
+def test_produccion_perezosa():
+    """Los primeros tokens salen antes de leer toda la entrada"""
+    print("\n[TEST] Producción perezosa")
+    codigo = generate_program(500, seed=2).encode('utf-8')
+    tokens = Lexer().iter_tokens(codigo, tam_bloque=256)
+    primero = next(tokens)
+    assert primero.tipo != TipoToken.EOF
+    tokens.close()
+    print(f"  [OK] Primer token: {primero.tipo.name}")
+
+
+def test_eof():
+    """El último token es EOF en la última línea"""
+    print("\n[TEST] EOF")
+    tokens = list(Lexer().iter_tokens(b"val x = 1\n\n", tam_bloque=3))
+    assert tokens[-1].tipo == TipoToken.EOF
+    assert tokens[-1].linea == 3
+
+
+def test_escaneo_no_final():
+    """Con final=False el scanner marca dónde reanudar"""
+    print("\n[TEST] Escaneo no final")
+    scanner = DFAScanner(Lexer.ESPECIFICACION_TOKENS, omitir=Lexer.TIPOS_OMITIDOS)
+    piezas = list(scanner.escanear("val abc", final=False))
+    assert piezas[-1] == (-1, 4, 4)
+    piezas = list(scanner.escanear("val x ", final=False))
+    assert piezas[-1] == (-1, 5, 5)
+    assert all(k >= 0 for k, _, _ in scanner.escanear("val abc"))
+
+
+def run_all_tests():
+    """Ejecuta todos los tests de tokenización por bloques"""
+    print("=" * 70)
+    print("TESTS DE LEXER POR BLOQUES")
+    print("=" * 70)
+
+    test_bloques_equivalen_a_tokenizar()
+    test_desde_archivo()
+    test_produccion_perezosa()
+    test_eof()
+    test_escaneo_no_final()
+
+    print("\n" + "=" * 70)
+    print("[OK] TODOS LOS TESTS DE LEXER POR BLOQUES PASARON")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    run_all_tests()
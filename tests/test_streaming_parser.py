@@ -0,0 +1,92 @@
+"""
+Tests para el parser sobre un flujo de tokens (TokenRingBuffer).
+"""
+
+import sys
+import os
+import tempfile
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.lexer import Lexer
+from core.parser import Parser
+from core.token_buffer import TokenRingBuffer
+from benchmarks.generator import generate_program
+
+
+CASOS = [
+    "fun main() {\n    val x: Int = 5\n    println(x)\n}\n",
+    "fun f(n: Int): Int {\n    for (i in 0 until n - 1) {\n        if (i > 2) { break }\n    }\n    return n\n}\n",
+    "val a = arr[0].size\nfor (i in 1..arr.size - 1) { println(i) }\n",
+    # Con errores: la recuperación también debe coincidir
+    "val = 5\nval y: Int = (3 + \nwhile (x { }\nval z = 1\n",
+    "",
+]
+
+
+def parsear(tokens):
+    parser = Parser(tokens)
+    ast = parser.parsear()
+    return ast, [str(e) for e in parser.error_manager.obtener_errores()]
+
+
+def test_flujo_equivale_a_lista():
+    """Parsear desde iter_tokens produce el mismo AST y errores que desde la lista"""
+    print("\n[TEST] Flujo vs lista")
+    for codigo in CASOS + [generate_program(300, seed=4)]:
+        esperado = parsear(Lexer().tokenizar(codigo))
+        obtenido = parsear(Lexer().iter_tokens(codigo.encode('utf-8'), tam_bloque=16))
+        assert obtenido == esperado, codigo[:40]
+    print("  [OK] AST y errores idénticos")
+
+
+def test_desde_archivo():
+    """Lexer y parser en una sola pasada sobre un archivo"""
+    print("\n[TEST] Parser desde archivo")
+    codigo = generate_program(200, seed=9)
+    with tempfile.NamedTemporaryFile('w', suffix='.kt', delete=False, encoding='utf-8') as archivo:
+        archivo.write(codigo)
+    try:
+        parser = Parser(Lexer().iter_tokens(archivo.name, tam_bloque=4096))
+        ast = parser.parsear()
+    finally:
+        os.unlink(archivo.name)
+    assert ast == parsear(Lexer().tokenizar(codigo))[0]
+    assert parser.flujo.leidos == parser.posicion + 1
+    print(f"  [OK] {parser.flujo.leidos} tokens, ventana de {Parser.CAPACIDAD_FLUJO}")
+
+
+def test_ventana():
+    """El buffer circular descarta los tokens fuera de la ventana"""
+    print("\n[TEST] Ventana del buffer circular")
+    flujo = TokenRingBuffer(iter(range(10)), capacidad=3)
+    assert flujo.obtener(4) == 4
+    assert flujo.obtener(2) == 2
+    try:
+        flujo.obtener(1)
+        assert False, "Debió lanzar IndexError"
+    except IndexError:
+        pass
+    assert flujo.obtener(-1) is None
+    assert flujo.obtener(10) is None and flujo.agotado
+    assert flujo.obtener(9) == 9
+
+
+def run_all_tests():
+    """Ejecuta todos los tests del parser sobre flujos"""
+    print("=" * 70)
+    print("TESTS DE PARSER SOBRE FLUJO DE TOKENS")
+    print("=" * 70)
+
+    test_flujo_equivale_a_lista()
+    test_desde_archivo()
+    test_ventana()
+
+    print("\n" + "=" * 70)
+    print("[OK] TODOS LOS TESTS DE PARSER SOBRE FLUJO PASARON")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,178 @@
+"""
+Tests para el TAC en columnas (core/tac_buffer.py).
+"""
+
+import sys
+import os
+import pickle
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.controller import CompiladorController
+from core.tac import TACGenerator, TACInstruction, Var
+from core.tac_buffer import TACBuffer
+from core.bytecode import BytecodeGenerator
+from core.jvm.jvm_compiler import JVMCompiler
+from core.utils import TipoDato
+
+
+CODIGO = """
+fun doble(x: Double): Double {
+    return x * 2
+}
+
+fun main() {
+    val arr: IntArray = intArrayOf(3, 1, 2)
+    var x: Int = 0
+    for (i in 0 until arr.size) {
+        if (arr[i] > 1) {
+            x = x + arr[i]
+        }
+    }
+    println(x)
+    println(doble(1.5))
+}
+"""
+
+
+def generar(compacto: bool):
+    """Genera el TAC de CODIGO (lista o TACBuffer)"""
+    controlador = CompiladorController()
+    controlador.ejecutar(CODIGO)
+    assert not controlador.error_manager.tiene_errores()
+    generador = TACGenerator(compacto=compacto)
+    return generador, generador.generate(controlador.ast)
+
+
+def test_vistas_instruccion():
+    """buffer[i] devuelve las mismas instrucciones que la lista"""
+    print("\n[TEST] Vistas de TACInstruction")
+    generador_lista, lista = generar(False)
+    generador, buffer = generar(True)
+    assert isinstance(buffer, TACBuffer)
+    assert len(buffer) == len(lista)
+    assert list(buffer) == lista
+    assert buffer[-1] == lista[-1]
+    assert [inst.linea for inst in buffer] == [inst.linea for inst in lista]
+    assert [inst.tipo for inst in buffer] == [inst.tipo for inst in lista]
+    assert generador.format_output() == generador_lista.format_output()
+    print(f"  [OK] {len(buffer)} instrucciones")
+
+
+def test_columnas_y_operandos():
+    """Operaciones como bytes y operandos internados una vez"""
+    print("\n[TEST] Columnas")
+    _, lista = generar(False)
+    _, buffer = generar(True)
+    assert buffer.nbytes() == 22 * len(buffer)
+    assert [buffer.op(i) for i in range(len(buffer))] == [inst.op for inst in lista]
+    assert list(buffer.posiciones('CALL')) == [i for i, inst in enumerate(lista) if inst.op == 'CALL']
+    assert list(buffer.posiciones('GOTO', 'IF_FALSE')) == \
+        [i for i, inst in enumerate(lista) if inst.op in ('GOTO', 'IF_FALSE')]
+    assert buffer.contar('LABEL') == sum(1 for inst in lista if inst.op == 'LABEL')
+
+    # Un operando que se usa varias veces es un solo objeto
+    x = [inst.result for inst in buffer if inst.result == 'x']
+    assert len(x) > 1 and all(op is x[0] for op in x)
+    assert len(buffer.operandos) < 3 * len(buffer)
+
+    # Variables homónimas de distinto tipo no se mezclan; CALL guarda texto
+    buffer = TACBuffer()
+    buffer.agregar('ASSIGN', '1', None, Var('x', TipoDato.INT), tipo=TipoDato.INT)
+    buffer.agregar('ASSIGN', '1.5', None, Var('x', TipoDato.DOUBLE), tipo=TipoDato.DOUBLE)
+    buffer.agregar('CALL', 'x', '0', None)
+    assert buffer[0].result.tipo == TipoDato.INT and buffer[1].result.tipo == TipoDato.DOUBLE
+    assert type(buffer[2].arg1) is str
+    print("  [OK] Columnas consistentes")
+
+
+def test_literales_homonimos():
+    """Literales de igual texto y distinto tipo conservan cada uno su tipo"""
+    print("\n[TEST] Literales homónimos")
+    codigo = """
+fun main() {
+    val s: String = "7"
+    val n: Int = 7
+    val b: Boolean = true
+    println(s)
+    println(n + 1)
+    println(b)
+}
+"""
+    controlador = CompiladorController()
+    controlador.ejecutar(codigo)
+    assert not controlador.error_manager.tiene_errores()
+    lista = TACGenerator().generate(controlador.ast)
+    buffer = TACGenerator(compacto=True).generate(controlador.ast)
+
+    def operandos(instrucciones):
+        return [(repr(op), type(getattr(op, 'valor', None)), getattr(op, 'es_global', None))
+                for inst in instrucciones for op in (inst.arg1, inst.arg2, inst.result)]
+
+    assert operandos(buffer) == operandos(lista)
+    siete = [inst.arg1 for inst in buffer if inst.op == 'ASSIGN' and str(inst.arg1) == '7']
+    assert {(op.tipo, type(op.valor)) for op in siete} == {(TipoDato.STRING, str), (TipoDato.INT, int)}
+
+    controlador = CompiladorController(tac_compacto=True)
+    resultado = controlador.ejecutar_jvm(codigo, class_name="Homonimos")
+    assert resultado["exito"], resultado["errores"]
+    jvm = [str(inst) for inst in JVMCompiler("Homonimos").build(controlador.tac_instructions).instructions]
+    assert jvm[jvm.index('BIPUSH 7') + 1].startswith('ISTORE')
+    print("  [OK] String \"7\" e Int 7 separados")
+
+
+def test_corte_y_serializacion():
+    """Cortes, copia desde instrucciones y pickle"""
+    print("\n[TEST] Cortes y serialización")
+    _, lista = generar(False)
+    buffer = TACBuffer.desde_instrucciones(lista)
+    assert buffer == lista
+    assert isinstance(buffer[3:9], TACBuffer)
+    assert list(buffer[3:9]) == lista[3:9]
+    copia = pickle.loads(pickle.dumps(buffer))
+    assert copia == lista
+    assert copia.internar(lista[1].result) == buffer.internar(lista[1].result)
+    try:
+        buffer.agregar('NOP')
+        assert False, "Debe rechazar operaciones desconocidas"
+    except ValueError:
+        pass
+    print("  [OK] Round-trip con pickle")
+
+
+def test_backends_con_buffer():
+    """Los backends y el controlador aceptan el TAC en columnas"""
+    print("\n[TEST] Backends con TACBuffer")
+    _, lista = generar(False)
+    _, buffer = generar(True)
+    esperado = [str(inst) for inst in BytecodeGenerator().generate(lista)]
+    assert [str(inst) for inst in BytecodeGenerator().generate(buffer)] == esperado
+
+    controlador = CompiladorController(tac_compacto=True)
+    resultado = controlador.ejecutar_jvm(CODIGO, class_name="Compacto")
+    assert resultado["exito"], resultado["errores"]
+    assert isinstance(controlador.tac_instructions, TACBuffer)
+    assert isinstance(controlador.tac_instructions[0], TACInstruction)
+    print("  [OK] Mismo bytecode y .class generado")
+
+
+def run_all_tests():
+    """Ejecuta todos los tests del TAC en columnas"""
+    print("=" * 70)
+    print("TESTS DE TAC BUFFER")
+    print("=" * 70)
+
+    test_vistas_instruccion()
+    test_columnas_y_operandos()
+    test_literales_homonimos()
+    test_corte_y_serializacion()
+    test_backends_con_buffer()
+
+    print("\n" + "=" * 70)
+    print("[OK] TODOS LOS TESTS DE TAC BUFFER PASARON")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -15,7 +15,8 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from core.controller import CompiladorController
-from core.tac import TACGenerator
+from core.tac import TACGenerator, Const, Var, Temp, Label, Property, as_operand
+from core.utils import TipoDato
 
 
 def compilar_y_generar_tac(codigo: str):
@@ -210,7 +211,7 @@ def test_if_statement():
     # Verificar IF_FALSE, GOTO y LABELs
     tiene_if_false = any(inst.op == 'IF_FALSE' for inst in tac)
     tiene_goto = any(inst.op == 'GOTO' for inst in tac)
-    num_labels = sum(1 for inst in tac if inst.op == 'LABEL' and inst.label and inst.label.startswith('L'))
+    num_labels = sum(1 for inst in tac if inst.op == 'LABEL' and inst.label and str(inst.label).startswith('L'))
 
     if not tiene_if_false:
         print("ERROR: No se encontró IF_FALSE")
@@ -253,7 +254,7 @@ def test_while_loop():
     # Verificar estructura del while
     tiene_if_false = any(inst.op == 'IF_FALSE' for inst in tac)
     tiene_goto = any(inst.op == 'GOTO' for inst in tac)
-    num_labels = sum(1 for inst in tac if inst.op == 'LABEL' and inst.label and inst.label.startswith('L'))
+    num_labels = sum(1 for inst in tac if inst.op == 'LABEL' and inst.label and str(inst.label).startswith('L'))
 
     if not tiene_if_false or not tiene_goto:
         print("ERROR: Estructura de while incorrecta")
@@ -446,6 +447,204 @@ def test_bubble_sort():
     return True
 
 
+def test_shadowing():
+    """Test 12: Variables que ocultan a otras (enlaces del análisis semántico)"""
+    print("\n[TEST 12] Variables que ocultan a otras")
+    codigo = """
+    fun main() {
+        var x: Int = 5
+        for (i in 0..2) {
+            val x: Int = i * 2
+            println(x)
+        }
+        println(x)
+    }
+    """
+
+    controlador = CompiladorController()
+    resultado = controlador.ejecutar(codigo)
+    if not resultado['exito'] or controlador.error_manager.tiene_errores():
+        print("ERROR: Compilación falló")
+        return False
+
+    # Enlaces: cada referencia apunta al símbolo de su declaración
+    cuerpo = controlador.ast.hijos[0].hijos[0]
+    externa, ciclo, println_externa = cuerpo.hijos
+    interna, println_interna = ciclo.hijos[1].hijos
+    if println_externa.hijos[0].enlace is not externa.enlace:
+        print("ERROR: La referencia externa no se resolvió a la declaración externa")
+        return False
+    if println_interna.hijos[0].enlace is not interna.enlace:
+        print("ERROR: La referencia interna no se resolvió a la declaración interna")
+        return False
+    if not interna.enlace.oculta or externa.enlace.oculta:
+        print("ERROR: Solo la declaración interna oculta a otra")
+        return False
+    if interna.enlace.profundidad <= externa.enlace.profundidad:
+        print("ERROR: La declaración interna debe estar en un scope más profundo")
+        return False
+
+    tac = TACGenerator().generate(controlador.ast)
+    for inst in tac:
+        print(f"  {inst}")
+
+    # La variable interna tiene su propio nombre TAC y no pisa a la externa
+    nombre_interna = f"x#{interna.enlace.id}"
+    params = [inst.arg1 for inst in tac if inst.op == 'PARAM']
+    if params != [nombre_interna, 'x']:
+        print(f"ERROR: PARAMs inesperados: {params}")
+        return False
+
+    # Un parámetro que oculta a una global conserva su nombre (los argumentos
+    # se enlazan por metadata['parametros']) y no es global
+    codigo = """
+    var x: Int = 1
+    fun f(x: Int): Int {
+        return x
+    }
+    """
+    controlador = CompiladorController()
+    resultado = controlador.ejecutar(codigo)
+    if not resultado['exito'] or controlador.error_manager.tiene_errores():
+        print("ERROR: Compilación con parámetro que oculta a una global falló")
+        return False
+    funcion = controlador.ast.hijos[1]
+    tac = TACGenerator().generate(controlador.ast)
+    retorno = next(inst for inst in tac if inst.op == 'RETURN')
+    if [p['nombre'] for p in funcion.metadata['parametros']] != [str(retorno.arg1)] \
+            or retorno.arg1.es_global or not tac[0].result.es_global:
+        print(f"ERROR: El parámetro x debe llamarse x y ser local: {retorno.arg1!r}")
+        return False
+
+    print("OK: Las variables que ocultan a otras tienen su propio nombre")
+    return True
+
+
+def test_typed_tac():
+    """Test 13: Tipos del análisis semántico en las instrucciones y temporales"""
+    print("\n[TEST 13] TAC tipado")
+    codigo = """
+    fun media(a: Int, b: Double): Double {
+        return a + b
+    }
+    fun main() {
+        val x: Double = 1
+        val datos: DoubleArray = doubleArrayOf(1.5, 2.5)
+        val y: Double = datos[0] * 2
+        val mayor: Boolean = y > 3
+        var n: Int = 2
+        n = n + 1
+    }
+    """
+
+    controlador = CompiladorController()
+    resultado = controlador.ejecutar(codigo)
+    if not resultado['exito'] or controlador.error_manager.tiene_errores():
+        print("ERROR: Compilación falló")
+        return False
+
+    generador = TACGenerator()
+    tac = generador.generate(controlador.ast)
+    for inst in tac:
+        print(f"  {str(inst):30} {inst.tipo.value if inst.tipo else '-'}")
+
+    tipos = {str(inst): inst.tipo for inst in tac}
+    esperados = {
+        "t0 = a + b": TipoDato.DOUBLE,
+        "RETURN t0": TipoDato.DOUBLE,
+        "x = 1": TipoDato.DOUBLE,            # Int asignado a una variable Double
+        "datos = t1": TipoDato.ARRAY_DOUBLE,
+        "t2 = datos[0]": TipoDato.DOUBLE,    # Tipo del elemento
+        "t3 = t2 * 2": TipoDato.DOUBLE,
+        "t4 = y > 3": TipoDato.DOUBLE,       # Las comparaciones llevan el tipo de los operandos
+        "t5 = n + 1": TipoDato.INT,
+        "n = t5": TipoDato.INT,
+    }
+    for texto, tipo in esperados.items():
+        if tipos.get(texto) != tipo:
+            print(f"ERROR: '{texto}' debía tener tipo {tipo}, tiene {tipos.get(texto)}")
+            return False
+
+    comparacion = next(inst for inst in tac if inst.op == 'GT')
+    if comparacion.tipo_resultado != TipoDato.BOOLEAN or generador.temp_types['t4'] != TipoDato.BOOLEAN:
+        print("ERROR: El resultado de una comparación es Boolean")
+        return False
+    if generador.temp_types['t1'] != TipoDato.ARRAY_DOUBLE:
+        print(f"ERROR: Tipo del temporal t1: {generador.temp_types['t1']}")
+        return False
+
+    print("OK: Instrucciones y temporales llevan su tipo")
+    return True
+
+
+def test_typed_operands():
+    """Test 14: Operandos tipados (Const, Var, Temp, Property, Label)"""
+    print("\n[TEST 14] Operandos tipados")
+    codigo = """
+    fun main() {
+        val arr: DoubleArray = doubleArrayOf(1.5, 2.5)
+        var x: Double = -2.5
+        var n: Int = arr.size
+        while (n > 0) {
+            n = n - 1
+        }
+    }
+    """
+
+    exito, tac, errores = compilar_y_generar_tac(codigo)
+
+    if not exito:
+        print(f"ERROR: Compilación falló: {errores}")
+        return False
+
+    asignaciones = {str(inst.result): inst.arg1 for inst in tac if inst.op == 'ASSIGN'}
+    propiedad = next(inst.arg1 for inst in tac if inst.op == 'ASSIGN' and isinstance(inst.arg1, Property))
+    if not isinstance(propiedad.objeto, Var) or propiedad.objeto.tipo != TipoDato.ARRAY_DOUBLE:
+        print(f"ERROR: arr.size debe ser Property sobre Var arr: {propiedad!r}")
+        return False
+
+    resta = next(inst for inst in tac if inst.op == 'SUB')
+    if not (isinstance(resta.arg1, Var) and isinstance(resta.arg2, Const) and isinstance(resta.result, Temp)):
+        print(f"ERROR: Clases de operandos en n - 1: {resta!r}")
+        return False
+    if resta.arg2.valor != 1 or resta.arg2.tipo != TipoDato.INT:
+        print(f"ERROR: Const 1 debe ser Int: {resta.arg2!r}")
+        return False
+
+    # Una misma variable es un único operando
+    variables = [op for inst in tac for op in (inst.arg1, inst.result) if op == 'n']
+    if any(op is not variables[0] for op in variables):
+        print("ERROR: La variable n debe crearse una sola vez")
+        return False
+
+    saltos = [inst for inst in tac if inst.op in ('GOTO', 'IF_FALSE')]
+    if not all(isinstance(inst.arg1 if inst.op == 'GOTO' else inst.arg2, Label) for inst in saltos):
+        print("ERROR: Los destinos de salto deben ser Label")
+        return False
+
+    # El texto se clasifica una sola vez (TAC escrito a mano)
+    casos = {'-2.5': Const, '42': Const, 'true': Const, 'arr.size': Property, 't3': Var}
+    for texto, clase in casos.items():
+        if type(as_operand(texto)) is not clase:
+            print(f"ERROR: as_operand({texto!r}) debe ser {clase.__name__}")
+            return False
+    if as_operand('-2.5').valor != -2.5 or as_operand('-2.5').tipo != TipoDato.DOUBLE:
+        print("ERROR: -2.5 es un Double negativo")
+        return False
+
+    # Literales que se imprimen igual pero tienen otro tipo no son iguales
+    cadena, entero = Const('7', '7', TipoDato.STRING), Const('7', 7, TipoDato.INT)
+    if cadena == entero or len({cadena, entero}) != 2 or entero != Const('7', 7, TipoDato.INT):
+        print("ERROR: Const debe compararse por texto, tipo y valor")
+        return False
+    if entero != '7' or Const('1', True, TipoDato.BOOLEAN) == Const('1', 1, TipoDato.BOOLEAN):
+        print("ERROR: Const es igual a su texto pero no a un valor de otra clase")
+        return False
+
+    print(f"OK: Operandos tipados ({len(asignaciones)} asignaciones)")
+    return True
+
+
 def main():
     """Ejecuta todos los tests"""
     print("=" * 70)
@@ -463,7 +662,10 @@ def main():
         test_function_with_return,
         test_function_call,
         test_arrays,
-        test_bubble_sort
+        test_bubble_sort,
+        test_shadowing,
+        test_typed_tac,
+        test_typed_operands
     ]
 
     resultados = []
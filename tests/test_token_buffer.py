@@ -0,0 +1,122 @@
+"""
+Tests para el buffer compacto de tokens (core/token_buffer.py).
+"""
+
+import sys
+import os
+import pickle
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.lexer import Lexer
+from core.parser import Parser
+from core.token_buffer import TokenBuffer
+from core.utils import Token, TipoToken
+
+
+CODIGO = """
+fun main() {
+    val x: Int = 42
+    var y: Double = 2.5
+    println("hola\\n" + x)
+    if (x >= 10 && true) {
+        y = y * 3.0
+    }
+}
+"""
+
+
+def test_vistas_token():
+    """buffer[i] devuelve Tokens con tipo, valor, línea y columna"""
+    print("\n[TEST] Vistas de Token")
+    tokens = Lexer().tokenizar(CODIGO)
+    assert isinstance(tokens, TokenBuffer)
+    assert tokens[0] == Token(TipoToken.FUN, 'fun', 2, 1)
+
+    por_tipo = {}
+    for token in tokens:
+        por_tipo.setdefault(token.tipo, token)
+    assert por_tipo[TipoToken.INT_LITERAL].valor == 42
+    assert por_tipo[TipoToken.DOUBLE_LITERAL].valor == 2.5
+    assert por_tipo[TipoToken.STRING_LITERAL].valor == 'hola\\n'
+    assert por_tipo[TipoToken.BOOLEAN_LITERAL].valor == 'true'
+    assert tokens[-1].tipo == TipoToken.EOF and tokens[-1].valor is None
+    assert tokens.tipo(-1) == TipoToken.EOF
+    print(f"  [OK] {len(tokens)} tokens")
+
+
+def test_columnas_y_texto():
+    """Las columnas guardan offsets y el texto se recorta del código"""
+    print("\n[TEST] Columnas")
+    tokens = Lexer().tokenizar(CODIGO)
+    for i in range(len(tokens) - 1):
+        texto = tokens.texto(i)
+        assert CODIGO[tokens.inicios[i]:].startswith(texto)
+        assert texto
+    assert tokens.nbytes() == 20 * len(tokens)
+    print("  [OK] Offsets consistentes")
+
+
+def test_corte():
+    """Un corte es otro TokenBuffer con los mismos tokens"""
+    print("\n[TEST] Cortes")
+    tokens = Lexer().tokenizar(CODIGO)
+    corte = tokens[5:12]
+    assert isinstance(corte, TokenBuffer)
+    assert list(corte) == list(tokens)[5:12]
+    assert list(tokens[:-1]) == list(tokens)[:-1]
+    assert tokens[::2] == list(tokens)[::2]
+    print("  [OK] Cortes equivalentes a listas")
+
+
+def test_serializacion():
+    """pickle conserva el buffer"""
+    print("\n[TEST] Serialización")
+    tokens = Lexer().tokenizar(CODIGO)
+    copia = pickle.loads(pickle.dumps(tokens))
+    assert list(copia) == list(tokens)
+    print("  [OK] Round-trip con pickle")
+
+
+def test_parser_con_buffer():
+    """El parser consume el buffer como antes la lista de tokens"""
+    print("\n[TEST] Parser con TokenBuffer")
+    lexer = Lexer()
+    tokens = lexer.tokenizar(CODIGO)
+    parser = Parser(tokens, lexer.error_manager)
+    ast = parser.parsear()
+    assert not lexer.error_manager.tiene_errores()
+    assert ast.hijos[0].tipo.name == 'FUNCION'
+    print("  [OK] AST generado")
+
+
+def test_sufijo_invalido():
+    """El lexer sigue detectando sufijos tras literales numéricos"""
+    print("\n[TEST] Sufijo de literal")
+    lexer = Lexer()
+    lexer.tokenizar("val x: Int = 10L")
+    assert lexer.error_manager.tiene_errores()
+    print("  [OK] Error léxico reportado")
+
+
+def run_all_tests():
+    """Ejecuta todos los tests del buffer de tokens"""
+    print("=" * 70)
+    print("TESTS DE TOKEN BUFFER")
+    print("=" * 70)
+
+    test_vistas_token()
+    test_columnas_y_texto()
+    test_corte()
+    test_serializacion()
+    test_parser_con_buffer()
+    test_sufijo_invalido()
+
+    print("\n" + "=" * 70)
+    print("[OK] TODOS LOS TESTS DE TOKEN BUFFER PASARON")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    run_all_tests()
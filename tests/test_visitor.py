@@ -0,0 +1,157 @@
+"""
+Tests para el recorrido del AST (core/visitor.py) y las pasadas que lo usan.
+"""
+
+import sys
+import os
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.visitor import ASTVisitor, ASTTransformer, iterar_nodos
+from core.lexer import Lexer
+from core.parser import Parser
+from core.semantic import AnalizadorSemantico
+from core.tac import TACGenerator
+from core.utils import NodoAST, TipoNodo
+
+
+def parsear(codigo):
+    lexer = Lexer()
+    parser = Parser(lexer.tokenizar(codigo), lexer.error_manager)
+    return parser.parsear()
+
+
+def literal(valor):
+    return NodoAST(TipoNodo.EXPRESION_LITERAL, valor)
+
+
+def suma(izquierdo, derecho):
+    return NodoAST(TipoNodo.EXPRESION_BINARIA, '+', [izquierdo, derecho])
+
+
+class Evaluador(ASTVisitor):
+    """Evalúa sumas de literales"""
+
+    def visitar_expresion_literal(self, nodo):
+        return nodo.valor
+
+    def visitar_expresion_binaria(self, nodo):
+        izquierdo = yield nodo.hijos[0]
+        derecho = yield nodo.hijos[1]
+        return izquierdo + derecho
+
+
+def test_despacho():
+    """Métodos por nombre, por METODOS y genérico"""
+    print("\n[TEST] Despacho por tabla")
+    assert Evaluador().visitar(suma(literal(2), suma(literal(3), literal(4)))) == 9
+
+    class Explicito(Evaluador):
+        METODOS = {TipoNodo.EXPRESION_LITERAL: 'doble'}
+
+        def doble(self, nodo):
+            return nodo.valor * 2
+
+    assert Explicito().visitar(suma(literal(2), literal(3))) == 10
+    # Sin método propio: visitar_generico (None en la base)
+    assert Evaluador().visitar(NodoAST(TipoNodo.BREAK)) is None
+
+
+def test_sin_limite_de_recursion():
+    """Árboles más profundos que el límite de recursión de Python"""
+    print("\n[TEST] Profundidad sin recursión")
+    profundidad = sys.getrecursionlimit() * 5
+    arbol = literal(1)
+    for _ in range(profundidad - 1):
+        arbol = suma(arbol, literal(1))
+    assert Evaluador().visitar(arbol) == profundidad
+    assert sum(1 for _ in iterar_nodos(arbol)) == 2 * profundidad - 1
+    print(f"  [OK] Profundidad {profundidad}")
+
+
+def test_excepciones():
+    """Una excepción en un hijo se lanza en el generador que lo visitó"""
+    print("\n[TEST] Excepciones")
+
+    class Divisor(Evaluador):
+        def visitar_expresion_literal(self, nodo):
+            return 1 // nodo.valor
+
+        def visitar_expresion_binaria(self, nodo):
+            try:
+                izquierdo = yield nodo.hijos[0]
+            except ZeroDivisionError:
+                izquierdo = 100
+            derecho = yield nodo.hijos[1]
+            return izquierdo + derecho
+
+    assert Divisor().visitar(suma(literal(0), literal(1))) == 101
+    try:
+        Divisor().visitar(suma(literal(1), suma(literal(1), literal(0))))
+        assert False, "Debió propagar ZeroDivisionError"
+    except ZeroDivisionError:
+        pass
+
+
+def test_transformador():
+    """ASTTransformer reemplaza y quita nodos"""
+    print("\n[TEST] Transformador")
+
+    class Plegado(ASTTransformer):
+        def visitar_expresion_binaria(self, nodo):
+            nodo = yield from self.transformar_hijos(nodo)
+            izquierdo, derecho = nodo.hijos
+            if izquierdo.tipo == derecho.tipo == TipoNodo.EXPRESION_LITERAL:
+                return literal(izquierdo.valor + derecho.valor)
+            return nodo
+
+        def visitar_break(self, nodo):
+            return None
+
+    ast = parsear("fun main() {\n    val x: Int = 1 + 2 + y\n    while (true) { break }\n}\n")
+    Plegado().visitar(ast)
+    declaracion, ciclo = ast.hijos[0].hijos[0].hijos
+    assert declaracion.hijos[0].hijos[0] == literal(3)
+    assert ciclo.hijos[1].hijos == ()
+
+
+def test_pasadas_profundas():
+    """Semántico y TAC sobre expresiones anidadas miles de niveles"""
+    print("\n[TEST] Pasadas sobre expresiones profundas")
+    profundidad = 5000
+    codigo = ("fun main() {\n"
+              f"    val x: Int = {' + '.join(['1'] * profundidad)}\n"
+              f"    val b: Boolean = {'!' * profundidad}true\n"
+              "    println(x)\n"
+              "}\n")
+    ast = parsear(codigo)
+    analizador = AnalizadorSemantico()
+    analizador.analizar(ast)
+    assert not analizador.error_manager.tiene_errores()
+    instrucciones = TACGenerator().generate(ast)
+    operaciones = [i.op for i in instrucciones]
+    assert operaciones.count('ADD') == profundidad - 1
+    assert operaciones.count('NOT') == profundidad
+    print(f"  [OK] {len(instrucciones)} instrucciones TAC")
+
+
+def run_all_tests():
+    """Ejecuta todos los tests del recorrido del AST"""
+    print("=" * 70)
+    print("TESTS DEL RECORRIDO DEL AST")
+    print("=" * 70)
+
+    test_despacho()
+    test_sin_limite_de_recursion()
+    test_excepciones()
+    test_transformador()
+    test_pasadas_profundas()
+
+    print("\n" + "=" * 70)
+    print("[OK] TODOS LOS TESTS DEL RECORRIDO DEL AST PASARON")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    run_all_tests()
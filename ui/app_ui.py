@@ -13,6 +13,7 @@ from ui.sidebar import Sidebar
 from ui.phases_panel import PhasesPanel
 from ui.status_bar import StatusBar
 from core.controller import CompiladorController
+from core.metrics import formatear_metricas
 
 
 class KForgeApp(tk.Tk):
@@ -90,6 +91,11 @@ class KForgeApp(tk.Tk):
                             command=lambda: self._toggle_theme("dark"))
         view_menu.add_command(label=self.lang.t("menu.light_theme"),
                             command=lambda: self._toggle_theme("light"))
+        view_menu.add_separator()
+        # Métricas por fase en la barra de estado (opcional: usa tracemalloc)
+        self.show_metrics = tk.BooleanVar(value=False)
+        view_menu.add_checkbutton(label=self.lang.t("menu.metrics"),
+                                  variable=self.show_metrics)
 
         # Atajos de teclado
         self.bind("<Control-n>", lambda e: self._new_file())
@@ -555,20 +561,23 @@ Caracteres: {chars}"""
 
         try:
             # 1. Ejecutar análisis léxico
-            resultado_lexico = self.controller.ejecutar_lexico(code)
+            metricas = self.show_metrics.get()
+            resultado_lexico = self.controller.ejecutar_lexico(code, metricas)
             if resultado_lexico["exito"]:
                 self.console_panel.show_tokens(resultado_lexico["tokens"])
                 self.phases_panel.set_phase_completed("lexical", True)
 
-            # 2. Ejecutar análisis sintáctico
-            resultado_sintactico = self.controller.ejecutar_sintactico(code)
+            # 2. Ejecutar análisis sintáctico (reutiliza los tokens memoizados)
+            resultado_sintactico = self.controller.ejecutar_sintactico(code, metricas)
             if resultado_sintactico["exito"]:
                 self.console_panel.show_ast(resultado_sintactico["arbol"])
                 self.phases_panel.set_phase_completed("syntactic", True)
 
-            # 3. Ejecutar análisis semántico (incluye TAC y Bytecode en v1.1)
-            resultado = self.controller.ejecutar_semantico(code)
+            # 3. Ejecutar análisis semántico (incluye TAC y Bytecode en v1.1;
+            #    reutiliza tokens y AST memoizados en el pipeline del controlador)
+            resultado = self.controller.ejecutar_semantico(code, metricas)
             self.console_panel.show_results(resultado)
+            self._show_metrics(resultado)
 
             # 4. Mostrar código generado si está disponible (v1.1)
             if resultado.get("codigo_intermedio") or resultado.get("bytecode"):
@@ -589,6 +598,13 @@ Caracteres: {chars}"""
             self.console_panel.write_error(str(e))
             self.phases_panel.set_phase_completed("semantic", False)
 
+    def _show_metrics(self, resultado: dict):
+        """Muestra las métricas por fase en la barra de estado (si se pidieron)."""
+        if "metricas" in resultado:
+            self.status_bar.set_info(formatear_metricas(resultado["metricas"]))
+        else:
+            self.status_bar.set_info("")
+
     def _run_complete(self):
         """Ejecuta compilación completa (semántica + resaltado)."""
         self._run_semantic()
@@ -614,20 +630,23 @@ Caracteres: {chars}"""
 
         try:
             # 1. Ejecutar análisis léxico
-            resultado_lexico = self.controller.ejecutar_lexico(code)
+            metricas = self.show_metrics.get()
+            resultado_lexico = self.controller.ejecutar_lexico(code, metricas)
             if resultado_lexico["exito"]:
                 self.console_panel.show_tokens(resultado_lexico["tokens"])
                 self.phases_panel.set_phase_completed("lexical", True)
 
-            # 2. Ejecutar análisis sintáctico
-            resultado_sintactico = self.controller.ejecutar_sintactico(code)
+            # 2. Ejecutar análisis sintáctico (reutiliza los tokens memoizados)
+            resultado_sintactico = self.controller.ejecutar_sintactico(code, metricas)
             if resultado_sintactico["exito"]:
                 self.console_panel.show_ast(resultado_sintactico["arbol"])
                 self.phases_panel.set_phase_completed("syntactic", True)
 
-            # 3. Ejecutar análisis semántico (v1.1: incluye TAC y Bytecode)
-            resultado = self.controller.ejecutar_semantico(code)
+            # 3. Ejecutar análisis semántico (v1.1: incluye TAC y Bytecode;
+            #    reutiliza tokens y AST memoizados en el pipeline del controlador)
+            resultado = self.controller.ejecutar_semantico(code, metricas)
             self.console_panel.show_results(resultado)
+            self._show_metrics(resultado)
 
             if resultado["exito"]:
                 self.phases_panel.set_phase_completed("semantic", True)
@@ -217,7 +217,9 @@ class CodeTab(tk.Frame):
 
         bytecode_ops = ['PUSH', 'LOAD', 'STORE', 'ADD', 'SUB', 'MUL', 'DIV', 'MOD',
                         'LT', 'GT', 'LE', 'GE', 'EQ', 'NE', 'AND', 'OR', 'NOT', 'NEG',
-                        'LABEL', 'JUMP', 'JUMPF', 'CALL', 'RET', 'HALT', 'ALOAD', 'ASTORE']
+                        'LABEL', 'JUMP', 'JUMPF', 'CALL', 'RET', 'HALT', 'ALOAD', 'ASTORE',
+                        'DADD', 'DSUB', 'DMUL', 'DDIV', 'DMOD', 'DLT', 'DGT', 'DLE', 'DGE',
+                        'DEQ', 'DNE', 'DNEG', 'DALOAD', 'DASTORE', 'I2D']
 
         all_ops = set(tac_ops + bytecode_ops)
 
@@ -6,6 +6,11 @@ import tkinter as tk
 from tkinter import ttk
 import re
 from ui.theme_manager import get_theme_manager
+from core.source import SourceText
+
+
+# Comentarios, strings y palabras en una sola pasada sobre todo el texto
+PATRON_RESALTADO = re.compile(r'(?P<comment>//[^\n]*)|(?P<string>"(?:[^"\\\n]|\\.)*")|(?P<word>\b\w+\b)')
 
 
 class EditorWithLineNumbers(tk.Frame):
@@ -114,39 +119,30 @@ class EditorWithLineNumbers(tk.Frame):
         for tag in ["keyword", "type", "string", "number", "comment"]:
             self.text.tag_remove(tag, "1.0", tk.END)
 
-        content = self.text.get("1.0", tk.END)
-        lines = content.split('\n')
+        fuente = SourceText(self.text.get("1.0", tk.END))
 
         keywords = set(self.theme.get_keywords())
         types = set(self.theme.get_types())
 
-        for line_num, line in enumerate(lines, 1):
-            # Comentarios
-            if '//' in line:
-                idx = line.index('//')
-                start = f"{line_num}.{idx}"
-                end = f"{line_num}.{len(line)}"
-                self.text.tag_add("comment", start, end)
-                line = line[:idx]
-
-            # Strings
-            for match in re.finditer(r'"([^"\\]|\\.)*"', line):
-                start = f"{line_num}.{match.start()}"
-                end = f"{line_num}.{match.end()}"
-                self.text.tag_add("string", start, end)
-
-            # Palabras clave y tipos
-            for match in re.finditer(r'\b\w+\b', line):
+        for match in PATRON_RESALTADO.finditer(fuente.texto):
+            tag = match.lastgroup
+            if tag == "word":
                 word = match.group()
-                start = f"{line_num}.{match.start()}"
-                end = f"{line_num}.{match.end()}"
-
                 if word in keywords:
-                    self.text.tag_add("keyword", start, end)
+                    tag = "keyword"
                 elif word in types:
-                    self.text.tag_add("type", start, end)
+                    tag = "type"
                 elif word.isdigit():
-                    self.text.tag_add("number", start, end)
+                    tag = "number"
+                else:
+                    continue
+            self.text.tag_add(tag, self._tk_index(fuente, match.start()), self._tk_index(fuente, match.end()))
+
+    @staticmethod
+    def _tk_index(fuente: SourceText, offset: int) -> str:
+        """Convierte un offset del texto a índice Tk ('línea.columna', columna 0-based)."""
+        linea, columna = fuente.posicion(offset)
+        return f"{linea}.{columna - 1}"
 
     def get_text(self):
         """Obtiene el texto del editor."""